@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ChallengeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.challenge'
+
+    def ready(self):
+        # LocalAccount 저장 → 캐시된 solved.ac 핸들 무효화
+        from . import signals  # noqa: F401
@@ -1,18 +1,17 @@
 # challenge/services.py
-import requests
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+from typing import Dict, Any, List, Tuple
 
-SOLVEDAC_BASE_URL = "https://solved.ac/api/v3"
+from django.conf import settings
+from django.core.cache import cache
 
-DEFAULT_HEADERS = {
-    "User-Agent": "dororo-lms/1.0",
-    "Accept": "application/json",
-}
+from apps.users.models import LocalAccount
 
+from .solvedac_client import SolvedAcAPIError, get_client
 
-class SolvedAcAPIError(Exception):
-    """solved.ac 호출 관련 커스텀 예외"""
-    pass
+logger = logging.getLogger(__name__)
 
 
 def fetch_solvedac_user(handle: str) -> Dict[str, Any]:
@@ -20,28 +19,20 @@ def fetch_solvedac_user(handle: str) -> Dict[str, Any]:
     solved.ac /user/show API 호출해서 유저 정보 가져오기.
     - handle: solved.ac 아이디 (백준 아이디와 동일)
     """
-    url = f"{SOLVEDAC_BASE_URL}/user/show"
+    return get_client().get_user(handle)
 
-    resp = requests.get(
-        url,
-        params={"handle": handle},
-        headers=DEFAULT_HEADERS,
-        timeout=3,
-    )
-
-    if resp.status_code != 200:
-        raise SolvedAcAPIError(f"solved.ac returned {resp.status_code}")
-
-    data = resp.json()
-
-    # 방어적으로 items 래핑 처리
-    if isinstance(data, dict) and "items" in data:
-        items = data.get("items") or []
-        if not items:
-            raise SolvedAcAPIError("solved.ac: user not found")
-        return items[0]
 
-    return data
+def _to_problem_list(items: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    problems: List[Dict[str, Any]] = []
+    for item in items[:limit]:
+        problems.append(
+            {
+                "problem_id": item.get("problemId"),
+                "title": item.get("titleKo"),
+                "level": item.get("level"),
+            }
+        )
+    return problems
 
 
 def fetch_solvedac_solved_problems(handle: str, limit: int = 5) -> List[Dict[str, Any]]:
@@ -52,43 +43,27 @@ def fetch_solvedac_solved_problems(handle: str, limit: int = 5) -> List[Dict[str
     if not handle:
         return []
 
-    url = f"{SOLVEDAC_BASE_URL}/search/problem"
-    params = {
-        "query": f"solved_by:{handle}",
-        "sort": "level",
-        "direction": "desc",
-        "page": 1,
-    }
-
-    resp = requests.get(
-        url,
-        params=params,
-        headers=DEFAULT_HEADERS,
-        timeout=3,
-    )
-
-    if resp.status_code != 200:
+    try:
+        items = get_client().search_solved_problems(handle)
+    except SolvedAcAPIError:
         return []
+    return _to_problem_list(items, limit)
 
-    data = resp.json()
-    items = data.get("items", [])[:limit]
 
-    problems: List[Dict[str, Any]] = []
-    for item in items:
-        problems.append(
-            {
-                "problem_id": item.get("problemId"),
-                "title": item.get("titleKo"),
-                "level": item.get("level"),
-            }
-        )
-    return problems
+def fetch_challenge_payload(handle: str, limit: int = 5) -> dict:
+    """
+    user/show 와 search/problem 을 동시에 호출해서 챌린지 화면 payload 생성.
+    - 유저 조회 실패 시 SolvedAcAPIError
+    """
+    user, items = get_client().get_user_and_solved_problems(handle)
+    return build_challenge_payload(user, recent_solved=_to_problem_list(items, limit))
 
 
-def build_challenge_payload(user: dict) -> dict:
+def build_challenge_payload(user: dict, recent_solved: List[Dict[str, Any]] | None = None) -> dict:
     """
     solved.ac user JSON → 그대로 매핑만 함.
     계산/추측 일절 없음.
+    - recent_solved 를 안 넘기면 여기서 search/problem 을 호출
     """
     handle = user.get("handle")
     solved_count = user.get("solvedCount", 0)
@@ -104,7 +79,8 @@ def build_challenge_payload(user: dict) -> dict:
 
     max_streak = user.get("maxStreak", 0)
 
-    recent_solved = fetch_solvedac_solved_problems(handle, limit=5)
+    if recent_solved is None:
+        recent_solved = fetch_solvedac_solved_problems(handle, limit=5)
 
     return {
         "handle": handle,
@@ -133,3 +109,96 @@ def build_challenge_payload(user: dict) -> dict:
         # search/problem 에서 가져온 거
         "recent_solved_problems": recent_solved,
     }
+
+
+# ---------- 챌린지 payload 캐시 (stale-while-revalidate) ----------
+# - fresh  : CHALLENGE_CACHE_FRESH_TTL 초 이내 → 그대로 응답
+# - stale  : 그 이후 ~ CHALLENGE_CACHE_STALE_TTL 초 → 일단 이전 값 응답 + 백그라운드 갱신
+# - miss   : 캐시 없음 → 동기 호출 (실패하면 SolvedAcAPIError)
+# solved.ac 가 느리거나 죽어 있어도 마지막 정상 payload 를 계속 내려준다.
+
+FRESH_TTL = getattr(settings, "CHALLENGE_CACHE_FRESH_TTL", 120)
+STALE_TTL = getattr(settings, "CHALLENGE_CACHE_STALE_TTL", 24 * 60 * 60)
+HANDLE_TTL = 10 * 60
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="challenge-refresh")
+
+
+def _payload_key(handle: str) -> str:
+    return f"challenge:payload:{handle.lower()}"
+
+
+def _handle_key(user_id) -> str:
+    return f"challenge:handle:{user_id}"
+
+
+def get_solvedac_handle(user) -> str:
+    """
+    LocalAccount.solvedac_handel (없거나 비어 있으면 username).
+    - 유저별로 캐시, LocalAccount 저장 시 signals.py 에서 무효화
+    """
+    key = _handle_key(user.id)
+    handle = cache.get(key)
+    if handle is not None:
+        return handle
+
+    handle = (
+        LocalAccount.objects
+        .filter(user_id=user.id)
+        .values_list("solvedac_handel", flat=True)
+        .first()
+    ) or user.username
+    cache.set(key, handle, timeout=HANDLE_TTL)
+    return handle
+
+
+def invalidate_solvedac_handle(user_id):
+    cache.delete(_handle_key(user_id))
+
+
+def _store_payload(handle: str, payload: dict) -> None:
+    cache.set(
+        _payload_key(handle),
+        {"payload": payload, "fetched_at": time.time()},
+        timeout=STALE_TTL,
+    )
+
+
+def refresh_challenge_payload(handle: str) -> dict:
+    payload = fetch_challenge_payload(handle)
+    _store_payload(handle, payload)
+    return payload
+
+
+def _refresh_in_background(handle: str) -> None:
+    # 같은 핸들 갱신이 이미 돌고 있으면 또 띄우지 않음
+    lock_key = f"{_payload_key(handle)}:refreshing"
+    if not cache.add(lock_key, True, timeout=30):
+        return
+
+    def run():
+        try:
+            refresh_challenge_payload(handle)
+        except Exception as exc:
+            logger.warning("challenge refresh failed: %s", exc, extra={"handle": handle})
+        finally:
+            cache.delete(lock_key)
+
+    _refresh_executor.submit(run)
+
+
+def get_cached_challenge_payload(handle: str) -> Tuple[dict, int, str]:
+    """
+    (payload, age 초, 캐시 상태 "HIT" | "STALE" | "MISS") 리턴.
+    캐시가 전혀 없고 solved.ac 호출도 실패하면 SolvedAcAPIError.
+    """
+    entry = cache.get(_payload_key(handle))
+    if entry is None:
+        return refresh_challenge_payload(handle), 0, "MISS"
+
+    age = max(int(time.time() - entry["fetched_at"]), 0)
+    if age < FRESH_TTL:
+        return entry["payload"], age, "HIT"
+
+    _refresh_in_background(handle)
+    return entry["payload"], age, "STALE"
@@ -0,0 +1,13 @@
+# challenge/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.users.models import LocalAccount
+
+from .services import invalidate_solvedac_handle
+
+
+@receiver(post_save, sender=LocalAccount)
+def local_account_saved(sender, instance, **kwargs):
+    # solvedac_handel 이 바뀌었을 수 있으니 캐시된 핸들 버림
+    invalidate_solvedac_handle(instance.user_id)
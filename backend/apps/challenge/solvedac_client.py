@@ -0,0 +1,191 @@
+# challenge/solvedac_client.py
+"""
+solved.ac API 공용 클라이언트 (challenge / gamification 같이 사용).
+
+- requests.Session 하나를 재사용 → keep-alive + 커넥션 풀
+- 서로 독립적인 호출(user/show, search/problem)은 스레드 풀로 동시에 보냄
+- 같은 요청이 이미 날아가는 중이면 새로 보내지 않고 그 결과를 같이 기다림 (coalescing)
+- 성공한 응답은 핸들 단위로 TTL 동안 메모리에 캐시
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+SOLVEDAC_BASE_URL = "https://solved.ac/api/v3"
+
+DEFAULT_HEADERS = {
+    "User-Agent": "dororo-lms/1.0",
+    "Accept": "application/json",
+}
+
+
+class SolvedAcAPIError(Exception):
+    """solved.ac 호출 관련 커스텀 예외"""
+    pass
+
+
+class SolvedAcClient:
+    def __init__(
+        self,
+        base_url: str = SOLVEDAC_BASE_URL,
+        timeout: float = 3,
+        cache_ttl: float = 60,
+        pool_size: int = 16,
+        max_workers: int = 8,
+        max_cache_entries: int = 2048,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="solvedac")
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple, Future] = {}
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+
+    # ---------- 내부 ----------
+
+    def _request(self, path: str, params: dict) -> Any:
+        try:
+            resp = self.session.get(
+                f"{self.base_url}{path}",
+                params=params,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as exc:
+            raise SolvedAcAPIError(f"solved.ac request failed: {exc}") from exc
+
+        if resp.status_code != 200:
+            raise SolvedAcAPIError(f"solved.ac returned {resp.status_code}")
+
+        try:
+            return resp.json()
+        except ValueError as exc:
+            raise SolvedAcAPIError("solved.ac invalid JSON") from exc
+
+    def _get(self, path: str, params: dict) -> Any:
+        """
+        캐시 → 진행 중인 같은 요청 → 새 요청 순서로 처리.
+        실패는 캐시하지 않는다.
+        """
+        key = (path, tuple(sorted(params.items())))
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._request(path, params)
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if self.cache_ttl > 0:
+                self._store(key, data)
+        future.set_result(data)
+        return data
+
+    def _store(self, key, data):
+        """lock 잡은 상태에서 호출. 너무 커지면 만료된 항목부터 정리"""
+        now = time.monotonic()
+        if len(self._cache) >= self.max_cache_entries:
+            for k in [k for k, (exp, _) in self._cache.items() if exp <= now]:
+                del self._cache[k]
+            if len(self._cache) >= self.max_cache_entries:
+                self._cache.clear()
+        self._cache[key] = (now + self.cache_ttl, data)
+
+    # ---------- API ----------
+
+    def get_user(self, handle: str) -> Dict[str, Any]:
+        """/user/show → 유저 JSON (없으면 SolvedAcAPIError)"""
+        data = self._get("/user/show", {"handle": handle})
+
+        # 방어적으로 items 래핑 처리
+        if isinstance(data, dict) and "items" in data:
+            items = data.get("items") or []
+            if not items:
+                raise SolvedAcAPIError("solved.ac: user not found")
+            return items[0]
+
+        return data
+
+    def search_solved_problems(self, handle: str) -> List[Dict[str, Any]]:
+        """
+        /search/problem 으로 이 유저가 푼 문제 목록 (level 높은 순, 첫 페이지).
+        - 진짜 '최근' 순서는 API가 안 주니까 level 기준으로 정렬
+        """
+        data = self._get(
+            "/search/problem",
+            {
+                "query": f"solved_by:{handle}",
+                "sort": "level",
+                "direction": "desc",
+                "page": 1,
+            },
+        )
+        return data.get("items", []) if isinstance(data, dict) else []
+
+    def get_user_and_solved_problems(self, handle: str):
+        """
+        user/show 와 search/problem 을 동시에 호출.
+        - user 실패 → SolvedAcAPIError
+        - 문제 목록 실패 → [] (기존 동작과 동일)
+        """
+        problems_future = self._executor.submit(self.search_solved_problems, handle)
+        user = self.get_user(handle)
+
+        try:
+            problems = problems_future.result()
+        except SolvedAcAPIError:
+            problems = []
+        return user, problems
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> SolvedAcClient:
+    """프로세스당 하나의 공용 클라이언트"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SolvedAcClient(
+                    base_url=getattr(settings, "SOLVEDAC_BASE_URL", SOLVEDAC_BASE_URL),
+                    cache_ttl=getattr(settings, "SOLVEDAC_CLIENT_CACHE_TTL", 60),
+                )
+    return _client
@@ -1,3 +1,123 @@
-from django.test import TestCase
+# challenge/tests.py
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from urllib.parse import urlparse
 
-# Create your tests here.
+from unittest import mock
+
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from . import services
+from .solvedac_client import DEFAULT_HEADERS, SolvedAcAPIError, SolvedAcClient
+
+STUB_DELAY = 0.2
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """solved.ac 흉내 내는 로컬 서버 (응답마다 STUB_DELAY 만큼 지연)"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        self.server.hits += 1
+        time.sleep(STUB_DELAY)
+        path = urlparse(self.path).path
+        if path.endswith("/user/show"):
+            body = {"handle": "stub", "solvedCount": 42, "tier": 11}
+        else:
+            body = {"items": [{"problemId": 1000, "titleKo": "A+B", "level": 1}]}
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+class SolvedAcClientTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        cls.server.hits = 0
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.hits = 0
+        self.client = SolvedAcClient(base_url=self.base_url, cache_ttl=60)
+
+    def test_concurrent_calls_beat_sequential(self):
+        # 기존 방식: 요청마다 새 연결 + 순차 호출
+        started = time.perf_counter()
+        requests.get(f"{self.base_url}/user/show", params={"handle": "stub"}, headers=DEFAULT_HEADERS)
+        requests.get(f"{self.base_url}/search/problem", params={"query": "solved_by:stub"})
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        user, problems = self.client.get_user_and_solved_problems("stub")
+        concurrent = time.perf_counter() - started
+
+        self.assertEqual(user["solvedCount"], 42)
+        self.assertEqual(problems[0]["problemId"], 1000)
+        self.assertGreaterEqual(sequential, 2 * STUB_DELAY)
+        self.assertLess(concurrent, 1.5 * STUB_DELAY)
+
+    def test_identical_inflight_requests_are_coalesced(self):
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(lambda _: self.client.get_user("stub"), range(10)))
+
+        self.assertTrue(all(r["solvedCount"] == 42 for r in results))
+        self.assertEqual(self.server.hits, 1)
+
+    def test_responses_cached_per_handle(self):
+        self.client.get_user("stub")
+        started = time.perf_counter()
+        self.client.get_user("stub")
+        self.assertLess(time.perf_counter() - started, STUB_DELAY / 2)
+        self.assertEqual(self.server.hits, 1)
+
+
+class ChallengeViewCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username="stub", password="pw")
+        self.client.login(username="stub", password="pw")
+
+    def test_stale_payload_served_when_upstream_fails(self):
+        payload = {"handle": "stub", "solved_count": 42}
+        with mock.patch.object(services, "fetch_challenge_payload", return_value=payload):
+            first = self.client.get("/api/student/challenge/")
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        # fresh 구간이 지났고 solved.ac 는 죽어 있음
+        entry = cache.get(services._payload_key("stub"))
+        entry["fetched_at"] -= services.FRESH_TTL + 5
+        cache.set(services._payload_key("stub"), entry)
+
+        failing = mock.patch.object(
+            services, "fetch_challenge_payload", side_effect=SolvedAcAPIError("down")
+        )
+        with failing, mock.patch.object(services._refresh_executor, "submit") as submit:
+            res = self.client.get("/api/student/challenge/")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data, payload)
+        self.assertEqual(res["X-Cache"], "STALE")
+        self.assertGreaterEqual(int(res["Age"]), services.FRESH_TTL)
+        submit.assert_called_once()
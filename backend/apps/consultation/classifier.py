@@ -0,0 +1,81 @@
+# apps/consultation/classifier.py
+"""
+상담 문의 키워드 분류기 (services.RULES 를 import 할 때 한 번만 컴파일)
+
+예전: 메시지마다 소문자로 바꾼 뒤 모든 카테고리의 모든 키워드를 `in` 으로 (~250번) 훑고
+      처음 걸린 카테고리 하나만 돌려줌
+지금: 키워드 전체를 trie 로 묶어서 정규식 하나로 만들고 (공통 접두사는 한 번만 비교)
+      텍스트를 한 번 훑으면서 걸린 키워드를 전부 모아 카테고리별 점수를 냄
+
+- 위치마다 (?=(...)) 로 가장 긴 키워드를 잡음 -> 겹치는 키워드("결제", "결제 오류")도 다 셈
+  (가장 긴 것의 접두사인 키워드는 미리 계산해둔 prefix 표로 같이 처리)
+- 점수 = 걸린 키워드 길이 합 (짧고 흔한 "팀", "500" 보다 긴 문구가 더 무겁게)
+- 같은 키워드는 여러 번 나와도 한 번만 셈
+"""
+import re
+from collections import defaultdict
+
+
+def _trie_pattern(words):
+    """단어 목록 -> 공통 접두사를 묶은 정규식 문자열"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # 여기서 끝나는 단어도 있으면 뒤는 선택 (greedy -> 가장 긴 것부터)
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class KeywordClassifier:
+    def __init__(self, rules):
+        """rules: [(카테고리, [키워드, ...]), ...] (앞에 있는 카테고리가 동점일 때 우선)"""
+        self.order = {category: i for i, (category, _) in enumerate(rules)}
+        self.categories = defaultdict(set)  # 키워드 -> 카테고리들 (같은 키워드가 여러 곳에 있을 수 있음)
+        for category, keywords in rules:
+            for kw in keywords:
+                self.categories[kw.lower()].add(category)
+
+        words = sorted(self.categories, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + _trie_pattern(words) + "))")
+
+        # 키워드 -> 그 키워드의 접두사이기도 한 키워드들 (자기 자신 포함)
+        self.prefixes = {
+            kw: [other for other in words if kw.startswith(other)]
+            for kw in words
+        }
+
+    def keywords(self, text):
+        """text 안에 들어있는 키워드 집합"""
+        found = set()
+        for m in self.pattern.finditer(text.lower()):
+            longest = m.group(1)
+            if longest not in found:
+                found.update(self.prefixes[longest])
+        return found
+
+    def scores(self, text):
+        """[(카테고리, 점수), ...] 점수 높은 순 (동점이면 rules 순서)"""
+        totals = defaultdict(int)
+        for kw in self.keywords(text):
+            for category in self.categories[kw]:
+                totals[category] += len(kw)
+        return sorted(totals.items(), key=lambda item: (-item[1], self.order[item[0]]))
+
+    def best(self, text):
+        ranked = self.scores(text)
+        return ranked[0][0] if ranked else None
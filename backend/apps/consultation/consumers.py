@@ -1,21 +1,81 @@
+import asyncio
 import json
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.contrib.auth.models import AnonymousUser
+
+from myproject.ws_metrics import metrics
+
+from . import suggestions
+from .models import Consultation
+from .views import _is_admin
 
 
 class ConsultationConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.consultation_id = self.scope["url_route"]["kwargs"]["consultation_id"]
         self.group_name = f"consultation_{self.consultation_id}"
+        self.joined = False
+        self.is_owner = False
+        self.stream_tasks = set()
+
+        # 본인 상담이거나 관리자만 (접속할 때 한 번만 체크)
+        user = self.scope.get("user")
+        if user is None or isinstance(user, AnonymousUser):
+            await self.close(code=4401)
+            return
+        if not await self._can_join(user):
+            await self.close(code=4403)
+            return
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        self.joined = True
+        metrics.connected(self.group_name)
+
+    @database_sync_to_async
+    def _can_join(self, user):
+        if _is_admin(user):
+            return Consultation.objects.filter(pk=self.consultation_id).exists()
+        self.is_owner = Consultation.objects.filter(pk=self.consultation_id, user=user).exists()
+        return self.is_owner
 
     async def disconnect(self, close_code):
+        # 보던 학생이 나가면 스트리밍 중인 LLM 호출도 끊음
+        tasks = list(self.stream_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if not self.joined:
+            return
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        metrics.disconnected(self.group_name)
 
     async def receive(self, text_data=None, bytes_data=None):
         # 서버 푸시용이므로 클라이언트→서버 메시지는 무시
         return
 
     async def consultation_message(self, event):
+        metrics.observe_fanout(self.group_name, event.get("sent_at"))
+        await self.send(text_data=json.dumps(event["payload"]))
+
+    async def consultation_suggestion(self, event):
+        # 추천 답변 (suggestions.py 에서 생성 끝나면 push)
+        await self.send(text_data=json.dumps(event["payload"]))
+
+    async def consultation_suggestion_start(self, event):
+        # 스트리밍 모드: 학생 소켓 하나만 LLM 을 읽음 (관리자 화면은 조각만 받음)
+        if not self.is_owner:
+            return
+        if not await suggestions.claim_stream(event["claim"]):
+            return
+        task = asyncio.create_task(
+            suggestions.stream_to_group(self.consultation_id, event["message_id"], event["text"])
+        )
+        self.stream_tasks.add(task)
+        task.add_done_callback(self.stream_tasks.discard)
+
+    async def consultation_suggestion_delta(self, event):
         await self.send(text_data=json.dumps(event["payload"]))
@@ -0,0 +1,144 @@
+# apps/consultation/fake_llm.py
+"""
+테스트/로컬용 가짜 LLM 서버 (Gemini generateContent + OpenAI chat/completions 흉내, 스트리밍 포함)
+
+    python manage.py fake_llm --port 8090 --delay 1.5
+    GOOGLE_API_KEY=fake GOOGLE_GENAI_BASE_URL=http://127.0.0.1:8090 python manage.py runserver
+
+테스트에서는
+    with FakeLLMServer(delay=0.1) as fake:
+        os.environ["GOOGLE_GENAI_BASE_URL"] = fake.url
+        ...
+        fake.requests  # 받은 요청 (path, body) 목록
+
+- delay  : 응답 전에 기다리는 시간(초) (느린 LLM 흉내)
+- status : 200 이 아니면 그 상태코드로 에러 응답 (쿼터 초과 429 등)
+- 스트리밍(:streamGenerateContent?alt=sse, "stream": true) 은 답변을 chunk_size 글자씩
+  chunked SSE 로 chunk_delay 초 간격으로 보냄. 중간에 클라이언트가 끊으면 fake.aborted 에 path
+- 답변은 사용자 메시지를 앞에 붙인 고정 문장이라 어떤 질문에 대한 답인지 확인 가능
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_reply(user_text: str) -> str:
+    return f"[fake] '{user_text[:40]}' 문의 확인했습니다. 이 안내로 해결되셨나요?"
+
+
+def _user_text(path, body):
+    if ":generateContent" in path or ":streamGenerateContent" in path:
+        contents = body.get("contents") or [{}]
+        parts = contents[-1].get("parts") or [{}]
+        return parts[0].get("text", "")
+    messages = body.get("messages") or [{}]
+    return messages[-1].get("content", "")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeLLM/1.0"
+
+    def log_message(self, format, *args):  # 테스트 출력 조용히
+        pass
+
+    def _json(self, status, data):
+        raw = json.dumps(data, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _sse(self, text, event, done=False):
+        fake = self.server.fake
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        pieces = [text[i:i + fake.chunk_size] for i in range(0, len(text), fake.chunk_size)]
+        events = [json.dumps(event(piece), ensure_ascii=False) for piece in pieces]
+        if done:
+            events.append("[DONE]")
+        try:
+            for i, data in enumerate(events):
+                if i and fake.chunk_delay:
+                    time.sleep(fake.chunk_delay)
+                raw = f"data: {data}\r\n\r\n".encode()
+                self.wfile.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            with fake.lock:
+                fake.aborted.append(self.path)
+        self.close_connection = True
+
+    def do_POST(self):
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+        with fake.lock:
+            fake.requests.append((self.path, body))
+
+        if fake.delay:
+            time.sleep(fake.delay)
+        if fake.status != 200:
+            return self._json(fake.status, {"error": {"code": fake.status, "message": "fake error"}})
+
+        text = fake_reply(_user_text(self.path, body))
+        if ":streamGenerateContent" in self.path:
+            return self._sse(text, lambda piece: {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}}],
+            })
+        if self.path.startswith("/v1/chat/completions") and body.get("stream"):
+            return self._sse(text, lambda piece: {
+                "choices": [{"index": 0, "delta": {"content": piece}}],
+            }, done=True)
+        if ":generateContent" in self.path:
+            return self._json(200, {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+            })
+        if self.path.startswith("/v1/chat/completions"):
+            return self._json(200, {
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+            })
+        return self._json(404, {"error": {"code": 404, "message": "unknown path"}})
+
+
+class FakeLLMServer:
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0, status=200, chunk_size=8, chunk_delay=0.0):
+        self.delay = delay
+        self.status = status
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.requests = []
+        self.aborted = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,31 @@
+# apps/consultation/management/commands/fake_llm.py
+"""
+로컬 개발/부하 테스트용 가짜 LLM 서버 (apps/consultation/fake_llm.py)
+
+    python manage.py fake_llm --port 8090 --delay 1.5
+    GOOGLE_API_KEY=fake GOOGLE_GENAI_BASE_URL=http://127.0.0.1:8090 python manage.py runserver
+"""
+from django.core.management.base import BaseCommand
+
+from apps.consultation.fake_llm import FakeLLMServer
+
+
+class Command(BaseCommand):
+    help = "Gemini / OpenAI API 를 흉내내는 가짜 LLM 서버를 띄웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8090)
+        parser.add_argument("--delay", type=float, default=0.0, help="응답 전 대기 시간(초)")
+        parser.add_argument("--status", type=int, default=200, help="200 이 아니면 항상 이 코드로 에러")
+        parser.add_argument("--chunk-delay", type=float, default=0.05, help="스트리밍 조각 사이 간격(초)")
+
+    def handle(self, *args, host="127.0.0.1", port=8090, delay=0.0, status=200, chunk_delay=0.05, **options):
+        fake = FakeLLMServer(host=host, port=port, delay=delay, status=status, chunk_delay=chunk_delay)
+        self.stdout.write(f"fake LLM listening on {fake.url} (delay={delay}s, status={status})")
+        try:
+            fake.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            fake.httpd.server_close()
@@ -0,0 +1,86 @@
+# apps/consultation/management/commands/suggestion_benchmark.py
+"""
+상담 키워드 분류 마이크로 벤치마크 (예전 선형 탐색 vs 컴파일된 분류기)
+
+    python manage.py suggestion_benchmark
+    python manage.py suggestion_benchmark --limit 5000 --repeat 20
+    python manage.py suggestion_benchmark --file corpus.txt   # 한 줄에 문의 하나
+
+- 말뭉치: 기본은 DB 에 있는 학생 상담 메시지 (ConsultationMessage, sender_type="student")
+- 예전 방식 두 가지(첫 매칭만 / 모든 카테고리)와 CLASSIFIER.scores 의 메시지당 시간(us)
+- 걸린 키워드 집합이 예전 방식과 같은지 확인하고, 첫 매칭과 최고 점수 카테고리가 달라진 건수도 출력
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.consultation.models import ConsultationMessage
+from apps.consultation.services import CLASSIFIER, RULES, _keyword_match
+
+
+def _legacy_first(text):
+    for category, keywords in RULES:
+        if _keyword_match(text, keywords):
+            return category
+    return None
+
+
+def _legacy_all(text):
+    return [category for category, keywords in RULES if _keyword_match(text, keywords)]
+
+
+class Command(BaseCommand):
+    help = "상담 규칙 분류기(정규식 한 번) 와 예전 키워드 선형 탐색의 속도를 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="문의 텍스트 파일 (한 줄에 하나). 없으면 DB 학생 메시지")
+        parser.add_argument("--limit", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, file=None, limit=10000, repeat=5, **options):
+        if file:
+            with open(file, encoding="utf-8") as f:
+                corpus = [line.strip() for line in f if line.strip()][:limit]
+        else:
+            corpus = list(
+                ConsultationMessage.objects.filter(sender_type="student")
+                .order_by("-id")
+                .values_list("text", flat=True)[:limit]
+            )
+        if not corpus:
+            raise CommandError("말뭉치가 비어 있습니다 (--file 로 지정하거나 상담 메시지가 있어야 함)")
+
+        self.stdout.write(
+            f"말뭉치 {len(corpus)}건, 평균 {sum(map(len, corpus)) / len(corpus):.0f}자, "
+            f"키워드 {len(CLASSIFIER.categories)}개 x {repeat}회"
+        )
+
+        # 결과 비교 (속도만 빠르고 결과가 다르면 의미 없음)
+        mismatched = 0
+        changed = 0
+        for text in corpus:
+            lower = text.lower()
+            expected = {kw for kw in CLASSIFIER.categories if kw in lower}
+            if CLASSIFIER.keywords(text) != expected:
+                mismatched += 1
+            if _legacy_first(text) != CLASSIFIER.best(text):
+                changed += 1
+
+        for name, fn in [
+            ("예전: 첫 매칭", _legacy_first),
+            ("예전: 모든 카테고리", _legacy_all),
+            ("컴파일: 모든 카테고리+점수", CLASSIFIER.scores),
+        ]:
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for text in corpus:
+                    fn(text)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            self.stdout.write(f"{name:<24} {best / len(corpus) * 1e6:8.1f} us/건")
+
+        self.stdout.write(f"키워드 집합 불일치 {mismatched}건")
+        self.stdout.write(f"첫 매칭 카테고리와 최고 점수 카테고리가 다른 문의 {changed}건")
+        if mismatched:
+            raise CommandError("분류기 결과가 선형 탐색과 다릅니다")
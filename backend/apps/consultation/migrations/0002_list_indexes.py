@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:47
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_last_message_at(apps, schema_editor):
+    """비어 있는 last_message_at 은 마지막 메시지 시각 (메시지가 없으면 생성 시각) 으로"""
+    Consultation = apps.get_model("consultation", "Consultation")
+    ConsultationMessage = apps.get_model("consultation", "ConsultationMessage")
+    latest = (
+        ConsultationMessage.objects.filter(consultation=OuterRef("pk"))
+        .values("consultation")
+        .annotate(at=Max("created_at"))
+        .values("at")
+    )
+    Consultation.objects.filter(last_message_at__isnull=True).update(
+        last_message_at=Coalesce(Subquery(latest), F("created_at"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultation', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='consultation',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True),
+        ),
+        migrations.RunPython(backfill_last_message_at, migrations.RunPython.noop),
+        # 다 채운 뒤 NOT NULL (키셋 커서가 NULL 행을 건너뛰거나 500 내지 않게)
+        migrations.AlterField(
+            model_name='consultation',
+            name='last_message_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['user', '-last_message_at'], name='consult_user_last_msg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['status', '-last_message_at'], name='consult_status_last_msg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['-last_message_at', '-id'], name='consult_last_msg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultationmessage',
+            index=models.Index(fields=['consultation', '-created_at'], name='consult_msg_latest_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class Consultation(models.Model):
@@ -18,11 +19,18 @@ class Consultation(models.Model):
         choices=Status.choices,
         default=Status.IN_PROGRESS,
     )
-    last_message_at = models.DateTimeField(null=True, blank=True)
+    # 목록 정렬/커서 기준이라 비어 있으면 안 됨 (메시지 없으면 생성 시각)
+    last_message_at = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-last_message_at", "-created_at"]
+        indexes = [
+            # 학생 본인 목록 / 관리자 상태별 목록 (최근 메시지 순 커서)
+            models.Index(fields=["user", "-last_message_at"], name="consult_user_last_msg_idx"),
+            models.Index(fields=["status", "-last_message_at"], name="consult_status_last_msg_idx"),
+            models.Index(fields=["-last_message_at", "-id"], name="consult_last_msg_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title or '무제 상담'} ({self.get_status_display()})"
@@ -47,6 +55,10 @@ class ConsultationMessage(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # 목록에서 상담마다 최신 메시지 하나 (Subquery)
+            models.Index(fields=["consultation", "-created_at"], name="consult_msg_latest_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.sender_type}] {self.text[:30]}"
@@ -0,0 +1,232 @@
+# apps/consultation/router.py
+"""
+LLM 공급자 라우터 (services.LLM_ROUTER 로 한 번만 만듦)
+
+예전: 메시지마다 Google 먼저 -> 쿼터 초과/장애여도 매번 15초 타임아웃을 다 기다린 뒤 규칙 기반
+      (OpenAI 는 아예 안 불림)
+지금:
+- 공급자마다 서킷 브레이커
+    연속 실패 CONSULTATION_LLM_BREAKER_FAILURES 번 -> open (CONSULTATION_LLM_BREAKER_COOLDOWN 초 동안 안 부름)
+    쿨다운 지나면 half-open: 시험 호출 하나만 보내서 성공하면 closed, 실패하면 다시 open
+- 헤지: 첫 공급자가 CONSULTATION_LLM_HEDGE_BUDGET 초(기본 2초) 안에 답이 없으면 다음 공급자도 같이 보내고
+  먼저 온 성공 답을 씀. 첫 공급자가 빨리 실패하면 기다리지 않고 바로 다음으로
+- 다 실패하거나 다 open 이면 None -> 호출한 쪽(build_suggestion)이 규칙 기반으로
+- 공급자별 지연 히스토그램 / 성공·실패·차단·헤지 횟수 (프로세스 단위, GET /api/consultations/llm-metrics/)
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+FAILURE_THRESHOLD = getattr(settings, "CONSULTATION_LLM_BREAKER_FAILURES", 3)
+COOLDOWN = getattr(settings, "CONSULTATION_LLM_BREAKER_COOLDOWN", 30.0)
+HEDGE_BUDGET = getattr(settings, "CONSULTATION_LLM_HEDGE_BUDGET", 2.0)
+WORKERS = getattr(settings, "CONSULTATION_LLM_WORKERS", 8)
+
+# 지연 히스토그램 버킷 상한(ms). 마지막 칸은 그보다 큰 것 전부
+BUCKETS_MS = (100, 250, 500, 1000, 2000, 5000, 10000, 15000)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False  # half-open 시험 호출이 나가 있는지
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def available(self):
+        """지금 부를 수 있어 보이는지 (상태는 안 바꿈)"""
+        with self._lock:
+            state = self._state()
+            return state == "closed" or (state == "half_open" and not self._trial)
+
+    def allow(self):
+        """실제로 부르기 직전에. half-open 이면 한 번만 True (시험 호출)"""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def release(self):
+        """결과 없이 끝난 호출 (취소 등) -> half-open 시험 자리만 돌려줌"""
+        with self._lock:
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._trial = False
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.total = 0.0
+            self.calls = 0
+            self.ok = 0
+            self.errors = 0
+            self.short_circuited = 0
+            self.hedged = 0
+            self.last_error = None
+
+    def observe(self, seconds, ok, error=None):
+        ms = seconds * 1000
+        idx = next((i for i, bound in enumerate(self.buckets) if ms <= bound), len(self.buckets))
+        with self._lock:
+            self.counts[idx] += 1
+            self.total += ms
+            self.calls += 1
+            if ok:
+                self.ok += 1
+            else:
+                self.errors += 1
+                self.last_error = (error or "")[:200]
+
+    def count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"le_{b}ms" for b in self.buckets] + ["inf"]
+            return {
+                "calls": self.calls,
+                "ok": self.ok,
+                "errors": self.errors,
+                "short_circuited": self.short_circuited,
+                "hedged": self.hedged,
+                "avg_ms": round(self.total / self.calls, 1) if self.calls else None,
+                "histogram": dict(zip(labels, self.counts)),
+                "last_error": self.last_error,
+            }
+
+
+class Provider:
+    def __init__(self, name, call, configured):
+        """
+        call(text) -> (SuggestionResult | None, 에러 문자열 | None)  (services._google_llm 같은 것)
+        configured() -> API 키가 있는지
+        """
+        self.name = name
+        self.call = call
+        self.configured = configured
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyHistogram()
+
+
+class ProviderRouter:
+    def __init__(self, providers, hedge_budget=HEDGE_BUDGET, workers=WORKERS):
+        self.providers = providers
+        self.hedge_budget = hedge_budget
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="consultation-llm")
+
+    def available(self):
+        """키가 있고 브레이커가 열려 있지 않은 공급자들 (우선순위 순)"""
+        return [p for p in self.providers if p.configured() and p.breaker.available()]
+
+    def _run(self, provider, text):
+        started = time.perf_counter()
+        try:
+            result, err = provider.call(text)
+        except Exception as e:  # call 안에서 다 잡지만 혹시 몰라서
+            result, err = None, str(e)
+        elapsed = time.perf_counter() - started
+        ok = bool(result and result.message)
+        provider.latency.observe(elapsed, ok, None if ok else (err or "empty response"))
+        if ok:
+            provider.breaker.success()
+        else:
+            provider.breaker.failure()
+        return result if ok else None
+
+    def _start_next(self, queue, text, running):
+        """다음으로 부를 수 있는 공급자 하나를 띄움. 없으면 None"""
+        while queue:
+            provider = queue.pop(0)
+            if not provider.breaker.allow():
+                provider.latency.count("short_circuited")
+                continue
+            running[self._executor.submit(self._run, provider, text)] = provider
+            return provider
+        return None
+
+    def call(self, text):
+        """
+        LLM 답 (SuggestionResult) 또는 None
+        None 이면 전부 실패했거나 부를 수 있는 공급자가 없음 -> 규칙 기반으로
+        """
+        queue = [p for p in self.providers if p.configured()]
+        running = {}
+        if self._start_next(queue, text, running) is None:
+            return None
+
+        while running:
+            # 대기 중인 공급자가 남아 있으면 예산만큼만 기다리고 헤지
+            timeout = self.hedge_budget if queue else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedge = self._start_next(queue, text, running)
+                if hedge is not None:
+                    hedge.latency.count("hedged")
+                continue
+            for future in done:
+                running.pop(future)
+                result = future.result()
+                if result is not None:
+                    # 늦게 끝나는 쪽도 _run 에서 브레이커/히스토그램엔 기록됨
+                    return result
+            if not running:
+                self._start_next(queue, text, running)
+        return None
+
+    def snapshot(self):
+        return {
+            "hedge_budget_s": self.hedge_budget,
+            "providers": {
+                p.name: {
+                    "configured": p.configured(),
+                    "state": p.breaker.state,
+                    **p.latency.snapshot(),
+                }
+                for p in self.providers
+            },
+        }
+
+    def reset(self):
+        for p in self.providers:
+            p.breaker.success()
+            p.latency.reset()
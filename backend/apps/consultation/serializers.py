@@ -26,26 +26,18 @@ class ConsultationListSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
+    # latest_text / latest_sender_type 는 목록 뷰에서 Subquery 로 annotate
     def get_last_message(self, obj):
-        message = getattr(obj, "_latest_message", None)
-        if message:
-            return message.text
-        latest = obj.messages.order_by("-created_at").first()
-        return latest.text if latest else None
+        return getattr(obj, "latest_text", None)
 
     def get_last_message_at(self, obj):
-        message = getattr(obj, "_latest_message", None)
-        if message:
-            return message.created_at
-        latest = obj.messages.order_by("-created_at").first()
-        return latest.created_at if latest else None
+        # 메시지가 없으면 last_message_at 은 생성 시각이라 예전처럼 None 으로
+        if getattr(obj, "latest_sender_type", None) is None:
+            return None
+        return obj.last_message_at
 
     def get_last_message_sender_type(self, obj):
-        message = getattr(obj, "_latest_message", None)
-        if message:
-            return message.sender_type
-        latest = obj.messages.order_by("-created_at").first()
-        return latest.sender_type if latest else None
+        return getattr(obj, "latest_sender_type", None)
 
 
 class ConsultationDetailSerializer(serializers.ModelSerializer):
@@ -1,35 +1,45 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
+import logging
 import os
 from urllib import request, error
 
+from .classifier import KeywordClassifier
+from .router import Provider, ProviderRouter
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class SuggestionResult:
     category: str | None
     message: str | None
+    # 규칙 기반일 때 걸린 카테고리 전부 [(카테고리, 점수), ...] 점수 높은 순
+    scores: list = field(default_factory=list)
 
 
 def _keyword_match(text: str, keywords: list[str]) -> bool:
+    # 예전 방식 (키워드마다 `in`). 지금은 CLASSIFIER 를 쓰고, 벤치마크 비교용으로만 남겨둠
     lower = text.lower()
     return any(kw.lower() in lower for kw in keywords)
 
 
-def _google_llm(text: str) -> tuple[SuggestionResult | None, str | None]:
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        return None, "GOOGLE_API_KEY not set"
+SYSTEM_PROMPT = (
+    "당신은 친절한 상담사입니다. 사용자의 메시지를 보고 간결한 안내와 다음 단계, "
+    "확인이 필요한 정보가 있다면 물어봐 주세요. 끝에 '이 안내로 해결되셨나요?'라는 "
+    "문구로 확인을 요청하세요."
+)
 
-    system_prompt = (
-        "당신은 친절한 상담사입니다. 사용자의 메시지를 보고 간결한 안내와 다음 단계, "
-        "확인이 필요한 정보가 있다면 물어봐 주세요. 끝에 '이 안내로 해결되셨나요?'라는 "
-        "문구로 확인을 요청하세요."
-    )
 
+def google_url(api_key: str, method: str = "generateContent") -> str:
     model = os.getenv("GOOGLE_GENAI_MODEL", "gemini-1.5-flash")
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
-    payload = {
-        "system_instruction": {"parts": [{"text": system_prompt}]},
+    base_url = os.getenv("GOOGLE_GENAI_BASE_URL", "https://generativelanguage.googleapis.com").rstrip("/")
+    return f"{base_url}/v1beta/models/{model}:{method}?key={api_key}"
+
+
+def google_payload(text: str) -> dict:
+    return {
+        "system_instruction": {"parts": [{"text": SYSTEM_PROMPT}]},
         "contents": [
             {
                 "role": "user",
@@ -42,9 +52,32 @@ def _google_llm(text: str) -> tuple[SuggestionResult | None, str | None]:
         },
     }
 
+
+def openai_url() -> str:
+    base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com").rstrip("/")
+    return f"{base_url}/v1/chat/completions"
+
+
+def openai_payload(text: str) -> dict:
+    return {
+        "model": os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"),
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": text},
+        ],
+        "max_tokens": 200,
+        "temperature": 0.4,
+    }
+
+
+def _google_llm(text: str) -> tuple[SuggestionResult | None, str | None]:
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        return None, "GOOGLE_API_KEY not set"
+
     req = request.Request(
-        url,
-        data=json.dumps(payload).encode(),
+        google_url(api_key),
+        data=json.dumps(google_payload(text)).encode(),
         headers={"Content-Type": "application/json"},
     )
     try:
@@ -77,26 +110,9 @@ def _openai_llm(text: str) -> tuple[SuggestionResult | None, str | None]:
     if not api_key:
         return None, "OPENAI_API_KEY not set"
 
-    payload = {
-        "model": os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"),
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "당신은 친절한 상담사입니다. 사용자의 메시지를 보고 간결한 안내와 다음 단계, "
-                    "확인이 필요한 정보가 있다면 물어봐 주세요. 끝에 '이 안내로 해결되셨나요?'라는 "
-                    "문구로 확인을 요청하세요."
-                ),
-            },
-            {"role": "user", "content": text},
-        ],
-        "max_tokens": 200,
-        "temperature": 0.4,
-    }
-
     req = request.Request(
-        "https://api.openai.com/v1/chat/completions",
-        data=json.dumps(payload).encode(),
+        openai_url(),
+        data=json.dumps(openai_payload(text)).encode(),
         headers={
             "Content-Type": "application/json",
             "Authorization": f"Bearer {api_key}",
@@ -213,6 +229,15 @@ RULES = [
     ]),
 ]
 
+# RULES 전체를 정규식 하나로 (import 할 때 한 번)
+CLASSIFIER = KeywordClassifier(RULES)
+
+
+def classify(text: str) -> list[tuple[str, int]]:
+    """걸린 카테고리 전부 [(카테고리, 점수), ...] 점수 높은 순"""
+    return CLASSIFIER.scores(text or "")
+
+
 TEMPLATES = {
     "결제 관련 문의": "결제 오류/중복 결제는 카드사 승인 상태를 먼저 확인해 주세요. 문제가 지속되면 결제 일시, 사용 카드, 오류 화면을 남겨 주시면 확인 후 처리하겠습니다.",
     "환불/취소 문의": "환불/취소는 결제 수단과 시점에 따라 절차가 다릅니다. 결제 일시와 금액, 사용 수단을 알려주시면 처리 방법과 예상 소요 시간을 안내드릴게요.",
@@ -234,22 +259,41 @@ TEMPLATES = {
 }
 
 
+# LLM 공급자 (앞에 있는 게 우선). 브레이커/헤지/지연 기록은 router.py
+LLM_ROUTER = ProviderRouter([
+    Provider("google", _google_llm, lambda: bool(os.getenv("GOOGLE_API_KEY"))),
+    Provider("openai", _openai_llm, lambda: bool(os.getenv("OPENAI_API_KEY"))),
+])
+
+
+def llm_enabled() -> bool:
+    """
+    LLM 을 부를 수 있는지 (키가 있고 브레이커가 안 열린 공급자가 하나라도)
+    없으면 규칙 기반만 -> 요청 안에서 바로 계산해도 됨
+    """
+    return bool(LLM_ROUTER.available())
+
+
 def build_suggestion(text: str) -> SuggestionResult:
     normalized = (text or "").strip()
     if not normalized:
         return SuggestionResult(category=None, message=None)
 
-    # LLM 우선: Google → OpenAI 순
-    if os.getenv("GOOGLE_API_KEY"):
-        llm_res, llm_err = _google_llm(normalized)
-        if llm_res and llm_res.message:
+    # LLM 우선: Google → OpenAI 순 (느리면 헤지, 계속 실패하는 쪽은 건너뜀)
+    if llm_enabled():
+        llm_res = LLM_ROUTER.call(normalized)
+        if llm_res is not None:
             return llm_res
-        if llm_err:
-            print(f"[LLM] google 실패, rules fallback. reason={llm_err}", flush=True)
+        logger.warning("consultation LLM: all available providers failed, rules fallback")
+
+    return rule_suggestion(normalized)
+
 
-    # 규칙 기반
-    for category, keywords in RULES:
-        if _keyword_match(normalized, keywords):
-            return SuggestionResult(category=category, message=TEMPLATES.get(category))
+def rule_suggestion(text: str) -> SuggestionResult:
+    """규칙 기반: 점수 제일 높은 카테고리 (동점이면 RULES 앞쪽)"""
+    scores = classify(text)
+    if scores:
+        category = scores[0][0]
+        return SuggestionResult(category=category, message=TEMPLATES.get(category), scores=scores)
 
     return SuggestionResult(category="기타", message="내용을 더 알려주시면 빠르게 확인 후 답변드리겠습니다.")
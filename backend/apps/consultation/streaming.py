@@ -0,0 +1,198 @@
+# apps/consultation/streaming.py
+"""
+LLM 추천 답변 스트리밍 (SSE 를 asyncio 로 읽음)
+
+- Gemini  : :streamGenerateContent?alt=sse  -> data: {"candidates":[{"content":{"parts":[{"text": ...}]}}]}
+- OpenAI  : chat/completions + "stream": true -> data: {"choices":[{"delta":{"content": ...}}]} ... data: [DONE]
+- HTTP 는 asyncio.open_connection 으로 직접 (비동기 HTTP 클라이언트 의존성 없이)
+  응답은 chunked / Content-Length / 연결 종료 세 가지 다 처리
+- 태스크를 cancel 하면 소켓을 닫아서 LLM 쪽 생성도 끊김 (ConsultationConsumer.disconnect 에서)
+- 공급자 순서/서킷 브레이커/지연 기록은 블로킹 호출과 같은 LLM_ROUTER 것을 씀
+  (첫 조각 전에 실패하면 다음 공급자로. 스트리밍은 헤지 안 함 - 조각이 섞이면 안 되니까)
+"""
+import asyncio
+import json
+import os
+import ssl
+import time
+from urllib.parse import urlsplit
+
+from .services import LLM_ROUTER, google_payload, google_url, openai_payload, openai_url
+
+CONNECT_TIMEOUT = 5
+# 토큰 사이 최대 대기 (전체 생성 시간이 아니라 "멈춰 있는" 시간 제한)
+READ_TIMEOUT = 15
+
+
+class LLMStreamError(Exception):
+    pass
+
+
+async def _read_line(reader):
+    return await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+
+
+async def _body_chunks(reader, headers):
+    """응답 바디를 오는 대로 bytes 로"""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await _read_line(reader)
+            if not size_line:
+                return
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                return
+            data = await asyncio.wait_for(reader.readexactly(size + 2), READ_TIMEOUT)
+            yield data[:-2]
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining > 0:
+            data = await asyncio.wait_for(reader.read(min(remaining, 65536)), READ_TIMEOUT)
+            if not data:
+                return
+            remaining -= len(data)
+            yield data
+    else:
+        while True:
+            data = await asyncio.wait_for(reader.read(65536), READ_TIMEOUT)
+            if not data:
+                return
+            yield data
+
+
+async def sse_post(url, payload, headers=None):
+    """POST 하고 SSE 이벤트의 data 문자열을 하나씩 yield"""
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    body = json.dumps(payload).encode()
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            parts.hostname, port,
+            ssl=ssl.create_default_context() if secure else None,
+        ),
+        CONNECT_TIMEOUT,
+    )
+    try:
+        lines = [
+            f"POST {path} HTTP/1.1",
+            f"Host: {parts.netloc}",
+            "Content-Type: application/json",
+            "Accept: text/event-stream",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+        status_line = await _read_line(reader)
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise LLMStreamError(f"bad status line: {status_line[:100]!r}")
+        response_headers = {}
+        while True:
+            line = await _read_line(reader)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if status != 200:
+            detail = b""
+            async for chunk in _body_chunks(reader, response_headers):
+                detail += chunk
+                if len(detail) > 2000:
+                    break
+            raise LLMStreamError(f"HTTP {status}: {detail[:500].decode(errors='replace')}")
+
+        buffer = b""
+        data_lines = []
+        async for chunk in _body_chunks(reader, response_headers):
+            buffer += chunk
+            while b"\n" in buffer:
+                raw, buffer = buffer.split(b"\n", 1)
+                line = raw.rstrip(b"\r").decode()
+                if not line:
+                    # 빈 줄 = 이벤트 하나 끝
+                    if data_lines:
+                        yield "\n".join(data_lines)
+                        data_lines = []
+                elif line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+        if data_lines:
+            yield "\n".join(data_lines)
+    finally:
+        writer.close()
+
+
+async def stream_google(text):
+    api_key = os.getenv("GOOGLE_API_KEY")
+    url = google_url(api_key, method="streamGenerateContent") + "&alt=sse"
+    async for data in sse_post(url, google_payload(text)):
+        event = json.loads(data)
+        for candidate in event.get("candidates", [])[:1]:
+            for part in candidate.get("content", {}).get("parts", []):
+                if part.get("text"):
+                    yield part["text"]
+
+
+async def stream_openai(text):
+    payload = dict(openai_payload(text), stream=True)
+    headers = {"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"}
+    async for data in sse_post(openai_url(), payload, headers=headers):
+        if data.strip() == "[DONE]":
+            return
+        event = json.loads(data)
+        for choice in event.get("choices", [])[:1]:
+            delta = (choice.get("delta") or {}).get("content")
+            if delta:
+                yield delta
+
+
+STREAMS = {"google": stream_google, "openai": stream_openai}
+
+
+async def stream_suggestion(text):
+    """
+    사용 가능한 LLM 으로 토큰 조각(delta)을 yield
+    부를 수 있는 공급자가 없거나 다 실패하면 LLMStreamError (조각이 나간 뒤 실패하면 그 에러 그대로)
+    """
+    last_error = None
+    for provider in LLM_ROUTER.providers:
+        if not provider.configured():
+            continue
+        if not provider.breaker.allow():
+            provider.latency.count("short_circuited")
+            continue
+        started = time.perf_counter()
+        streamed = False
+        recorded = False
+        try:
+            async for delta in STREAMS[provider.name](text):
+                streamed = True
+                yield delta
+        except Exception as e:
+            provider.latency.observe(time.perf_counter() - started, False, str(e))
+            provider.breaker.failure()
+            recorded = True
+            if streamed:
+                raise
+            last_error = e
+            continue
+        else:
+            provider.latency.observe(time.perf_counter() - started, streamed, None if streamed else "empty response")
+            recorded = True
+            if streamed:
+                provider.breaker.success()
+                return
+            provider.breaker.failure()
+            last_error = "empty response"
+        finally:
+            # 취소(소켓 끊김)는 공급자 잘못이 아니니 기록 없이 시험 자리만 반납
+            if not recorded:
+                provider.breaker.release()
+    raise LLMStreamError(f"no LLM provider available: {last_error or 'all disabled'}")
@@ -0,0 +1,228 @@
+# apps/consultation/suggestions.py
+"""
+상담 추천 답변 비동기 처리
+
+- 메시지 저장 API 는 LLM 을 기다리지 않고 바로 응답 (예전엔 Gemini 호출로 최대 15초 붙잡힘)
+- 커밋 뒤 스레드 풀에서 build_suggestion -> consultation_{id} 그룹으로 push
+    {"type": "suggestion", "message_id": ..., "category": ..., "message": ...}
+- LLM 결과는 정규화한 텍스트의 sha256 으로 캐시 (같은 질문이면 LLM 을 다시 부르지 않음)
+  규칙 기반 결과는 싸니까 캐시 안 함 (LLM 이 잠깐 실패했을 때 규칙 답이 굳어버리지 않게)
+- LLM 키가 없으면 규칙 기반이라 요청 안에서 바로 계산
+
+CONSULTATION_SUGGESTION_INLINE = True 면 스레드 풀 대신 커밋 직후 그 자리에서 (테스트/디버깅용)
+
+CONSULTATION_SUGGESTION_STREAM = True 면 스트리밍 모드
+- 스레드 풀 대신 그룹에 consultation_suggestion_start 를 보내고, 상담 주인(학생)의 웹소켓이
+  stream_to_group 으로 LLM SSE 를 읽으면서 조각마다 {"type": "suggestion_delta", ...} push
+- 다 끝나면 위와 같은 {"type": "suggestion"} 한 번 (캐시도 그때)
+- 그 소켓이 끊기면 태스크 cancel -> LLM 연결도 닫힘
+- 학생 소켓이 안 열려 있으면 아무도 안 가져가니까, CONSULTATION_SUGGESTION_STREAM_CLAIM_TIMEOUT 초
+  안에 claim 이 없으면 스레드 풀(_generate) 로 넘김 (claim 은 요청마다 nonce 로 한 번만)
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .services import SuggestionResult, build_suggestion, llm_enabled, rule_suggestion
+from .streaming import stream_suggestion
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = getattr(settings, "CONSULTATION_SUGGESTION_CACHE_TTL", 24 * 60 * 60)
+WORKERS = getattr(settings, "CONSULTATION_SUGGESTION_WORKERS", 4)
+INLINE = getattr(settings, "CONSULTATION_SUGGESTION_INLINE", False)
+STREAM = getattr(settings, "CONSULTATION_SUGGESTION_STREAM", False)
+STREAM_CLAIM_TIMEOUT = getattr(settings, "CONSULTATION_SUGGESTION_STREAM_CLAIM_TIMEOUT", 2.0)
+
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="consultation-suggest")
+
+
+def normalize_text(text: str) -> str:
+    """전각/반각, 대소문자, 공백 차이는 같은 질문으로"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.lower().split())
+
+
+def _cache_key(text: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+    return f"consultation:suggestion:{digest}"
+
+
+def _pending_key(consultation_id, text: str) -> str:
+    return f"{_cache_key(text)}:pending:{consultation_id}"
+
+
+def _as_dict(result: SuggestionResult, pending=False) -> dict:
+    return {
+        "category": result.category,
+        "message": result.message,
+        "pending": pending,
+        "scores": [{"category": c, "score": score} for c, score in result.scores],
+    }
+
+
+def cached_suggestion(text: str) -> SuggestionResult | None:
+    data = cache.get(_cache_key(text))
+    if data is None:
+        return None
+    return SuggestionResult(category=data["category"], message=data["message"])
+
+
+def get_suggestion(text: str) -> SuggestionResult:
+    """캐시 -> 없으면 build_suggestion (LLM 이 답한 것만 캐시). 블로킹"""
+    result = cached_suggestion(text)
+    if result is not None:
+        return result
+
+    result = build_suggestion(text)
+    if result.category == "LLM" and result.message:
+        cache.set(
+            _cache_key(text),
+            {"category": result.category, "message": result.message},
+            timeout=CACHE_TTL,
+        )
+    return result
+
+
+def _suggestion_event(message_id, result: SuggestionResult) -> dict:
+    return {
+        "type": "consultation_suggestion",
+        "payload": {
+            "type": "suggestion",
+            "message_id": message_id,
+            "category": result.category,
+            "message": result.message,
+        },
+    }
+
+
+def _push(consultation_id, message_id, result: SuggestionResult):
+    async_to_sync(get_channel_layer().group_send)(
+        f"consultation_{consultation_id}", _suggestion_event(message_id, result)
+    )
+
+
+def _generate(consultation_id, message_id, text):
+    started = time.perf_counter()
+    try:
+        result = get_suggestion(text)
+        _push(consultation_id, message_id, result)
+    except Exception:
+        logger.exception("consultation suggestion failed", extra={"consultation_id": consultation_id})
+        return
+    finally:
+        cache.delete(_pending_key(consultation_id, text))
+    logger.info(
+        "consultation suggestion ready in %.0fms",
+        (time.perf_counter() - started) * 1000,
+        extra={"consultation_id": consultation_id, "category": result.category},
+    )
+
+
+def request_suggestion(consultation_id, text, message_id=None) -> dict | None:
+    """
+    API 응답에 넣을 suggestion dict
+    - 캐시에 있거나 규칙 기반이면 바로 결과
+    - 아니면 {"pending": True} 를 돌려주고, 생성되면 웹소켓으로 push
+    """
+    if not (text or "").strip():
+        return None
+
+    result = cached_suggestion(text)
+    if result is None and not llm_enabled():
+        result = build_suggestion(text)
+    if result is not None:
+        return _as_dict(result)
+
+    # 스트리밍: 중복은 받은 소켓 쪽에서 claim_stream 으로 막음 (아무도 안 받으면 폴백 타이머가 _generate)
+    if STREAM:
+        transaction.on_commit(lambda: _start_stream(consultation_id, message_id, text))
+        return _as_dict(SuggestionResult(category=None, message=None), pending=True)
+
+    # 같은 상담에서 같은 질문이 이미 생성 중이면 또 안 띄움 (다 되면 그쪽에서 push)
+    if not cache.add(_pending_key(consultation_id, text), True, timeout=60):
+        return _as_dict(SuggestionResult(category=None, message=None), pending=True)
+
+    if INLINE:
+        transaction.on_commit(lambda: _generate(consultation_id, message_id, text))
+    else:
+        transaction.on_commit(lambda: _executor.submit(_generate, consultation_id, message_id, text))
+    return _as_dict(SuggestionResult(category=None, message=None), pending=True)
+
+
+# ---------------------------------------------------------------------------
+# 스트리밍 모드 (ConsultationConsumer 에서)
+# ---------------------------------------------------------------------------
+
+def _start_stream(consultation_id, message_id, text):
+    claim = uuid.uuid4().hex
+    async_to_sync(get_channel_layer().group_send)(
+        f"consultation_{consultation_id}",
+        {"type": "consultation_suggestion_start", "message_id": message_id, "text": text, "claim": claim},
+    )
+    timer = threading.Timer(
+        STREAM_CLAIM_TIMEOUT, _fallback_if_unclaimed, args=(consultation_id, message_id, text, claim)
+    )
+    timer.daemon = True
+    timer.start()
+
+
+def _claim_key(claim):
+    return f"consultation:suggestion:claim:{claim}"
+
+
+def _fallback_if_unclaimed(consultation_id, message_id, text, claim):
+    # 학생 소켓이 하나도 안 열려 있으면 -> 스레드 풀에서 블로킹 생성 후 push (다음 접속 때 캐시/재요청으로 받음)
+    if cache.add(_claim_key(claim), "fallback", timeout=10 * 60):
+        _executor.submit(_generate, consultation_id, message_id, text)
+
+
+async def claim_stream(claim) -> bool:
+    """같은 상담에 소켓이 여러 개(탭 여러 개)여도, 폴백 타이머와도 한 번만"""
+    return await cache.aadd(_claim_key(claim), "socket", timeout=10 * 60)
+
+
+async def stream_to_group(consultation_id, message_id, text):
+    """
+    LLM 조각을 그룹으로 push 하고 마지막에 전체 결과 push + 캐시
+    - 한 조각도 못 받고 실패하면 규칙 기반 결과로
+    - 중간에 끊기면 받은 데까지만 보내고 캐시는 안 함
+    """
+    layer = get_channel_layer()
+    group = f"consultation_{consultation_id}"
+    parts = []
+    failed = False
+    try:
+        async for delta in stream_suggestion(text):
+            parts.append(delta)
+            await layer.group_send(group, {
+                "type": "consultation_suggestion_delta",
+                "payload": {"type": "suggestion_delta", "message_id": message_id, "delta": delta},
+            })
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        failed = True
+        logger.warning("consultation suggestion stream failed: %s", e, extra={"consultation_id": consultation_id})
+
+    message = "".join(parts).strip()
+    if message:
+        result = SuggestionResult(category="LLM", message=message)
+        if not failed:
+            await cache.aset(
+                _cache_key(text), {"category": result.category, "message": message}, timeout=CACHE_TTL
+            )
+    else:
+        result = rule_suggestion(normalize_text(text))
+    await layer.group_send(group, _suggestion_event(message_id, result))
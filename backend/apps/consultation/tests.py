@@ -1,3 +1,451 @@
+# apps/consultation/tests.py
+import io
+import json
+import os
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import suggestions
+from .classifier import KeywordClassifier
+from .fake_llm import FakeLLMServer, fake_reply
+from .models import Consultation, ConsultationMessage
+from .router import CircuitBreaker
+from .services import CLASSIFIER, LLM_ROUTER, RULES, build_suggestion, classify
+from .routing import websocket_urlpatterns
+
+
+class SuggestionPipelineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        LLM_ROUTER.reset()
+        self.user = User.objects.create_user(username="stu", password="pw")
+        self.consultation = Consultation.objects.create(user=self.user, title="상담")
+        self.client.force_login(self.user)
+        self.url = f"/api/consultations/{self.consultation.id}/messages/"
+
+    def _llm(self, fake):
+        env = {"GOOGLE_API_KEY": "test", "GOOGLE_GENAI_BASE_URL": fake.url, "OPENAI_API_KEY": ""}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(self.url, {"text": text}, content_type="application/json")
+        self.assertEqual(res.status_code, 201)
+        return res.json()
+
+    def test_rules_answer_inline_without_llm(self):
+        with mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "", "OPENAI_API_KEY": ""}):
+            data = self._post("과제 제출 기한이 언제인가요?")
+        self.assertEqual(data["suggestion"]["category"], "과제/리포트 문의")
+        self.assertFalse(data["suggestion"]["pending"])
+
+    def test_message_is_saved_without_waiting_for_llm_then_pushed_and_cached(self):
+        pushed = []
+        done = threading.Event()
+
+        def record(consultation_id, message_id, result):
+            pushed.append((consultation_id, message_id, result))
+            done.set()
+
+        with FakeLLMServer(delay=0.5) as fake, mock.patch.object(suggestions, "_push", side_effect=record):
+            self._llm(fake)
+            started = time.perf_counter()
+            data = self._post("환불은 어떻게 하나요?")
+            self.assertLess(time.perf_counter() - started, 0.4)
+            self.assertTrue(data["suggestion"]["pending"])
+
+            self.assertTrue(done.wait(5))
+            consultation_id, message_id, result = pushed[0]
+            self.assertEqual((consultation_id, message_id), (self.consultation.id, data["id"]))
+            self.assertEqual(result.message, fake_reply("환불은 어떻게 하나요?"))
+
+            # 공백/대소문자만 다른 같은 질문은 캐시에서 바로
+            again = self._post("  환불은   어떻게 하나요? ")
+            self.assertFalse(again["suggestion"]["pending"])
+            self.assertEqual(again["suggestion"]["message"], result.message)
+            self.assertEqual(len(fake.requests), 1)
+
+    def test_llm_failure_falls_back_to_rules_and_is_not_cached(self):
+        with FakeLLMServer(status=429) as fake:
+            self._llm(fake)
+            result = suggestions.get_suggestion("환불해주세요")
+        self.assertEqual(result.category, "환불/취소 문의")
+        self.assertIsNone(suggestions.cached_suggestion("환불해주세요"))
+
+    def test_suggestion_pushed_to_consultation_socket(self):
+        async def run():
+            comm = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns), f"/ws/consultations/{self.consultation.id}/"
+            )
+            comm.scope["user"] = self.user
+            connected, _ = await comm.connect()
+            self.assertTrue(connected)
+
+            await sync_to_async(suggestions._generate)(self.consultation.id, 7, "시험 범위 알려주세요")
+            event = json.loads(await comm.receive_from(timeout=5))
+            await comm.disconnect()
+            return event
+
+        with FakeLLMServer() as fake:
+            self._llm(fake)
+            event = async_to_sync(run)()
+        self.assertEqual(event["type"], "suggestion")
+        self.assertEqual(event["message_id"], 7)
+        self.assertEqual(event["category"], "LLM")
+
+
+class SuggestionStreamTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        LLM_ROUTER.reset()
+        self.user = User.objects.create_user(username="stu", password="pw")
+        self.consultation = Consultation.objects.create(user=self.user, title="상담")
+        # 소켓이 claim 하면 폴백(_generate)은 안 돌아야 함
+        for patcher in (
+            mock.patch.object(suggestions, "STREAM_CLAIM_TIMEOUT", 0.3),
+            mock.patch.object(suggestions, "_generate"),
+        ):
+            patched = patcher.start()
+            self.addCleanup(patcher.stop)
+        self.fallback = patched
+
+    def _llm(self, fake):
+        env = {"GOOGLE_API_KEY": "test", "GOOGLE_GENAI_BASE_URL": fake.url, "OPENAI_API_KEY": ""}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _connect(self):
+        comm = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f"/ws/consultations/{self.consultation.id}/"
+        )
+        comm.scope["user"] = self.user
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        return comm
+
+    def test_request_in_stream_mode_asks_socket_to_stream(self):
+        with mock.patch.object(suggestions, "STREAM", True), \
+                mock.patch.object(suggestions, "_start_stream") as start, \
+                mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "test", "OPENAI_API_KEY": ""}), \
+                self.captureOnCommitCallbacks(execute=True):
+            data = suggestions.request_suggestion(self.consultation.id, "환불은 어떻게 하나요?", message_id=3)
+        self.assertTrue(data["pending"])
+        start.assert_called_once_with(self.consultation.id, 3, "환불은 어떻게 하나요?")
+
+    def test_deltas_then_final_suggestion_and_cache(self):
+        text = "시험 범위 알려주세요"
+
+        async def run():
+            comm = await self._connect()
+            await sync_to_async(suggestions._start_stream)(self.consultation.id, 7, text)
+            events = []
+            while True:
+                event = json.loads(await comm.receive_from(timeout=5))
+                events.append(event)
+                if event["type"] == "suggestion":
+                    break
+            await comm.disconnect()
+            return events
+
+        with FakeLLMServer(chunk_size=5) as fake:
+            self._llm(fake)
+            events = async_to_sync(run)()
+
+        deltas = events[:-1]
+        self.assertGreater(len(deltas), 1)
+        self.assertTrue(all(e["type"] == "suggestion_delta" and e["message_id"] == 7 for e in deltas))
+        self.assertEqual("".join(e["delta"] for e in deltas), fake_reply(text))
+        self.assertEqual(events[-1]["message"], fake_reply(text))
+        self.assertEqual(suggestions.cached_suggestion(text).message, fake_reply(text))
+        time.sleep(0.5)
+        self.fallback.assert_not_called()
+
+    def test_no_socket_hands_off_to_thread_pool(self):
+        suggestions._start_stream(self.consultation.id, 5, "시험 범위 알려주세요")
+        deadline = time.time() + 3
+        while not self.fallback.called and time.time() < deadline:
+            time.sleep(0.05)
+        self.fallback.assert_called_once_with(self.consultation.id, 5, "시험 범위 알려주세요")
+
+    def test_stream_error_falls_back_to_rules(self):
+        async def run():
+            comm = await self._connect()
+            await sync_to_async(suggestions._start_stream)(self.consultation.id, 1, "환불해주세요")
+            event = json.loads(await comm.receive_from(timeout=5))
+            await comm.disconnect()
+            return event
+
+        with FakeLLMServer(status=500) as fake:
+            self._llm(fake)
+            event = async_to_sync(run)()
+        self.assertEqual(event["type"], "suggestion")
+        self.assertEqual(event["category"], "환불/취소 문의")
+        self.assertIsNone(suggestions.cached_suggestion("환불해주세요"))
+
+    def test_disconnect_cancels_llm_stream(self):
+        text = "과제 제출 기한이 언제인가요?"
+
+        async def run():
+            comm = await self._connect()
+            await sync_to_async(suggestions._start_stream)(self.consultation.id, 1, text)
+            first = json.loads(await comm.receive_from(timeout=5))
+            await comm.disconnect()
+            return first
+
+        with FakeLLMServer(chunk_size=2, chunk_delay=0.1) as fake:
+            self._llm(fake)
+            first = async_to_sync(run)()
+            deadline = time.time() + 3
+            while not fake.aborted and time.time() < deadline:
+                time.sleep(0.05)
+        self.assertEqual(first["type"], "suggestion_delta")
+        self.assertEqual(len(fake.aborted), 1)
+        self.assertIsNone(suggestions.cached_suggestion(text))
+        time.sleep(0.5)
+        self.fallback.assert_not_called()
+
+
+class LLMRouterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        LLM_ROUTER.reset()
+        self.addCleanup(LLM_ROUTER.reset)
+
+    def _providers(self, google, openai):
+        env = {
+            "GOOGLE_API_KEY": "test", "GOOGLE_GENAI_BASE_URL": google.url,
+            "OPENAI_API_KEY": "test", "OPENAI_BASE_URL": openai.url,
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _stats(self, name):
+        return LLM_ROUTER.snapshot()["providers"][name]
+
+    def test_breaker_states(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=10, clock=lambda: now[0])
+        breaker.failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+        now[0] = 10
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # 시험 호출은 하나만
+        breaker.failure()
+        self.assertEqual(breaker.state, "open")
+
+        now[0] = 20
+        self.assertTrue(breaker.allow())
+        breaker.success()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_google_error_fails_over_to_openai(self):
+        with FakeLLMServer(status=503) as google, FakeLLMServer() as openai:
+            self._providers(google, openai)
+            started = time.perf_counter()
+            result = build_suggestion("환불해주세요")
+            self.assertLess(time.perf_counter() - started, 1.5)
+        self.assertEqual(result.category, "LLM")
+        self.assertEqual(result.message, fake_reply("환불해주세요"))
+        self.assertEqual(len(openai.requests), 1)
+        self.assertEqual(self._stats("google")["errors"], 1)
+        self.assertEqual(self._stats("openai")["ok"], 1)
+
+    def test_open_breaker_skips_provider(self):
+        with FakeLLMServer(status=429) as google, FakeLLMServer() as openai:
+            self._providers(google, openai)
+            for _ in range(5):
+                build_suggestion("시험 범위 알려주세요")
+        self.assertEqual(len(google.requests), 3)
+        self.assertEqual(len(openai.requests), 5)
+        stats = self._stats("google")
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual(stats["short_circuited"], 2)
+
+    def test_slow_provider_is_hedged(self):
+        with FakeLLMServer(delay=1.5) as google, FakeLLMServer() as openai, \
+                mock.patch.object(LLM_ROUTER, "hedge_budget", 0.2):
+            self._providers(google, openai)
+            started = time.perf_counter()
+            result = build_suggestion("과제 제출 기한")
+            elapsed = time.perf_counter() - started
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(result.message, fake_reply("과제 제출 기한"))
+        self.assertEqual(len(google.requests), 1)
+        self.assertEqual(self._stats("openai")["hedged"], 1)
+        self.assertEqual(sum(self._stats("openai")["histogram"].values()), 1)
+
+    def test_all_providers_open_answers_rules_inline(self):
+        with FakeLLMServer(status=500) as google, FakeLLMServer(status=500) as openai:
+            self._providers(google, openai)
+            for _ in range(3):
+                self.assertEqual(build_suggestion("환불해주세요").category, "환불/취소 문의")
+            data = suggestions.request_suggestion(1, "환불해주세요")
+        self.assertFalse(data["pending"])
+        self.assertEqual(data["category"], "환불/취소 문의")
+        self.assertEqual((len(google.requests), len(openai.requests)), (3, 3))
+
+    def test_metrics_endpoint_is_admin_only(self):
+        user = User.objects.create_user(username="u", password="pw")
+        admin = User.objects.create_user(username="a", password="pw", is_staff=True)
+        self.client.force_login(user)
+        self.assertEqual(self.client.get("/api/consultations/llm-metrics/").status_code, 403)
+        self.client.force_login(admin)
+        res = self.client.get("/api/consultations/llm-metrics/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(set(res.json()["providers"]), {"google", "openai"})
+
+
+class ConsultationListTest(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username="stu", password="pw")
+        self.other = User.objects.create_user(username="other", password="pw")
+        self.admin = User.objects.create_user(username="adm", password="pw", is_staff=True)
+        base = timezone.now()
+        self.consultations = []
+        for i in range(7):
+            c = Consultation.objects.create(
+                user=self.student if i % 2 == 0 else self.other,
+                title=f"상담 {i}",
+                status=Consultation.Status.DONE if i % 3 == 0 else Consultation.Status.IN_PROGRESS,
+            )
+            ConsultationMessage.objects.create(consultation=c, sender_type="student", text=f"질문 {i}")
+            ConsultationMessage.objects.create(consultation=c, sender_type="admin", text=f"답변 {i}")
+            # 몇 개는 같은 시각 (커서가 id 로 이어지는지)
+            c.last_message_at = base - timezone.timedelta(minutes=i // 2)
+            c.save(update_fields=["last_message_at"])
+            self.consultations.append(c)
+
+    def _get(self, user, url="/api/consultations/"):
+        self.client.force_login(user)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200, res.content)
+        return res.json()
+
+    def test_latest_message_annotated(self):
+        data = self._get(self.student)
+        self.assertEqual({row["id"] for row in data}, {c.id for c in self.consultations[::2]})
+        first = data[0]
+        self.assertEqual(first["last_message"], "답변 0")
+        self.assertEqual(first["last_message_sender_type"], "admin")
+        self.assertIsNotNone(first["last_message_at"])
+
+    def test_consultation_without_messages(self):
+        empty = Consultation.objects.create(user=self.student, title="빈 상담")
+        self.assertIsNotNone(empty.last_message_at)
+        row = next(r for r in self._get(self.student) if r["id"] == empty.id)
+        self.assertIsNone(row["last_message"])
+        self.assertIsNone(row["last_message_at"])
+
+    def test_query_count_does_not_grow_with_consultations(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get("/api/consultations/")
+        for i in range(20):
+            c = Consultation.objects.create(user=self.student, title=f"추가 {i}")
+            ConsultationMessage.objects.create(consultation=c, sender_type="student", text="질문")
+        with CaptureQueriesContext(connection) as many:
+            res = self.client.get("/api/consultations/")
+        self.assertEqual(len(res.json()), 27)
+        self.assertEqual(len(many), len(few))
+
+    def test_keyset_pages_cover_everything_in_order(self):
+        seen = []
+        url = "/api/consultations/?page_size=3"
+        while url:
+            page = self._get(self.admin, url)
+            seen += [row["id"] for row in page["results"]]
+            url = page["next"]
+        expected = [
+            c.id for c in sorted(self.consultations, key=lambda c: (c.last_message_at, c.id), reverse=True)
+        ]
+        self.assertEqual(seen, expected)
+
+    def test_keyset_cursor_with_identical_timestamps(self):
+        same = timezone.now() + timezone.timedelta(hours=1)
+        ids = []
+        for i in range(5):
+            c = Consultation.objects.create(user=self.student, title=f"동시 {i}")
+            Consultation.objects.filter(pk=c.pk).update(last_message_at=same)
+            ids.append(c.id)
+        first = self._get(self.admin, "/api/consultations/?page_size=2")
+        second = self._get(self.admin, first["next"])
+        third = self._get(self.admin, second["next"])
+        got = [row["id"] for page in (first, second, third) for row in page["results"]]
+        self.assertEqual(got[:5], sorted(ids, reverse=True))
+
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get("/api/consultations/?cursor=bm9wZQ").status_code, 404)
+
+    def test_status_filter(self):
+        page = self._get(self.admin, "/api/consultations/?status=IN_PROGRESS&page_size=50")
+        self.assertEqual(
+            {row["id"] for row in page["results"]},
+            {c.id for c in self.consultations if c.status == Consultation.Status.IN_PROGRESS},
+        )
+        self.assertTrue(all(row["status"] == "IN_PROGRESS" for row in page["results"]))
+
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get("/api/consultations/?status=NOPE").status_code, 400)
+
+
+class KeywordClassifierTest(TestCase):
+    TEXTS = [
+        "결제가 안 돼요 카드가 막혔어요",
+        "과제 제출 기한이 언제인가요? 파일 형식은?",
+        "강의 자료 PPT 가 안 떠요, LMS 오류인가요",
+        "팀플 팀원이 안 나와요",
+        "그냥 궁금한 게 있어요",
+    ]
+
+    def test_finds_same_keywords_as_linear_scan(self):
+        for text in self.TEXTS:
+            lower = text.lower()
+            expected = {kw.lower() for _, kws in RULES for kw in kws if kw.lower() in lower}
+            self.assertEqual(CLASSIFIER.keywords(text), expected, text)
+
+    def test_overlapping_keywords_and_scores(self):
+        classifier = KeywordClassifier([
+            ("A", ["결제", "결제 오류"]),
+            ("B", ["오류"]),
+        ])
+        self.assertEqual(classifier.keywords("결제 오류 났어요"), {"결제", "결제 오류", "오류"})
+        self.assertEqual(classifier.scores("결제 오류 났어요"), [("A", 7), ("B", 2)])
+        self.assertEqual(classifier.scores("오류 오류 오류"), [("B", 2)])
+        self.assertEqual(classifier.scores("아무 말"), [])
+
+    def test_rule_suggestion_reports_all_hits(self):
+        with mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "", "OPENAI_API_KEY": ""}):
+            result = build_suggestion("강의 자료 PPT 가 안 떠요, LMS 오류인가요")
+        self.assertEqual(result.category, "강의자료/녹화본 문의")
+        self.assertEqual([c for c, _ in result.scores], [c for c, _ in classify("강의 자료 PPT 가 안 떠요, LMS 오류인가요")])
+        self.assertIn("오류/장애 문의", dict(result.scores))
 
-# Create your tests here.
+    def test_benchmark_command(self):
+        user = User.objects.create_user(username="b", password="pw")
+        consultation = Consultation.objects.create(user=user)
+        for text in self.TEXTS:
+            ConsultationMessage.objects.create(consultation=consultation, sender_type="student", text=text)
+        out = io.StringIO()
+        call_command("suggestion_benchmark", "--repeat", "1", stdout=out)
+        self.assertIn("키워드 집합 불일치 0건", out.getvalue())
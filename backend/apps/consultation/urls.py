@@ -3,6 +3,7 @@ from django.urls import path
 from .views import (
     ConsultationCloseAPIView,
     ConsultationDetailAPIView,
+    ConsultationLLMMetricsAPIView,
     ConsultationListCreateAPIView,
     ConsultationMessageCreateAPIView,
     ConsultationSuggestionAPIView,
@@ -32,4 +33,7 @@ urlpatterns = [
         "consultations/<int:consultation_id>/suggestion/",
         ConsultationSuggestionAPIView.as_view(),
     ),
+
+    # LLM 공급자 상태/지연 (관리자)
+    path("consultations/llm-metrics/", ConsultationLLMMetricsAPIView.as_view()),
 ]
@@ -1,4 +1,6 @@
-from django.db.models import Prefetch
+import time
+
+from django.db.models import OuterRef, Subquery
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -7,13 +9,16 @@ from rest_framework.views import APIView
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
+from myproject.pagination import KeysetPagination
+
 from .models import Consultation, ConsultationMessage
 from .serializers import (
     ConsultationDetailSerializer,
     ConsultationListSerializer,
     ConsultationMessageSerializer,
 )
-from .services import build_suggestion
+from .services import LLM_ROUTER
+from .suggestions import request_suggestion
 
 
 def _is_admin(user):
@@ -28,32 +33,57 @@ def _is_admin(user):
         return user.is_staff
 
 
+class ConsultationKeysetPagination(KeysetPagination):
+    """
+    상담 목록 keyset 페이지네이션 (최근 메시지 순, 앞으로만, myproject/pagination.py)
+    - (user, last_message_at) / (status, last_message_at) 인덱스를 그대로 탐
+    """
+    ordering_field = "last_message_at"
+
+
 class ConsultationListCreateAPIView(APIView):
+    """
+    GET /api/consultations/
+    - 학생은 본인 상담, 관리자는 전체
+    - ?status=IN_PROGRESS / DONE 로 거르기
+    - ?cursor= / ?page_size= 를 주면 keyset 페이지네이션 ({next, results})
+      안 주면 예전처럼 배열 그대로 (기존 프론트 호환)
+    """
     permission_classes = [IsAuthenticated]
+    pagination_class = ConsultationKeysetPagination
 
     def get_queryset(self, user):
         qs = Consultation.objects.all()
         if not _is_admin(user):
             qs = qs.filter(user=user)
 
-        # 최신 메시지를 미리 가져와서 serializer에서 사용
-        latest_message_prefetch = Prefetch(
-            "messages",
-            queryset=ConsultationMessage.objects.order_by("-created_at"),
-            to_attr="prefetched_messages",
+        # 최신 메시지는 상담마다 Subquery 로 한 줄씩만 (예전엔 전체 메시지를 prefetch)
+        latest = ConsultationMessage.objects.filter(consultation=OuterRef("pk")).order_by("-created_at", "-id")
+        return qs.annotate(
+            latest_text=Subquery(latest.values("text")[:1]),
+            latest_sender_type=Subquery(latest.values("sender_type")[:1]),
         )
-        qs = qs.prefetch_related(latest_message_prefetch)
-        return qs
 
     def get(self, request):
         consultations = self.get_queryset(request.user)
 
-        # serializer에서 첫 메시지만 쓰도록 _latest_message 세팅
-        for c in consultations:
-            prefetched = getattr(c, "prefetched_messages", [])
-            c._latest_message = prefetched[0] if prefetched else None
-
-        serializer = ConsultationListSerializer(consultations, many=True)
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            if status_filter not in Consultation.Status.values:
+                return Response(
+                    {"detail": f"status 는 {', '.join(Consultation.Status.values)} 중 하나여야 합니다."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            consultations = consultations.filter(status=status_filter)
+
+        params = request.query_params
+        if "cursor" in params or "page_size" in params:
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(consultations, request, view=self)
+            serializer = ConsultationListSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = ConsultationListSerializer(consultations.order_by("-last_message_at", "-id"), many=True)
         return Response(serializer.data)
 
     def post(self, request):
@@ -78,11 +108,8 @@ class ConsultationListCreateAPIView(APIView):
             )
             consultation.last_message_at = message.created_at
             consultation.save(update_fields=["last_message_at"])
-            suggestion_res = build_suggestion(first_message)
-            suggestion = {
-                "category": suggestion_res.category,
-                "message": suggestion_res.message,
-            }
+            # LLM 은 기다리지 않음 (캐시/규칙이면 바로, 아니면 pending + 웹소켓 push)
+            suggestion = request_suggestion(consultation.id, first_message, message_id=message.id)
 
         serializer = ConsultationDetailSerializer(consultation)
         data = serializer.data
@@ -161,6 +188,7 @@ class ConsultationMessageCreateAPIView(APIView):
             f"consultation_{consultation.id}",
             {
                 "type": "consultation_message",
+                "sent_at": time.time(),  # 팬아웃 지연 측정용
                 "payload": {
                     "id": message.id,
                     "sender_type": sender_type,
@@ -170,12 +198,8 @@ class ConsultationMessageCreateAPIView(APIView):
             },
         )
 
-        suggestion_res = build_suggestion(text)
         res_data = ConsultationMessageSerializer(message).data
-        res_data["suggestion"] = {
-            "category": suggestion_res.category,
-            "message": suggestion_res.message,
-        }
+        res_data["suggestion"] = request_suggestion(consultation.id, text, message_id=message.id)
 
         return Response(res_data, status=status.HTTP_201_CREATED)
 
@@ -183,6 +207,7 @@ class ConsultationMessageCreateAPIView(APIView):
 class ConsultationSuggestionAPIView(APIView):
     """
     임의 텍스트 또는 최신 메시지를 기반으로 추천 답변을 내려주는 엔드포인트.
+    캐시에 없으면 {"pending": true} 로 바로 응답하고 결과는 웹소켓으로 push.
     """
 
     permission_classes = [IsAuthenticated]
@@ -195,15 +220,28 @@ class ConsultationSuggestionAPIView(APIView):
         )
 
         text = (request.data.get("text") or "").strip()
+        message_id = None
         if not text:
             latest = consultation.messages.order_by("-created_at").first()
             text = latest.text if latest else ""
+            message_id = latest.id if latest else None
 
-        suggestion_res = build_suggestion(text)
+        suggestion = request_suggestion(consultation.id, text, message_id=message_id)
         return Response(
-            {
-                "category": suggestion_res.category,
-                "message": suggestion_res.message,
-            },
+            suggestion or {"category": None, "message": None, "pending": False},
             status=status.HTTP_200_OK,
         )
+
+
+class ConsultationLLMMetricsAPIView(APIView):
+    """
+    GET /api/consultations/llm-metrics/
+    - 이 워커의 LLM 공급자별 브레이커 상태 / 지연 히스토그램 / 헤지 횟수 (관리자만)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not _is_admin(request.user):
+            return Response({"detail": "관리자만 볼 수 있습니다."}, status=status.HTTP_403_FORBIDDEN)
+        return Response(LLM_ROUTER.snapshot())
@@ -0,0 +1,77 @@
+# apps/eval/management/commands/reconcile_eval_stats.py
+"""
+강의평가 통계 테이블(CourseEvalStat / QuestionEvalStat)을 원자료로 다시 계산해서 어긋난 값을 바로잡는다.
+
+    python manage.py reconcile_eval_stats
+    python manage.py reconcile_eval_stats --course 3 --course 7
+    python manage.py reconcile_eval_stats --dry-run
+
+평가 제출 API 는 통계를 증감으로만 고치기 때문에, 관리자 화면에서 평가/답변을 직접 지우거나
+고친 뒤에는 이걸 한 번 돌려야 함
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.eval.models import CourseEvalStat, QuestionEvalStat
+from apps.eval.services import compute_stats, rebuild_stats
+
+STAT_FIELDS = ["count", "total", "total_sq", "min_score", "max_score"]
+
+
+class Command(BaseCommand):
+    help = "강의평가 통계 테이블을 평가/답변 기록으로 재계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            action="append",
+            type=int,
+            dest="course_ids",
+            help="특정 course id 만 재계산 (여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="DB 를 고치지 않고 어긋난 강의만 출력",
+        )
+
+    def handle(self, *args, course_ids=None, dry_run=False, **options):
+        responses, questions = compute_stats(course_ids)
+
+        course_stats = CourseEvalStat.objects.all()
+        question_stats = QuestionEvalStat.objects.filter(count__gt=0)
+        if course_ids:
+            course_stats = course_stats.filter(course_id__in=course_ids)
+            question_stats = question_stats.filter(course_id__in=course_ids)
+
+        current_responses = {
+            c: n for c, n in course_stats.values_list("course_id", "response_count") if n
+        }
+        current_questions = {
+            (row["course_id"], row["question_id"]): {f: row[f] for f in STAT_FIELDS}
+            for row in question_stats.values("course_id", "question_id", *STAT_FIELDS)
+        }
+
+        drifted = set()
+        for course_id in set(responses) | set(current_responses):
+            if responses.get(course_id, 0) != current_responses.get(course_id, 0):
+                self.stdout.write(
+                    f"course={course_id} 응답 수: {current_responses.get(course_id, 0)} -> {responses.get(course_id, 0)}"
+                )
+                drifted.add(course_id)
+        for key in set(questions) | set(current_questions):
+            if questions.get(key) != current_questions.get(key):
+                self.stdout.write(
+                    f"course={key[0]} question={key[1]} drift: {current_questions.get(key)} -> {questions.get(key)}"
+                )
+                drifted.add(key[0])
+
+        if dry_run:
+            self.stdout.write(f"[dry-run] 수정 필요 강의 {len(drifted)}개")
+            return
+
+        if drifted:
+            with transaction.atomic():
+                rebuild_stats(sorted(drifted))
+
+        self.stdout.write(self.style.SUCCESS(f"재계산 완료: 수정 {len(drifted)}개 강의"))
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_stats(apps, schema_editor):
+    """지금까지 쌓인 평가로 통계 테이블을 채워 둔다."""
+    CourseEvaluation = apps.get_model("eval", "CourseEvaluation")
+    EvaluationAnswer = apps.get_model("eval", "EvaluationAnswer")
+    CourseEvalStat = apps.get_model("eval", "CourseEvalStat")
+    QuestionEvalStat = apps.get_model("eval", "QuestionEvalStat")
+
+    CourseEvalStat.objects.bulk_create(
+        [
+            CourseEvalStat(course_id=course_id, response_count=n)
+            for course_id, n in CourseEvaluation.objects.values("course_id")
+            .annotate(n=Count("id")).values_list("course_id", "n")
+        ],
+        batch_size=500,
+    )
+
+    stats = {}
+    rows = (
+        EvaluationAnswer.objects.filter(score__isnull=False)
+        .values("evaluation__course_id", "question_id", "score")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        key = (row["evaluation__course_id"], row["question_id"])
+        score, n = row["score"], row["n"]
+        stat = stats.setdefault(key, QuestionEvalStat(
+            course_id=key[0], question_id=key[1], min_score=score, max_score=score,
+        ))
+        stat.count += n
+        stat.total += score * n
+        stat.total_sq += score * score * n
+        stat.min_score = min(stat.min_score, score)
+        stat.max_score = max(stat.max_score, score)
+    QuestionEvalStat.objects.bulk_create(list(stats.values()), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eval', '0001_initial'),
+        ('learning', '0009_submission_pipeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseEvalStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('response_count', models.PositiveIntegerField(default=0, verbose_name='응답 수')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='eval_stat', to='learning.course', verbose_name='강의')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuestionEvalStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='점수 답변 수')),
+                ('total', models.BigIntegerField(default=0, verbose_name='점수 합')),
+                ('total_sq', models.BigIntegerField(default=0, verbose_name='점수 제곱 합')),
+                ('min_score', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='최저 점수')),
+                ('max_score', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='최고 점수')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_eval_stats', to='learning.course', verbose_name='강의')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='eval.evaluationquestion', verbose_name='질문')),
+            ],
+            options={
+                'unique_together': {('course', 'question')},
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
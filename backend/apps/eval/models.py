@@ -81,3 +81,60 @@ class EvaluationAnswer(models.Model):
     @property
     def is_text_answer(self):
         return self.question.is_text
+
+
+class CourseEvalStat(models.Model):
+    """
+    강의별 평가 요약 (강사 대시보드용)
+    - response_count : 평가를 낸 학생 수 (CourseEvaluation 개수)
+    점수 통계는 QuestionEvalStat 을 합쳐서 씀
+    """
+    course = models.OneToOneField(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="eval_stat",
+        verbose_name="강의"
+    )
+    response_count = models.PositiveIntegerField("응답 수", default=0)
+    updated_at = models.DateTimeField("갱신 시각", auto_now=True)
+
+    def __str__(self):
+        return f"{self.course} 평가 요약 ({self.response_count})"
+
+
+class QuestionEvalStat(models.Model):
+    """
+    강의 x 문항 점수 통계 (미리 계산해두는 테이블)
+    - 평가 제출할 때 CourseEvaluationCreateSerializer.create 에서 증감
+      → 조회할 때 EvaluationAnswer 전체를 다시 집계하지 않기 위함
+    - 평균 = total / count, 분산 = total_sq / count - 평균²
+    - 어긋나면 `manage.py reconcile_eval_stats` 로 재계산
+    """
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="question_eval_stats",
+        verbose_name="강의"
+    )
+    question = models.ForeignKey(
+        EvaluationQuestion,
+        on_delete=models.CASCADE,
+        related_name="stats",
+        verbose_name="질문"
+    )
+    count = models.PositiveIntegerField("점수 답변 수", default=0)
+    total = models.BigIntegerField("점수 합", default=0)
+    total_sq = models.BigIntegerField("점수 제곱 합", default=0)
+    min_score = models.PositiveSmallIntegerField("최저 점수", null=True, blank=True)
+    max_score = models.PositiveSmallIntegerField("최고 점수", null=True, blank=True)
+    updated_at = models.DateTimeField("갱신 시각", auto_now=True)
+
+    class Meta:
+        unique_together = ("course", "question")
+
+    def __str__(self):
+        return f"{self.course} / {self.question} ({self.count})"
+
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else None
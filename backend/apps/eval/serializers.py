@@ -4,6 +4,7 @@ from rest_framework import serializers
 
 from apps.learning.models import Course, StudentEnrollment
 from .models import EvaluationQuestion, CourseEvaluation, EvaluationAnswer
+from .services import record_answers
 
 
 class EvaluationQuestionSerializer(serializers.ModelSerializer):
@@ -116,6 +117,7 @@ class CourseEvaluationCreateSerializer(serializers.Serializer):
         - 처음 제출: 새 CourseEvaluation + Answer 생성
         - 같은 학생/같은 강의 두 번째 이후 제출:
           기존 CourseEvaluation 재사용하고, Answer 싹 지우고 새로 채움(수정처럼 동작)
+        - 통계 테이블(QuestionEvalStat)도 같은 트랜잭션에서 바뀐 만큼만 증감
         """
         request = self.context["request"]
         user = request.user
@@ -123,12 +125,19 @@ class CourseEvaluationCreateSerializer(serializers.Serializer):
 
         # 1) 기존 평가가 있으면 재사용, 없으면 새로 생성
         evaluation = getattr(self, "existing_evaluation", None)
-        if evaluation is None:
+        created = evaluation is None
+        removed = []
+        if created:
             evaluation = CourseEvaluation.objects.create(
                 student=user,
                 course=course,
             )
         else:
+            # 같은 학생이 동시에 두 번 고쳐도 통계에서 두 번 빼지 않게 잠금
+            evaluation = CourseEvaluation.objects.select_for_update().get(pk=evaluation.pk)
+            removed = list(
+                evaluation.answers.filter(score__isnull=False).values_list("question_id", "score")
+            )
             # 기존 답변 전부 삭제 (질문 수/내용 바뀌어도 안전하게 갈아끼우기)
             evaluation.answers.all().delete()
 
@@ -164,6 +173,12 @@ class CourseEvaluationCreateSerializer(serializers.Serializer):
             )
 
         EvaluationAnswer.objects.bulk_create(answer_objs)
+        record_answers(
+            course.id,
+            added=[(a.question_id, a.score) for a in answer_objs],
+            removed=removed,
+            new_response=created,
+        )
         return evaluation
 
 
@@ -198,13 +213,26 @@ class TeacherSummarySerializer(serializers.Serializer):
 class QuestionStatSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     text = serializers.CharField()
+    count = serializers.IntegerField()
     avg_score = serializers.FloatField()
+    stddev = serializers.FloatField()
+    # 1점 ~ 5점 응답 수
+    distribution = serializers.ListField(child=serializers.IntegerField())
 
 
 class TeacherCourseDetailSerializer(serializers.Serializer):
-    """강의별 상세: 질문별 평균 + 코멘트"""
+    """강의별 상세: 질문별 통계 + 코멘트 첫 페이지"""
     id = serializers.IntegerField()
     name = serializers.CharField()
     info = serializers.CharField()
     surveys = QuestionStatSerializer(many=True)
     comments = serializers.ListField(child=serializers.CharField())
+    # 다음 코멘트 페이지 (GET /api/evals/teacher/courses/<id>/comments/?cursor=...), 없으면 null
+    comments_next = serializers.CharField(allow_null=True)
+
+
+class EvalCommentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EvaluationAnswer
+        fields = ["id", "text"]
+        read_only_fields = fields
@@ -0,0 +1,192 @@
+# apps/eval/services.py
+"""
+강의평가 통계 테이블(CourseEvalStat / QuestionEvalStat) 갱신
+
+- record_answers : 평가 제출 트랜잭션 안에서 바뀐 점수만큼 증감 (답변 전체 재집계 X)
+- rebuild_stats  : 원자료(EvaluationAnswer)로 처음부터 다시 계산 (마이그레이션/reconcile 용)
+- question_score_stats : 강의 상세용 문항별 평균/표준편차/점수 분포 (GROUP BY 한 번)
+"""
+import math
+from collections import defaultdict
+
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from .models import CourseEvalStat, CourseEvaluation, EvaluationAnswer, QuestionEvalStat
+
+
+def record_answers(course_id, added=(), removed=(), new_response=False):
+    """
+    added / removed : (question_id, score) 목록 (score 가 None 인 서술형은 알아서 뺌)
+    new_response    : 이 강의에 처음 낸 평가면 True (응답 수 +1)
+
+    EvaluationAnswer 를 다 쓴 뒤에, 같은 트랜잭션 안에서 호출해야 함
+    (지운 점수가 최저/최고였으면 그 문항만 원자료로 다시 구해서)
+    """
+    if new_response:
+        CourseEvalStat.objects.get_or_create(course_id=course_id)
+        stat = CourseEvalStat.objects.select_for_update().get(course_id=course_id)
+        stat.response_count += 1
+        stat.save(update_fields=["response_count", "updated_at"])
+
+    deltas = defaultdict(lambda: {"added": [], "removed": []})
+    for question_id, score in added:
+        if score is not None:
+            deltas[question_id]["added"].append(score)
+    for question_id, score in removed:
+        if score is not None:
+            deltas[question_id]["removed"].append(score)
+    if not deltas:
+        return
+
+    # 행이 없으면 먼저 만들고, 락은 id 순서대로 (동시 제출끼리 데드락 안 나게)
+    QuestionEvalStat.objects.bulk_create(
+        [QuestionEvalStat(course_id=course_id, question_id=q) for q in deltas],
+        ignore_conflicts=True,
+    )
+    stats = list(
+        QuestionEvalStat.objects.select_for_update()
+        .filter(course_id=course_id, question_id__in=list(deltas))
+        .order_by("id")
+    )
+
+    now = timezone.now()
+    recompute = []
+    for stat in stats:
+        d = deltas[stat.question_id]
+        stat.updated_at = now  # bulk_update 는 auto_now 안 채움
+        stat.count += len(d["added"]) - len(d["removed"])
+        stat.total += sum(d["added"]) - sum(d["removed"])
+        stat.total_sq += sum(s * s for s in d["added"]) - sum(s * s for s in d["removed"])
+
+        if stat.count <= 0:
+            stat.count = stat.total = stat.total_sq = 0
+            stat.min_score = stat.max_score = None
+            continue
+
+        if any(s in (stat.min_score, stat.max_score) for s in d["removed"]):
+            # 최저/최고는 빼기로 못 되돌림 -> 이 문항만 다시 집계
+            recompute.append(stat)
+            continue
+
+        if d["added"]:
+            low, high = min(d["added"]), max(d["added"])
+            stat.min_score = low if stat.min_score is None else min(stat.min_score, low)
+            stat.max_score = high if stat.max_score is None else max(stat.max_score, high)
+
+    if recompute:
+        bounds = {
+            row["question_id"]: row
+            for row in EvaluationAnswer.objects.filter(
+                evaluation__course_id=course_id,
+                question_id__in=[s.question_id for s in recompute],
+                score__isnull=False,
+            )
+            .values("question_id")
+            .annotate(low=Min("score"), high=Max("score"))
+        }
+        for stat in recompute:
+            row = bounds.get(stat.question_id, {})
+            stat.min_score = row.get("low")
+            stat.max_score = row.get("high")
+
+    QuestionEvalStat.objects.bulk_update(
+        stats, ["count", "total", "total_sq", "min_score", "max_score", "updated_at"]
+    )
+
+
+def compute_stats(course_ids=None):
+    """
+    원자료로 계산한 기대값
+    -> ({course_id: response_count}, {(course_id, question_id): {count, total, total_sq, min_score, max_score}})
+    """
+    evaluations = CourseEvaluation.objects.all()
+    answers = EvaluationAnswer.objects.filter(score__isnull=False)
+    if course_ids is not None:
+        evaluations = evaluations.filter(course_id__in=course_ids)
+        answers = answers.filter(evaluation__course_id__in=course_ids)
+
+    responses = dict(
+        evaluations.values("course_id").annotate(n=Count("id")).values_list("course_id", "n")
+    )
+    # score 가 1~5 라 제곱합은 점수별 개수로 구함 (DB 마다 다른 제곱 함수 안 씀)
+    questions = {}
+    rows = (
+        answers.values("evaluation__course_id", "question_id", "score")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        key = (row["evaluation__course_id"], row["question_id"])
+        score, n = row["score"], row["n"]
+        stat = questions.setdefault(
+            key, {"count": 0, "total": 0, "total_sq": 0, "min_score": score, "max_score": score}
+        )
+        stat["count"] += n
+        stat["total"] += score * n
+        stat["total_sq"] += score * score * n
+        stat["min_score"] = min(stat["min_score"], score)
+        stat["max_score"] = max(stat["max_score"], score)
+    return responses, questions
+
+
+def rebuild_stats(course_ids=None):
+    """통계 테이블을 원자료 기준으로 통째로 다시 씀. (강의 요약 수, 문항 통계 수)"""
+    responses, questions = compute_stats(course_ids)
+
+    course_stats = CourseEvalStat.objects.all()
+    question_stats = QuestionEvalStat.objects.all()
+    if course_ids is not None:
+        course_stats = course_stats.filter(course_id__in=course_ids)
+        question_stats = question_stats.filter(course_id__in=course_ids)
+    course_stats.delete()
+    question_stats.delete()
+
+    CourseEvalStat.objects.bulk_create(
+        [CourseEvalStat(course_id=c, response_count=n) for c, n in responses.items()],
+        batch_size=500,
+    )
+    QuestionEvalStat.objects.bulk_create(
+        [QuestionEvalStat(course_id=c, question_id=q, **values) for (c, q), values in questions.items()],
+        batch_size=500,
+    )
+    return len(responses), len(questions)
+
+
+SCORES = range(1, 6)  # 점수형 문항은 1~5 점
+
+
+def question_score_stats(course_id):
+    """
+    강의 하나의 점수형(활성) 문항별 통계 -> [{id, text, count, avg_score, stddev, distribution}]
+    문항 수만큼 Avg 를 돌리지 않고 question 으로 묶어서 한 번에 (점수별 개수 = 분포)
+    """
+    rows = (
+        EvaluationAnswer.objects.filter(
+            evaluation__course_id=course_id,
+            score__isnull=False,
+            question__is_active=True,
+            question__is_text=False,
+        )
+        .values("question_id", "question__text", "question__order")
+        .annotate(**{f"n{s}": Count("id", filter=Q(score=s)) for s in SCORES})
+        .order_by("question__order", "question_id")
+    )
+
+    stats = []
+    for row in rows:
+        distribution = [row[f"n{s}"] for s in SCORES]
+        count = sum(distribution)
+        if not count:
+            continue
+        avg = sum(s * n for s, n in zip(SCORES, distribution)) / count
+        variance = sum(n * (s - avg) ** 2 for s, n in zip(SCORES, distribution)) / count
+        stats.append({
+            "id": row["question_id"],
+            "text": row["question__text"],
+            "count": count,
+            "avg_score": avg,
+            "stddev": math.sqrt(variance),
+            "distribution": distribution,
+        })
+    return stats
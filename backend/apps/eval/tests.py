@@ -1,3 +1,156 @@
+# apps/eval/tests.py
+import io
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.learning.models import Course, StudentEnrollment
+from .models import CourseEvalStat, EvaluationAnswer, EvaluationQuestion, QuestionEvalStat
+from .services import compute_stats
+from .views import CommentCursorPagination
+
+
+class EvalStatsTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="t1", password="pw")
+        self.course = Course.objects.create(title="Python 기초", instructor=self.teacher, status="finished")
+        self.q1 = EvaluationQuestion.objects.create(text="강의 만족도", order=1)
+        self.q2 = EvaluationQuestion.objects.create(text="난이도", order=2)
+        self.q_text = EvaluationQuestion.objects.create(text="하고 싶은 말", is_text=True, order=3)
+        self.students = []
+        for i in range(3):
+            student = User.objects.create_user(username=f"s{i}", password="pw")
+            StudentEnrollment.objects.create(student=student, course=self.course)
+            self.students.append(student)
+
+    def _submit(self, student, s1, s2, text="좋았어요"):
+        self.client.force_login(student)
+        res = self.client.post(
+            "/api/evals/responses/",
+            {
+                "course_id": self.course.id,
+                "answers": [
+                    {"question": self.q1.id, "score": s1},
+                    {"question": self.q2.id, "score": s2},
+                    {"question": self.q_text.id, "text": text},
+                ],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(res.status_code, 201, res.content)
+
+    def _stat(self, question):
+        return QuestionEvalStat.objects.get(course=self.course, question=question)
+
+    def test_submit_updates_stats_incrementally(self):
+        self._submit(self.students[0], 5, 3)
+        self._submit(self.students[1], 3, 4)
+
+        stat = self._stat(self.q1)
+        self.assertEqual((stat.count, stat.total, stat.total_sq), (2, 8, 34))
+        self.assertEqual((stat.min_score, stat.max_score), (3, 5))
+        self.assertFalse(QuestionEvalStat.objects.filter(question=self.q_text).exists())
+        self.assertEqual(CourseEvalStat.objects.get(course=self.course).response_count, 2)
+
+        # 다시 내면 예전 점수는 빠지고 최저/최고도 다시 맞춰짐
+        self._submit(self.students[1], 4, 4)
+        stat = self._stat(self.q1)
+        self.assertEqual((stat.count, stat.total, stat.total_sq), (2, 9, 41))
+        self.assertEqual((stat.min_score, stat.max_score), (4, 5))
+        self.assertEqual(CourseEvalStat.objects.get(course=self.course).response_count, 2)
+
+        responses, questions = compute_stats()
+        self.assertEqual(responses, {self.course.id: 2})
+        for (course_id, question_id), expected in questions.items():
+            row = QuestionEvalStat.objects.get(course_id=course_id, question_id=question_id)
+            self.assertEqual(
+                {f: getattr(row, f) for f in expected}, expected
+            )
+
+    def test_summary_and_detail_read_stats(self):
+        self._submit(self.students[0], 5, 1)
+        self._submit(self.students[1], 3, 2)
+        Course.objects.create(title="빈 강의", instructor=self.teacher, status="finished")
+
+        self.client.force_login(self.teacher)
+        res = self.client.get("/api/evals/teacher/summary/")
+        self.assertEqual(res.status_code, 200)
+        data = res.json()
+        self.assertEqual(data["total_courses"], 2)
+        self.assertEqual(data["completed_ratio"], 0.5)
+        self.assertAlmostEqual(data["average_score"], 11 / 4)
+        course = data["courses"][0]
+        self.assertEqual((course["count"], course["min"], course["max"]), (2, 1.0, 5.0))
+        self.assertAlmostEqual(course["avg"], 11 / 4)
+
+        res = self.client.get(f"/api/evals/teacher/courses/{self.course.id}/")
+        data = res.json()
+        self.assertEqual([s["avg_score"] for s in data["surveys"]], [4.0, 1.5])
+        self.assertEqual(data["surveys"][0]["distribution"], [0, 0, 1, 0, 1])
+        self.assertEqual(data["surveys"][0]["count"], 2)
+        self.assertAlmostEqual(data["surveys"][0]["stddev"], 1.0)
+        self.assertEqual(data["comments"], ["좋았어요", "좋았어요"])
+        self.assertIsNone(data["comments_next"])
+
+    def test_detail_queries_do_not_grow_with_questions(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(f"/api/evals/teacher/courses/{self.course.id}/")
+            self.assertEqual(res.status_code, 200)
+            return len(ctx)
+
+        self._submit(self.students[0], 5, 1)
+        self.client.force_login(self.teacher)
+        before = count_queries()
+        for i in range(5):
+            EvaluationQuestion.objects.create(text=f"추가 {i}", order=10 + i)
+        self.assertEqual(count_queries(), before)
+
+    def test_comments_cursor_pagination(self):
+        for i, student in enumerate(self.students):
+            self._submit(student, 5, 5, text=f"코멘트 {i}")
+
+        self.client.force_login(self.teacher)
+        with mock.patch.object(CommentCursorPagination, "page_size", 2):
+            data = self.client.get(f"/api/evals/teacher/courses/{self.course.id}/").json()
+            self.assertEqual(data["comments"], ["코멘트 2", "코멘트 1"])
+            self.assertIn(f"/api/evals/teacher/courses/{self.course.id}/comments/?cursor=", data["comments_next"])
+
+            page = self.client.get(data["comments_next"]).json()
+            self.assertEqual([c["text"] for c in page["results"]], ["코멘트 0"])
+            self.assertIsNone(page["next"])
+
+        # 다른 강사는 못 봄
+        other = User.objects.create_user(username="t2", password="pw")
+        self.client.force_login(other)
+        res = self.client.get(f"/api/evals/teacher/courses/{self.course.id}/comments/")
+        self.assertEqual(res.status_code, 404)
+
+    def test_summary_query_count_does_not_grow_with_courses(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get("/api/evals/teacher/summary/")
+            return len(ctx)
+
+        self._submit(self.students[0], 5, 1)
+        self.client.force_login(self.teacher)
+        before = count_queries()
+        for i in range(5):
+            Course.objects.create(title=f"C{i}", instructor=self.teacher, status="finished")
+        self.assertEqual(count_queries(), before)
+
+    def test_reconcile_fixes_drift(self):
+        self._submit(self.students[0], 5, 1)
+        self._submit(self.students[1], 3, 2)
+        # 관리자 화면에서 직접 지운 상황
+        EvaluationAnswer.objects.filter(evaluation__student=self.students[0]).delete()
+        self.students[0].course_evaluations.all().delete()
 
-# Create your tests here.
+        call_command("reconcile_eval_stats", stdout=io.StringIO())
+        stat = self._stat(self.q1)
+        self.assertEqual((stat.count, stat.total, stat.min_score, stat.max_score), (1, 3, 3, 3))
+        self.assertEqual(CourseEvalStat.objects.get(course=self.course).response_count, 1)
@@ -6,6 +6,7 @@ from .views import (
     submit_evaluation,
     TeacherEvalSummaryAPIView,
     TeacherEvalCourseDetailAPIView,
+    TeacherEvalCommentListAPIView,
     teacher_test_course_list,           # ⬅ 추가
     teacher_test_assign_course,
 )
@@ -23,6 +24,11 @@ urlpatterns = [
         TeacherEvalCourseDetailAPIView.as_view(),
         name="eval-teacher-course-detail",
     ),
+    path(
+        "evals/teacher/courses/<int:course_id>/comments/",
+        TeacherEvalCommentListAPIView.as_view(),
+        name="eval-teacher-course-comments",
+    ),
     path(
         "evals/teacher/test/courses/",
         teacher_test_course_list,
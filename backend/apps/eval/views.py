@@ -1,23 +1,28 @@
 # apps/eval/views.py
 
-from django.db.models import Avg, Max, Min, Count, Q
+from django.conf import settings
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
 from apps.learning.models import Course, StudentEnrollment
 from rest_framework.views import APIView
-from .models import EvaluationQuestion, CourseEvaluation, EvaluationAnswer
+from .models import EvaluationQuestion, EvaluationAnswer, QuestionEvalStat
 from .serializers import (
     EvaluationQuestionSerializer,
     CourseEvaluationCreateSerializer,
     CourseEvaluationSimpleSerializer,
     TeacherSummarySerializer,
     TeacherCourseDetailSerializer,
+    EvalCommentSerializer,
 )
+from .services import question_score_stats
 
 
 # ===============================
@@ -73,30 +78,39 @@ class TeacherEvalSummaryAPIView(generics.GenericAPIView):
 
         # ✅ 종료된(status='finished') 강의만 요약에 포함
         #   Course.STATUS_CHOICES 에서 'finished' 가 종료 상태 
-        courses_qs = Course.objects.filter(
-            instructor=user,
-            status="finished",
-        ).order_by("id")
-
-        total_courses = courses_qs.count()
-        summary_courses = []
-        all_scores_qs = EvaluationAnswer.objects.none()
-
-        for course in courses_qs:
-            numeric_answers = EvaluationAnswer.objects.filter(
-                evaluation__course=course,
-                score__isnull=False,
+        courses = list(
+            Course.objects.filter(
+                instructor=user,
+                status="finished",
             )
-            all_scores_qs = all_scores_qs | numeric_answers
+            .select_related("instructor", "eval_stat")
+            .order_by("id")
+        )
 
-            stats = numeric_answers.aggregate(
-                avg=Avg("score"),
-                max=Max("score"),
-                min=Min("score"),
-                count=Count("id"),
+        # 미리 계산된 통계 테이블만 읽음 (강의 수 x 문항 수 행, 응답 수와 무관)
+        per_course = {}
+        for stat in QuestionEvalStat.objects.filter(
+            course_id__in=[c.id for c in courses],
+            count__gt=0,
+        ):
+            merged = per_course.setdefault(
+                stat.course_id, {"count": 0, "total": 0, "min": None, "max": None}
             )
+            merged["count"] += stat.count
+            merged["total"] += stat.total
+            merged["min"] = stat.min_score if merged["min"] is None else min(merged["min"], stat.min_score)
+            merged["max"] = stat.max_score if merged["max"] is None else max(merged["max"], stat.max_score)
+
+        total_courses = len(courses)
+        summary_courses = []
+        score_count = 0
+        score_total = 0
 
-            eval_count = CourseEvaluation.objects.filter(course=course).count()
+        for course in courses:
+            stats = per_course.get(course.id, {})
+            score_count += stats.get("count", 0)
+            score_total += stats.get("total", 0)
+            eval_stat = getattr(course, "eval_stat", None)
 
             instructor = course.instructor
             teacher_name = (
@@ -111,14 +125,13 @@ class TeacherEvalSummaryAPIView(generics.GenericAPIView):
                 "short_name": course.title[:8],
                 "code": course.course_type or "",
                 "teacher": teacher_name,
-                "avg": float(stats["avg"] or 0.0),
-                "max": float(stats["max"] or 0.0),
-                "min": float(stats["min"] or 0.0),
-                "count": int(eval_count),
+                "avg": float(stats["total"] / stats["count"]) if stats else 0.0,
+                "max": float(stats.get("max") or 0.0),
+                "min": float(stats.get("min") or 0.0),
+                "count": eval_stat.response_count if eval_stat else 0,
             })
 
-        overall_stats = all_scores_qs.aggregate(avg=Avg("score"))
-        average_score = overall_stats["avg"]
+        average_score = score_total / score_count if score_count else None
 
         courses_with_responses = sum(1 for c in summary_courses if c["count"] > 0)
         completed_ratio = (
@@ -136,42 +149,43 @@ class TeacherEvalSummaryAPIView(generics.GenericAPIView):
         return Response(serializer.data)
 
 
+class CommentCursorPagination(CursorPagination):
+    """코멘트는 최신순으로 한 페이지씩 (OFFSET 없이 id 기준으로 이어서)"""
+    page_size = getattr(settings, "EVAL_COMMENT_PAGE_SIZE", 20)
+    ordering = "-id"
+
+
+def course_comments(course):
+    return EvaluationAnswer.objects.filter(
+        evaluation__course=course,
+        question__is_text=True,
+    ).exclude(Q(text__isnull=True) | Q(text__exact=""))
+
+
 class TeacherEvalCourseDetailAPIView(generics.GenericAPIView):
     """
     GET /api/evals/teacher/courses/<course_id>/
-    - 해당 강의에 대한 질문별 평균 점수 + 학생 코멘트
+    - 해당 강의에 대한 질문별 통계(평균/표준편차/1~5점 분포) + 학생 코멘트 첫 페이지
+    - 나머지 코멘트는 comments_next 로 이어서
     """
     permission_classes = [IsAuthenticated]
     serializer_class = TeacherCourseDetailSerializer
 
     def get(self, request, course_id, *args, **kwargs):
         user = request.user
-        course = get_object_or_404(Course, id=course_id, instructor=user)
-
-        questions = EvaluationQuestion.objects.filter(is_active=True).order_by("order", "id")
-
-        surveys = []
-        for q in questions:
-            if q.is_text:
-                continue
-            q_stats = EvaluationAnswer.objects.filter(
-                evaluation__course=course,
-                question=q,
-                score__isnull=False,
-            ).aggregate(avg=Avg("score"))
-            if q_stats["avg"] is not None:
-                surveys.append({
-                    "id": q.id,
-                    "text": q.text,
-                    "avg_score": float(q_stats["avg"]),
-                })
-
-        comments_qs = EvaluationAnswer.objects.filter(
-            evaluation__course=course,
-            question__is_text=True,
-        ).exclude(Q(text__isnull=True) | Q(text__exact=""))
-
-        comments = list(comments_qs.values_list("text", flat=True))
+        course = get_object_or_404(
+            Course.objects.select_related("instructor"), id=course_id, instructor=user
+        )
+
+        surveys = question_score_stats(course.id)
+
+        paginator = CommentCursorPagination()
+        page = paginator.paginate_queryset(course_comments(course), request, view=self)
+        # 다음 페이지 링크는 코멘트 목록 API 쪽으로
+        paginator.base_url = request.build_absolute_uri(
+            reverse("eval-teacher-course-comments", kwargs={"course_id": course.id})
+        )
+        comments = [answer.text for answer in page]
 
         instructor = course.instructor
         teacher_name = (
@@ -187,12 +201,27 @@ class TeacherEvalCourseDetailAPIView(generics.GenericAPIView):
             "info": info_str,
             "surveys": surveys,
             "comments": comments,
+            "comments_next": paginator.get_next_link(),
         }
 
         serializer = self.get_serializer(payload)
         return Response(serializer.data)
 
 
+class TeacherEvalCommentListAPIView(generics.ListAPIView):
+    """
+    GET /api/evals/teacher/courses/<course_id>/comments/?cursor=...
+    - 학생 코멘트 커서 페이지네이션 ({next, previous, results})
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = EvalCommentSerializer
+    pagination_class = CommentCursorPagination
+
+    def get_queryset(self):
+        course = get_object_or_404(Course, id=self.kwargs["course_id"], instructor=self.request.user)
+        return course_comments(course).only("id", "text")
+
+
 # ===============================
 # 강사용: 테스트용 강의 매달기 기능
 # ===============================
@@ -16,6 +16,9 @@ class GamificationProfileAdmin(admin.ModelAdmin):
         "stage",
         "step",
         "progress_percent",
+        "attendance_count",
+        "assignment_count",
+        "solved_problem_count",
         "created_at",
         "updated_at",
     )
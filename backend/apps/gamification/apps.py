@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GamificationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.gamification'
+
+    def ready(self):
+        # 출석/제출 → 점수 이벤트 시그널 등록
+        from . import signals  # noqa: F401
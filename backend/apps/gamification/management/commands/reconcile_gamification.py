@@ -0,0 +1,121 @@
+# apps/gamification/management/commands/reconcile_gamification.py
+"""
+GamificationProfile 카운터를 원자료로 다시 계산해서 어긋난 값(drift)을 바로잡는다.
+
+    python manage.py reconcile_gamification
+    python manage.py reconcile_gamification --user 3 --user 7
+    python manage.py reconcile_gamification --dry-run
+
+- 출석  : DailyLmsAccess(is_checked=True) 개수
+- 과제  : Submission(status="submitted") 개수
+- 문제  : SolvedAcProgress.credited_solved_count (solved.ac 원격 호출 없음)
+
+유저별 COUNT 를 돌지 않고 GROUP BY 3번으로 한꺼번에 집계한다.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.gamification.models import DailyLmsAccess, GamificationProfile, SolvedAcProgress
+from apps.gamification.services import SCORE_FIELDS, _apply_score
+from apps.learning.models import Submission
+
+COUNTER_FIELDS = ["attendance_count", "assignment_count", "solved_problem_count"]
+
+
+class Command(BaseCommand):
+    help = "GamificationProfile 점수 카운터를 출석/제출/solved.ac 기록으로 재계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            type=int,
+            dest="user_ids",
+            help="특정 user id 만 재계산 (여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="DB 를 고치지 않고 어긋난 프로필만 출력",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+        )
+
+    def handle(self, *args, user_ids=None, dry_run=False, batch_size=500, **options):
+        attendance_qs = DailyLmsAccess.objects.filter(is_checked=True)
+        submission_qs = Submission.objects.filter(status="submitted")
+        solved_qs = SolvedAcProgress.objects.all()
+        profile_qs = GamificationProfile.objects.all()
+
+        if user_ids:
+            attendance_qs = attendance_qs.filter(user_id__in=user_ids)
+            submission_qs = submission_qs.filter(student_id__in=user_ids)
+            solved_qs = solved_qs.filter(user_id__in=user_ids)
+            profile_qs = profile_qs.filter(user_id__in=user_ids)
+
+        attendance = dict(
+            attendance_qs.values("user_id").annotate(n=Count("id")).values_list("user_id", "n")
+        )
+        assignments = dict(
+            submission_qs.values("student_id").annotate(n=Count("id")).values_list("student_id", "n")
+        )
+        solved = dict(solved_qs.values_list("user_id", "credited_solved_count"))
+
+        profiles = {p.user_id: p for p in profile_qs}
+
+        # 원자료가 하나라도 있는 유저 + 이미 프로필이 있는 유저
+        target_ids = set(attendance) | set(assignments) | set(solved) | set(profiles)
+        if user_ids:
+            existing = set(
+                get_user_model().objects.filter(id__in=user_ids).values_list("id", flat=True)
+            )
+            target_ids |= existing
+
+        to_update = []
+        to_create = []
+        for user_id in sorted(target_ids):
+            expected = {
+                "attendance_count": attendance.get(user_id, 0),
+                "assignment_count": assignments.get(user_id, 0),
+                "solved_problem_count": solved.get(user_id, 0),
+            }
+
+            profile = profiles.get(user_id)
+            if profile is None:
+                profile = GamificationProfile(user_id=user_id, **expected)
+                _apply_score(profile)
+                to_create.append(profile)
+                continue
+
+            current = {f: getattr(profile, f) for f in COUNTER_FIELDS}
+            if current == expected:
+                continue
+
+            self.stdout.write(f"user={user_id} drift: {current} -> {expected}")
+            for field, value in expected.items():
+                setattr(profile, field, value)
+            _apply_score(profile)
+            to_update.append(profile)
+
+        if dry_run:
+            self.stdout.write(
+                f"[dry-run] 수정 필요 {len(to_update)}건, 신규 프로필 {len(to_create)}건"
+            )
+            return
+
+        with transaction.atomic():
+            GamificationProfile.objects.bulk_create(to_create, batch_size=batch_size)
+            GamificationProfile.objects.bulk_update(to_update, SCORE_FIELDS, batch_size=batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"재계산 완료: 수정 {len(to_update)}건, 신규 {len(to_create)}건 "
+                f"(검사 {len(target_ids)}명)"
+            )
+        )
@@ -0,0 +1,49 @@
+# apps/gamification/management/commands/sync_solvedac.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.gamification.sync import sync_all
+
+
+class Command(BaseCommand):
+    help = "연동된 solved.ac 핸들의 풀이 수를 동기화하고 점수 이벤트를 발행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="종료하지 않고 --interval 초마다 반복",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=60,
+            help="--loop 일 때 한 바퀴 사이 대기 시간(초)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="TTL/백오프 무시하고 전부 다시 호출",
+        )
+        parser.add_argument(
+            "--user",
+            action="append",
+            type=int,
+            dest="user_ids",
+            help="특정 user id 만 동기화 (여러 번 지정 가능)",
+        )
+
+    def handle(self, *args, loop=False, interval=60, force=False, user_ids=None, **options):
+        while True:
+            report = sync_all(user_ids=user_ids, force=force)
+            self.stdout.write(
+                f"solved.ac sync: 동기화 {report.synced}, 실패 {report.failed}, "
+                f"TTL skip {report.skipped_fresh}, 백오프 skip {report.skipped_backoff}"
+            )
+            if not loop:
+                return
+            time.sleep(interval)
+            # 오래 도는 프로세스라 끊긴 DB 연결 정리
+            close_old_connections()
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    """
+    기존 프로필의 카운터를 원자료로 채우고, 점수/레벨도 rebuild_profile 과 같은 계산(_apply_score)으로 다시 맞춘다.
+    (읽기 경로가 카운터 기준 점수를 그대로 보여주므로 둘이 어긋나면 안 됨)
+    """
+    from apps.gamification.services import SCORE_FIELDS, _apply_score
+
+    GamificationProfile = apps.get_model("gamification", "GamificationProfile")
+    DailyLmsAccess = apps.get_model("gamification", "DailyLmsAccess")
+    SolvedAcProgress = apps.get_model("gamification", "SolvedAcProgress")
+    Submission = apps.get_model("learning", "Submission")
+
+    attendance = dict(
+        DailyLmsAccess.objects.filter(is_checked=True)
+        .values("user_id").annotate(n=Count("id")).values_list("user_id", "n")
+    )
+    assignments = dict(
+        Submission.objects.filter(status="submitted")
+        .values("student_id").annotate(n=Count("id")).values_list("student_id", "n")
+    )
+    solved = dict(SolvedAcProgress.objects.values_list("user_id", "credited_solved_count"))
+
+    profiles = list(GamificationProfile.objects.all())
+    for p in profiles:
+        p.attendance_count = attendance.get(p.user_id, 0)
+        p.assignment_count = assignments.get(p.user_id, 0)
+        p.solved_problem_count = solved.get(p.user_id, 0)
+        _apply_score(p)
+
+    GamificationProfile.objects.bulk_update(profiles, SCORE_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0001_initial'),
+        ('learning', '0008_alter_submission_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamificationprofile',
+            name='assignment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gamificationprofile',
+            name='attendance_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gamificationprofile',
+            name='solved_problem_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0002_gamificationprofile_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solvedacprogress',
+            name='last_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solvedacprogress',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solvedacprogress',
+            name='sync_failures',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
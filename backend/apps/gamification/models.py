@@ -8,6 +8,10 @@ class GamificationProfile(models.Model):
     - total_score : 출석/과제/문제풀이로 계산된 누적 점수 (0 ~ 4200)
     - stage / step : STAGE 1~2, STEP 1~5 (6은 all clear 화면)
     - progress : 전체 진행률 (0.0 ~ 1.0)
+    - attendance_count / assignment_count / solved_problem_count :
+        점수 이벤트로 그때그때 갱신되는 원자료 카운터
+        → 조회할 때 COUNT(*) 를 다시 돌리지 않기 위함
+        → 어긋나면 `manage.py reconcile_gamification` 으로 재계산
     """
 
     # 한 유저당 딱 1개만 가질 수 있다
@@ -24,6 +28,11 @@ class GamificationProfile(models.Model):
     # 전체 진행률 (0.0 ~ 1.0)
     progress = models.FloatField(default=0.0)
 
+    # 점수 계산용 원자료 카운터 (이벤트로 증감)
+    attendance_count = models.PositiveIntegerField(default=0)
+    assignment_count = models.PositiveIntegerField(default=0)
+    solved_problem_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True, editable=False)
 
@@ -82,6 +91,10 @@ class SolvedAcProgress(models.Model):
     - last_handle :
         마지막으로 동기화할 때 사용한 solved.ac 핸들
         → 핸들이 바뀌었는지 감지용
+        (비어 있으면 아직 한 번도 성공 못 한 row - 실패 기록만 있음)
+
+    - last_synced_at / sync_failures / next_attempt_at :
+        sync_solvedac 의 TTL / 백오프 상태 (cron 으로 매번 새 프로세스여도 유지되게 DB 에)
     """
 
     user = models.OneToOneField(
@@ -102,6 +115,11 @@ class SolvedAcProgress(models.Model):
     # 마지막으로 동기화할 때 사용한 핸들 (핸들 변경 감지용)
     last_handle = models.CharField(max_length=50, blank=True)
 
+    # 백그라운드 동기화 상태 (apps/gamification/sync.py)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    sync_failures = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True, editable=False)
 
@@ -1,10 +1,13 @@
 from dataclasses import dataclass
+from datetime import timedelta
 import logging
 
-import requests
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 
+from apps.challenge.solvedac_client import SolvedAcAPIError, get_client
 from apps.learning.models import Submission
 
 from .constants import (
@@ -107,76 +110,73 @@ def get_assignment_count(user) -> int:
 
 # ---------- solved.ac 연동 ----------
 
-SOLVEDAC_USER_API = "https://solved.ac/api/v3/user/show"
-
-
 def _fetch_solvedac_profile(handle: str) -> dict | None:
     """
-    solved.ac 에서 유저 프로필 JSON 가져오기.
+    solved.ac 에서 유저 프로필 JSON 가져오기. (공용 클라이언트 사용)
     실패 시 None 리턴.
     """
     try:
-        resp = requests.get(
-            SOLVEDAC_USER_API,
-            params={"handle": handle},
-            timeout=3,
-        )
-        resp.raise_for_status()
-    except requests.RequestException as exc:
+        return get_client().get_user(handle)
+    except SolvedAcAPIError as exc:
         logger.warning("solved.ac request failed: %s", exc, extra={"handle": handle})
         return None
 
-    try:
-        return resp.json()
-    except ValueError as exc:
-        logger.warning("solved.ac invalid JSON: %s", exc, extra={"handle": handle})
-        return None
-
 
 def get_solved_problem_count(user) -> int:
     """
-    solved.ac 연동으로 '연동 이후 새로 푼 문제들의 총합'을 계산한다.
+    지금까지 점수로 인정된 solved.ac 문제 개수 (저장된 값만 읽음).
 
-    - user.local_account.solvedac_handle 에서 핸들 가져옴
-    - solved.ac /api/v3/user/show 로 현재 solvedCount 읽음
-      (공식 비공식 문서 참고: solvedCount 필드 사용)
-    - SolvedAcProgress:
-        * credited_solved_count : 지금까지 점수로 인정된 문제 개수 (절대 줄어들지 않음)
-        * last_solved_count     : 마지막으로 본 solvedCount
-        * last_handle           : 마지막으로 사용한 solved.ac 핸들
-    - 같은 핸들이면 증가분만 더해주고,
-      핸들이 바뀌면 기존 점수 유지 + 새 핸들은 그 시점부터 다시 카운트.
+    solved.ac 원격 호출은 요청 경로에서 하지 않는다.
+    → 주기적으로 도는 `manage.py sync_solvedac` (apps/gamification/sync.py) 가
+      SolvedAcProgress 를 갱신하고 점수 이벤트를 발행한다.
     """
-
-    # 0) 핸들 없는 계정은 0
-    local = getattr(user, "local_account", None)
-    if local is None:
+    progress = SolvedAcProgress.objects.filter(user=user).first()
+    if progress is None:
         return 0
+    return progress.credited_solved_count
 
-    handle = getattr(local, "solvedac_handel", None)
-    if not handle:
-        return 0
-
-    # 1) solved.ac 에서 현재 solvedCount 읽기
-    data = _fetch_solvedac_profile(handle)
-    if data is None:
-        # API 실패 시: 이미 인정된 점수만 유지
-        progress = getattr(user, "solvedac_progress", None)
-        if progress is None:
-            return 0
-        return progress.credited_solved_count
 
+def parse_solved_count(data: dict) -> int:
+    """solved.ac /user/show 응답에서 solvedCount (음수/이상값은 0)"""
     try:
         current_solved = int(data.get("solvedCount") or 0)
-    except (TypeError, ValueError):
+    except (TypeError, ValueError, AttributeError):
         current_solved = 0
 
     if current_solved < 0:
         current_solved = 0
+    return current_solved
 
-    # 2) progress row 가져오기 (없으면 생성)
-    progress, created = SolvedAcProgress.objects.get_or_create(
-        user=user,
+
+def sync_solvedac_progress(user_id, handle: str) -> bool:
+    """
+    solved.ac 에서 현재 solvedCount 를 읽어 SolvedAcProgress 에 반영한다.
+    실패하면 False (이미 인정된 점수는 그대로 유지)
+    """
+    data = _fetch_solvedac_profile(handle)
+    if data is None:
+        return False
+
+    apply_solved_count(user_id, handle, parse_solved_count(data))
+    return True
+
+
+@transaction.atomic
+def apply_solved_count(user_id, handle: str, current_solved: int) -> int:
+    """
+    solved.ac 연동으로 '연동 이후 새로 푼 문제들의 총합'을 계산한다.
+
+    - SolvedAcProgress:
+        * credited_solved_count : 지금까지 점수로 인정된 문제 개수 (절대 줄어들지 않음)
+        * last_solved_count     : 마지막으로 본 solvedCount
+        * last_handle           : 마지막으로 사용한 solved.ac 핸들
+    - 같은 핸들이면 증가분만 더해주고,
+      핸들이 바뀌면 기존 점수 유지 + 새 핸들은 그 시점부터 다시 카운트.
+    - 새로 인정된 문제가 있으면 점수 이벤트 발행
+    """
+    # 1) progress row 가져오기 (없으면 생성)
+    progress, created = SolvedAcProgress.objects.select_for_update().get_or_create(
+        user_id=user_id,
         defaults={
             # 처음 연동 시:
             #   - baseline_solved_count = 현재까지 푼 문제 수
@@ -193,7 +193,17 @@ def get_solved_problem_count(user) -> int:
     if created:
         return progress.credited_solved_count
 
-    # 3) 기존 row가 있는 경우 처리
+    # 동기화 실패 기록만 있던 row (한 번도 성공 못 함) -> 처음 연동과 똑같이
+    if not progress.last_handle:
+        progress.baseline_solved_count = current_solved
+        progress.last_solved_count = current_solved
+        progress.last_handle = handle
+        progress.save(
+            update_fields=["baseline_solved_count", "last_solved_count", "last_handle", "updated_at"]
+        )
+        return progress.credited_solved_count
+
+    # 2) 기존 row가 있는 경우 처리
 
     # (1) 핸들이 변경된 경우:
     #     - 기존 credited_solved_count 는 유지
@@ -233,35 +243,31 @@ def get_solved_problem_count(user) -> int:
         ]
     )
 
+    # 새로 인정된 문제 수만큼 점수 이벤트 발행
+    if delta > 0:
+        post_score_event(user_id, solved_problem=delta)
+
     return progress.credited_solved_count
 
 
-# ---------- 프로필 업데이트 + 상태 dict ----------
+# ---------- 점수 이벤트 (카운터 증감) ----------
 
 
-@transaction.atomic
-def update_profile_and_build_status(user) -> dict:
+def _apply_score(profile: GamificationProfile) -> None:
     """
-    1) 출석/과제/백준 문제 수 카운트
-    2) 점수 / 레벨 / EXP 계산
-    3) GamificationProfile 업데이트
-    4) 프론트에 내려줄 dict 리턴
+    profile 의 카운터 값으로 total_score / stage / step / progress 를 다시 채운다.
+    (DB 저장은 호출한 쪽에서)
     """
-    attendance_count = get_attendance_count(user)
-    assignment_count = get_assignment_count(user)
-    solved_problem_count = get_solved_problem_count(user)
-
     source = ScoreSource(
-        attendance_count=attendance_count,
-        assignment_count=assignment_count,
-        solved_problem_count=solved_problem_count,
+        attendance_count=profile.attendance_count,
+        assignment_count=profile.assignment_count,
+        solved_problem_count=profile.solved_problem_count,
     )
 
     total_score = calc_total_score(source)
     stage, step = get_stage_step(total_score)
 
-    is_clear = total_score >= MAX_SCORE
-    if is_clear:
+    if total_score >= MAX_SCORE:
         # 올클리어 화면: STAGE 2 / STEP 6
         stage, step = 2, 6
 
@@ -271,10 +277,83 @@ def update_profile_and_build_status(user) -> dict:
     else:
         global_progress = 0.0
 
-    if global_progress < 0:
-        global_progress = 0.0
-    if global_progress > 1:
-        global_progress = 1.0
+    profile.total_score = total_score
+    profile.stage = stage
+    profile.step = step
+    profile.progress = min(max(global_progress, 0.0), 1.0)
+
+
+SCORE_FIELDS = [
+    "attendance_count",
+    "assignment_count",
+    "solved_problem_count",
+    "total_score",
+    "stage",
+    "step",
+    "progress",
+]
+
+
+def rebuild_profile(user) -> GamificationProfile:
+    """
+    원자료(DailyLmsAccess / Submission / SolvedAcProgress)로 카운터를 처음부터 다시 계산.
+    - 프로필이 아직 없을 때, 또는 reconcile 커맨드에서 사용
+    - solved.ac 는 원격 호출 없이 저장된 credited_solved_count 만 사용
+    - user 는 User 객체 또는 user id
+    """
+    user_id = getattr(user, "pk", user)
+    progress = SolvedAcProgress.objects.filter(user_id=user_id).first()
+
+    profile, _ = GamificationProfile.objects.get_or_create(user_id=user_id)
+    profile.attendance_count = get_attendance_count(user_id)
+    profile.assignment_count = get_assignment_count(user_id)
+    profile.solved_problem_count = progress.credited_solved_count if progress else 0
+    _apply_score(profile)
+    profile.save(update_fields=SCORE_FIELDS + ["updated_at"])
+    return profile
+
+
+@transaction.atomic
+def post_score_event(user, *, attendance=0, assignment=0, solved_problem=0) -> GamificationProfile | None:
+    """
+    점수 이벤트 하나를 GamificationProfile 카운터에 바로 반영한다.
+
+    - attendance     : 출석 도장 증감 (+1 / -1)
+    - assignment     : 제출 상태 과제 증감 (+1 / -1)
+    - solved_problem : 새로 인정된 solved.ac 문제 수
+
+    프로필이 아직 없으면 원자료로 한 번 전체 계산해서 만든다.
+    (이벤트를 일으킨 row 도 이미 저장된 상태라 카운트에 포함됨)
+    감소 이벤트뿐이면 만들지 않는다. (유저 삭제로 인한 cascade 삭제 등)
+    """
+    user_id = getattr(user, "pk", user)
+    profile = (
+        GamificationProfile.objects.select_for_update()
+        .filter(user_id=user_id)
+        .first()
+    )
+    if profile is None:
+        if max(attendance, assignment, solved_problem) <= 0:
+            return None
+        return rebuild_profile(user_id)
+
+    profile.attendance_count = max(profile.attendance_count + attendance, 0)
+    profile.assignment_count = max(profile.assignment_count + assignment, 0)
+    profile.solved_problem_count = max(profile.solved_problem_count + solved_problem, 0)
+    _apply_score(profile)
+    profile.save(update_fields=SCORE_FIELDS + ["updated_at"])
+    return profile
+
+
+# ---------- 상태 dict ----------
+
+
+def build_level_status(profile: GamificationProfile) -> dict:
+    """
+    저장된 GamificationProfile 로 프론트에 내려줄 dict 를 만든다. (DB 접근 없음)
+    """
+    total_score = profile.total_score
+    is_clear = total_score >= MAX_SCORE
 
     # STEP 내 EXP 계산
     if is_clear:
@@ -283,7 +362,7 @@ def update_profile_and_build_status(user) -> dict:
         step_exp_max = max_s - min_s
         step_exp_current = step_exp_max
     else:
-        min_s, max_s = get_step_bounds(stage, step)
+        min_s, max_s = get_step_bounds(profile.stage, profile.step)
         step_exp_max = max(max_s - min_s, 1)
         step_exp_current = total_score - min_s
         if step_exp_current < 0:
@@ -291,48 +370,107 @@ def update_profile_and_build_status(user) -> dict:
         if step_exp_current > step_exp_max:
             step_exp_current = step_exp_max
 
-    # GamificationProfile 저장/업데이트
-    profile, created = GamificationProfile.objects.get_or_create(
-        user=user,
-        defaults={
-            "total_score": total_score,
-            "stage": stage,
-            "step": step,
-            "progress": global_progress,
-        },
-    )
-
-    if not created:
-        profile.total_score = total_score
-        profile.stage = stage
-        profile.step = step
-        profile.progress = global_progress
-        profile.save(
-            update_fields=[
-                "total_score",
-                "stage",
-                "step",
-                "progress",
-                "updated_at",
-            ]
-        )
-
     return {
         "total_score": total_score,
         "max_score": MAX_SCORE,
-        "stage": stage,
-        "step": step,
-        "global_progress": global_progress,
+        "stage": profile.stage,
+        "step": profile.step,
+        "global_progress": profile.progress,
         "step_exp_current": step_exp_current,
         "step_exp_max": step_exp_max,
         "is_clear": is_clear,
         # 디버깅/표시용 서브 정보
-        "attendance_count": attendance_count,
-        "assignment_count": assignment_count,
-        "solved_problem_count": solved_problem_count,
+        "attendance_count": profile.attendance_count,
+        "assignment_count": profile.assignment_count,
+        "solved_problem_count": profile.solved_problem_count,
     }
 
 
+def get_level_status(user) -> dict:
+    """
+    /api/me/level/ 읽기 경로.
+    - 카운터는 이벤트로 이미 갱신돼 있으므로 프로필 한 줄만 읽는다.
+    - 프로필이 없는 유저(첫 접속)만 원자료로 한 번 계산
+    """
+    profile = GamificationProfile.objects.filter(user=user).first()
+    if profile is None:
+        profile = rebuild_profile(user)
+    return build_level_status(profile)
+
+
+# ---------- 출석 6칸 윈도우 ----------
+
+ATTENDANCE_WINDOW_DAYS = 6
+# 캐시가 워커끼리 공유(redis)될 때만 길게. locmem 이면 다른 워커의 무효화가 안 보이니 짧게
+ATTENDANCE_CACHE_TTL = getattr(settings, "GAMIFICATION_ATTENDANCE_CACHE_TTL", 60)
+
+
+@dataclass
+class AttendanceDay:
+    index: int  # 1 ~ 6 일차
+    date: object
+    has_accessed: bool
+    is_checked: bool
+
+
+def _attendance_window_key(user_id) -> str:
+    return f"gamification:attendance-window:{user_id}"
+
+
+def invalidate_attendance_window(user_id) -> None:
+    cache.delete(_attendance_window_key(user_id))
+
+
+def _load_attendance_rows(user_id) -> list[tuple]:
+    """
+    1일차(가장 첫 기록 날짜)부터 6일 안의 기록을 쿼리 한 번으로 가져온다.
+
+    (user, date) 가 unique 라서 날짜순 앞 6개 row 안에
+    윈도우(첫 날짜 ~ +5일)에 들어가는 row 가 전부 들어 있다.
+    → 첫 날짜를 따로 조회하지 않고 LIMIT 6 한 번으로 끝.
+    """
+    key = _attendance_window_key(user_id)
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(
+            DailyLmsAccess.objects
+            .filter(user_id=user_id)
+            .order_by("date")
+            .values_list("date", "has_accessed", "is_checked")[:ATTENDANCE_WINDOW_DAYS]
+        )
+        # 다음 출석/접속 기록이 저장될 때까지 유지 (signals.py 에서 무효화)
+        cache.set(key, rows, timeout=ATTENDANCE_CACHE_TTL)
+    return rows
+
+
+def get_attendance_window(user, today=None) -> tuple[object, list[AttendanceDay]]:
+    """
+    (1일차 날짜, 6일치 AttendanceDay 리스트) 리턴.
+    - 아직 아무 기록 없으면 오늘이 1일차
+    - 기록 없는 날은 has_accessed / is_checked 둘 다 False
+    """
+    if today is None:
+        today = timezone.now().date()
+
+    rows = _load_attendance_rows(user.id)
+    start_date = rows[0][0] if rows else today
+    by_date = {date: (has_accessed, is_checked) for date, has_accessed, is_checked in rows}
+
+    days = []
+    for i in range(ATTENDANCE_WINDOW_DAYS):
+        date = start_date + timedelta(days=i)
+        has_accessed, is_checked = by_date.get(date, (False, False))
+        days.append(
+            AttendanceDay(
+                index=i + 1,
+                date=date,
+                has_accessed=has_accessed,
+                is_checked=is_checked,
+            )
+        )
+    return start_date, days
+
+
 # ---------- LMS 접속 트래킹 ----------
 
 
@@ -0,0 +1,87 @@
+# apps/gamification/signals.py
+"""
+출석 도장 / 과제 제출 상태가 바뀔 때 점수 이벤트를 발행하는 시그널.
+(출석 기록이 바뀌면 캐시된 출석 6칸 윈도우도 여기서 무효화)
+
+- post_init 에서 로드 시점의 값을 기억해 두고
+- post_save / post_delete 에서 "점수 인정 상태"가 바뀐 경우에만 카운터를 증감한다.
+  (이전 값을 다시 조회하지 않으므로 추가 쿼리 없음)
+- only()/defer() 로 필드가 빠진 채 로드된 객체는 이전 값을 모르므로 건너뛴다.
+- queryset.update() / bulk 작업은 시그널을 타지 않으므로
+  `manage.py reconcile_gamification` 으로 보정한다.
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.learning.models import Submission
+
+from .models import DailyLmsAccess
+from .services import invalidate_attendance_window, post_score_event
+
+
+# ---------- 출석 도장 ----------
+
+
+@receiver(post_init, sender=DailyLmsAccess)
+def remember_attendance_state(sender, instance, **kwargs):
+    if not instance.pk:
+        instance._counted = False
+    elif "is_checked" in instance.__dict__:
+        instance._counted = bool(instance.is_checked)
+    else:
+        instance._counted = None
+
+
+@receiver(post_save, sender=DailyLmsAccess)
+def attendance_saved(sender, instance, created, **kwargs):
+    invalidate_attendance_window(instance.user_id)
+
+    was_counted = False if created else getattr(instance, "_counted", None)
+    is_counted = bool(instance.is_checked)
+    instance._counted = is_counted
+
+    if was_counted is not None and was_counted != is_counted:
+        post_score_event(instance.user_id, attendance=1 if is_counted else -1)
+
+
+@receiver(post_delete, sender=DailyLmsAccess)
+def attendance_deleted(sender, instance, **kwargs):
+    invalidate_attendance_window(instance.user_id)
+    if instance.is_checked:
+        post_score_event(instance.user_id, attendance=-1)
+
+
+# ---------- 과제 제출 ----------
+# get_assignment_count 와 같은 기준: status == "submitted" 인 제출만 점수 인정
+
+
+@receiver(post_init, sender=Submission)
+def remember_submission_state(sender, instance, **kwargs):
+    if not instance.pk:
+        instance._counted = False
+    elif "status" in instance.__dict__:
+        instance._counted = instance.status == "submitted"
+    else:
+        instance._counted = None
+
+
+@receiver(post_save, sender=Submission)
+def submission_saved(sender, instance, created, **kwargs):
+    was_counted = False if created else getattr(instance, "_counted", None)
+    is_counted = instance.status == "submitted"
+    instance._counted = is_counted
+
+    if getattr(instance, "_skip_score_event", False):
+        # 제출 접수 fast path: 점수는 SubmissionJob 워커가 반영 (apps/learning/submissions.py)
+        instance._skip_score_event = False
+        return
+
+    if was_counted is not None and was_counted != is_counted:
+        post_score_event(instance.student_id, assignment=1 if is_counted else -1)
+
+
+@receiver(post_delete, sender=Submission)
+def submission_deleted(sender, instance, **kwargs):
+    if instance.status == "submitted":
+        post_score_event(instance.student_id, assignment=-1)
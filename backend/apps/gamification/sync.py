@@ -0,0 +1,146 @@
+# apps/gamification/sync.py
+"""
+solved.ac 백그라운드 동기화.
+
+웹 요청은 SolvedAcProgress.credited_solved_count 만 읽고,
+실제 solved.ac 호출은 여기서 주기적으로 처리한다.
+
+    python manage.py sync_solvedac            # 한 번 돌고 종료 (cron 용)
+    python manage.py sync_solvedac --loop     # 계속 돌면서 주기적으로 동기화
+
+- TTL     : 한 번 동기화한 핸들은 SOLVEDAC_SYNC_TTL 초 동안 다시 부르지 않음
+- 속도 제한 : 요청 사이에 최소 SOLVEDAC_SYNC_MIN_INTERVAL 초 간격
+- 백오프   : 실패한 핸들은 60s → 120s → ... (최대 SOLVEDAC_SYNC_MAX_BACKOFF) 동안 건너뜀
+
+TTL/백오프 상태는 SolvedAcProgress (last_synced_at / sync_failures / next_attempt_at) 에 유저 단위로 저장한다.
+(cron 으로 매번 새 프로세스가 떠도 유지됨. 핸들이 바뀌면 TTL 은 무시하고 바로 동기화)
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from apps.users.models import LocalAccount
+
+from .models import SolvedAcProgress
+from .services import sync_solvedac_progress
+
+logger = logging.getLogger(__name__)
+
+SYNC_TTL = getattr(settings, "SOLVEDAC_SYNC_TTL", 600)
+MIN_INTERVAL = getattr(settings, "SOLVEDAC_SYNC_MIN_INTERVAL", 0.5)
+BASE_BACKOFF = getattr(settings, "SOLVEDAC_SYNC_BASE_BACKOFF", 60)
+MAX_BACKOFF = getattr(settings, "SOLVEDAC_SYNC_MAX_BACKOFF", 6 * 60 * 60)
+
+
+class RateLimiter:
+    """요청 사이 최소 간격을 지키도록 sleep 하는 단순 limiter"""
+
+    def __init__(self, min_interval: float, clock=time.monotonic, sleep=time.sleep):
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._last = None
+
+    def wait(self):
+        if self._last is not None:
+            remaining = self.min_interval - (self._clock() - self._last)
+            if remaining > 0:
+                self._sleep(remaining)
+        self._last = self._clock()
+
+
+@dataclass
+class SyncReport:
+    synced: int = 0
+    skipped_fresh: int = 0
+    skipped_backoff: int = 0
+    failed: int = 0
+
+
+def _record_success(user_id) -> None:
+    SolvedAcProgress.objects.filter(user_id=user_id).update(
+        last_synced_at=timezone.now(), sync_failures=0, next_attempt_at=None
+    )
+
+
+def _record_failure(user_id) -> int:
+    """실패 횟수 +1 하고 지수 백오프 시간(초)만큼 next_attempt_at 을 미룸"""
+    # 한 번도 성공 못 한 유저도 실패 기록은 남아야 함 (last_handle 비워둔 row -> 첫 성공 때 baseline 잡음)
+    SolvedAcProgress.objects.get_or_create(user_id=user_id)
+    SolvedAcProgress.objects.filter(user_id=user_id).update(sync_failures=F("sync_failures") + 1)
+    failures = SolvedAcProgress.objects.values_list("sync_failures", flat=True).get(user_id=user_id)
+
+    delay = min(BASE_BACKOFF * (2 ** (failures - 1)), MAX_BACKOFF)
+    # 여러 핸들이 같은 순간에 다시 몰리지 않도록 약간의 jitter
+    delay = int(delay * random.uniform(0.8, 1.2))
+    SolvedAcProgress.objects.filter(user_id=user_id).update(
+        next_attempt_at=timezone.now() + timedelta(seconds=delay)
+    )
+    return delay
+
+
+def linked_handles(user_ids=None):
+    """solved.ac 핸들을 연동한 (user_id, handle) 목록"""
+    qs = (
+        LocalAccount.objects
+        .exclude(solvedac_handel__isnull=True)
+        .exclude(solvedac_handel="")
+    )
+    if user_ids:
+        qs = qs.filter(user_id__in=user_ids)
+    return list(qs.order_by("user_id").values_list("user_id", "solvedac_handel"))
+
+
+def sync_all(user_ids=None, force=False, limiter=None) -> SyncReport:
+    """
+    연동된 모든 핸들을 한 바퀴 동기화한다.
+    - force=True 면 TTL/백오프 무시
+    """
+    limiter = limiter or RateLimiter(MIN_INTERVAL)
+    report = SyncReport()
+
+    handles = linked_handles(user_ids)
+    # 동기화 상태는 한 번에 읽어둠
+    states = {
+        row[0]: row[1:]
+        for row in SolvedAcProgress.objects
+        .filter(user_id__in=[user_id for user_id, _ in handles])
+        .values_list("user_id", "last_handle", "last_synced_at", "next_attempt_at")
+    }
+
+    for user_id, raw_handle in handles:
+        handle = raw_handle.strip()
+        if not handle:
+            continue
+
+        if not force and user_id in states:
+            last_handle, last_synced_at, next_attempt_at = states[user_id]
+            now = timezone.now()
+            if next_attempt_at and next_attempt_at > now:
+                report.skipped_backoff += 1
+                continue
+            if (
+                last_handle == handle
+                and last_synced_at
+                and now - last_synced_at < timedelta(seconds=SYNC_TTL)
+            ):
+                report.skipped_fresh += 1
+                continue
+
+        limiter.wait()
+        if sync_solvedac_progress(user_id, handle):
+            _record_success(user_id)
+            report.synced += 1
+        else:
+            delay = _record_failure(user_id)
+            logger.info("solved.ac sync failed, backing off %ss", delay, extra={"handle": handle})
+            report.failed += 1
+
+    return report
@@ -1,3 +1,144 @@
+# apps/gamification/tests.py
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.learning.models import Assignment, Course, Submission
+from apps.users.models import LocalAccount
+
+from .constants import ASSIGNMENT_POINT, ATTENDANCE_POINT, PROBLEM_POINT
+from .models import DailyLmsAccess, GamificationProfile, SolvedAcProgress
+from .services import get_attendance_window, get_level_status
+from .sync import RateLimiter, sync_all
+
+
+class ScoreEventTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student", password="pw")
+        course = Course.objects.create(title="C")
+        self.assignment = Assignment.objects.create(
+            course=course,
+            title="HW1",
+            description="",
+            due_date=timezone.now() + timedelta(days=1),
+        )
+
+    def test_stamp_and_submission_update_counters(self):
+        DailyLmsAccess.objects.create(user=self.user, date=timezone.now().date(), is_checked=True)
+        Submission.objects.create(assignment=self.assignment, student=self.user)
+
+        profile = GamificationProfile.objects.get(user=self.user)
+        self.assertEqual(profile.attendance_count, 1)
+        self.assertEqual(profile.assignment_count, 1)
+        self.assertEqual(profile.total_score, ATTENDANCE_POINT + ASSIGNMENT_POINT)
+
+    def test_grading_removes_assignment_credit(self):
+        sub = Submission.objects.create(assignment=self.assignment, student=self.user)
+        sub.status = "graded"
+        sub.save()
+
+        self.assertEqual(GamificationProfile.objects.get(user=self.user).assignment_count, 0)
+
+    def test_read_path_is_single_query(self):
+        DailyLmsAccess.objects.create(user=self.user, date=timezone.now().date(), is_checked=True)
+
+        with self.assertNumQueries(1):
+            status = get_level_status(self.user)
+        self.assertEqual(status["total_score"], ATTENDANCE_POINT)
+
+    def test_reconcile_fixes_drift(self):
+        DailyLmsAccess.objects.create(user=self.user, date=timezone.now().date(), is_checked=True)
+        # 시그널을 타지 않는 변경 → drift 발생
+        DailyLmsAccess.objects.filter(user=self.user).update(is_checked=False)
+
+        call_command("reconcile_gamification", stdout=StringIO())
+
+        profile = GamificationProfile.objects.get(user=self.user)
+        self.assertEqual(profile.attendance_count, 0)
+        self.assertEqual(profile.total_score, 0)
+
+
+class SolvedAcSyncTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="coder", password="pw")
+        LocalAccount.objects.create(
+            user=self.user, phone_number="010", nickname="c", role="SP", solvedac_handel="coder"
+        )
+        self.limiter = RateLimiter(0)
+
+    def _sync(self, solved_count, **kwargs):
+        # cron 처럼 매번 새 프로세스 (캐시에 남은 상태 없이)
+        cache.clear()
+        target = "apps.gamification.services._fetch_solvedac_profile"
+        with mock.patch(target, return_value={"solvedCount": solved_count}) as fetch:
+            report = sync_all(limiter=self.limiter, **kwargs)
+        return report, fetch
+
+    def test_credits_only_new_problems_and_respects_ttl(self):
+        self._sync(100)
+        report, fetch = self._sync(103)
+        # TTL 안에서는 다시 호출하지 않음
+        self.assertEqual(report.skipped_fresh, 1)
+        fetch.assert_not_called()
+
+        self._sync(103, force=True)
+        progress = SolvedAcProgress.objects.get(user=self.user)
+        self.assertEqual(progress.credited_solved_count, 3)
+        self.assertEqual(get_level_status(self.user)["total_score"], 3 * PROBLEM_POINT)
+
+    def test_failure_backs_off(self):
+        target = "apps.gamification.services._fetch_solvedac_profile"
+        with mock.patch(target, return_value=None):
+            first = sync_all(limiter=self.limiter)
+            cache.clear()
+            second = sync_all(limiter=self.limiter)
+        self.assertEqual(first.failed, 1)
+        self.assertEqual(second.skipped_backoff, 1)
+        progress = SolvedAcProgress.objects.get(user=self.user)
+        self.assertEqual(progress.sync_failures, 1)
+        self.assertGreater(progress.next_attempt_at, timezone.now())
+
+    def test_first_success_after_failures_sets_baseline(self):
+        target = "apps.gamification.services._fetch_solvedac_profile"
+        with mock.patch(target, return_value=None):
+            sync_all(limiter=self.limiter)
+
+        # 백오프 끝난 뒤 첫 성공: 연동 전에 푼 100문제는 인정 안 됨
+        SolvedAcProgress.objects.filter(user=self.user).update(next_attempt_at=None)
+        report, _ = self._sync(100)
+        self.assertEqual(report.synced, 1)
+        progress = SolvedAcProgress.objects.get(user=self.user)
+        self.assertEqual((progress.baseline_solved_count, progress.credited_solved_count), (100, 0))
+        self.assertEqual(progress.sync_failures, 0)
+        self.assertIsNotNone(progress.last_synced_at)
+
+
+class AttendanceWindowTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="student", password="pw")
+        self.start = timezone.now().date() - timedelta(days=2)
+        for offset in (0, 1, 7):
+            DailyLmsAccess.objects.create(
+                user=self.user, date=self.start + timedelta(days=offset), is_checked=True
+            )
+
+    def test_window_loaded_once_and_invalidated_on_stamp(self):
+        with self.assertNumQueries(1):
+            start_date, days = get_attendance_window(self.user)
+        with self.assertNumQueries(0):
+            get_attendance_window(self.user)
+
+        self.assertEqual(start_date, self.start)
+        self.assertEqual([d.is_checked for d in days], [True, True, False, False, False, False])
 
-# Create your tests here.
+        DailyLmsAccess.objects.create(user=self.user, date=self.start + timedelta(days=2), is_checked=True)
+        _, days = get_attendance_window(self.user)
+        self.assertTrue(days[2].is_checked)
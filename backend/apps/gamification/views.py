@@ -1,14 +1,17 @@
 # apps/gamification/views.py
 
-from datetime import timedelta
-
 from django.utils import timezone
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .models import DailyLmsAccess
-from .services import get_attendance_count, update_profile_and_build_status, track_lms_access
+from .services import (
+    get_attendance_count,
+    get_attendance_window,
+    get_level_status,
+    track_lms_access,
+)
 
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.utils.decorators import method_decorator
@@ -27,31 +30,19 @@ class AttendanceStatusView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        user = request.user
         today = timezone.now().date()
 
-        # 이 유저의 가장 첫 LMS 출석/접속 날짜를 1일차 기준으로 사용
-        qs = DailyLmsAccess.objects.filter(user=user).order_by("date")
-        if qs.exists():
-            start_date = qs.first().date
-        else:
-            # 아직 아무 기록 없으면 오늘이 1일차
-            start_date = today
+        # 이 유저의 가장 첫 LMS 출석/접속 날짜를 1일차 기준으로 6일치 (쿼리 1번, 캐시)
+        _, days = get_attendance_window(request.user, today)
 
         statuses = []
 
-        for i in range(6):
-            date = start_date + timedelta(days=i)
-            obj = DailyLmsAccess.objects.filter(user=user, date=date).first()
-
-            has_accessed = obj.has_accessed if obj else False
-            is_checked = obj.is_checked if obj else False
-
+        for day in days:
             # 날짜 기준으로 status 계산
-            if date < today:
-                status_str = "done" if is_checked else "upcoming"
-            elif date == today:
-                if is_checked:
+            if day.date < today:
+                status_str = "done" if day.is_checked else "upcoming"
+            elif day.date == today:
+                if day.is_checked:
                     status_str = "done"
                 else:
                     # 오늘이지만 아직 안 찍었으면 current
@@ -94,8 +85,9 @@ class MyLevelView(APIView):
     def get(self, request, *args, **kwargs):
         user = request.user
 
-        # 점수/레벨 다시 계산 + GamificationProfile 업데이트
-        status_dict = update_profile_and_build_status(user)
+        # 출석/과제/문제 카운터는 이벤트로 이미 갱신돼 있음 → 프로필 한 줄만 읽기
+        # (solved.ac 는 sync_solvedac 워커가 따로 반영)
+        status_dict = get_level_status(user)
 
         data = {
             "exp": {
@@ -169,12 +161,11 @@ class TodayAttendanceStampView(APIView):
                 status=status.HTTP_200_OK,
             )
 
-        # 여기서 도장 찍기
+        # 여기서 도장 찍기 (저장 시 출석 점수 이벤트 발행 → signals.py)
         obj.is_checked = True
         obj.save(update_fields=["is_checked", "updated_at"])
 
-        # 출석 1회 늘었으니 점수/레벨 재계산
-        status_dict = update_profile_and_build_status(request.user)
+        status_dict = get_level_status(request.user)
 
         return Response(status_dict, status=status.HTTP_200_OK)
 
@@ -188,29 +179,18 @@ class AttendanceMapView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        user = request.user
         today = timezone.now().date()
 
-        qs = DailyLmsAccess.objects.filter(user=user).order_by("date")
-        if qs.exists():
-            start_date = qs.first().date
-        else:
-            start_date = today
+        start_date, window = get_attendance_window(request.user, today)
 
         days = []
-        for i in range(6):
-            date = start_date + timedelta(days=i)
-            obj = DailyLmsAccess.objects.filter(user=user, date=date).first()
-
-            has_accessed = obj.has_accessed if obj else False
-            is_checked = obj.is_checked if obj else False
-
-            if date < today:
-                status_str = "done" if is_checked else "upcoming"
-            elif date == today:
-                if is_checked:
+        for day in window:
+            if day.date < today:
+                status_str = "done" if day.is_checked else "upcoming"
+            elif day.date == today:
+                if day.is_checked:
                     status_str = "done"
-                elif has_accessed:
+                elif day.has_accessed:
                     status_str = "current"
                 else:
                     status_str = "upcoming"
@@ -219,8 +199,8 @@ class AttendanceMapView(APIView):
 
             days.append(
                 {
-                    "index": i + 1,
-                    "date": str(date),
+                    "index": day.index,
+                    "date": str(day.date),
                     "status": status_str,
                 }
             )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GroupConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.group'
+
+    def ready(self):
+        # Document 변경 → 페이지 트리 캐시 무효화
+        from . import signals  # noqa: F401
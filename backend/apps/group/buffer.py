@@ -0,0 +1,146 @@
+# apps/group/buffer.py
+"""
+그룹 채팅 write-behind 버퍼 (방 하나당 하나, 프로세스 단위)
+
+- receive 에서는 메시지를 버퍼에 넣고 임시 id(provisional id)로 바로 브로드캐스트
+- FLUSH_INTERVAL_MS 마다 또는 FLUSH_BATCH 개가 모이면 abulk_create 로 한 번에 저장
+- 저장이 끝나면 {"type": "chat_message_saved", "ids": [[임시 id, 실제 id], ...]} 를 방에 보냄
+
+내구성
+- 소켓이 끊기면(disconnect) 그 방 버퍼를 바로 flush 하고 끝날 때까지 기다림
+  (서버 종료 시에도 daphne 가 소켓을 닫으면서 disconnect 가 불리므로 같이 저장됨)
+- ASGI lifespan 을 보내는 서버(uvicorn 등)는 종료(lifespan.shutdown) 때 lifespan() 이 flush_all
+  (myproject/asgi.py 에 연결)
+- 저장 실패하면 버퍼 앞쪽에 다시 넣고 다음 flush 때 재시도 (MAX_RETRIES 넘으면 로그 남기고 버림)
+- 프로세스가 강제로 죽으면 최대 FLUSH_INTERVAL_MS 만큼의 메시지는 잃을 수 있음
+- FLUSH_INTERVAL_MS = 0 이면 예전처럼 메시지마다 바로 저장 (write-through)
+"""
+import asyncio
+import itertools
+import logging
+import time
+
+from django.conf import settings
+
+from .models import GroupMessage
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_MS = getattr(settings, "GROUP_CHAT_FLUSH_INTERVAL_MS", 50)
+FLUSH_BATCH = getattr(settings, "GROUP_CHAT_FLUSH_BATCH", 100)
+MAX_RETRIES = 3
+
+_seq = itertools.count(1)
+
+
+def provisional_id():
+    # 프로세스 안에서만 유일하면 됨 (ack 로 실제 id 로 바뀜)
+    return f"tmp-{int(time.time() * 1000)}-{next(_seq)}"
+
+
+class RoomWriteBuffer:
+    def __init__(self, group_id, room_name, channel_layer, interval_ms=None, batch_size=None):
+        self.group_id = group_id
+        self.room_name = room_name
+        self.channel_layer = channel_layer
+        self.interval = (FLUSH_INTERVAL_MS if interval_ms is None else interval_ms) / 1000
+        self.batch_size = batch_size or FLUSH_BATCH
+        self.refs = 0  # 이 프로세스에서 이 방에 붙어 있는 소켓 수
+
+        self._pending = []  # [(임시 id, GroupMessage, 재시도 횟수)]
+        self._timer = None
+        self._lock = asyncio.Lock()
+        self._tasks = set()
+
+    def add(self, message, temp_id):
+        self._pending.append((temp_id, message, 0))
+
+        if len(self._pending) >= self.batch_size:
+            self._spawn_flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.interval, self._spawn_flush)
+
+    def _spawn_flush(self):
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        # 태스크가 GC 로 사라지지 않게 들고 있다가 끝나면 정리
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            try:
+                saved = await GroupMessage.objects.abulk_create([m for _, m, _ in batch])
+            except Exception:
+                logger.exception("group chat flush failed", extra={"group_id": self.group_id})
+                retry = [(t, m, n + 1) for t, m, n in batch if n + 1 < MAX_RETRIES]
+                dropped = len(batch) - len(retry)
+                if dropped:
+                    logger.error("group chat dropped %s messages", dropped, extra={"group_id": self.group_id})
+                self._pending = retry + self._pending
+                if self._pending and self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(self.interval, self._spawn_flush)
+                return 0
+
+            await self.channel_layer.group_send(
+                self.room_name,
+                {
+                    "type": "chat_message_saved",
+                    "ids": [[t, m.pk] for (t, _, _), m in zip(batch, saved)],
+                },
+            )
+            return len(saved)
+
+    async def drain(self):
+        """대기 중인 flush 태스크까지 다 끝날 때까지"""
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+_buffers = {}
+
+
+def acquire(group_id, room_name, channel_layer):
+    buffer = _buffers.get(group_id)
+    if buffer is None:
+        buffer = _buffers[group_id] = RoomWriteBuffer(group_id, room_name, channel_layer)
+    buffer.refs += 1
+    return buffer
+
+
+async def release(buffer):
+    """소켓 하나가 나갈 때: 그 방 버퍼를 저장하고, 마지막 소켓이면 버퍼 정리"""
+    buffer.refs -= 1
+    await buffer.drain()
+    if buffer.refs <= 0 and _buffers.get(buffer.group_id) is buffer and not buffer._pending:
+        del _buffers[buffer.group_id]
+
+
+async def flush_all():
+    for buffer in list(_buffers.values()):
+        await buffer.drain()
+
+
+async def lifespan(scope, receive, send):
+    """ASGI lifespan: 워커 종료 직전에 모든 방 버퍼 저장"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            try:
+                await flush_all()
+            except Exception:
+                logger.exception("group chat flush on shutdown failed")
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -0,0 +1,482 @@
+# apps/group/collab.py
+"""
+그룹 페이지 동시 편집
+
+- 블록 상태(content / block_type / rev / 최근 op 로그 / dirty)는 공유 캐시(CACHES, 운영은 Redis)에 둔다
+  -> ASGI 워커가 여러 개여도 모든 워커가 같은 블록 상태를 봄 (sticky 라우팅 필요 없음)
+- op 은 블록 단위 락(cache.add) 안에서 읽고 -> 적용하고 -> 다시 씀
+- op 은 같은 방(page_<id>) 사람들에게 channel layer 로 바로 브로드캐스트
+- 바뀐 블록(dirty)만 CHECKPOINT_MS 마다 abulk_update 한 번으로 저장 (그 블록들 락을 잡은 채로)
+  -> 10명이 같이 쳐도 DB 쓰기는 초당 1번 정도
+- HTTP 로 블록을 고치거나 지우면(DocumentUpdateView) 같은 락 안에서 공유 상태에도 반영 (http_update / http_delete)
+  -> checkpoint 가 옛 내용으로 HTTP 수정을 덮어쓰지 않음
+- 마지막 사람이 나가면 바로 checkpoint
+- 워커 안의 PageSession 은 접속 수 / checkpoint 타이머 / 이 페이지 블록 id 만 들고 있음
+
+op 종류 (이 페이지 아래 블록만. page / folder 는 편집 불가)
+- splice: {"op": "splice", "id": 블록 id, "rev": 기준 rev, "pos": 위치, "delete": 지울 글자 수, "insert": "추가 문자열"}
+  기준 rev 이후에 다른 사람 op 이 있었으면 위치를 변환(transform)해서 적용
+- set:    {"op": "set", "id": 블록 id, "content": "...", "block_type": "text"}  (블록 전체 교체)
+"""
+import asyncio
+import logging
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Document
+from .services import invalidate_documents
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_MS = getattr(settings, "GROUP_DOC_CHECKPOINT_MS", 1000)
+OP_LOG_SIZE = 200  # 블록마다 기억하는 최근 op 수 (이보다 오래된 rev 기준 op 은 resync)
+STRUCTURE_TYPES = ("page", "folder")
+EDITABLE_TYPES = {t for t, _ in Document.BLOCK_TYPES if t not in STRUCTURE_TYPES}
+
+STATE_TTL = 60 * 60 * 24
+LOCK_TIMEOUT = 5  # 락 잡은 워커가 죽어도 이 시간 뒤엔 풀림
+LOCK_WAIT = 2.0
+
+
+class OpError(Exception):
+    """적용 못 하는 op -> 클라이언트에 resync 보냄"""
+
+    def __init__(self, message, block=None):
+        super().__init__(message)
+        self.block = block
+
+
+class BlockBusy(OpError):
+    """블록 락을 LOCK_WAIT 안에 못 잡음"""
+
+
+def _state_key(block_id):
+    return f"group:collab:block:{block_id}"
+
+
+def _lock_key(block_id):
+    return f"group:collab:block:{block_id}:lock"
+
+
+# 락 값 = 잡을 때마다 새 토큰. 풀 때는 아직 내 토큰일 때만 지움
+# (LOCK_TIMEOUT 이 지나 다른 쪽이 잡은 락을 먼저 잡았던 쪽이 지워버리지 않게)
+_UNLOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _new_token():
+    # int 는 RedisCache 가 pickle 없이 그대로 저장 -> 스크립트에서 바로 비교 가능
+    return secrets.randbits(62) + 1
+
+
+def _lock(block_id, wait=LOCK_WAIT):
+    """락을 잡으면 토큰, wait 안에 못 잡으면 None"""
+    token = _new_token()
+    deadline = time.monotonic() + wait
+    while not cache.add(_lock_key(block_id), token, timeout=LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(0.005)
+    return token
+
+
+def _unlock(block_id, token):
+    """compare-and-delete: 락 값이 아직 token 일 때만 지움"""
+    key = _lock_key(block_id)
+    client = getattr(cache, "_cache", None)
+    if hasattr(client, "get_client"):
+        # django RedisCache -> Lua 로 비교+삭제 한 번에
+        raw_key = cache.make_and_validate_key(key)
+        client.get_client(raw_key, write=True).eval(_UNLOCK_SCRIPT, 1, raw_key, token)
+    elif cache.get(key) == token:
+        # locmem 등 (프로세스 하나짜리 개발/테스트 환경)
+        cache.delete(key)
+
+
+async def _alock(block_id, wait=LOCK_WAIT):
+    token = _new_token()
+    deadline = time.monotonic() + wait
+    while not await cache.aadd(_lock_key(block_id), token, timeout=LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            return None
+        await asyncio.sleep(0.005)
+    return token
+
+
+async def _aunlock(block_id, token):
+    await sync_to_async(_unlock)(block_id, token)
+
+
+class Block:
+    __slots__ = ("id", "page_id", "parent_id", "block_type", "content", "order_index", "rev", "log", "dirty")
+
+    def __init__(self, doc, page_id):
+        self.id = doc.id
+        self.page_id = page_id
+        self.parent_id = doc.parent_id
+        self.block_type = doc.block_type
+        self.content = doc.content or ""
+        self.order_index = doc.order_index
+        self.rev = 0
+        self.log = deque(maxlen=OP_LOG_SIZE)  # (rev, pos, delete, insert_len)
+        self.dirty = False
+
+    def replace(self, content=None, block_type=None):
+        if content is not None:
+            # 전체 교체 = 처음부터 끝까지 지우고 새로 넣는 splice 로 기록 (이후 transform 용)
+            old_len = len(self.content)
+            self.content = str(content)
+            self.rev += 1
+            self.log.append((self.rev, 0, old_len, len(self.content)))
+        if block_type is not None:
+            self.block_type = block_type
+            if content is None:
+                self.rev += 1
+                self.log.append((self.rev, 0, 0, 0))
+
+    def set_op(self):
+        return {
+            "op": "set",
+            "id": self.id,
+            "rev": self.rev,
+            "content": self.content,
+            "block_type": self.block_type,
+        }
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "parent": self.parent_id,
+            "block_type": self.block_type,
+            "content": self.content,
+            "order_index": self.order_index,
+            "rev": self.rev,
+        }
+
+
+def transform(pos, delete, other_pos, other_delete, other_insert):
+    """
+    먼저 적용된 다른 op(other)을 반영해서 내 op 의 (pos, delete) 를 옮김
+    - 같은 위치 삽입이면 먼저 온 쪽이 앞
+    """
+    if other_delete:
+        other_end = other_pos + other_delete
+        if pos >= other_end:
+            pos -= other_delete
+        elif pos + delete > other_pos:
+            # 지우려던 범위가 이미 일부 지워짐
+            overlap = min(pos + delete, other_end) - max(pos, other_pos)
+            delete -= overlap
+            pos = min(pos, other_pos)
+
+    if other_insert:
+        if other_pos <= pos:
+            pos += other_insert
+        elif other_pos < pos + delete:
+            # 내가 지우려던 범위 안에 끼어든 글자도 같이 지움
+            delete += other_insert
+    return pos, delete
+
+
+class PageSession:
+    def __init__(self, group_id, page_id, interval_ms=None):
+        self.group_id = int(group_id)
+        self.page_id = int(page_id)
+        self.interval = (CHECKPOINT_MS if interval_ms is None else interval_ms) / 1000
+        self.block_ids = set()  # checkpoint 때 dirty 인지 볼 블록들
+        self.refs = 0
+
+        self._save_lock = asyncio.Lock()
+        self._timer = None
+        self._tasks = set()
+
+    # --- 로드 ---------------------------------------------------------------
+
+    async def snapshot(self):
+        """DB 의 블록 구조 + 공유 상태의 내용/rev (공유 상태가 없는 블록은 DB 에서 올려둠)"""
+        docs = await database_sync_to_async(self._load_docs)()
+        keys = {_state_key(doc.id): doc for doc in docs}
+        states = await cache.aget_many(list(keys))
+        for key, doc in keys.items():
+            if key not in states:
+                block = Block(doc, self.page_id)
+                # 다른 워커가 먼저 올렸으면 그걸 씀
+                if not await cache.aadd(key, block, timeout=STATE_TTL):
+                    block = await cache.aget(key) or block
+                states[key] = block
+        self.block_ids.update(doc.id for doc in docs)
+
+        blocks = []
+        for key, doc in keys.items():
+            block = states[key].as_dict()
+            block.update(parent=doc.parent_id, order_index=doc.order_index)
+            blocks.append(block)
+        return sorted(blocks, key=lambda b: (b["order_index"], b["id"]))
+
+    def _load_docs(self):
+        # 그룹 문서 한 번에 가져와서 페이지 아래 것만 (build_page_tree 와 같은 방식)
+        docs = list(
+            Document.objects
+            .filter(group_id=self.group_id)
+            .only("id", "parent_id", "block_type", "content", "order_index")
+            .order_by("order_index", "id")
+        )
+        children = {}
+        for doc in docs:
+            children.setdefault(doc.parent_id, []).append(doc)
+
+        result, stack = [], [self.page_id]
+        while stack:
+            for child in children.get(stack.pop(), []):
+                if child.block_type in STRUCTURE_TYPES:
+                    continue
+                result.append(child)
+                stack.append(child.id)
+        return result
+
+    async def get_block(self, block_id):
+        """이 페이지 아래 블록만 (락 잡은 상태에서 부름)"""
+        block = await cache.aget(_state_key(block_id))
+        if block is not None and block.page_id == self.page_id:
+            return block
+
+        # 세션 도중 HTTP 로 새로 만들었거나 다른 페이지에서 옮겨온 블록일 수 있음
+        doc = await Document.objects.filter(
+            pk=block_id, group_id=self.group_id
+        ).exclude(
+            block_type__in=STRUCTURE_TYPES
+        ).only("id", "parent_id", "block_type", "content", "order_index").afirst()
+        if doc is None or not (doc.parent_id == self.page_id or doc.parent_id in self.block_ids):
+            raise OpError("unknown block")
+        if block is None:
+            block = Block(doc, self.page_id)
+        else:
+            # 아직 저장 안 된 내용이 있을 수 있어서 상태는 그대로 두고 페이지만 바꿈
+            block.page_id = self.page_id
+            block.parent_id = doc.parent_id
+        return block
+
+    # --- op 적용 ------------------------------------------------------------
+
+    async def apply(self, op):
+        """op 적용하고 브로드캐스트할 op(서버 rev 포함) 돌려줌"""
+        try:
+            block_id = int(op.get("id"))
+        except (TypeError, ValueError):
+            raise OpError("id is required")
+
+        token = await _alock(block_id)
+        if token is None:
+            raise BlockBusy("block is busy")
+        try:
+            block = await self.get_block(block_id)
+
+            kind = op.get("op")
+            if kind == "splice":
+                result = self._splice(block, op)
+            elif kind == "set":
+                result = self._set(block, op)
+            else:
+                raise OpError("unknown op", block)
+
+            block.dirty = True
+            await cache.aset(_state_key(block_id), block, timeout=STATE_TTL)
+        finally:
+            await _aunlock(block_id, token)
+
+        self.block_ids.add(block_id)
+        self._schedule_checkpoint()
+        return result
+
+    def _splice(self, block, op):
+        try:
+            base_rev = int(op.get("rev", block.rev))
+            pos = int(op.get("pos", 0))
+            delete = int(op.get("delete", 0))
+        except (TypeError, ValueError):
+            raise OpError("bad splice", block)
+        insert = str(op.get("insert") or "")
+        if base_rev > block.rev or pos < 0 or delete < 0:
+            raise OpError("bad splice", block)
+
+        if base_rev < block.rev:
+            missed = [entry for entry in block.log if entry[0] > base_rev]
+            if len(missed) != block.rev - base_rev:
+                # 로그에서 밀려난 옛날 rev 기준 -> 클라이언트가 다시 받아야 함
+                raise OpError("rev too old", block)
+            for _, other_pos, other_delete, other_insert in missed:
+                pos, delete = transform(pos, delete, other_pos, other_delete, other_insert)
+
+        pos = min(pos, len(block.content))
+        delete = min(delete, len(block.content) - pos)
+        block.content = block.content[:pos] + insert + block.content[pos + delete:]
+        block.rev += 1
+        block.log.append((block.rev, pos, delete, len(insert)))
+
+        return {
+            "op": "splice",
+            "id": block.id,
+            "rev": block.rev,
+            "pos": pos,
+            "delete": delete,
+            "insert": insert,
+        }
+
+    def _set(self, block, op):
+        content = op.get("content")
+        block_type = op.get("block_type")
+        # page / folder 로 바꾸면 사이드바 구조가 깨짐 -> HTTP API 로만
+        if block_type is not None and block_type not in EDITABLE_TYPES:
+            raise OpError("bad block_type", block)
+
+        block.replace(content, block_type)
+        return block.set_op()
+
+    # --- checkpoint ---------------------------------------------------------
+
+    def _schedule_checkpoint(self):
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.interval, self._spawn_checkpoint)
+
+    def _spawn_checkpoint(self):
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self.checkpoint())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def checkpoint(self):
+        """
+        dirty 블록만 bulk_update 한 번으로 저장
+        (다른 워커가 고친 블록도 이 페이지 것이면 같이 저장됨)
+        """
+        async with self._save_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            ids = sorted(self.block_ids)
+            states = await cache.aget_many([_state_key(i) for i in ids])
+            dirty = [i for i in ids if getattr(states.get(_state_key(i)), "dirty", False)]
+            if not dirty:
+                return 0
+
+            # 저장하는 동안 op / HTTP 수정이 끼어들지 못하게 (id 순서로 잡아서 교착 없음)
+            locked = {}
+            for i in dirty:
+                token = await _alock(i)
+                if token is not None:
+                    locked[i] = token
+            try:
+                states = await cache.aget_many([_state_key(i) for i in locked])
+                blocks = [b for b in states.values() if b.dirty and b.page_id == self.page_id]
+                now = timezone.now()
+                docs = [
+                    Document(id=b.id, content=b.content, block_type=b.block_type, updated_at=now)
+                    for b in blocks
+                ]
+                try:
+                    await Document.objects.abulk_update(docs, ["content", "block_type", "updated_at"])
+                    await database_sync_to_async(invalidate_documents)(self.group_id)
+                except Exception:
+                    logger.exception("page checkpoint failed", extra={"page_id": self.page_id})
+                    self._schedule_checkpoint()
+                    return 0
+
+                for b in blocks:
+                    b.dirty = False
+                await cache.aset_many({_state_key(b.id): b for b in blocks}, timeout=STATE_TTL)
+            finally:
+                for i, token in locked.items():
+                    await _aunlock(i, token)
+
+            if len(locked) < len(dirty):
+                self._schedule_checkpoint()
+            return len(docs)
+
+    async def drain(self):
+        await self.checkpoint()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+# 워커 안에서 페이지별 접속 수 / 타이머만. 블록 상태는 공유 캐시
+_sessions = {}
+
+
+def acquire(group_id, page_id):
+    page_id = int(page_id)
+    session = _sessions.get(page_id)
+    if session is None:
+        session = _sessions[page_id] = PageSession(group_id, page_id)
+    session.refs += 1
+    return session
+
+
+async def release(session):
+    session.refs -= 1
+    if session.refs > 0:
+        return
+    await session.drain()
+    if session.refs <= 0 and _sessions.get(session.page_id) is session:
+        del _sessions[session.page_id]
+
+
+# --- HTTP 쪽 (DocumentUpdateView) -------------------------------------------
+
+
+@contextmanager
+def block_lock(block_id):
+    """
+    with collab.block_lock(doc_id): ...
+    HTTP 로 블록을 고치는 동안 op / checkpoint 가 끼어들지 못하게. 못 잡으면 BlockBusy
+    """
+    token = _lock(block_id)
+    if token is None:
+        raise BlockBusy("block is busy")
+    try:
+        yield
+    finally:
+        _unlock(block_id, token)
+
+
+def http_update(doc):
+    """
+    HTTP 로 저장된 doc 을 공유 상태에 반영 (block_lock 안에서, DB 저장 후에 부름)
+    공유 상태가 있던 블록이고 내용이 바뀌었으면 (page_id, set op) -> 그 방에 브로드캐스트, 아니면 None
+    """
+    key = _state_key(doc.id)
+    block = cache.get(key)
+    if block is None:
+        return None
+    if doc.block_type in STRUCTURE_TYPES or doc.parent_id != block.parent_id:
+        # 더 이상 이 페이지의 블록이 아님 -> 다음 op 때 DB 에서 다시 확인
+        cache.delete(key)
+        return None
+
+    # DB 에 방금 쓴 내용이 최신 -> 이전에 쌓인 dirty 는 버림
+    rev = block.rev
+    block.replace(
+        doc.content if doc.content != block.content else None,
+        doc.block_type if doc.block_type != block.block_type else None,
+    )
+    block.order_index = doc.order_index
+    block.dirty = False
+    cache.set(key, block, timeout=STATE_TTL)
+    return (block.page_id, block.set_op()) if block.rev != rev else None
+
+
+def http_delete(block_id):
+    cache.delete(_state_key(block_id))
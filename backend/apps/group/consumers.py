@@ -1,11 +1,33 @@
 # apps/group/consumers.py
 
 import json
+import logging
+import time
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.utils import timezone
 
-from .models import Group, GroupMessage
+from myproject.ws_metrics import metrics
+
+from . import buffer as write_buffer
+from . import collab
+from .models import Document, GroupMember, GroupMessage
+from .serializers import GroupMessageSerializer, serialize_message_page
+from .services import InvalidCursor, fetch_group_messages
+
+logger = logging.getLogger(__name__)
+
+REPLAY_SIZE = getattr(settings, "GROUP_CHAT_REPLAY_SIZE", 50)
+
+
+def can_join_group(user, group_id):
+    if user.is_staff:
+        return True
+    return GroupMember.objects.filter(group_id=group_id, user_id=user.id).exists()
 
 
 class GroupChatConsumer(AsyncWebsocketConsumer):
@@ -13,67 +35,101 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
         # URL에서 group_id 가져오기 (/ws/group/<group_id>/)
         self.group_id = self.scope["url_route"]["kwargs"]["group_id"]
         self.room_name = f"group_{self.group_id}"
+        self.joined = False
+
+        # 로그인/그룹 멤버 체크는 접속할 때 한 번만 (receive 에서는 안 함)
+        self.user = self.scope.get("user")
+        if self.user is None or isinstance(self.user, AnonymousUser):
+            await self.close(code=4401)
+            return
+        if not await self._can_join():
+            await self.close(code=4403)
+            return
 
         # 같은 그룹 사람들끼리 같은 room_name 으로 묶기
         await self.channel_layer.group_add(self.room_name, self.channel_name)
         await self.accept()
+        self.joined = True
+        self.buffer = write_buffer.acquire(self.group_id, self.room_name, self.channel_layer)
+        metrics.connected(self.room_name)
+
+        # 최근 메시지만 먼저 보내줌 (전체 히스토리 X)
+        # 재연결이면 ?after_id=<마지막으로 받은 id> 로 빠진 것만
+        await self.send_history()
+
+    async def send_history(self):
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        after_id = (query.get("after_id") or [None])[0]
+
+        try:
+            payload = await self._load_history(after_id)
+        except InvalidCursor:
+            # 모르는 id 면 최신 N 개로
+            payload = await self._load_history(None)
+
+        await self.send(text_data=json.dumps({"type": "history", **payload}))
+
+    @database_sync_to_async
+    def _can_join(self):
+        return can_join_group(self.user, self.group_id)
+
+    @database_sync_to_async
+    def _load_history(self, after_id):
+        page = fetch_group_messages(self.group_id, after_id=after_id, limit=REPLAY_SIZE)
+        return serialize_message_page(page, user_id=self.user.id)
 
     async def disconnect(self, close_code):
+        if not self.joined:
+            return
         # 연결 끊길 때 room 에서 빼주기
         await self.channel_layer.group_discard(self.room_name, self.channel_name)
+        metrics.disconnected(self.room_name)
+        # 버퍼에 남은 메시지는 여기서 저장 끝날 때까지 기다림
+        await write_buffer.release(self.buffer)
 
     async def receive(self, text_data):
         """
         클라이언트가 보낸 메시지를 받는 부분
         1) JSON 파싱
-        2) 로그인 유저/그룹 체크
-        3) DB에 GroupMessage 저장
-        4) 같은 room 에 모두에게 브로드캐스트
+        2) 방 버퍼에 넣기 (유저/그룹 체크는 connect 에서 끝남)
+        3) 같은 room 에 모두에게 브로드캐스트 (임시 id)
         """
-        print(">>> receive called:", text_data)  # 디버깅용 로그
+        logger.debug("group chat receive: %s", text_data)
 
         try:
             data = json.loads(text_data)
         except json.JSONDecodeError:
-            print(">>> invalid json")
+            logger.debug("group chat invalid json")
             return
 
         message = (data.get("message") or "").strip()
-        user = self.scope.get("user")
 
         if not message:
-            print(">>> empty message, ignore")
-            return
-
-        # 로그인 안 돼 있으면 무시 (테스트 시 주석처리)
-        if isinstance(user, AnonymousUser):
-            print(">>> AnonymousUser, ignore")
-            return
-
-        # group 존재하는지 확인
-        try:
-            group = await Group.objects.aget(id=self.group_id)
-        except Group.DoesNotExist:
-            print(">>> group not found:", self.group_id)
+            logger.debug("group chat empty message, ignore")
             return
 
-        # DB 저장
-        saved = await GroupMessage.objects.acreate(
-            group=group,
-            user=user,
+        # 바로 저장하지 않고 방 버퍼에 넣은 뒤 임시 id 로 먼저 브로드캐스트
+        # (실제 저장은 buffer.py 에서 모아서 abulk_create -> chat_message_saved 로 id 알려줌)
+        msg = GroupMessage(
+            group_id=self.group_id,
+            user=self.user,
             content=message,
+            created_at=timezone.now(),
         )
-
-        # 같은 room 에 모두에게 브로드캐스트
+        if write_buffer.FLUSH_INTERVAL_MS > 0:
+            temp_id = write_buffer.provisional_id()
+            self.buffer.add(msg, temp_id)
+        else:
+            await msg.asave()
+            temp_id = msg.pk
+
+        # 같은 room 에 모두에게 브로드캐스트 (REST 히스토리와 같은 포맷)
+        # sent_at 은 팬아웃 지연 측정용
+        data = GroupMessageSerializer(msg).data
+        data["id"] = temp_id
         await self.channel_layer.group_send(
             self.room_name,
-            {
-                "type": "chat_message",
-                "id": saved.id,
-                "sender": user.username,
-                "text": saved.content,
-                "time": timezone.localtime(saved.created_at).strftime("%H:%M"),
-            },
+            {"type": "chat_message", "sent_at": time.time(), **data},
         )
 
     async def chat_message(self, event):
@@ -81,12 +137,10 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
         group_send 로 넘어온 이벤트를 실제 브라우저로 보내는 부분
         여기서 "이 소켓 유저가 보낸 메시지인지"를 계산해서 is_me 플래그를 붙인다.
         """
-        user = self.scope.get("user", None)
+        metrics.observe_fanout(self.room_name, event.get("sent_at"))
 
-        is_me = False
-        if user and not isinstance(user, AnonymousUser):
-            # 이 소켓에 연결된 유저와 sender 가 같으면 내 메시지
-            is_me = (user.username == event.get("sender"))
+        # 이 소켓에 연결된 유저와 sender 가 같으면 내 메시지
+        is_me = (self.user.username == event.get("sender"))
 
         payload = {
             "type": "chat_message",
@@ -98,3 +152,102 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
         }
 
         await self.send(text_data=json.dumps(payload))
+
+    async def chat_message_saved(self, event):
+        """버퍼가 DB 에 저장한 뒤 임시 id -> 실제 id 알려주기"""
+        await self.send(text_data=json.dumps({
+            "type": "chat_message_saved",
+            "ids": event["ids"],
+        }))
+
+
+class DocumentEditConsumer(AsyncWebsocketConsumer):
+    """
+    그룹 페이지 동시 편집 (/ws/group/<group_id>/pages/<page_id>/)
+
+    - 접속하면 {"type": "snapshot", "blocks": [...]} (블록마다 rev 포함)
+    - 클라이언트 -> 서버: collab.py 의 op (splice / set), client_op_id 는 그대로 돌려줌
+    - 서버 -> 모두: {"type": "op", ..., "rev": 서버 rev, "by": 보낸 사람, "is_me": ...}
+    - 적용 못 하는 op 이면 보낸 사람한테만 {"type": "resync", "block": 현재 블록}
+    - DB 저장은 collab.PageSession 이 모아서 주기적으로 (블록 생성/삭제/이동은 기존 HTTP API)
+    - HTTP 로 블록 내용을 바꾸면 DocumentUpdateView 가 같은 방에 set op 을 보냄 (by 는 그 사람)
+    """
+
+    async def connect(self):
+        self.group_id = self.scope["url_route"]["kwargs"]["group_id"]
+        self.page_id = self.scope["url_route"]["kwargs"]["page_id"]
+        self.room_name = f"page_{self.page_id}"
+        self.joined = False
+
+        self.user = self.scope.get("user")
+        if self.user is None or isinstance(self.user, AnonymousUser):
+            await self.close(code=4401)
+            return
+        if not await database_sync_to_async(can_join_group)(self.user, self.group_id):
+            await self.close(code=4403)
+            return
+        page_exists = await Document.objects.filter(
+            pk=self.page_id, group_id=self.group_id, block_type="page"
+        ).aexists()
+        if not page_exists:
+            await self.close(code=4404)
+            return
+
+        await self.channel_layer.group_add(self.room_name, self.channel_name)
+        await self.accept()
+        self.joined = True
+        self.session = collab.acquire(self.group_id, self.page_id)
+        metrics.connected(self.room_name)
+
+        await self.send(text_data=json.dumps({
+            "type": "snapshot",
+            "page_id": self.page_id,
+            "blocks": await self.session.snapshot(),
+        }))
+
+    async def disconnect(self, close_code):
+        if not self.joined:
+            return
+        await self.channel_layer.group_discard(self.room_name, self.channel_name)
+        metrics.disconnected(self.room_name)
+        # 마지막 편집자가 나가면 여기서 checkpoint 끝날 때까지 기다림
+        await collab.release(self.session)
+
+    async def receive(self, text_data):
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(data, dict):
+            return
+
+        try:
+            result = await self.session.apply(data)
+        except collab.OpError as e:
+            await self.send(text_data=json.dumps({
+                "type": "resync",
+                "error": str(e),
+                "client_op_id": data.get("client_op_id"),
+                "block": e.block.as_dict() if e.block else None,
+            }))
+            return
+
+        await self.channel_layer.group_send(
+            self.room_name,
+            {
+                "type": "doc_op",
+                "sent_at": time.time(),
+                "by": self.user.username,
+                "origin": self.channel_name,
+                "client_op_id": data.get("client_op_id"),
+                **result,
+            },
+        )
+
+    async def doc_op(self, event):
+        metrics.observe_fanout(self.room_name, event.get("sent_at"))
+
+        payload = {k: v for k, v in event.items() if k not in ("type", "sent_at", "origin")}
+        payload["type"] = "op"
+        payload["is_me"] = event.get("origin") == self.channel_name
+        await self.send(text_data=json.dumps(payload))
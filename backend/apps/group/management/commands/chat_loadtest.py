@@ -0,0 +1,113 @@
+# apps/group/management/commands/chat_loadtest.py
+import asyncio
+import json
+import time
+import uuid
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.group import buffer as write_buffer
+from apps.group.models import Group, GroupMember, GroupMessage
+from apps.group.routing import websocket_urlpatterns
+
+
+class Command(BaseCommand):
+    help = "그룹 채팅 소켓에 메시지를 몰아 보내고 초당 저장 건수를 잽니다 (write-through vs 버퍼)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("group_id", type=int)
+        parser.add_argument("--clients", type=int, default=10, help="동시 접속 소켓 수")
+        parser.add_argument("--messages", type=int, default=100, help="소켓당 보낼 메시지 수")
+        parser.add_argument(
+            "--flush-ms",
+            type=int,
+            action="append",
+            dest="flush_ms",
+            help="버퍼 flush 간격(ms). 0 이면 메시지마다 저장. 여러 번 지정하면 차례로 비교 (기본: 0, 50)",
+        )
+        parser.add_argument("--keep", action="store_true", help="테스트로 만든 메시지를 지우지 않음")
+        parser.add_argument("--timeout", type=float, default=60.0, help="전부 저장될 때까지 기다리는 최대 시간(초)")
+
+    def handle(self, group_id, clients=10, messages=100, flush_ms=None, keep=False, timeout=60.0, **options):
+        group = Group.objects.filter(pk=group_id).first()
+        if group is None:
+            raise CommandError(f"group {group_id} not found")
+
+        user_ids = list(GroupMember.objects.filter(group=group).values_list("user_id", flat=True))
+        users = list(get_user_model().objects.filter(pk__in=user_ids)) or list(
+            get_user_model().objects.filter(is_staff=True)[:1]
+        )
+        if not users:
+            raise CommandError("그룹 멤버(또는 staff 유저)가 최소 1명 있어야 합니다.")
+
+        for interval in flush_ms or [0, 50]:
+            # 이번 실행이 보낸 메시지만 세고 지우려고 내용 앞에 실행마다 다른 표식
+            # (테스트 중에 실제 사용자가 같은 방에 쓴 메시지는 건드리지 않음)
+            marker = f"[loadtest {uuid.uuid4().hex[:12]}]"
+            mine = GroupMessage.objects.filter(
+                group=group, user__in=users, content__startswith=marker
+            )
+            try:
+                elapsed, timed_out = self._run(group.id, users, clients, messages, interval, marker, mine, timeout)
+            finally:
+                saved = mine.count()
+                if not keep:
+                    mine.delete()
+            total = clients * messages
+            mode = "write-through" if interval == 0 else f"buffer {interval}ms"
+            if timed_out:
+                self.stdout.write(f"{mode:>16}: {timeout:.0f}s 안에 다 저장되지 않음 (저장 {saved}/{total})")
+                continue
+            self.stdout.write(
+                f"{mode:>16}: {total} msgs in {elapsed:.2f}s -> {total / elapsed:,.0f} msg/s (저장 {saved}/{total})"
+            )
+
+    def _run(self, group_id, users, clients, messages, interval, marker, mine, timeout):
+        previous = write_buffer.FLUSH_INTERVAL_MS
+        write_buffer.FLUSH_INTERVAL_MS = interval
+        channel_layers.backends.clear()
+        try:
+            return async_to_sync(self._blast)(group_id, users, clients, messages, marker, mine, timeout)
+        finally:
+            write_buffer.FLUSH_INTERVAL_MS = previous
+
+    async def _blast(self, group_id, users, clients, messages, marker, mine, timeout):
+        app = URLRouter(websocket_urlpatterns)
+        comms = []
+        for i in range(clients):
+            comm = WebsocketCommunicator(app, f"/ws/group/{group_id}/")
+            comm.scope["user"] = users[i % len(users)]
+            connected, _ = await comm.connect()
+            if not connected:
+                raise CommandError("소켓 연결 실패 (멤버 권한 확인)")
+            await comm.receive_from()  # history
+            comms.append(comm)
+
+        expected = clients * messages
+        count = sync_to_async(mine.count)
+
+        async def send_all(comm):
+            for n in range(messages):
+                await comm.send_to(text_data=json.dumps({"message": f"{marker} {n}"}))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send_all(c) for c in comms))
+
+        # 전부 DB 에 들어갈 때까지 (버퍼 모드는 flush 타이머/배치로 저장됨). 빠진 게 있으면 timeout 에서 포기
+        deadline = started + timeout
+        timed_out = False
+        while await count() < expected:
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - started
+
+        for comm in comms:
+            await comm.disconnect()
+        return elapsed, timed_out
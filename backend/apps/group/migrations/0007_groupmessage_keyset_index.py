@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0006_merge_20251208_2231'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupmessage',
+            index=models.Index(fields=['group', 'created_at', 'id'], name='group_msg_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0008_document_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='document',
+            options={'ordering': ['order_index', 'id']},
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='order_index',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['group', 'parent', 'order_index'], name='group_doc_order_idx'),
+        ),
+    ]
@@ -25,6 +25,7 @@ class GroupFile(models.Model):
     group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="files")
     uploader = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True) # models.SET_NULL - 사용자 삭제되어도 파일 날라가지 않음
     file = models.FileField(upload_to="resources/group")
+    filename = models.CharField(max_length=255, blank=True, default="")  # 올린 사람이 보낸 파일이름 (file 은 공유 blob 일 수 있음)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -41,6 +42,10 @@ class GroupMessage(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # 채팅 keyset 페이지네이션용
+            models.Index(fields=["group", "created_at", "id"], name="group_msg_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.group}] {self.user}: {self.content[:20]}"
@@ -61,11 +66,16 @@ class Document(models.Model):
 
     content = models.TextField(blank=True)
     file = models.FileField(upload_to="resources/team/document_files/", null=True, blank=True)
-    order_index = models.PositiveIntegerField(default=0)
+    # 실수 순서값 (사이에 끼우면 중간값) -> apps/group/ordering.py
+    order_index = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # 사이드바 ETag 용
 
     class Meta:
-        ordering = ["order_index"]
+        ordering = ["order_index", "id"]
+        indexes = [
+            models.Index(fields=["group", "parent", "order_index"], name="group_doc_order_idx"),
+        ]
 
     def __str__(self):
         return f"{self.block_type}: {self.content[:30] if self.content else '(no content)'}"
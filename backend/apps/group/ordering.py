@@ -0,0 +1,168 @@
+# apps/group/ordering.py
+"""
+그룹 문서(폴더/페이지/블록) 순서
+
+order_index 는 실수(fractional) 값
+- 맨 뒤에 추가: 마지막 형제 + STEP (Max 집계/락 없음)
+- 사이에 끼우기/이동: 앞뒤 형제 값의 중간 -> 그 행 하나만 UPDATE
+- 중간값이 더 안 나오면(간격 소진) 그 형제들만 STEP 간격으로 다시 매김 (bulk_update 1번)
+
+동시에 두 명이 맨 뒤에 추가해서 값이 같아지면 id 순으로 정렬됨
+(같은 값 사이에 끼워 넣을 때는 rebalance 후 다시 계산)
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Document
+from .services import invalidate_documents
+
+STEP = 1024.0
+KEEP_PARENT = object()
+
+# 종류별로 올 수 있는 부모 종류 (None = 최상위). PageListCreateView / DocumentBlockCreateView 와 같은 규칙
+PARENT_TYPES = {"folder": (None,), "page": (None, "folder")}
+BLOCK_PARENT_TYPES = ("page",)
+
+
+def siblings(group_id, parent_id, block_type=None):
+    qs = Document.objects.filter(group_id=group_id, parent_id=parent_id)
+    if block_type:
+        qs = qs.filter(block_type=block_type)
+    return qs
+
+
+def append_position(group_id, parent_id, block_type=None):
+    """맨 뒤 위치 (인덱스 타는 ORDER BY ... LIMIT 1 한 번)"""
+    last = (
+        siblings(group_id, parent_id, block_type)
+        .order_by("-order_index")
+        .values_list("order_index", flat=True)
+        .first()
+    )
+    return (last or 0) + STEP
+
+
+def position_between(before, after):
+    """
+    before < x < after 인 값. 둘 다 None 이면 STEP
+    간격이 너무 좁으면 None (rebalance 필요)
+    """
+    if before is None and after is None:
+        return STEP
+    if before is None:
+        return after - STEP
+    if after is None:
+        return before + STEP
+
+    mid = (before + after) / 2
+    if not (before < mid < after):
+        return None
+    return mid
+
+
+def rebalance(group_id, parent_id, block_type=None):
+    """형제들 순서 그대로 STEP 간격으로 다시 매김 (bulk_update)"""
+    docs = list(siblings(group_id, parent_id, block_type).order_by("order_index", "id"))
+    now = timezone.now()
+    for i, doc in enumerate(docs, start=1):
+        doc.order_index = i * STEP
+        doc.updated_at = now
+    Document.objects.bulk_update(docs, ["order_index", "updated_at"])
+    invalidate_documents(group_id)
+    return {doc.id: doc.order_index for doc in docs}
+
+
+def check_parent(group_id, block_types, parent):
+    """
+    parent(None / "root" / id) 가 같은 그룹 안에서 block_types 전부의 부모가 될 수 있는지 확인하고
+    parent id (최상위면 None) 를 돌려줌. 안 되면 ValueError
+    """
+    if parent in (None, "", "root"):
+        parent_type = None
+        parent_id = None
+    else:
+        try:
+            parent_id = int(parent)
+        except (TypeError, ValueError):
+            raise ValueError("parent 가 올바르지 않습니다.")
+        parent_type = (
+            Document.objects.filter(id=parent_id, group_id=group_id).values_list("block_type", flat=True).first()
+        )
+        if parent_type is None:
+            raise ValueError("parent 를 이 그룹에서 찾을 수 없습니다.")
+
+    for block_type in block_types:
+        if parent_type not in PARENT_TYPES.get(block_type, BLOCK_PARENT_TYPES):
+            raise ValueError(f"{block_type} 는 {parent_type or 'root'} 아래로 옮길 수 없습니다.")
+    return parent_id
+
+
+def move_document(doc, parent_id, before_id=None, after_id=None):
+    """
+    doc 을 parent 아래 after_id 다음 / before_id 앞으로 이동
+    (after_id = 바로 앞 형제, before_id = 바로 뒤 형제. 둘 다 없으면 맨 뒤)
+    after_id / before_id 가 그 부모 아래 형제가 아니면 ValueError (parent 검증은 check_parent)
+    """
+    block_type = doc.block_type if doc.block_type in ("folder", "page") else None
+
+    with transaction.atomic():
+        if before_id is None and after_id is None:
+            doc.order_index = append_position(doc.group_id, parent_id, block_type)
+        else:
+            wanted = [i for i in (after_id, before_id) if i is not None]
+            neighbours = dict(
+                siblings(doc.group_id, parent_id, block_type)
+                .filter(id__in=wanted)
+                .exclude(id=doc.id)
+                .values_list("id", "order_index")
+            )
+            if len(neighbours) != len(set(wanted)):
+                raise ValueError("after_id / before_id 는 같은 부모 아래의 형제여야 합니다.")
+            position = position_between(neighbours.get(after_id), neighbours.get(before_id))
+            if position is None:
+                neighbours = rebalance(doc.group_id, parent_id, block_type)
+                position = position_between(neighbours.get(after_id), neighbours.get(before_id))
+            if position is None:
+                # 앞/뒤가 뒤바뀐 요청 같은 경우 -> 그냥 맨 뒤로
+                position = append_position(doc.group_id, parent_id, block_type)
+            doc.order_index = position
+
+        doc.parent_id = parent_id
+        doc.save(update_fields=["order_index", "parent", "updated_at"])
+    return doc
+
+
+def apply_orders(group_id, orders, parent=KEEP_PARENT):
+    """
+    예전 방식 일괄 정렬: [{"id": 1, "order_index": 1}, ...] 를 bulk_update 한 번으로
+    parent 를 넘기면(None 포함) 전부 그 부모로 옮김
+    """
+    by_id = {}
+    for item in orders:
+        if not isinstance(item, dict):
+            continue
+        try:
+            by_id[int(item["id"])] = item
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    docs = list(Document.objects.filter(id__in=list(by_id), group_id=group_id))
+    now = timezone.now()
+    fields = {"updated_at"}
+    for doc in docs:
+        item = by_id[doc.id]
+        try:
+            doc.order_index = float(item["order_index"])
+            fields.add("order_index")
+        except (KeyError, TypeError, ValueError):
+            pass
+        if parent is not KEEP_PARENT:
+            doc.parent_id = parent
+            fields.add("parent")
+        doc.updated_at = now
+
+    if docs and len(fields) > 1:
+        Document.objects.bulk_update(docs, sorted(fields))
+        # bulk_update 는 시그널이 안 나가서 직접 무효화
+        invalidate_documents(group_id)
+    return len(docs)
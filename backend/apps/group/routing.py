@@ -4,4 +4,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     path("ws/group/<int:group_id>/", consumers.GroupChatConsumer.as_asgi()),
+    path("ws/group/<int:group_id>/pages/<int:page_id>/", consumers.DocumentEditConsumer.as_asgi()),
 ]
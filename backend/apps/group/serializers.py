@@ -1,5 +1,8 @@
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Group, GroupMember, Document, GroupFile
+
+from myproject.files import display_name, protected_file_url
+from .models import Group, GroupMember, Document, GroupFile, GroupMessage
 
 class GroupSerializer(serializers.ModelSerializer):
     class Meta:
@@ -28,13 +31,10 @@ class GroupFileSerializer(serializers.ModelSerializer):
         fields = ["id", "filename", "file_url", "uploader_name", "created_at"]
 
     def get_filename(self, obj):
-        return obj.file.name.split("/")[-1]
+        return display_name(obj.file)
 
     def get_file_url(self, obj):
-        request = self.context.get("request")
-        if request:
-            return request.build_absolute_uri(obj.file.url)
-        return obj.file.url
+        return protected_file_url(self.context.get("request"), "group-file", obj.id, obj.file)
 
 class DocumentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -51,3 +51,32 @@ class DocumentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "group", "created_at"]
 
+
+
+class GroupMessageSerializer(serializers.ModelSerializer):
+    """
+    채팅 메시지 (REST 히스토리 / 웹소켓 공통 포맷)
+    {id, sender, text, time, is_me}
+    """
+    sender = serializers.CharField(source="user.username", read_only=True)
+    text = serializers.CharField(source="content", read_only=True)
+    time = serializers.SerializerMethodField()
+    is_me = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GroupMessage
+        fields = ["id", "sender", "text", "time", "is_me"]
+
+    def get_time(self, obj):
+        return timezone.localtime(obj.created_at).strftime("%H:%M")
+
+    def get_is_me(self, obj):
+        user_id = self.context.get("user_id")
+        return user_id is not None and obj.user_id == user_id
+
+
+def serialize_message_page(page, user_id=None):
+    return {
+        "results": GroupMessageSerializer(page.messages, many=True, context={"user_id": user_id}).data,
+        "has_more": page.has_more,
+    }
@@ -0,0 +1,236 @@
+# apps/group/services.py
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+
+from .models import Document, GroupMessage
+
+CHAT_PAGE_SIZE = getattr(settings, "GROUP_CHAT_PAGE_SIZE", 50)
+CHAT_MAX_PAGE_SIZE = getattr(settings, "GROUP_CHAT_MAX_PAGE_SIZE", 200)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class MessagePage:
+    messages: list = field(default_factory=list)  # 항상 오래된 -> 최신 순
+    has_more: bool = False  # 요청 방향으로 더 남았는지
+
+
+def clamp_limit(raw, default=None):
+    default = default or CHAT_PAGE_SIZE
+    try:
+        limit = int(raw) if raw not in (None, "") else default
+    except (TypeError, ValueError):
+        raise InvalidCursor("limit must be an integer")
+    return max(1, min(limit, CHAT_MAX_PAGE_SIZE))
+
+
+def _parse_id(raw, name):
+    if raw in (None, ""):
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise InvalidCursor(f"{name} must be an integer")
+
+
+def fetch_group_messages(group_id, before_id=None, after_id=None, limit=None):
+    """
+    그룹 채팅 keyset 페이지네이션 ((group_id, created_at, id) 인덱스 사용)
+    - 아무것도 없으면: 최신 limit 개
+    - before_id: 그 메시지보다 이전 limit 개 (위로 스크롤)
+    - after_id: 그 메시지 이후 limit 개 (재연결 후 따라잡기)
+    """
+    limit = clamp_limit(limit)
+    before_id = _parse_id(before_id, "before_id")
+    after_id = _parse_id(after_id, "after_id")
+
+    qs = GroupMessage.objects.filter(group_id=group_id).select_related("user")
+
+    anchor_id = after_id if after_id is not None else before_id
+    if anchor_id is not None:
+        anchor = (
+            GroupMessage.objects
+            .filter(group_id=group_id, pk=anchor_id)
+            .values_list("created_at", flat=True)
+            .first()
+        )
+        if anchor is None:
+            raise InvalidCursor("unknown message id")
+
+    if after_id is not None:
+        qs = qs.filter(
+            Q(created_at__gt=anchor) | Q(created_at=anchor, id__gt=after_id)
+        ).order_by("created_at", "id")
+        rows = list(qs[:limit + 1])
+        return MessagePage(messages=rows[:limit], has_more=len(rows) > limit)
+
+    if before_id is not None:
+        qs = qs.filter(Q(created_at__lt=anchor) | Q(created_at=anchor, id__lt=before_id))
+
+    rows = list(qs.order_by("-created_at", "-id")[:limit + 1])
+    page = rows[:limit]
+    page.reverse()
+    return MessagePage(messages=page, has_more=len(rows) > limit)
+
+
+# ---------------------------------------------------------------------------
+# 문서(페이지) 트리
+# ---------------------------------------------------------------------------
+
+PAGE_TREE_TTL = getattr(settings, "GROUP_PAGE_TREE_CACHE_TTL", 300)
+
+
+def _doc_version_key(group_id):
+    return f"group:docs:version:{group_id}"
+
+
+def get_document_version(group_id):
+    """그룹 문서가 바뀔 때마다 올라가는 버전 (캐시 키에 섞어서 씀)"""
+    version = cache.get(_doc_version_key(group_id))
+    if version is None:
+        cache.add(_doc_version_key(group_id), 1, timeout=None)
+        version = cache.get(_doc_version_key(group_id), 1)
+    return version
+
+
+def invalidate_documents(group_id):
+    """그룹 문서 생성/수정/삭제/재정렬 시 호출 -> 이 그룹 트리 캐시 전부 무효"""
+    try:
+        cache.incr(_doc_version_key(group_id))
+    except ValueError:
+        cache.set(_doc_version_key(group_id), 2, timeout=None)
+
+
+def _serialize_node(doc):
+    return {
+        "id": doc.id,
+        "block_type": doc.block_type,
+        "content": doc.content,
+        "file": doc.file.url if doc.file else None,
+        "order_index": doc.order_index,
+        "children": [],
+    }
+
+
+def build_page_tree(group_id, page_id):
+    """
+    페이지 하나의 블록 트리를 쿼리 한 번으로
+    - 그룹 문서를 한 번에 가져와서 parent 기준으로 묶고 O(n) 으로 조립
+    - 페이지가 없으면 None
+    """
+    docs = list(
+        Document.objects
+        .filter(group_id=group_id)
+        .only("id", "parent_id", "block_type", "content", "file", "order_index")
+        .order_by("order_index", "id")
+    )
+
+    nodes = {}
+    root = None
+    for doc in docs:
+        nodes[doc.id] = _serialize_node(doc)
+        if doc.id == page_id and doc.block_type == "page":
+            root = nodes[doc.id]
+    if root is None:
+        return None
+
+    # order_index 순으로 이미 정렬돼 있으니 붙이는 순서 = 자식 순서
+    for doc in docs:
+        if doc.parent_id is not None and doc.parent_id in nodes:
+            nodes[doc.parent_id]["children"].append(nodes[doc.id])
+    return root
+
+
+def get_page_tree(group_id, page_id):
+    key = f"group:page_tree:{group_id}:{page_id}:v{get_document_version(group_id)}"
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_page_tree(group_id, page_id)
+        if tree is not None:
+            cache.set(key, tree, timeout=PAGE_TREE_TTL)
+    return tree
+
+
+# ---------------------------------------------------------------------------
+# 사이드바 (폴더/페이지 목록)
+# ---------------------------------------------------------------------------
+
+SIDEBAR_TYPES = ("folder", "page")
+
+
+def sidebar_etag(group_id):
+    """
+    폴더/페이지 중 가장 최근 수정 시각 + 개수로 ETag 만듦 (집계 쿼리 1번)
+    - 개수는 삭제만 일어난 경우(최대 수정 시각 그대로)를 잡으려고
+    """
+    agg = Document.objects.filter(group_id=group_id, block_type__in=SIDEBAR_TYPES).aggregate(
+        last=Max("updated_at"),
+        n=Count("id"),
+    )
+    last = agg["last"].timestamp() if agg["last"] else 0
+    return f'W/"sidebar-{group_id}-{agg["n"]}-{last:.6f}"'
+
+
+def _sidebar_item(doc):
+    return {
+        "id": doc.id,
+        "title": doc.content or f"Page {doc.id}",
+        "order_index": doc.order_index,
+    }
+
+
+def build_sidebar(group_id):
+    """
+    폴더 -> 페이지 사이드바를 쿼리 한 번으로
+    - 루트 폴더마다 바로 아래 페이지들, 폴더 없는 루트 페이지는 "root" 버킷
+    """
+    docs = (
+        Document.objects
+        .filter(group_id=group_id, block_type__in=SIDEBAR_TYPES)
+        .only("id", "parent_id", "block_type", "content", "order_index", "created_at")
+        .order_by("order_index", "created_at")
+    )
+
+    folders = []
+    folder_items = {}
+    root_pages = []
+    pages = []
+    for doc in docs:
+        if doc.block_type == "folder":
+            if doc.parent_id is None:
+                folders.append(doc)
+                folder_items[doc.id] = []
+        else:
+            pages.append(doc)
+
+    for doc in pages:
+        if doc.parent_id is None:
+            root_pages.append(_sidebar_item(doc))
+        elif doc.parent_id in folder_items:
+            folder_items[doc.parent_id].append(_sidebar_item(doc))
+
+    data = [
+        {
+            "id": f.id,
+            "name": f.content or "폴더",
+            "order_index": f.order_index,
+            "items": folder_items[f.id],
+        }
+        for f in folders
+    ]
+
+    # 고아 페이지는 루트 버킷으로 반환
+    if root_pages:
+        data.append({
+            "id": "root",
+            "name": "페이지",
+            "order_index": 0,
+            "items": root_pages,
+        })
+    return data
@@ -0,0 +1,14 @@
+# apps/group/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Document
+from .services import invalidate_documents
+
+
+@receiver(post_save, sender=Document)
+@receiver(post_delete, sender=Document)
+def document_changed(sender, instance, **kwargs):
+    # 블록/페이지 생성, 수정, 삭제 -> 그룹 페이지 트리 캐시 무효화
+    # (bulk_update 같은 건 시그널이 안 나가니 호출한 쪽에서 invalidate_documents 직접 호출)
+    invalidate_documents(instance.group_id)
@@ -1,3 +1,836 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.learning.models import Course
+from myproject import files
+from myproject.ws_metrics import metrics
+
+from . import buffer as write_buffer
+from . import collab
+from .models import Document, Group, GroupFile, GroupMember, GroupMessage
+from .ordering import STEP, move_document
+from .routing import websocket_urlpatterns
+
+try:
+    import channels_redis  # noqa: F401
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class GroupChatHistoryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1", password="pw")
+        self.other = User.objects.create_user(username="u2", password="pw")
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        GroupMember.objects.create(group=self.group, user=self.user)
+        self.ids = [
+            GroupMessage.objects.create(
+                group=self.group,
+                user=self.user if i % 2 else self.other,
+                content=f"m{i}",
+            ).id
+            for i in range(7)
+        ]
+        self.url = f"/api/group/{self.group.id}/messages_load/"
+        self.client.force_login(self.user)
+
+    def test_latest_page_then_before_id(self):
+        data = self.client.get(self.url, {"limit": 3}).json()
+        self.assertEqual([m["id"] for m in data["results"]], self.ids[-3:])
+        self.assertTrue(data["has_more"])
+        self.assertEqual(set(data["results"][0]), {"id", "sender", "text", "time", "is_me"})
+
+        oldest = data["results"][0]["id"]
+        data = self.client.get(self.url, {"limit": 3, "before_id": oldest}).json()
+        self.assertEqual([m["id"] for m in data["results"]], self.ids[1:4])
+
+        data = self.client.get(self.url, {"limit": 3, "before_id": self.ids[1]}).json()
+        self.assertEqual([m["id"] for m in data["results"]], self.ids[:1])
+        self.assertFalse(data["has_more"])
+
+    def test_after_id_and_bad_cursor(self):
+        data = self.client.get(self.url, {"after_id": self.ids[4]}).json()
+        self.assertEqual([m["id"] for m in data["results"]], self.ids[5:])
+        self.assertFalse(data["has_more"])
+
+        res = self.client.get(self.url, {"before_id": "abc"})
+        self.assertEqual(res.status_code, 400)
+
+    def test_consumer_replays_recent_messages(self):
+        async def run():
+            app = URLRouter(websocket_urlpatterns)
+            comm = WebsocketCommunicator(app, f"/ws/group/{self.group.id}/?after_id={self.ids[4]}")
+            comm.scope["user"] = self.user
+            connected, _ = await comm.connect()
+            self.assertTrue(connected)
+            frame = json.loads(await comm.receive_from())
+            await comm.disconnect()
+            return frame
+
+        frame = async_to_sync(run)()
+        self.assertEqual(frame["type"], "history")
+        self.assertEqual([m["id"] for m in frame["results"]], self.ids[5:])
+        self.assertEqual([m["is_me"] for m in frame["results"]], [True, False])
+
+    def test_consumer_rejects_anonymous_and_non_members(self):
+        outsider = User.objects.create_user(username="u3", password="pw")
+
+        async def try_connect(user):
+            comm = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/group/{self.group.id}/")
+            comm.scope["user"] = user
+            connected, code = await comm.connect()
+            await comm.disconnect()
+            return connected
+
+        self.assertFalse(async_to_sync(try_connect)(AnonymousUser()))
+        self.assertFalse(async_to_sync(try_connect)(outsider))
+        self.assertTrue(async_to_sync(try_connect)(self.user))
+
+    def test_buffered_messages_flush_on_disconnect(self):
+        GroupMember.objects.create(group=self.group, user=self.other)
+        before = GroupMessage.objects.count()
+
+        async def run():
+            app = URLRouter(websocket_urlpatterns)
+            sender = WebsocketCommunicator(app, f"/ws/group/{self.group.id}/")
+            sender.scope["user"] = self.user
+            watcher = WebsocketCommunicator(app, f"/ws/group/{self.group.id}/")
+            watcher.scope["user"] = self.other
+            for comm in (sender, watcher):
+                await comm.connect()
+                await comm.receive_from()  # history
+
+            for n in range(5):
+                await sender.send_to(text_data=json.dumps({"message": f"b{n}"}))
+            broadcast = [json.loads(await watcher.receive_from()) for _ in range(5)]
+            saved_before_disconnect = await GroupMessage.objects.acount()
+
+            # 보낸 사람이 나가면 그 방 버퍼가 저장되고 남은 사람한테 실제 id 가 감
+            await sender.disconnect()
+            ack = json.loads(await watcher.receive_from())
+            await watcher.disconnect()
+            return broadcast, saved_before_disconnect, ack
+
+        previous = write_buffer.FLUSH_INTERVAL_MS
+        write_buffer.FLUSH_INTERVAL_MS = 60 * 1000  # 타이머로는 안 나가게
+        try:
+            broadcast, saved_before_disconnect, ack = async_to_sync(run)()
+        finally:
+            write_buffer.FLUSH_INTERVAL_MS = previous
+
+        self.assertTrue(all(str(m["id"]).startswith("tmp-") for m in broadcast))
+        self.assertEqual(saved_before_disconnect, before)
+
+        self.assertEqual(ack["type"], "chat_message_saved")
+        self.assertEqual([t for t, _ in ack["ids"]], [m["id"] for m in broadcast])
+        real_ids = [pk for _, pk in ack["ids"]]
+        self.assertEqual(
+            list(GroupMessage.objects.filter(pk__in=real_ids).order_by("id").values_list("content", flat=True)),
+            [f"b{n}" for n in range(5)],
+        )
+
+    def test_lifespan_shutdown_flushes_buffers(self):
+        from channels.layers import get_channel_layer
+
+        async def run():
+            buffer = write_buffer.acquire(self.group.id, f"group_{self.group.id}", get_channel_layer())
+            buffer.interval = 60  # 타이머로는 안 나가게
+            for n in range(3):
+                buffer.add(GroupMessage(group_id=self.group.id, user=self.user, content=f"s{n}"), f"tmp-{n}")
+
+            events = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+            sent = []
+
+            async def receive():
+                return events.pop(0)
+
+            async def send(message):
+                sent.append(message["type"])
+
+            await write_buffer.lifespan({"type": "lifespan"}, receive, send)
+            buffer.refs -= 1
+            write_buffer._buffers.pop(self.group.id, None)
+            return sent
+
+        sent = async_to_sync(run)()
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        self.assertEqual(
+            list(GroupMessage.objects.filter(group=self.group, content__startswith="s").values_list("content", flat=True)),
+            ["s0", "s1", "s2"],
+        )
+
+    def test_loadtest_removes_only_its_own_messages(self):
+        real = GroupMessage.objects.create(group=self.group, user=self.user, content="진짜 메시지")
+        before = set(GroupMessage.objects.filter(group=self.group).values_list("id", flat=True))
+        out = StringIO()
+        call_command(
+            "chat_loadtest", str(self.group.id), "--clients", "2", "--messages", "3", "--flush-ms", "0",
+            stdout=out,
+        )
+        self.assertIn("저장 6/6", out.getvalue())
+        after = set(GroupMessage.objects.filter(group=self.group).values_list("id", flat=True))
+        self.assertEqual(after, before)
+        self.assertIn(real.id, after)
+
+
+class PageTreeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="u1", password="pw")
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        self.page = Document.objects.create(group=self.group, block_type="page", content="P")
+        self.url = f"/api/group/groups/{self.group.id}/pages/{self.page.id}/"
+        self.client.force_login(self.user)
+
+    def _add_blocks(self, n):
+        for i in range(n):
+            toggle = Document.objects.create(
+                group=self.group, parent=self.page, block_type="toggle", order_index=i
+            )
+            Document.objects.create(group=self.group, parent=toggle, block_type="text", content=f"t{i}")
+
+    def test_tree_is_one_query_and_ordered(self):
+        self._add_blocks(30)
+        Document.objects.filter(parent=self.page, order_index=0).update(order_index=99)
+
+        # 세션 + 유저 2개 + 문서 1개
+        with self.assertNumQueries(3):
+            data = self.client.get(self.url).json()
+
+        self.assertEqual(len(data["children"]), 30)
+        self.assertEqual(data["children"][-1]["children"][0]["content"], "t0")
+
+    def test_cache_invalidated_on_block_create(self):
+        self._add_blocks(2)
+        self.client.get(self.url)
+        with self.assertNumQueries(2):  # 세션/유저만, 트리는 캐시에서
+            self.client.get(self.url)
+
+        res = self.client.post(
+            f"/api/group/{self.group.id}/pages/{self.page.id}/blocks/",
+            {"block_type": "text", "content": "new"},
+        )
+        self.assertEqual(res.status_code, 201)
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["children"][-1]["content"], "new")
+
+    def test_missing_page(self):
+        res = self.client.get(f"/api/group/groups/{self.group.id}/pages/999/")
+        self.assertEqual(res.status_code, 404)
+
+
+class SidebarTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1", password="pw")
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        self.url = f"/api/group/{self.group.id}/pages/"
+        self.client.force_login(self.user)
+
+    def test_sidebar_shape_and_query_count(self):
+        for i in range(5):
+            folder = Document.objects.create(
+                group=self.group, block_type="folder", content=f"F{i}", order_index=i
+            )
+            for j in range(3):
+                Document.objects.create(
+                    group=self.group, parent=folder, block_type="page", content=f"P{i}{j}", order_index=j
+                )
+        Document.objects.create(group=self.group, block_type="page", content="loose")
+
+        # 세션/유저 2개 + ETag 집계 1개 + 사이드바 1개
+        with self.assertNumQueries(4):
+            data = self.client.get(self.url).json()
+
+        self.assertEqual([f["name"] for f in data], ["F0", "F1", "F2", "F3", "F4", "페이지"])
+        self.assertEqual([p["title"] for p in data[0]["items"]], ["P00", "P01", "P02"])
+        self.assertEqual(data[-1]["id"], "root")
+
+    def test_etag_304_and_changes(self):
+        folder = Document.objects.create(group=self.group, block_type="folder", content="F")
+        page = Document.objects.create(group=self.group, parent=folder, block_type="page", content="P")
+
+        etag = self.client.get(self.url)["ETag"]
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        # 페이지 이동(reorder) -> ETag 바뀜
+        self.client.post(
+            f"/api/group/{self.group.id}/pages/reorder/",
+            {"parent": "root", "orders": [{"id": page.id, "order_index": 1}]},
+            content_type="application/json",
+        )
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+        # 삭제만 해도 바뀜
+        etag = res["ETag"]
+        page.delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class DocumentOrderingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1", password="pw")
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        self.page = Document.objects.create(group=self.group, block_type="page", content="P")
+        self.client.force_login(self.user)
+
+    def _blocks(self, n):
+        url = f"/api/group/{self.group.id}/pages/{self.page.id}/blocks/"
+        return [self.client.post(url, {"content": f"b{i}"}).json()["id"] for i in range(n)]
+
+    def _order(self):
+        return list(Document.objects.filter(parent=self.page).values_list("id", flat=True))
+
+    def test_append_and_move_between(self):
+        a, b, c = self._blocks(3)
+        self.assertEqual(self._order(), [a, b, c])
+
+        doc = Document.objects.get(pk=c)
+        with CaptureQueriesContext(connection) as ctx:
+            move_document(doc, self.page.id, after_id=a, before_id=b)
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual(self._order(), [a, c, b])
+        self.assertEqual(Document.objects.get(pk=c).order_index, 1.5 * STEP)
+
+    def test_rebalance_when_gap_runs_out(self):
+        a, b = self._blocks(2)
+        inserted = []
+        # 항상 a 바로 뒤에 끼워 넣어서 간격을 반씩 줄임 -> 어느 순간 rebalance
+        for _ in range(60):
+            (x,) = self._blocks(1)
+            move_document(Document.objects.get(pk=x), self.page.id, after_id=a, before_id=inserted[-1] if inserted else b)
+            inserted.append(x)
+
+        self.assertEqual(self._order(), [a] + inserted[::-1] + [b])
+        values = list(Document.objects.filter(parent=self.page).values_list("order_index", flat=True))
+        self.assertEqual(len(set(values)), len(values))
+
+    def test_bulk_reorder_and_single_move_api(self):
+        a, b, c = self._blocks(3)
+        url = f"/api/group/{self.group.id}/pages/reorder/"
+
+        res = self.client.post(
+            url,
+            {"parent": self.page.id, "orders": [{"id": a, "order_index": 3}, {"id": b, "order_index": 1}, {"id": c, "order_index": 2}]},
+            content_type="application/json",
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self._order(), [b, c, a])
+
+        res = self.client.post(url, {"id": a, "parent": self.page.id, "before_id": b}, content_type="application/json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self._order(), [a, b, c])
+
+    def test_single_move_rejects_bad_parent_and_non_siblings(self):
+        a, b = self._blocks(2)
+        url = f"/api/group/{self.group.id}/pages/reorder/"
+        other_group = Group.objects.create(name="H", course=self.group.course)
+        foreign_page = Document.objects.create(group=other_group, block_type="page", content="X")
+        folder = Document.objects.create(group=self.group, block_type="folder", content="F")
+        other_page = Document.objects.create(group=self.group, block_type="page", content="Q")
+        stranger = Document.objects.create(group=self.group, parent=other_page, block_type="text", content="z").id
+
+        bad = [
+            {"id": a, "parent": foreign_page.id},  # 다른 그룹
+            {"id": a, "parent": 999999},  # 없는 id
+            {"id": a, "parent": folder.id},  # 블록은 페이지 아래만
+            {"id": self.page.id, "parent": other_page.id},  # 페이지는 폴더/최상위만
+            {"id": folder.id, "parent": folder.id},
+            {"id": a, "parent": self.page.id, "after_id": stranger},  # 형제가 아님
+            {"id": a, "parent": self.page.id, "before_id": "x"},
+        ]
+        for body in bad:
+            res = self.client.post(url, body, content_type="application/json")
+            self.assertEqual(res.status_code, 400, body)
+        self.assertEqual(self._order(), [a, b])
+        self.assertEqual(Document.objects.get(pk=a).group_id, self.group.id)
+
+        res = self.client.post(url, {"id": self.page.id, "parent": folder.id}, content_type="application/json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(Document.objects.get(pk=self.page.id).parent_id, folder.id)
+
+        res = self.client.post(
+            url, {"parent": foreign_page.id, "orders": [{"id": a, "order_index": 1}]}, content_type="application/json"
+        )
+        self.assertEqual(res.status_code, 400)
+
+    def test_bulk_reorder_with_null_parent_keeps_parents(self):
+        a, b = self._blocks(2)
+        url = f"/api/group/{self.group.id}/pages/reorder/"
+        res = self.client.post(
+            url,
+            {"parent": None, "orders": [{"id": a, "order_index": 2}, {"id": b, "order_index": 1}]},
+            content_type="application/json",
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self._order(), [b, a])
+
+
+def _redis_url():
+    """CHANNEL_REDIS_URL 이 있으면 진짜 redis-server, 없으면 fakeredis TCP 서버"""
+    url = os.getenv("CHANNEL_REDIS_URL")
+    if url:
+        return url, None
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}/0", server
+
+
+@unittest.skipUnless(fakeredis or os.getenv("CHANNEL_REDIS_URL"), "channels_redis/fakeredis not installed")
+class RedisChannelLayerTest(TestCase):
+    """워커 두 개(채널 레이어 인스턴스 두 개)에 나뉜 소켓끼리 브로드캐스트 되는지"""
+
+    def setUp(self):
+        self.url, self.server = _redis_url()
+        self.user = User.objects.create_user(username="u1", password="pw")
+        self.other = User.objects.create_user(username="u2", password="pw")
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        GroupMember.objects.create(group=self.group, user=self.user)
+        GroupMember.objects.create(group=self.group, user=self.other)
+        metrics.reset()
+
+    def tearDown(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def _layers(self):
+        from channels.layers import channel_layers
+
+        config = {
+            "default": {
+                "BACKEND": "channels_redis.core.RedisChannelLayer",
+                "CONFIG": {"hosts": [self.url], "prefix": "test"},
+            },
+        }
+        return config, channel_layers
+
+    def test_broadcast_crosses_workers(self):
+        config, channel_layers = self._layers()
+
+        async def run():
+            app = URLRouter(websocket_urlpatterns)
+            path = f"/ws/group/{self.group.id}/"
+
+            worker_a = WebsocketCommunicator(app, path)
+            worker_a.scope["user"] = self.user
+            await worker_a.connect()
+            await worker_a.receive_from()  # history
+
+            # 다른 워커 흉내: 레이어 인스턴스를 새로 만들어서 두 번째 소켓 연결
+            channel_layers.backends.clear()
+            worker_b = WebsocketCommunicator(app, path)
+            worker_b.scope["user"] = self.other
+            await worker_b.connect()
+            await worker_b.receive_from()
+
+            await worker_b.send_to(text_data=json.dumps({"message": "hello"}))
+            got_a = json.loads(await worker_a.receive_from(timeout=5))
+            got_b = json.loads(await worker_b.receive_from(timeout=5))
+
+            await worker_a.disconnect()
+            await worker_b.disconnect()
+            for layer in list(channel_layers.backends.values()):
+                await layer.flush()
+            return got_a, got_b
+
+        with override_settings(CHANNEL_LAYERS=config):
+            channel_layers.backends.clear()
+            try:
+                got_a, got_b = async_to_sync(run)()
+            finally:
+                channel_layers.backends.clear()
+
+        self.assertEqual(got_a["text"], "hello")
+        self.assertFalse(got_a["is_me"])
+        self.assertTrue(got_b["is_me"])
+
+        room = metrics.snapshot()["rooms"][f"group_{self.group.id}"]
+        self.assertEqual(room["delivered"], 2)
+        self.assertEqual(room["peak_connections"], 2)
+        self.assertIsNotNone(room["fanout_p95_ms"])
+
+
+@unittest.skipUnless(fakeredis or os.getenv("CHANNEL_REDIS_URL"), "channels_redis/fakeredis not installed")
+class SharedCacheTest(TestCase):
+    """워커 두 개(캐시 인스턴스 두 개)가 같은 redis 캐시를 보면 한쪽 무효화가 다른 쪽 트리에도 보이는지"""
+
+    def setUp(self):
+        self.url, self.server = _redis_url()
+        user = User.objects.create_user(username="u1", password="pw")
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        GroupMember.objects.create(group=self.group, user=user)
+        self.page = Document.objects.create(group=self.group, block_type="page", content="P")
+
+    def tearDown(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def test_invalidation_crosses_workers(self):
+        from django.core.cache.backends.redis import RedisCache
+
+        from . import services
+
+        worker_a = RedisCache(self.url, {"KEY_PREFIX": "test-shared"})
+        worker_b = RedisCache(self.url, {"KEY_PREFIX": "test-shared"})
+        worker_a.clear()
+
+        with mock.patch.object(services, "cache", worker_a):
+            self.assertEqual(services.get_page_tree(self.group.id, self.page.id)["children"], [])
+
+        Document.objects.create(group=self.group, parent=self.page, block_type="text", content="new")
+        with mock.patch.object(services, "cache", worker_b):
+            services.invalidate_documents(self.group.id)
+
+        with mock.patch.object(services, "cache", worker_a):
+            tree = services.get_page_tree(self.group.id, self.page.id)
+        self.assertEqual([c["content"] for c in tree["children"]], ["new"])
+
+
+    def test_block_lock_release_only_removes_own_token(self):
+        from django.core.cache.backends.redis import RedisCache
+
+        worker_a = RedisCache(self.url, {"KEY_PREFIX": "test-lock"})
+        worker_b = RedisCache(self.url, {"KEY_PREFIX": "test-lock"})
+        worker_a.clear()
+
+        with mock.patch.object(collab, "cache", worker_a):
+            stale = collab._lock(7)
+        # a 의 락이 LOCK_TIMEOUT 으로 풀리고 b 가 잡음
+        worker_a.delete(collab._lock_key(7))
+        with mock.patch.object(collab, "cache", worker_b):
+            current = collab._lock(7)
+        self.assertNotEqual(stale, current)
+
+        with mock.patch.object(collab, "cache", worker_a):
+            collab._unlock(7, stale)  # 늦게 끝난 a -> b 의 락은 그대로
+            self.assertIsNone(collab._lock(7, wait=0))
+        with mock.patch.object(collab, "cache", worker_b):
+            collab._unlock(7, current)
+            self.assertIsNotNone(collab._lock(7, wait=0))
+
+
+class DocumentEditConsumerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(username=f"e{i}", password="pw") for i in range(10)]
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        for user in self.users:
+            GroupMember.objects.create(group=self.group, user=user)
+        self.page = Document.objects.create(group=self.group, block_type="page", content="P")
+        self.block = Document.objects.create(group=self.group, parent=self.page, block_type="text", content="hello")
+        self.path = f"/ws/group/{self.group.id}/pages/{self.page.id}/"
+
+    async def _connect(self, user):
+        comm = WebsocketCommunicator(URLRouter(websocket_urlpatterns), self.path)
+        comm.scope["user"] = user
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        snapshot = json.loads(await comm.receive_from())
+        return comm, snapshot
+
+    def _with_interval(self, ms, coro):
+        previous = collab.CHECKPOINT_MS
+        collab.CHECKPOINT_MS = ms
+        try:
+            return async_to_sync(coro)()
+        finally:
+            collab.CHECKPOINT_MS = previous
+
+    def test_transform_concurrent_inserts_and_deletes(self):
+        # "hello" 에서 둘 다 rev 0 기준: A 가 0 에 "A", B 가 5 에 "!"
+        self.assertEqual(collab.transform(5, 0, 0, 0, 1), (6, 0))
+        # 앞에서 2글자 지워졌으면 뒤쪽 위치가 당겨짐
+        self.assertEqual(collab.transform(4, 1, 0, 2, 0), (2, 1))
+        # 지우려던 범위가 이미 지워졌으면 지울 게 없음
+        self.assertEqual(collab.transform(1, 2, 0, 4, 0), (0, 0))
+
+    def test_concurrent_splices_converge_and_broadcast(self):
+        async def run():
+            a, snapshot = await self._connect(self.users[0])
+            b, _ = await self._connect(self.users[1])
+
+            await a.send_to(text_data=json.dumps(
+                {"op": "splice", "id": self.block.id, "rev": 0, "pos": 0, "delete": 0, "insert": "A", "client_op_id": "a1"}
+            ))
+            ops_a = [json.loads(await a.receive_from())]
+            # b 는 a 의 op 을 아직 반영 못 한 상태(rev 0 기준)에서 끝에 추가
+            await b.send_to(text_data=json.dumps(
+                {"op": "splice", "id": self.block.id, "rev": 0, "pos": 5, "delete": 0, "insert": "!"}
+            ))
+            ops_a.append(json.loads(await a.receive_from()))
+            ops_b = [json.loads(await b.receive_from()) for _ in range(2)]
+
+            await b.send_to(text_data=json.dumps({"op": "bogus", "id": self.block.id}))
+            resync = json.loads(await b.receive_from())
+
+            await a.disconnect()
+            await b.disconnect()
+            return snapshot, ops_a, ops_b, resync
+
+        snapshot, ops_a, ops_b, resync = self._with_interval(60 * 1000, run)
+
+        self.assertEqual([blk["id"] for blk in snapshot["blocks"]], [self.block.id])
+        self.assertEqual(snapshot["blocks"][0]["rev"], 0)
+
+        strip = lambda ops: [{k: v for k, v in op.items() if k != "is_me"} for op in ops]
+        self.assertEqual(strip(ops_a), strip(ops_b))
+        self.assertEqual([op["rev"] for op in ops_a], [1, 2])
+        self.assertEqual(ops_a[1]["pos"], 6)  # 앞에 "A" 가 들어가서 한 칸 밀림
+        self.assertEqual([op["is_me"] for op in ops_a], [True, False])
+        self.assertEqual([op["is_me"] for op in ops_b], [False, True])
+        self.assertEqual(ops_b[0]["client_op_id"], "a1")
+
+        self.assertEqual(resync["type"], "resync")
+        self.assertEqual(resync["block"]["content"], "Ahello!")
+
+        self.block.refresh_from_db()
+        self.assertEqual(self.block.content, "Ahello!")
+
+    def test_edits_are_checkpointed_in_batches(self):
+        other = Document.objects.create(group=self.group, parent=self.page, block_type="text", content="")
+
+        async def run():
+            editors = [await self._connect(user) for user in self.users]
+            comms = [comm for comm, _ in editors]
+            for n in range(5):
+                for i, comm in enumerate(comms):
+                    target = self.block.id if i % 2 else other.id
+                    await comm.send_to(text_data=json.dumps(
+                        {"op": "splice", "id": target, "pos": 10 ** 6, "delete": 0, "insert": str(i)}
+                    ))
+            for comm in comms:
+                for _ in range(50):
+                    await comm.receive_from()
+            for comm in comms:
+                await comm.disconnect()
+
+        with CaptureQueriesContext(connection) as ctx:
+            self._with_interval(60 * 1000, run)
+
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        # 편집 50번 -> 마지막에 bulk_update 한 번
+        self.assertEqual(len(updates), 1)
+
+        self.block.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(sorted(self.block.content), sorted("hello" + "13579" * 5))
+        self.assertEqual(sorted(other.content), sorted("02468" * 5))
+
+    def test_checkpoint_timer_saves_while_connected(self):
+        async def run():
+            comm, _ = await self._connect(self.users[0])
+            await comm.send_to(text_data=json.dumps({"op": "set", "id": self.block.id, "content": "new"}))
+            await comm.receive_from()
+            await asyncio.sleep(0.2)
+            saved = (await Document.objects.aget(pk=self.block.id)).content
+            await comm.disconnect()
+            return saved
+
+        self.assertEqual(self._with_interval(20, run), "new")
+
+    def test_ops_only_touch_blocks_under_the_page(self):
+        other_page = Document.objects.create(group=self.group, block_type="page", content="Q")
+        foreign = Document.objects.create(group=self.group, parent=other_page, block_type="text", content="z")
+
+        async def run():
+            comm, _ = await self._connect(self.users[0])
+            replies = []
+            for op in (
+                {"op": "set", "id": foreign.id, "content": "hijack"},
+                {"op": "set", "id": self.page.id, "content": "renamed"},
+                {"op": "set", "id": self.block.id, "block_type": "page"},
+            ):
+                await comm.send_to(text_data=json.dumps(op))
+                replies.append(json.loads(await comm.receive_from()))
+            await comm.disconnect()
+            return replies
+
+        replies = self._with_interval(60 * 1000, run)
+        self.assertEqual([r["type"] for r in replies], ["resync"] * 3)
+        self.assertEqual(
+            list(Document.objects.filter(pk__in=[foreign.id, self.page.id, self.block.id])
+                 .order_by("pk").values_list("content", "block_type")),
+            [("P", "page"), ("hello", "text"), ("z", "text")],
+        )
+
+    def test_http_update_wins_over_pending_edits(self):
+        self.client.force_login(self.users[1])
+
+        async def run():
+            comm, _ = await self._connect(self.users[0])
+            await comm.send_to(text_data=json.dumps({"op": "splice", "id": self.block.id, "pos": 0, "insert": "ws "}))
+            await comm.receive_from()
+
+            res = await sync_to_async(self.client.patch)(
+                f"/api/group/pages/{self.block.id}/", {"content": "from http"}, content_type="application/json"
+            )
+            pushed = json.loads(await comm.receive_from())
+            # HTTP 이후의 편집은 HTTP 내용 위에
+            await comm.send_to(text_data=json.dumps(
+                {"op": "splice", "id": self.block.id, "rev": pushed["rev"], "pos": 9, "insert": "!"}
+            ))
+            await comm.receive_from()
+            await comm.disconnect()
+            return res.status_code, pushed
+
+        status_code, pushed = self._with_interval(60 * 1000, run)
+        self.assertEqual(status_code, 200)
+        self.assertEqual((pushed["op"], pushed["content"], pushed["by"]), ("set", "from http", "e1"))
+        self.block.refresh_from_db()
+        self.assertEqual(self.block.content, "from http!")
+
+    def test_sessions_on_different_workers_share_block_state(self):
+        async def run():
+            # 워커 두 개에 각자 세션이 있어도 블록 상태는 공유 캐시 하나
+            worker_a = collab.PageSession(self.group.id, self.page.id, interval_ms=60 * 1000)
+            worker_b = collab.PageSession(self.group.id, self.page.id, interval_ms=60 * 1000)
+            await worker_a.snapshot()
+            await worker_b.snapshot()
+
+            first = await worker_a.apply({"op": "splice", "id": self.block.id, "rev": 0, "pos": 0, "insert": "A"})
+            second = await worker_b.apply({"op": "splice", "id": self.block.id, "rev": 0, "pos": 5, "insert": "!"})
+            saved = await worker_b.checkpoint()
+            await worker_a.drain()
+            await worker_b.drain()
+            return first, second, saved, await worker_a.snapshot()
+
+        first, second, saved, snapshot = async_to_sync(run)()
+        self.assertEqual((first["rev"], second["rev"], second["pos"]), (1, 2, 6))
+        self.assertEqual(saved, 1)
+        self.assertEqual(snapshot[0]["content"], "Ahello!")
+        self.block.refresh_from_db()
+        self.assertEqual(self.block.content, "Ahello!")
+
+    def test_rejects_page_from_other_group(self):
+        other_group = Group.objects.create(name="H", course=self.group.course)
+        other_page = Document.objects.create(group=other_group, block_type="page", content="X")
+
+        async def run():
+            comm = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns),
+                f"/ws/group/{self.group.id}/pages/{other_page.id}/",
+            )
+            comm.scope["user"] = self.users[0]
+            connected, code = await comm.connect()
+            return connected, code
+
+        self.assertEqual(async_to_sync(run)(), (False, 4404))
+
+
+class ProtectedFileTest(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(username="u1", password="pw")
+        self.group = Group.objects.create(name="G", course=Course.objects.create(title="C"))
+        GroupMember.objects.create(group=self.group, user=self.user)
+        self.body = bytes(range(256)) * 40
+        self.gf = GroupFile.objects.create(
+            group=self.group, uploader=self.user, file=ContentFile(self.body, name="clip.mp4")
+        )
+        self.url = f"/api/files/group-file/{self.gf.id}/clip.mp4"
+        self.client.force_login(self.user)
+
+    def test_full_and_conditional_get(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(b"".join(res.streaming_content), self.body)
+        self.assertEqual(res["Accept-Ranges"], "bytes")
+        self.assertEqual(res["Content-Type"], "video/mp4")
+
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_range_requests(self):
+        res = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(res.status_code, 206)
+        self.assertEqual(res["Content-Range"], f"bytes 100-199/{len(self.body)}")
+        self.assertEqual(res["Content-Length"], "100")
+        self.assertEqual(b"".join(res.streaming_content), self.body[100:200])
+
+        res = self.client.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(b"".join(res.streaming_content), self.body[-10:])
+
+        # 파일이 바뀐 뒤(If-Range 불일치)면 전체 파일
+        res = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(res.status_code, 200)
+        res.close()
+
+        res = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.body)}-")
+        self.assertEqual(res.status_code, 416)
+
+    def test_permission_and_offload(self):
+        self.client.force_login(User.objects.create_user(username="outsider", password="pw"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.client.force_login(self.user)
+        previous = files.OFFLOAD
+        files.OFFLOAD = "nginx"
+        try:
+            res = self.client.get(self.url)
+        finally:
+            files.OFFLOAD = previous
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["X-Accel-Redirect"], f"/protected/media/{self.gf.file.name}")
+        self.assertEqual(res.content, b"")
+
+    def test_serializer_links_to_protected_url(self):
+        data = self.client.get(f"/api/group/{self.group.id}/files/").json()
+        self.assertTrue(data[0]["file_url"].endswith(self.url))
+
+    def test_legacy_course_message_path_checks_permission(self):
+        from pathlib import Path
+
+        from apps.message.models import CourseMessage, CourseMessageThread
+
+        base = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, base, ignore_errors=True)
+        (base / "course_messages").mkdir()
+        (base / "course_messages" / "old.pdf").write_bytes(b"%PDF old")
+        thread = CourseMessageThread.objects.create(course=self.group.course, creator=self.user, title="Q")
+        CourseMessage.objects.create(
+            thread=thread, sender=self.user, content="x", attachment="course_messages/old.pdf"
+        )
+
+        with override_settings(BASE_DIR=base):
+            self.client.logout()
+            self.assertEqual(self.client.get("/course_messages/old.pdf").status_code, 401)
+
+            self.client.force_login(User.objects.create_user(username="outsider", password="pw"))
+            self.assertEqual(self.client.get("/course_messages/old.pdf").status_code, 403)
+            (base / "course_messages" / "stray.pdf").write_bytes(b"x")
+            self.assertEqual(self.client.get("/course_messages/stray.pdf").status_code, 404)
+
+            self.client.force_login(self.user)
+            res = self.client.get("/course_messages/old.pdf")
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(b"".join(res.streaming_content), b"%PDF old")
@@ -1,5 +1,11 @@
 # apps/group/views.py
-from django.db import models
+import os
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils.http import parse_etags
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.views import APIView
@@ -44,28 +50,43 @@ class MyGroupView(APIView):
 
 
 from rest_framework.decorators import api_view, permission_classes
-from django.utils import timezone
 
 from .models import GroupMessage
+from .serializers import GroupMessageSerializer, serialize_message_page
+from . import collab
+from .ordering import append_position, apply_orders, check_parent, move_document
+from .services import (
+    InvalidCursor,
+    build_sidebar,
+    fetch_group_messages,
+    get_page_tree,
+    sidebar_etag,
+)
+
+def message_history_response(request, group_id):
+    """
+    그룹 채팅 히스토리 (keyset 페이지네이션)
+    ?before_id= / ?after_id= / ?limit= (기본 50, 최대 200)
+    -> {"results": [{id, sender, text, time, is_me}, ...], "has_more": bool}
+    """
+    params = request.query_params
+    try:
+        page = fetch_group_messages(
+            group_id,
+            before_id=params.get("before_id"),
+            after_id=params.get("after_id"),
+            limit=params.get("limit"),
+        )
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(serialize_message_page(page, user_id=request.user.id))
+
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def group_messages(request, group_id):
-    user = request.user
-
-    qs = GroupMessage.objects.filter(group_id=group_id).select_related("user").order_by("created_at")
-
-    data = []
-    for msg in qs:
-        data.append({
-            "id": msg.id,
-            "sender": msg.user.username,
-            "text": msg.content,
-            "time": timezone.localtime(msg.created_at).strftime("%H:%M"),
-            "is_me": (msg.user_id == user.id),
-        })
-
-    return Response(data)
+    return message_history_response(request, group_id)
 
 
 
@@ -114,6 +135,7 @@ class GroupFileListCreateView(APIView):
             group=group,
             uploader=request.user,
             file=uploaded_file,
+            filename=os.path.basename(uploaded_file.name)[:255],
         )
 
         serializer = GroupFileSerializer(
@@ -130,24 +152,8 @@ class GroupMessageListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, group_id):
-        # 해당 그룹의 메시지를 오래된 순으로 반환
-        messages = (
-            GroupMessage.objects
-            .filter(group_id=group_id)
-            .select_related("user")
-            .order_by("created_at")
-        )
-
-        data = [
-            {
-                "id": m.id,
-                "sender": m.user.username,
-                "text": m.content,
-                "time": m.created_at.strftime("%H:%M"),
-            }
-            for m in messages
-        ]
-        return Response(data)
+        # messages_load 와 같은 포맷 (전체 히스토리 대신 페이지 단위)
+        return message_history_response(request, group_id)
 
     def post(self, request, group_id):
         content = request.data.get("message") or request.data.get("text")
@@ -159,12 +165,7 @@ class GroupMessageListView(APIView):
             user=request.user,
             content=content.strip(),
         )
-        data = {
-            "id": msg.id,
-            "sender": msg.user.username,
-            "text": msg.content,
-            "time": msg.created_at.strftime("%H:%M"),
-        }
+        data = GroupMessageSerializer(msg, context={"user_id": request.user.id}).data
         return Response(data, status=status.HTTP_201_CREATED)
     
 # notiont 기능 - 수정중
@@ -175,38 +176,18 @@ class CsrfExemptSessionAuthentication(SessionAuthentication):
         # Disable CSRF check for API endpoints that are called with session cookies
         return
 
-def build_document_tree(document):
-    return {
-        "id": document.id,
-        "block_type": document.block_type,
-        "content": document.content,
-        "file": document.file.url if document.file else None,
-        "order_index": document.order_index,
-        "children": [
-            build_document_tree(child)
-            for child in document.children.all().order_by("order_index")
-        ]
-    }
 class PageDetailView(APIView):
 
     def get(self, request, group_id, page_id):
+        # 페이지 트리 (그룹 문서 한 번에 가져와서 메모리에서 조립, 캐시됨)
+        data = get_page_tree(group_id, page_id)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
 
-        # 1. 그룹 검증
-        try:
-            group = Group.objects.get(id=group_id)
-        except Group.DoesNotExist:
+        # 못 찾았으면 어느 쪽이 없는지만 구분해서 알려줌
+        if not Group.objects.filter(id=group_id).exists():
             return Response({"error": "Group not found"}, status=status.HTTP_404_NOT_FOUND)
-
-        # 2. 페이지 문서 찾기
-        try:
-            page = Document.objects.get(id=page_id, group=group, block_type="page")
-        except Document.DoesNotExist:
-            return Response({"error": "Page not found"}, status=status.HTTP_404_NOT_FOUND)
-
-        # 3. 트리 구조로 변환
-        data = build_document_tree(page)
-
-        return Response(data, status=status.HTTP_200_OK)
+        return Response({"error": "Page not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -215,53 +196,15 @@ class PageListCreateView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
 
     def get(self, request, group_id):
-        folders = (
-            Document.objects
-            .filter(group_id=group_id, parent__isnull=True, block_type="folder")
-            .order_by("order_index", "created_at")
-        )
-        pages_without_folder = (
-            Document.objects
-            .filter(group_id=group_id, parent__isnull=True, block_type="page")
-            .order_by("order_index", "created_at")
-        )
-
-        data = []
-        for f in folders:
-            children = (
-                Document.objects
-                .filter(parent=f, block_type="page")
-                .order_by("order_index", "created_at")
-            )
-            data.append({
-                "id": f.id,
-                "name": f.content or "폴더",
-                "order_index": f.order_index,
-                "items": [
-                    {
-                        "id": c.id,
-                        "title": c.content or f"Page {c.id}",
-                        "order_index": c.order_index,
-                    } for c in children
-                ]
-            })
-
-        # 고아 페이지는 루트 버킷으로 반환
-        if pages_without_folder:
-            data.append({
-                "id": "root",
-                "name": "페이지",
-                "order_index": 0,
-                "items": [
-                    {
-                        "id": p.id,
-                        "title": p.content or f"Page {p.id}",
-                        "order_index": p.order_index,
-                    } for p in pages_without_folder
-                ]
-            })
-
-        return Response(data, status=status.HTTP_200_OK)
+        # 폴더/페이지가 그대로면 304 (프론트가 If-None-Match 로 싸게 폴링)
+        etag = sidebar_etag(group_id)
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(build_sidebar(group_id), status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
     def post(self, request, group_id):
         title = (request.data.get("title") or request.data.get("content") or "").strip()
@@ -272,18 +215,12 @@ class PageListCreateView(APIView):
         parent_id = request.data.get("parent_id")
 
         if block_type == "folder":
-            max_order = (
-                Document.objects
-                .filter(group_id=group_id, parent__isnull=True, block_type="folder")
-                .aggregate(models.Max("order_index"))
-                .get("order_index__max") or 0
-            )
             folder = Document.objects.create(
                 group_id=group_id,
                 parent=None,
                 block_type="folder",
                 content=title,
-                order_index=max_order + 1,
+                order_index=append_position(group_id, None, "folder"),
             )
             return Response(
                 {"id": folder.id, "name": folder.content, "order_index": folder.order_index, "items": []},
@@ -293,18 +230,12 @@ class PageListCreateView(APIView):
             parent_obj = None
             if parent_id and parent_id != "root":
                 parent_obj = Document.objects.filter(id=parent_id, group_id=group_id, block_type="folder").first()
-            max_order = (
-                Document.objects
-                .filter(group_id=group_id, parent=parent_obj, block_type="page")
-                .aggregate(models.Max("order_index"))
-                .get("order_index__max") or 0
-            )
             page = Document.objects.create(
                 group_id=group_id,
                 parent=parent_obj,
                 block_type="page",
                 content=title,
-                order_index=max_order + 1,
+                order_index=append_position(group_id, parent_obj.id if parent_obj else None, "page"),
             )
             return Response(
                 {
@@ -330,18 +261,12 @@ class DocumentBlockCreateView(APIView):
 
         block_type = request.data.get("block_type", "text")
         content = request.data.get("content", "")
-        max_order = (
-            Document.objects
-            .filter(group_id=group_id, parent=parent)
-            .aggregate(models.Max("order_index"))
-            .get("order_index__max") or 0
-        )
         doc = Document.objects.create(
             group_id=group_id,
             parent=parent,
             block_type=block_type,
             content=content,
-            order_index=max_order + 1,
+            order_index=append_position(group_id, parent.id),
         )
         ser = DocumentSerializer(doc)
         return Response(ser.data, status=status.HTTP_201_CREATED)
@@ -353,11 +278,6 @@ class DocumentUpdateView(APIView):
     authentication_classes = [CsrfExemptSessionAuthentication]
 
     def patch(self, request, doc_id):
-        try:
-            doc = Document.objects.select_for_update().get(id=doc_id)
-        except Document.DoesNotExist:
-            return Response({"error": "Document not found"}, status=status.HTTP_404_NOT_FOUND)
-
         data = {}
         if "content" in request.data:
             data["content"] = request.data.get("content", "")
@@ -368,23 +288,67 @@ class DocumentUpdateView(APIView):
         if "parent" in request.data:
             data["parent_id"] = request.data.get("parent")
 
-        for k, v in data.items():
-            setattr(doc, k, v)
-        doc.save()
+        # select_for_update 는 트랜잭션 안에서만 락이 잡힘
+        # (여러 명이 같이 치는 건 웹소켓 DocumentEditConsumer 쪽으로)
+        # 편집 세션 블록 락도 잡아서 checkpoint 가 이 수정을 옛 내용으로 덮어쓰지 않게
+        try:
+            with collab.block_lock(doc_id):
+                with transaction.atomic():
+                    try:
+                        doc = Document.objects.select_for_update().get(id=doc_id)
+                    except Document.DoesNotExist:
+                        return Response({"error": "Document not found"}, status=status.HTTP_404_NOT_FOUND)
+
+                    for k, v in data.items():
+                        setattr(doc, k, v)
+                    doc.save()
+                changed = collab.http_update(doc)
+        except collab.BlockBusy:
+            return Response({"error": "Document is busy, try again"}, status=status.HTTP_409_CONFLICT)
+
+        if changed:
+            # 같은 페이지를 편집 중인 사람들한테도 반영
+            page_id, op = changed
+            async_to_sync(get_channel_layer().group_send)(
+                f"page_{page_id}",
+                {
+                    "type": "doc_op",
+                    "sent_at": time.time(),
+                    "by": request.user.username,
+                    "origin": None,
+                    "client_op_id": None,
+                    **op,
+                },
+            )
 
         ser = DocumentSerializer(doc)
         return Response(ser.data, status=status.HTTP_200_OK)
 
     def delete(self, request, doc_id):
         try:
-            doc = Document.objects.get(id=doc_id)
-        except Document.DoesNotExist:
-            return Response({"error": "Document not found"}, status=status.HTTP_404_NOT_FOUND)
-
-        doc.delete()
+            with collab.block_lock(doc_id):
+                try:
+                    doc = Document.objects.get(id=doc_id)
+                except Document.DoesNotExist:
+                    return Response({"error": "Document not found"}, status=status.HTTP_404_NOT_FOUND)
+
+                doc.delete()
+                collab.http_delete(doc_id)
+        except collab.BlockBusy:
+            return Response({"error": "Document is busy, try again"}, status=status.HTTP_409_CONFLICT)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+def _optional_id(value):
+    """after_id / before_id: 없으면 None, 숫자가 아니면 ValueError"""
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"잘못된 id 입니다: {value}")
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class PageReorderView(APIView):
     permission_classes = [IsAuthenticated]
@@ -392,34 +356,56 @@ class PageReorderView(APIView):
 
     def post(self, request, group_id):
         """
-        Payload 예:
+        1) 하나만 옮기기 (행 하나만 UPDATE)
         {
-            "parent": null | <folder_id> | <page_id>,
+            "id": 5,
+            "parent": null | "root" | <folder_id> | <page_id>,
+            "after_id": <바로 앞 형제 id> | null,
+            "before_id": <바로 뒤 형제 id> | null
+        }
+
+        2) 일괄 정렬 (bulk_update 한 번)
+        {
+            "parent": null | "root" | <folder_id> | <page_id>,   # null(또는 키 없음)이면 부모 그대로, 아니면 전부 그 부모로
             "orders": [ {"id":1,"order_index":1}, {"id":5,"order_index":2} ]
         }
         """
-        parent = request.data.get("parent")
-        orders = request.data.get("orders")
+        data = request.data
+
+        if "orders" not in data and "id" in data:
+            doc = Document.objects.filter(id=data.get("id"), group_id=group_id).first()
+            if doc is None:
+                return Response({"error": "Document not found"}, status=status.HTTP_404_NOT_FOUND)
+            try:
+                parent_id = check_parent(group_id, [doc.block_type], data.get("parent", doc.parent_id))
+                doc = move_document(
+                    doc,
+                    parent_id,
+                    before_id=_optional_id(data.get("before_id")),
+                    after_id=_optional_id(data.get("after_id")),
+                )
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {"status": "ok", "id": doc.id, "order_index": doc.order_index, "parent": doc.parent_id},
+                status=status.HTTP_200_OK,
+            )
+
+        orders = data.get("orders")
         if not isinstance(orders, list):
             return Response({"error": "orders must be a list"}, status=status.HTTP_400_BAD_REQUEST)
 
-        ids = [item.get("id") for item in orders if "id" in item]
-        docs = {
-            d.id: d
-            for d in Document.objects.filter(id__in=ids, group_id=group_id)
-        }
-        for item in orders:
-            doc = docs.get(item.get("id"))
-            if doc is None:
-                continue
-            fields = []
-            if "order_index" in item:
-                doc.order_index = item["order_index"]
-                fields.append("order_index")
-            if parent is not None:
-                doc.parent_id = parent if parent != "root" else None
-                fields.append("parent")
-            if fields:
-                doc.save(update_fields=fields)
+        if data.get("parent") is not None:
+            ids = [item.get("id") for item in orders if isinstance(item, dict)]
+            try:
+                block_types = set(
+                    Document.objects.filter(id__in=ids, group_id=group_id).values_list("block_type", flat=True)
+                )
+                parent_id = check_parent(group_id, block_types, data.get("parent"))
+            except (TypeError, ValueError) as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            apply_orders(group_id, orders, parent=parent_id)
+        else:
+            apply_orders(group_id, orders)
 
         return Response({"status": "ok"}, status=status.HTTP_200_OK)
@@ -0,0 +1,323 @@
+# apps/learning/importers.py
+"""
+강의 단위 일괄 등록 (수강생 / 수업 일정 / 강의자료).
+
+학기 세팅할 때 Schedule POST 수백 번 + StudentEnrollment 하나씩 생성하던 걸
+CSV / JSON 한 번으로 처리한다.
+
+레코드 형식 (CSV 는 헤더에 이 컬럼들, JSON 은 같은 키):
+    type=enrollment : student (user id) 또는 username
+    type=schedule   : date (YYYY-MM-DD), start_time, end_time (HH:MM)
+    type=lesson     : week, title, material_type(pdf/video/etc), video_url
+
+- chunk_size 개씩 끊어서 검증 → chunk 당 트랜잭션 1번
+- 이미 있는 건 건너뜀 -> 같은 파일을 다시 돌려도 중복 생성 없음
+    수강/출석: bulk_create(ignore_conflicts=True)
+    일정: 같은 (date, start_time), 강의자료: 같은 (week, title) 이 있으면 skipped 로만 셈
+- 새 일정 × 전체 수강생, 새 수강생 × 기존 일정 Attendance(absent) 를 같이 만든다
+  (ScheduleViewSet.perform_create 와 같은 규칙)
+- 잘못된 row 는 건너뛰고 errors 에 row 번호와 사유를 모은다
+- enrollment 는 LocalAccount.role == 'SP' (학생) 계정만
+- 파일 중간에서 읽기 실패(깨진 CSV/JSON 줄 등)하면 거기까지 읽은 row 만 넣고 멈춘다.
+  이미 커밋된 chunk 는 그대로 두고 report.aborted 에 멈춘 row 번호와 사유를 남긴다
+- created.attendances 는 실제로 새로 생긴 행 수 (이미 있던 건 안 셈)
+"""
+
+import csv
+from dataclasses import dataclass, field
+import io
+import json
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_time
+
+from apps.users.models import LocalAccount
+
+from .models import Attendance, Lesson, Schedule, StudentEnrollment
+
+RECORD_TYPES = ("enrollment", "schedule", "lesson")
+STUDENT_ROLE = LocalAccount.Role.STUDENT_PARENT
+# 레코드를 읽다가 나는 에러 (json.JSONDecodeError 도 ValueError)
+PARSE_ERRORS = (ValueError, csv.Error, UnicodeDecodeError)
+MATERIAL_TYPES = {choice for choice, _ in Lesson.MATERIAL_TYPE_CHOICES}
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    chunks: int = 0
+    enrollments: int = 0
+    schedules: int = 0
+    lessons: int = 0
+    attendances: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    aborted: dict = None  # {"row": 읽다 실패한 row 번호, "error": 사유}
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "created": {
+                "enrollments": self.enrollments,
+                "schedules": self.schedules,
+                "lessons": self.lessons,
+                "attendances": self.attendances,
+            },
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "aborted": self.aborted,
+        }
+
+
+# ---------- 입력 파싱 ----------
+
+
+def iter_records(stream, fmt: str):
+    """
+    CSV / JSON Lines 는 한 줄씩 읽고 (메모리에 전부 안 올림),
+    JSON 은 배열 또는 {"enrollments": [...], "schedules": [...], "lessons": [...]} 형태.
+    stream 은 bytes/text 파일 객체 모두 가능
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig")
+
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {k.strip(): (v or "").strip() for k, v in row.items() if k}
+    elif fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    elif fmt == "json":
+        yield from iter_json_records(json.load(stream))
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+
+def iter_json_records(data):
+    """이미 파싱된 JSON (배열 또는 종류별로 묶인 dict) → 레코드"""
+    if isinstance(data, dict):
+        for plural in ("enrollments", "schedules", "lessons"):
+            for item in data.get(plural) or []:
+                yield {"type": plural[:-1], **item} if isinstance(item, dict) else item
+    else:
+        yield from data
+
+
+def guess_format(filename: str, content_type: str = "") -> str:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "json"
+
+
+# ---------- import ----------
+
+
+class CourseImporter:
+    def __init__(self, course, chunk_size=500, on_progress=None):
+        self.course = course
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.report = ImportReport()
+
+        # chunk 마다 다시 조회하지 않도록 현재 상태를 메모리에 들고 간다
+        self.enrolled_ids = set(
+            StudentEnrollment.objects.filter(course=course).values_list("student_id", flat=True)
+        )
+        schedules = list(Schedule.objects.filter(course=course).values_list("id", "date", "start_time"))
+        self.schedule_ids = [sid for sid, _, _ in schedules]
+        self.schedule_keys = {(date, start) for _, date, start in schedules}
+        self.lesson_keys = set(Lesson.objects.filter(course=course).values_list("week", "title"))
+
+    def run(self, records) -> ImportReport:
+        records = iter(records)
+        row_no = 0
+        while True:
+            chunk = []
+            try:
+                for record in islice(records, self.chunk_size):
+                    row_no += 1
+                    chunk.append((row_no, record))
+            except PARSE_ERRORS as e:
+                self.report.aborted = {"row": row_no + 1, "error": str(e)}
+
+            if chunk:
+                self._import_chunk(chunk)
+                self.report.rows += len(chunk)
+                self.report.chunks += 1
+                if self.on_progress:
+                    self.on_progress(self.report)
+            if not chunk or self.report.aborted:
+                break
+
+        return self.report
+
+    # ---------- chunk 단위 ----------
+
+    def _error(self, row_no, message):
+        self.report.errors.append({"row": row_no, "error": message})
+
+    def _import_chunk(self, chunk):
+        enroll_rows, schedules, lessons = [], [], []
+
+        for row_no, record in chunk:
+            if not isinstance(record, dict):
+                self._error(row_no, "레코드 형식이 잘못되었습니다.")
+                continue
+            kind = (record.get("type") or "").strip().lower()
+            if kind == "enrollment":
+                enroll_rows.append((row_no, record))
+            elif kind == "schedule":
+                obj = self._build_schedule(row_no, record)
+                if obj:
+                    key = (obj.date, obj.start_time)
+                    if key in self.schedule_keys:
+                        self.report.skipped += 1
+                    else:
+                        self.schedule_keys.add(key)
+                        schedules.append(obj)
+            elif kind == "lesson":
+                obj = self._build_lesson(row_no, record)
+                if obj:
+                    key = (obj.week, obj.title)
+                    if key in self.lesson_keys:
+                        self.report.skipped += 1
+                    else:
+                        self.lesson_keys.add(key)
+                        lessons.append(obj)
+            else:
+                self._error(row_no, f"type 은 {RECORD_TYPES} 중 하나여야 합니다.")
+
+        student_ids = self._resolve_students(enroll_rows)
+
+        with transaction.atomic():
+            new_student_ids = [sid for sid in student_ids if sid not in self.enrolled_ids]
+            StudentEnrollment.objects.bulk_create(
+                [StudentEnrollment(course=self.course, student_id=sid) for sid in new_student_ids],
+                ignore_conflicts=True,
+            )
+
+            # 새 Schedule 의 id 가 필요해서 ignore_conflicts 없이 생성 (unique 제약 없음)
+            created_schedules = Schedule.objects.bulk_create(schedules)
+            Lesson.objects.bulk_create(lessons)
+
+            new_schedule_ids = [s.id for s in created_schedules]
+            pairs = [(sid, sch) for sch in new_schedule_ids for sid in self.enrolled_ids]
+            pairs += [(sid, sch) for sid in new_student_ids for sch in self.schedule_ids]
+            pairs += [(sid, sch) for sid in new_student_ids for sch in new_schedule_ids]
+            # ignore_conflicts 면 bulk_create 결과로는 실제 insert 수를 알 수 없어서 앞뒤 count
+            attendances = Attendance.objects.filter(course=self.course)
+            before = attendances.count() if pairs else 0
+            Attendance.objects.bulk_create(
+                [
+                    Attendance(course=self.course, student_id=sid, schedule_id=sch, status="absent")
+                    for sid, sch in pairs
+                ],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            written = attendances.count() - before if pairs else 0
+
+        # 트랜잭션이 끝난 뒤에만 메모리 상태/리포트 반영
+        self.enrolled_ids.update(new_student_ids)
+        self.schedule_ids.extend(new_schedule_ids)
+        self.report.enrollments += len(new_student_ids)
+        self.report.schedules += len(created_schedules)
+        self.report.lessons += len(lessons)
+        self.report.attendances += written
+
+    def _resolve_students(self, enroll_rows):
+        """student(id) / username 을 chunk 당 쿼리 1번으로 user id 로 바꾼다 (학생 계정만)"""
+        if not enroll_rows:
+            return []
+
+        ids, usernames = set(), set()
+        for _, record in enroll_rows:
+            student = str(record.get("student") or "").strip()
+            if student.isdigit():
+                ids.add(int(student))
+            elif record.get("username"):
+                usernames.add(str(record["username"]).strip())
+
+        users = User.objects.filter(Q(id__in=ids) | Q(username__in=usernames)).values_list(
+            "id", "username", "local_account__role"
+        )
+        by_id = {uid for uid, _, _ in users}
+        by_username = {name: uid for uid, name, _ in users}
+        students = {uid for uid, _, role in users if role == STUDENT_ROLE}
+
+        resolved = []
+        seen = set()
+        for row_no, record in enroll_rows:
+            student = str(record.get("student") or "").strip()
+            if student.isdigit():
+                uid = int(student) if int(student) in by_id else None
+            else:
+                uid = by_username.get(str(record.get("username") or "").strip())
+            if uid is None:
+                self._error(row_no, "존재하지 않는 학생입니다.")
+                continue
+            if uid not in students:
+                self._error(row_no, "학생 계정이 아닙니다.")
+                continue
+            if uid not in seen:
+                seen.add(uid)
+                resolved.append(uid)
+        return resolved
+
+    def _build_schedule(self, row_no, record):
+        try:
+            date = _parse(parse_date, record.get("date"))
+            start = _parse(parse_time, record.get("start_time"))
+            end = _parse(parse_time, record.get("end_time"))
+        except ValueError:
+            self._error(row_no, "date / start_time / end_time 형식이 잘못되었습니다.")
+            return None
+
+        # ScheduleSerializer.validate 와 같은 규칙
+        if start >= end:
+            self._error(row_no, "종료 시간은 시작 시간보다 늦어야 합니다.")
+            return None
+        return Schedule(course=self.course, date=date, start_time=start, end_time=end)
+
+    def _build_lesson(self, row_no, record):
+        title = str(record.get("title") or "").strip()
+        material_type = str(record.get("material_type") or "pdf").strip()
+        try:
+            week = int(record.get("week"))
+        except (TypeError, ValueError):
+            week = 0
+
+        if week <= 0 or not title:
+            self._error(row_no, "week(1 이상) 와 title 은 필수입니다.")
+            return None
+        if material_type not in MATERIAL_TYPES:
+            self._error(row_no, f"material_type 은 {sorted(MATERIAL_TYPES)} 중 하나여야 합니다.")
+            return None
+
+        return Lesson(
+            course=self.course,
+            week=week,
+            title=title[:200],
+            material_type=material_type,
+            video_url=(record.get("video_url") or None),
+        )
+
+
+def _parse(parser, value):
+    parsed = parser(str(value or "").strip())
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+def import_course_records(course, records, chunk_size=500, on_progress=None) -> ImportReport:
+    return CourseImporter(course, chunk_size=chunk_size, on_progress=on_progress).run(records)
@@ -0,0 +1,64 @@
+# apps/learning/management/commands/import_course_data.py
+"""
+강의 하나에 수강생 / 수업 일정 / 강의자료를 일괄 등록한다.
+
+    python manage.py import_course_data 12 semester.csv
+    python manage.py import_course_data 12 semester.jsonl --chunk-size 1000
+    cat semester.csv | python manage.py import_course_data 12 - --format csv
+
+레코드 형식은 apps/learning/importers.py 참고.
+"""
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.learning.importers import guess_format, import_course_records, iter_records
+from apps.learning.models import Course
+
+
+class Command(BaseCommand):
+    help = "CSV/JSON 으로 강의의 수강생/일정/강의자료를 일괄 등록합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_id", type=int)
+        parser.add_argument("path", help="입력 파일 경로 ('-' 이면 stdin)")
+        parser.add_argument("--format", choices=["csv", "json", "jsonl"])
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, course_id, path, format=None, chunk_size=500, **options):
+        try:
+            course = Course.objects.get(id=course_id)
+        except Course.DoesNotExist:
+            raise CommandError(f"존재하지 않는 강의입니다: {course_id}")
+
+        fmt = format or ("csv" if path == "-" else guess_format(path))
+        started = time.monotonic()
+
+        def progress(report):
+            self.stdout.write(
+                f"  chunk {report.chunks}: {report.rows} rows "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+
+        if path == "-":
+            report = import_course_records(
+                course, iter_records(sys.stdin, fmt), chunk_size=chunk_size, on_progress=progress
+            )
+        else:
+            with open(path, "rb") as f:
+                report = import_course_records(
+                    course, iter_records(f, fmt), chunk_size=chunk_size, on_progress=progress
+                )
+
+        for err in report.errors:
+            self.stderr.write(f"  row {err['row']}: {err['error']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"완료 ({time.monotonic() - started:.1f}s): 수강 {report.enrollments}, "
+                f"일정 {report.schedules}, 강의자료 {report.lessons}, "
+                f"출석 {report.attendances}, 오류 {len(report.errors)}"
+            )
+        )
@@ -0,0 +1,39 @@
+# apps/learning/management/commands/process_submissions.py
+"""
+제출 후처리 워커 (SubmissionJob 큐)
+
+    python manage.py process_submissions            # 계속 돌면서 처리
+    python manage.py process_submissions --once     # 쌓인 것만 처리하고 종료
+
+- 용량/확장자/바이러스 검사, 썸네일, 점수 반영 (apps/learning/submissions.py)
+- 워커 여러 개 띄워도 됨 (SELECT ... FOR UPDATE SKIP LOCKED 로 job 을 나눠 가짐)
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.learning.submissions import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "과제 제출 후처리 큐(SubmissionJob)를 처리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="대기 중인 job 이 없으면 종료")
+        parser.add_argument("--batch", type=int, default=20, help="한 번에 가져올 job 수")
+        parser.add_argument("--sleep", type=float, default=1.0, help="큐가 비었을 때 쉬는 시간(초)")
+
+    def handle(self, *args, once=False, batch=20, sleep=1.0, **options):
+        processed = 0
+        while True:
+            ids = claim_jobs(limit=batch)
+            for job_id in ids:
+                run_job(job_id)
+            processed += len(ids)
+
+            if not ids:
+                if once:
+                    break
+                time.sleep(sleep)
+
+        self.stdout.write(self.style.SUCCESS(f"processed {processed} job(s)"))
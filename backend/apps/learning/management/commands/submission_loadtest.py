@@ -0,0 +1,164 @@
+# apps/learning/management/commands/submission_loadtest.py
+"""
+마감 직전 제출 몰림 흉내
+
+    python manage.py submission_loadtest <assignment_id>
+    python manage.py submission_loadtest 3 --students 1000 --seconds 60 --threads 64 --process
+
+- 임시 학생 N명을 만들어 과제 강의에 등록하고, --seconds 구간 안의 랜덤 시각에 한 명씩
+  기존 제출 API(POST /api/student/course/<id>/assignment/<id>/)로 파일을 냄 (앱 안에서 django.test.Client)
+- 응답 지연 p50/p95/p99/max, 실패 수, 큐에 쌓인 job 수를 출력
+- --process: 끝난 뒤 process_submissions 와 같은 방식으로 큐를 비우는 데 걸린 시간
+- --duplicate-ratio: 같은 내용 파일 비율 (StoredBlob 중복 제거 확인용)
+- 기본으로 만든 학생/제출은 끝나고 지움, blob 은 남은 제출/그룹 파일이 안 쓰는 것만 (--keep 이면 남김)
+"""
+import os
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from apps.group.models import GroupFile
+from apps.learning.models import Assignment, StudentEnrollment, Submission, SubmissionJob
+from apps.learning.submissions import claim_jobs, run_job
+from apps.uploads.models import StoredBlob
+from apps.users.models import LocalAccount
+
+
+def _pct(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class Command(BaseCommand):
+    help = "학생 N명이 같은 시간대에 과제를 제출하는 상황을 흉내내서 접수 지연을 잽니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("assignment_id", type=int)
+        parser.add_argument("--students", type=int, default=1000)
+        parser.add_argument("--seconds", type=float, default=60.0, help="제출이 몰리는 구간 길이")
+        parser.add_argument("--threads", type=int, default=64, help="동시에 요청 보내는 스레드 수")
+        parser.add_argument("--size", type=int, default=200 * 1024, help="제출 파일 크기(바이트)")
+        parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+        parser.add_argument("--process", action="store_true", help="끝난 뒤 후처리 큐까지 비우기")
+        parser.add_argument("--keep", action="store_true", help="만든 학생/제출을 지우지 않음")
+
+    def handle(self, assignment_id, students=1000, seconds=60.0, threads=64, size=200 * 1024,
+               duplicate_ratio=0.1, process=False, keep=False, **options):
+        assignment = Assignment.objects.select_related("course").filter(pk=assignment_id).first()
+        if assignment is None:
+            raise CommandError(f"assignment {assignment_id} not found")
+
+        users = self._make_students(assignment, students)
+        url = f"/api/student/course/{assignment.course_id}/assignment/{assignment.id}/"
+        shared = os.urandom(size)
+        blob_ids_before = set(StoredBlob.objects.values_list("id", flat=True))
+
+        # 세션 로그인은 미리 (측정 구간에는 제출 요청만)
+        clients = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+
+        offsets = sorted(random.uniform(0, seconds) for _ in users)
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+        start = time.perf_counter() + 0.5
+
+        def submit(i):
+            delay = start + offsets[i] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            body = shared if random.random() < duplicate_ratio else os.urandom(size)
+            upload = SimpleUploadedFile(f"report_{i}.pdf", body, content_type="application/pdf")
+
+            t0 = time.perf_counter()
+            try:
+                res = clients[i].post(url, {"file": upload})
+                code = res.status_code
+            except Exception as e:  # DB lock 등도 실패로 집계
+                code = repr(e)
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                if code != 200:
+                    failures.append(code)
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(submit, range(len(users))))
+        wall = time.perf_counter() - start
+
+        lat = sorted(latencies)
+        ms = lambda v: f"{v * 1000:,.1f}ms"  # noqa: E731
+        self.stdout.write(
+            f"제출 {len(users)}건 / {wall:.1f}s -> 성공 {len(users) - len(failures)}, 실패 {len(failures)}"
+        )
+        self.stdout.write(
+            f"지연 p50 {ms(_pct(lat, 50))}  p95 {ms(_pct(lat, 95))}  p99 {ms(_pct(lat, 99))}  "
+            f"max {ms(lat[-1] if lat else 0)}  평균 {ms(statistics.mean(lat) if lat else 0)}"
+        )
+        if failures:
+            self.stdout.write(f"실패 예시: {failures[:5]}")
+
+        new_blobs = StoredBlob.objects.exclude(id__in=blob_ids_before).count()
+        queued = SubmissionJob.objects.filter(submission__student__in=users, status="queued").count()
+        self.stdout.write(f"새 blob {new_blobs}개 (중복 제거), 후처리 대기 job {queued}개")
+
+        if process:
+            t0 = time.perf_counter()
+            done = 0
+            while True:
+                ids = claim_jobs(limit=50)
+                if not ids:
+                    break
+                for job_id in ids:
+                    run_job(job_id)
+                done += len(ids)
+            took = time.perf_counter() - t0
+            self.stdout.write(f"후처리 {done}건 / {took:.1f}s -> {done / took if took else 0:,.0f} job/s")
+
+        if not keep:
+            self._cleanup(users, blob_ids_before)
+
+    def _make_students(self, assignment, count):
+        User = get_user_model()
+        prefix = f"loadtest_{int(time.time())}_"
+        User.objects.bulk_create([User(username=f"{prefix}{i}") for i in range(count)])
+        users = list(User.objects.filter(username__startswith=prefix).order_by("id"))
+        # 학생 API 는 LocalAccount.role == "SP" 만 통과
+        stamp = int(time.time()) % 10 ** 6
+        LocalAccount.objects.bulk_create([
+            LocalAccount(user=u, phone_number=f"999{stamp:06d}{i:05d}", nickname=u.username[-20:], role="SP")
+            for i, u in enumerate(users)
+        ])
+        StudentEnrollment.objects.bulk_create(
+            [StudentEnrollment(student=u, course_id=assignment.course_id) for u in users]
+        )
+        return users
+
+    def _cleanup(self, users, blob_ids_before):
+        Submission.objects.filter(student__in=users).delete()
+        # blob 은 내용 기준으로 공유됨 -> 그 사이 진짜 학생이 같은 내용을 냈을 수 있으니 아무도 안 쓰는 것만
+        new_blobs = list(StoredBlob.objects.exclude(id__in=blob_ids_before))
+        names = [blob.file.name for blob in new_blobs]
+        used_ids = set(
+            Submission.objects.filter(blob__in=new_blobs).values_list("blob_id", flat=True)
+        )
+        used_names = set(Submission.objects.filter(file__in=names).values_list("file", flat=True))
+        used_names |= set(GroupFile.objects.filter(file__in=names).values_list("file", flat=True))
+        for blob in new_blobs:
+            if blob.id in used_ids or blob.file.name in used_names:
+                continue
+            blob.file.delete(save=False)
+            blob.delete()
+        get_user_model().objects.filter(pk__in=[u.pk for u in users]).delete()
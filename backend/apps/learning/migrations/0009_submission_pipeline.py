@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0008_alter_submission_status'),
+        ('uploads', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='uploads.storedblob'),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='received_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='reject_reason',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='resources/submissions/thumbs'),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='status',
+            field=models.CharField(choices=[('submitted', '제출됨'), ('graded', '평가됨'), ('rejected', '반려됨')], default='submitted', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='SubmissionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('blob_id', models.BigIntegerField(blank=True, null=True)),
+                ('score_delta', models.SmallIntegerField(default=0)),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '처리 중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='learning.submission')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='submission_job_queue_idx')],
+            },
+        ),
+    ]
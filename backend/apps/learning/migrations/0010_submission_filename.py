@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0009_submission_pipeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='filename',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
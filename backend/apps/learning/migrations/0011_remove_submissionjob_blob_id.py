@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0010_submission_filename'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='submissionjob',
+            name='blob_id',
+        ),
+    ]
@@ -1,6 +1,7 @@
 # apps/learning/models.py
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.text import slugify
 
 # Create your models here.
@@ -101,20 +102,60 @@ class Assignment(models.Model):
         return f"[{self.course.title}] {self.title}"
 
 class Submission(models.Model):
-    STATUS_CHOICES={
+    # set 이면 순서가 매번 달라져서 makemigrations 때마다 AlterField 가 생김 -> 튜플로
+    STATUS_CHOICES = (
         ("submitted", "제출됨"),
         ("graded", "평가됨"),
-    }
+        ("rejected", "반려됨"),  # 후처리(용량/바이러스 검사)에서 걸린 제출
+    )
     assignment = models.ForeignKey(Assignment, on_delete = models.CASCADE, related_name="submissions")
     student = models.ForeignKey(User, on_delete=models.CASCADE)
     file = models.FileField(upload_to='resources/submissions', blank=True)
+    filename = models.CharField(max_length=255, blank=True, default="")  # 학생이 올린 파일이름 (file 은 공유 blob 경로)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='submitted')
     grade = models.PositiveSmallIntegerField(null=True, blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    # 제출 접수 (apps/learning/submissions.py)
+    received_at = models.DateTimeField(null=True, blank=True)  # 요청이 들어온 시각 (마감 판정 기준)
+    blob = models.ForeignKey("uploads.StoredBlob", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    thumbnail = models.ImageField(upload_to="resources/submissions/thumbs", null=True, blank=True)
+    reject_reason = models.CharField(max_length=200, blank=True, default="")
+
     def __str__(self):
         return f"{self.assignment.title} - {self.student.username} ({self.status})"
 
+
+class SubmissionJob(models.Model):
+    """
+    제출 후처리 큐 (용량/확장자/바이러스 검사, 썸네일, 점수 반영)
+    - 접수(fast path)에서 Submission 과 같은 트랜잭션으로 만들고
+    - manage.py process_submissions 워커가 가져가서 처리
+    """
+    STATUS_CHOICES = (
+        ("queued", "대기"),
+        ("running", "처리 중"),
+        ("done", "완료"),
+        ("failed", "실패"),
+    )
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="jobs")
+    score_delta = models.SmallIntegerField(default=0)  # 접수 때 미뤄둔 과제 점수 증감
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    run_after = models.DateTimeField(default=timezone.now)  # 재시도는 뒤로 미룸
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="submission_job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"job {self.id} ({self.status}) for submission {self.submission_id}"
+
 class Schedule(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="schedules")
     date = models.DateField()
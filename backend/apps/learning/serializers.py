@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from myproject.files import protected_file_url
 from .models import (
     Course,
     StudentEnrollment,
@@ -21,8 +23,9 @@ class LessonMaterialSerializer(serializers.ModelSerializer):
 
     def get_url(self, obj):
         request = self.context.get("request")
-        if obj.material_type == "pdf" and obj.file:
-            return request.build_absolute_uri(obj.file.url)
+        # 업로드된 PDF/영상은 권한 체크 + Range 지원 엔드포인트로 (영상 탐색 가능)
+        if obj.material_type in ("pdf", "video") and obj.file:
+            return protected_file_url(request, "lesson", obj.id, obj.file)
         if obj.material_type == "video" and obj.video_url:
             return obj.video_url
         return None
@@ -66,7 +69,7 @@ class StudentAssignmentSerializer(serializers.ModelSerializer):
 class SubmissionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Submission
-        fields = ["id", "assignment", "student", "file", "status", "grade", "submitted_at",]
+        fields = ["id", "assignment", "student", "file", "filename", "status", "grade", "submitted_at",]
 
 
 
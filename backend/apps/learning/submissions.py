@@ -0,0 +1,255 @@
+# apps/learning/submissions.py
+"""
+과제 제출 접수 / 후처리
+
+마감 직전에 몰려도 요청 안에서는 최소한만 한다 (fast path)
+- accept_submission: 파일은 StoredBlob 으로(해시 중복 제거), Submission 갱신 + SubmissionJob 생성을
+  트랜잭션 하나로. 접수 시각(received_at)은 요청이 들어온 시각
+- 점수(GamificationProfile) 갱신은 여기서 안 하고 job 에 score_delta 로 넘김
+
+나머지는 워커가 (manage.py process_submissions)
+- 용량 / 막힌 확장자 / 바이러스 검사(SUBMISSION_SCANNER) -> 걸리면 status="rejected"
+- 이미지면 썸네일
+- 미뤄둔 점수 반영
+
+SUBMISSION_JOBS_INLINE = True 면 커밋 직후 요청 안에서 바로 처리 (워커 없는 개발 환경용)
+
+running 인 채로 SUBMISSION_JOB_LEASE_SECONDS 넘게 안 끝난 job (워커가 죽음) 은 claim_jobs 가 다시 queued 로.
+job.updated_at 이 임대 표시 -> 다시 가져간 쪽이 있으면 늦게 끝난 원래 워커는 결과를 안 씀 (점수 두 번 반영 X)
+"""
+import io
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.gamification.services import post_score_event
+from apps.uploads.services import blob_from_upload
+
+from .models import Submission, SubmissionJob
+
+logger = logging.getLogger(__name__)
+
+MAX_SIZE = getattr(settings, "SUBMISSION_MAX_SIZE", 100 * 1024 * 1024)
+BLOCKED_EXTENSIONS = getattr(settings, "SUBMISSION_BLOCKED_EXTENSIONS", (".exe", ".bat", ".cmd", ".com", ".scr", ".msi"))
+SCANNER = getattr(settings, "SUBMISSION_SCANNER", "")  # "모듈.함수" (path) -> None, 감염이면 ValueError
+JOBS_INLINE = getattr(settings, "SUBMISSION_JOBS_INLINE", False)
+JOB_LEASE_SECONDS = getattr(settings, "SUBMISSION_JOB_LEASE_SECONDS", 15 * 60)
+MAX_ATTEMPTS = 5
+THUMBNAIL_SIZE = (320, 320)
+
+
+class SubmissionRejected(Exception):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# 접수 (요청 안)
+# ---------------------------------------------------------------------------
+
+def accept_submission(assignment, student, uploaded_file=None, blob=None, received_at=None, filename=None):
+    """
+    제출 접수. uploaded_file(multipart) 또는 blob(청크 업로드 완료분) 중 하나
+    filename: 이 학생이 보낸 파일이름 (blob 은 공유라서 blob 경로의 이름은 남의 것일 수 있음)
+    마감 체크는 호출하는 쪽에서 received_at 기준으로
+    """
+    received_at = received_at or timezone.now()
+    filename = os.path.basename(filename or getattr(uploaded_file, "name", "") or "")[:255]
+    if blob is None:
+        # 트랜잭션 밖에서 디스크 쓰기 + 해시 (락 잡은 채로 오래 안 있게)
+        blob = blob_from_upload(uploaded_file)
+
+    with transaction.atomic():
+        submission = (
+            Submission.objects.select_for_update()
+            .filter(assignment=assignment, student=student)
+            .first()
+        )
+        was_counted = submission is not None and submission.status == "submitted"
+        if submission is None:
+            submission = Submission(assignment=assignment, student=student)
+
+        submission.file = blob.file.name
+        submission.blob = blob
+        submission.filename = filename
+        submission.status = "submitted"
+        submission.grade = None  # 다시 내면 평가 초기화
+        submission.submitted_at = received_at
+        submission.received_at = received_at
+        submission.thumbnail = None
+        submission.reject_reason = ""
+        # 점수 시그널은 건너뛰고 job 에서 반영
+        submission._skip_score_event = True
+        submission.save()
+
+        job = SubmissionJob.objects.create(
+            submission=submission,
+            score_delta=0 if was_counted else 1,
+        )
+
+    if JOBS_INLINE:
+        transaction.on_commit(lambda: run_job(job.id))
+    return submission
+
+
+# ---------------------------------------------------------------------------
+# 후처리 (워커)
+# ---------------------------------------------------------------------------
+
+def claim_jobs(limit=20, now=None):
+    """대기 중인 job 을 running 으로 바꾸면서 가져옴 (워커 여러 개여도 한 번씩만)"""
+    now = now or timezone.now()
+    requeue_stale_jobs(now)
+    with transaction.atomic():
+        ids = list(
+            SubmissionJob.objects.select_for_update(skip_locked=True)
+            .filter(status="queued", run_after__lte=now)
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+        SubmissionJob.objects.filter(id__in=ids).update(status="running", updated_at=now)
+    return ids
+
+
+def requeue_stale_jobs(now=None):
+    """임대 시간이 지난 running job -> 다시 queued (시도 횟수 +1, 다 썼으면 failed). 바꾼 수"""
+    now = now or timezone.now()
+    stale = SubmissionJob.objects.filter(
+        status="running", updated_at__lt=now - timedelta(seconds=JOB_LEASE_SECONDS)
+    )
+    changes = {"attempts": F("attempts") + 1, "last_error": "lease expired", "updated_at": now}
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS - 1).update(status="failed", **changes)
+    requeued = stale.update(status="queued", run_after=now, **changes)
+    if failed or requeued:
+        logger.warning("submission jobs lease expired: %s requeued, %s failed", requeued, failed)
+    return failed + requeued
+
+
+def run_job(job_id):
+    job = SubmissionJob.objects.select_related("submission", "submission__blob").filter(pk=job_id).first()
+    if job is None or job.status in ("done", "failed"):
+        return
+    try:
+        process_job(job)
+    except Exception as e:
+        logger.exception("submission job failed", extra={"job_id": job.id})
+        job.attempts += 1
+        job.last_error = str(e)[:1000]
+        if job.attempts >= MAX_ATTEMPTS:
+            job.status = "failed"
+        else:
+            job.status = "queued"
+            job.run_after = timezone.now() + timedelta(seconds=2 ** job.attempts * 5)
+        # 임대가 끝나서 다른 워커가 가져갔으면(updated_at 바뀜) 건드리지 않음
+        SubmissionJob.objects.filter(pk=job.pk, updated_at=job.updated_at).update(
+            attempts=job.attempts,
+            last_error=job.last_error,
+            status=job.status,
+            run_after=job.run_after,
+            updated_at=timezone.now(),
+        )
+
+
+def process_job(job):
+    """
+    검사 / 썸네일 만들기는 락 없이 하고, 결과 반영은 트랜잭션 하나에서
+    job 이 아직 내 것인지 + 이 job 이 그 제출의 최신 job 인지(재제출 안 됐는지) 다시 확인한 뒤에
+    (같은 내용으로 다시 내면 blob 이 같아서 blob 으로는 재제출을 구분 못 함 -> 접수마다 새로 생기는 job id 로)
+    """
+    submission = job.submission
+    reject_reason = thumbnail = None
+    if _latest_job_id(submission.pk) == job.pk:
+        try:
+            check_file(submission)
+        except SubmissionRejected as e:
+            reject_reason = str(e)[:200]
+        else:
+            thumbnail = render_thumbnail(submission)
+
+    with transaction.atomic():
+        owned = (
+            SubmissionJob.objects.select_for_update()
+            .filter(pk=job.pk, updated_at=job.updated_at)
+            .exclude(status__in=("done", "failed"))
+            .exists()
+        )
+        if not owned:
+            # 임대가 끝나서 다른 워커가 다시 가져감 -> 그쪽이 반영
+            logger.warning("submission job lease lost", extra={"job_id": job.id})
+            return
+
+        # 접수(accept_submission)도 Submission 행을 잡고 job 을 만듦 -> 잡은 뒤에 보면 최신 job 이 다 보임
+        current = Submission.objects.select_for_update().get(pk=submission.pk)
+        if _latest_job_id(current.pk) != job.pk:
+            # 그 사이에 다시 냈음 -> 검사는 최신 job 이 함, 점수만 반영
+            _apply_score(current, job.score_delta)
+        elif reject_reason is not None:
+            current.status = "rejected"
+            current.reject_reason = reject_reason
+            current._skip_score_event = True
+            current.save(update_fields=["status", "reject_reason"])
+            # 반려 = 점수 인정 안 됨: 접수 때 미뤄둔 +1 은 취소, 예전 제출로 인정돼 있던 건 -1
+            _apply_score(current, job.score_delta - 1)
+        else:
+            if thumbnail is not None:
+                current.thumbnail.save(f"{current.id}.jpg", ContentFile(thumbnail), save=False)
+                current.save(update_fields=["thumbnail"])
+            _apply_score(current, job.score_delta)
+
+        SubmissionJob.objects.filter(pk=job.pk).update(status="done", updated_at=timezone.now())
+
+
+def _latest_job_id(submission_id):
+    return (
+        SubmissionJob.objects.filter(submission_id=submission_id)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def _apply_score(submission, delta):
+    if delta:
+        post_score_event(submission.student_id, assignment=delta)
+
+
+def check_file(submission):
+    blob = submission.blob
+    size = blob.size if blob else submission.file.size
+    if size > MAX_SIZE:
+        raise SubmissionRejected(f"파일이 너무 큽니다 (최대 {MAX_SIZE // (1024 * 1024)}MB)")
+
+    # file 은 공유 blob 경로(처음 올린 사람의 이름) -> 이 학생이 보낸 이름으로 판단
+    ext = os.path.splitext(submission.filename or submission.file.name)[1].lower()
+    if ext in BLOCKED_EXTENSIONS:
+        raise SubmissionRejected(f"{ext} 파일은 제출할 수 없습니다")
+
+    if SCANNER:
+        try:
+            import_string(SCANNER)(submission.file.path)
+        except ValueError as e:
+            raise SubmissionRejected(f"악성 파일로 판정됨: {e}")
+
+
+def render_thumbnail(submission):
+    """이미지 제출만 썸네일 JPEG bytes (PDF 등은 None)"""
+    try:
+        from PIL import Image, UnidentifiedImageError
+    except ImportError:
+        return None
+
+    try:
+        with submission.file.open("rb") as f:
+            image = Image.open(f)
+            image.thumbnail(THUMBNAIL_SIZE)
+            out = io.BytesIO()
+            image.convert("RGB").save(out, format="JPEG", quality=80)
+    except (UnidentifiedImageError, OSError):
+        return None
+    return out.getvalue()
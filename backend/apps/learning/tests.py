@@ -1,9 +1,25 @@
 # apps/learning/tests.py
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.contrib.auth.models import User
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
-from .models import Course
+from apps.gamification.models import GamificationProfile
+from apps.uploads.models import StoredBlob
+from apps.users.models import LocalAccount
+from .models import Assignment, Course, StudentEnrollment, Submission, SubmissionJob
+from . import submissions
+from .submissions import accept_submission, claim_jobs, run_job
 
 class CourseModelTest(TestCase):
     def test_str_and_ordering(self):
@@ -39,3 +55,245 @@ class CourseAPITest(APITestCase):
         self.client.login(username="other", password="pw")
         res2 = self.client.patch(f"/api/courses/{cid}/", {"title": "Hacked"}, format="json")
         self.assertEqual(res2.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CourseImportTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(title="Import")
+        users = User.objects.bulk_create([User(username=f"s{i}") for i in range(500)])
+        users = User.objects.filter(username__in=[u.username for u in users])
+        LocalAccount.objects.bulk_create(
+            [LocalAccount(user=u, phone_number=f"010-1{u.id:07d}", nickname=u.username, role="SP") for u in users]
+        )
+
+    def test_bulk_import_creates_enrollments_schedules_and_attendance(self):
+        from .importers import import_course_records
+        from .models import Attendance, Lesson, Schedule, StudentEnrollment
+
+        records = [{"type": "enrollment", "username": f"s{i}"} for i in range(500)]
+        records += [
+            {"type": "schedule", "date": f"2025-03-0{d}", "start_time": "09:00", "end_time": "10:00"}
+            for d in range(1, 4)
+        ]
+        records.append({"type": "lesson", "week": 1, "title": "OT"})
+        records.append({"type": "enrollment", "username": "nobody"})
+
+        # 쿼리 수는 row 수가 아니라 chunk 수에 비례
+        with CaptureQueriesContext(connection) as ctx:
+            report = import_course_records(self.course, records, chunk_size=200)
+        self.assertLess(len(ctx.captured_queries), 30)
+
+        self.assertEqual(StudentEnrollment.objects.filter(course=self.course).count(), 500)
+        self.assertEqual(Attendance.objects.filter(course=self.course).count(), 1500)
+        self.assertEqual(report.lessons, 1)
+        self.assertEqual([e["row"] for e in report.errors], [505])
+
+        # 다시 돌려도 중복 생성 없음
+        again = import_course_records(self.course, records)
+        self.assertEqual(StudentEnrollment.objects.filter(course=self.course).count(), 500)
+        self.assertEqual(Schedule.objects.filter(course=self.course).count(), 3)
+        self.assertEqual(Lesson.objects.filter(course=self.course).count(), 1)
+        self.assertEqual(report.attendances, 1500)
+        self.assertEqual((again.schedules, again.lessons, again.attendances, again.skipped), (0, 0, 0, 4))
+
+    def test_only_student_accounts_are_enrolled(self):
+        from .importers import import_course_records
+
+        User.objects.create(username="manager")
+        teacher = User.objects.create(username="teacher")
+        LocalAccount.objects.create(user=teacher, phone_number="010-9999-0000", nickname="t", role="MG")
+
+        report = import_course_records(
+            self.course,
+            [{"type": "enrollment", "username": name} for name in ("s1", "manager", "teacher")],
+        )
+        self.assertEqual(report.enrollments, 1)
+        self.assertEqual([e["row"] for e in report.errors], [2, 3])
+
+    def test_parse_error_returns_partial_report(self):
+        from .models import StudentEnrollment
+
+        instructor = User.objects.create_user(username="inst", password="pw")
+        self.course.instructor = instructor
+        self.course.save()
+        client = APIClient()
+        client.force_authenticate(instructor)
+
+        lines = [json.dumps({"type": "enrollment", "username": f"s{i}"}) for i in range(5)]
+        lines.insert(3, "{broken")
+        upload = SimpleUploadedFile("rows.jsonl", "\n".join(lines).encode(), content_type="application/x-ndjson")
+
+        res = client.post(
+            f"/api/courses/{self.course.id}/import/?chunk_size=2", {"file": upload}, format="multipart"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        # chunk 1 (row 1-2) 은 커밋, chunk 2 는 row 3 까지 넣고 row 4 에서 멈춤
+        self.assertEqual(res.data["aborted"]["row"], 4)
+        self.assertEqual(res.data["rows"], 3)
+        self.assertEqual(res.data["created"]["enrollments"], 3)
+        self.assertEqual(StudentEnrollment.objects.filter(course=self.course).count(), 3)
+
+
+class SubmissionPipelineTest(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.student = User.objects.create_user(username="s1", password="pw")
+        LocalAccount.objects.create(user=self.student, phone_number="010-0000-0001", nickname="s1", role="SP")
+        self.course = Course.objects.create(title="C")
+        StudentEnrollment.objects.create(student=self.student, course=self.course)
+        self.assignment = Assignment.objects.create(
+            course=self.course, title="A1", description="", due_date=timezone.now() + timedelta(hours=1)
+        )
+        self.url = f"/api/student/course/{self.course.id}/assignment/{self.assignment.id}/"
+        self.client.force_login(self.student)
+
+    def _submit(self, name="report.pdf", body=b"%PDF-1.4 hello"):
+        return self.client.post(self.url, {"file": SimpleUploadedFile(name, body)})
+
+    def _profile(self):
+        return GamificationProfile.objects.filter(user=self.student).first()
+
+    def _drain(self):
+        for job_id in claim_jobs(limit=100):
+            run_job(job_id)
+
+    def test_fast_path_defers_score_to_worker(self):
+        res = self._submit()
+        self.assertEqual(res.status_code, 200)
+
+        submission = Submission.objects.get()
+        self.assertIsNotNone(submission.received_at)
+        self.assertIsNotNone(submission.blob)
+        self.assertIsNone(self._profile())  # 점수는 아직
+        self.assertEqual(SubmissionJob.objects.get().status, "queued")
+
+        self._drain()
+        self.assertEqual(SubmissionJob.objects.get().status, "done")
+        self.assertEqual(self._profile().assignment_count, 1)
+
+        # 다시 내도 점수는 그대로, 같은 내용이면 blob 재사용
+        self._submit()
+        self._drain()
+        self.assertEqual(self._profile().assignment_count, 1)
+        self.assertEqual(StoredBlob.objects.count(), 1)
+
+    def test_blocked_file_is_rejected_and_uncounted(self):
+        self._submit()
+        self._drain()
+        self.assertEqual(self._profile().assignment_count, 1)
+
+        self._submit(name="virus.exe", body=b"MZ...")
+        self._drain()
+        submission = Submission.objects.get()
+        self.assertEqual(submission.status, "rejected")
+        self.assertIn(".exe", submission.reject_reason)
+        self.assertEqual(self._profile().assignment_count, 0)
+
+    def test_extension_check_uses_submitters_filename(self):
+        other = User.objects.create_user(username="s2", password="pw")
+        StudentEnrollment.objects.create(student=other, course=self.course)
+        accept_submission(self.assignment, other, uploaded_file=SimpleUploadedFile("x.txt", b"MZ..."))
+        self._drain()
+
+        # 같은 내용이 먼저 x.txt 로 올라가 있어도 이 학생이 보낸 이름(.exe)으로 검사
+        self._submit(name="evil.exe", body=b"MZ...")
+        self._drain()
+        submission = Submission.objects.get(student=self.student)
+        self.assertEqual(submission.status, "rejected")
+        self.assertEqual(submission.filename, "evil.exe")
+        self.assertEqual(Submission.objects.get(student=other).status, "submitted")
+
+        # 반대로 남이 .exe 로 올린 내용을 정상 이름으로 내면 통과
+        accept_submission(self.assignment, other, uploaded_file=SimpleUploadedFile("tool.exe", b"plain text"))
+        self._submit(name="notes.txt", body=b"plain text")
+        self._drain()
+        self.assertEqual(Submission.objects.get(student=self.student).status, "submitted")
+        self.assertEqual(Submission.objects.get(student=other).status, "rejected")
+
+    def test_image_submission_gets_thumbnail(self):
+        out = io.BytesIO()
+        Image.new("RGB", (800, 600), "red").save(out, format="PNG")
+        self._submit(name="photo.png", body=out.getvalue())
+        self._drain()
+        submission = Submission.objects.get()
+        self.assertTrue(submission.thumbnail)
+        with Image.open(submission.thumbnail.path) as thumb:
+            self.assertLessEqual(max(thumb.size), 320)
+
+    def test_stale_running_job_is_reclaimed_once(self):
+        self._submit()
+        started = timezone.now()
+        (job_id,) = claim_jobs(now=started)
+        crashed = SubmissionJob.objects.select_related("submission").get(pk=job_id)
+
+        # 임대 안 지났으면 그대로 running
+        self.assertEqual(claim_jobs(now=started + timedelta(seconds=10)), [])
+        later = started + timedelta(seconds=submissions.JOB_LEASE_SECONDS + 1)
+        self.assertEqual(claim_jobs(now=later), [job_id])
+        run_job(job_id)
+        self.assertEqual(SubmissionJob.objects.get().status, "done")
+        self.assertEqual(SubmissionJob.objects.get().attempts, 1)
+
+        # 죽은 줄 알았던 워커가 늦게 끝나도 점수는 한 번만
+        submissions.process_job(crashed)
+        self.assertEqual(self._profile().assignment_count, 1)
+
+    def test_resubmission_while_job_runs_is_not_rejected(self):
+        self._submit(name="virus.exe", body=b"MZ...")
+        (job_id,) = claim_jobs()
+        running = SubmissionJob.objects.select_related("submission", "submission__blob").get(pk=job_id)
+
+        # 검사 도중에 정상 파일로 다시 냄
+        self._submit(name="report.pdf", body=b"%PDF-1.4 fixed")
+        submissions.process_job(running)
+        submission = Submission.objects.get()
+        self.assertEqual(submission.status, "submitted")
+        self.assertEqual(submission.reject_reason, "")
+
+        self._drain()
+        self.assertEqual(Submission.objects.get().status, "submitted")
+        self.assertEqual(self._profile().assignment_count, 1)
+
+    def test_loadtest_cleanup_keeps_blobs_still_in_use(self):
+        from .management.commands.submission_loadtest import Command
+
+        bot = User.objects.create(username="loadtest_bot")
+        StudentEnrollment.objects.create(student=bot, course=self.course)
+        before = set(StoredBlob.objects.values_list("id", flat=True))
+
+        self._submit(body=b"shared")  # 진짜 학생이 같은 내용을 냄
+        shared = accept_submission(self.assignment, bot, uploaded_file=SimpleUploadedFile("a.pdf", b"shared"))
+        other_assignment = Assignment.objects.create(
+            course=self.course, title="A2", description="", due_date=timezone.now() + timedelta(hours=1)
+        )
+        only_bot = accept_submission(other_assignment, bot, uploaded_file=SimpleUploadedFile("b.pdf", b"only bot"))
+        shared_blob, bot_blob = shared.blob, only_bot.blob
+
+        Command()._cleanup([bot], before)
+
+        self.assertTrue(StoredBlob.objects.filter(pk=shared_blob.pk).exists())
+        with Submission.objects.get(student=self.student).file.open("rb") as f:
+            self.assertEqual(f.read(), b"shared")
+        self.assertFalse(StoredBlob.objects.filter(pk=bot_blob.pk).exists())
+        self.assertFalse(bot_blob.file.storage.exists(bot_blob.file.name))
+
+    def test_superseded_job_only_applies_score(self):
+        self._submit(body=b"first")
+        self._submit(name="virus.exe", body=b"second")
+        self._drain()
+        self.assertEqual(Submission.objects.get().status, "rejected")
+        self.assertEqual(self._profile().assignment_count, 0)
+
+    def test_resubmitting_identical_rejected_file_counts_once(self):
+        # 같은 내용(= 같은 blob)으로 다시 내도 먼저 job 은 밀린 걸로 처리
+        self._submit(name="virus.exe", body=b"MZ...")
+        self._submit(name="virus.exe", body=b"MZ...")
+        self.assertEqual(SubmissionJob.objects.count(), 2)
+        self._drain()
+        self.assertEqual(Submission.objects.get().status, "rejected")
+        self.assertEqual(self._profile().assignment_count, 0)
@@ -28,6 +28,7 @@ urlpatterns = [
 ]
 
 from .views_teacher import (
+    CourseImportAPIView,
     AssignmentViewSet,
     SubmissionViewSet,
     ScheduleViewSet,
@@ -35,6 +36,11 @@ from .views_teacher import (
     NoticeViewSet,
     AttendanceViewSet,
 )
+urlpatterns += [
+    # 수강생/일정/강의자료 일괄 등록
+    path('courses/<int:course_id>/import/', CourseImportAPIView.as_view(), name='course-import'),
+]
+
 router.register('assignments', AssignmentViewSet)
 router.register('submissions', SubmissionViewSet)
 router.register('schedule', ScheduleViewSet)
@@ -8,6 +8,9 @@ from rest_framework.parsers import MultiPartParser, FormParser
 
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+
+from myproject.files import protected_file_url
+from .submissions import accept_submission
 from .permissions import IsStudent
 
 
@@ -116,42 +119,31 @@ class StudentAssignmentDetailAPIView(APIView):
             "due_date": assignment.due_date,
             "file": assignment.file.url if assignment.file else None,
             "submitted": submission is not None,
-            "submitted_file": submission.file.url if submission else None,
+            "submitted_file": protected_file_url(request, "submission", submission.id, submission.file) if submission else None,
         })
 
     def post(self, request, course_id, assignment_id):
+        # 접수 시각은 요청이 들어온 시각 (파일 저장이 오래 걸려도 마감 판정은 이걸로)
+        received_at = timezone.now()
         student = request.user
 
         course = get_object_or_404(
             Course.objects.filter(enrollments__student=student),
             id=course_id
         )
-        
-        print("FILES:", request.FILES)
-        print("DATA:", request.data)
         assignment = get_object_or_404(
             Assignment, id=assignment_id, course=course
         )
-        
-        file = request.FILES.get("file")
-        
 
+        file = request.FILES.get("file")
         if not file:
             return Response({"detail": "file is required"}, status=400)
 
-        now = timezone.now()
-        if assignment.due_date < now:
+        if assignment.due_date < received_at:
             return Response({"detail": "마감 시간이 지났습니다"}, status=400)
 
-        submission, created = Submission.objects.get_or_create(
-            assignment=assignment,
-            student=student
-        )
-
-        submission.file = file
-        submission.submitted_at = now
-        submission.status = "submitted"
-        submission.save()
+        # 검사/썸네일/점수는 SubmissionJob 으로 (apps/learning/submissions.py)
+        submission = accept_submission(assignment, student, uploaded_file=file, received_at=received_at)
         return Response(SubmissionSerializer(submission).data, status=200)
 
 class LessonAPIView(APIView):
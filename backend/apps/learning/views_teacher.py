@@ -1,7 +1,13 @@
+import logging
+
 from rest_framework import viewsets, status
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import (
     Course,
     StudentEnrollment,
@@ -24,6 +30,10 @@ from .serializers import (
     AttendanceSerializer,
     TeacherAssignmentRequestSerializer,
 )
+from .importers import guess_format, import_course_records, iter_json_records, iter_records
+from .submissions import accept_submission
+
+logger = logging.getLogger(__name__)
 
 class NoticeViewSet(viewsets.ModelViewSet):
     queryset = Notice.objects.all()
@@ -74,6 +84,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         return SubmissionSerializer
     
     def create(self, request, *args, **kwargs):
+        received_at = timezone.now()
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -86,35 +97,76 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             return Response({"detail": "파일을 업로드해야 합니다."},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # 마감 체크
-        now = timezone.now()
-        if assignment.due_date < now:
+        # 마감 체크 (요청이 들어온 시각 기준)
+        if assignment.due_date < received_at:
             return Response(
                 {"detail": "마감 시간이 지나 제출할 수 없습니다."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 기존 제출 있는지 확인
-        existing_submission = Submission.objects.filter(
-            assignment=assignment, student=student
-        ).first()
+        existed = Submission.objects.filter(assignment=assignment, student=student).exists()
+        # 있으면 파일만 덮어쓰고 평가 초기화, 검사/점수는 SubmissionJob 으로
+        submission = accept_submission(assignment, student, uploaded_file=file, received_at=received_at)
+        return Response(
+            SubmissionSerializer(submission).data,
+            status=status.HTTP_200_OK if existed else status.HTTP_201_CREATED,
+        )
+
+
+class CourseImportAPIView(APIView):
+    """
+    POST /api/courses/<course_id>/import/
+    - 수강생 / 수업 일정 / 강의자료 일괄 등록 (형식은 importers.py 참고)
+    - multipart: file=<csv|json|jsonl>, (선택) format
+    - ?chunk_size=500 : 한 트랜잭션에 넣을 row 수
+    - JSON body: [{"type": "enrollment", "username": "..."}, ...]
+                 또는 {"enrollments": [...], "schedules": [...], "lessons": [...]}
+    - 강의 담당 강사 또는 관리자(is_staff)만 가능
+    - 파일 중간에서 읽기 실패 -> 400 + 그때까지 반영된 리포트 (aborted 에 멈춘 row)
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def post(self, request, course_id):
+        course = get_object_or_404(Course, id=course_id)
+        if not (request.user.is_staff or course.instructor_id == request.user.id):
+            return Response(
+                {"detail": "강의 담당 강사만 일괄 등록할 수 있습니다."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
 
-        if existing_submission:
-            # 파일만 덮어쓰기
-            existing_submission.file = file
-            existing_submission.submitted_at = now
-            existing_submission.status = "submitted"
-            existing_submission.grade = None  # 평가 초기화 (원하면 유지 가능)
-            existing_submission.save()
+        upload = request.FILES.get("file")
+        if upload:
+            fmt = request.data.get("format") or guess_format(upload.name, upload.content_type or "")
+            records = iter_records(upload.file, fmt)
+        else:
+            records = iter_json_records(request.data)
+
+        try:
+            chunk_size = max(int(request.query_params.get("chunk_size") or 500), 1)
+        except ValueError:
+            chunk_size = 500
+
+        def log_progress(report):
+            logger.info(
+                "course %s import: %s rows (%s chunks)", course.id, report.rows, report.chunks
+            )
 
+        report = import_course_records(
+            course, records, chunk_size=chunk_size, on_progress=log_progress
+        )
+        if report.aborted:
+            # 앞쪽 chunk 는 이미 커밋됨 -> 어디까지 들어갔는지 리포트를 같이 돌려준다
             return Response(
-                SubmissionSerializer(existing_submission).data,
-                status=status.HTTP_200_OK
+                {
+                    "detail": f"{report.aborted['row']}번째 row 에서 파일을 읽을 수 없습니다: "
+                    f"{report.aborted['error']} (그 앞 {report.rows}개 row 는 반영됨)",
+                    **report.as_dict(),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 첫 제출
-        serializer.save(submitted_at=now, status="submitted")
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
 
 
 #____________관리자/강사 전용 API___(수정 많이 필요함)___________
@@ -18,6 +18,8 @@ class CourseMessageThreadAdmin(admin.ModelAdmin):
         "course",
         "creator",
         "is_closed",
+        "message_count",
+        "last_message_at",
         "updated_at",
         "created_at",
     )
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """
+    기존 메시지로 스레드 비정규화 값 + 참여자 read cursor 채우기
+    - 보낸 사람은 자기가 마지막으로 보낸 메시지까지는 읽은 걸로
+    - 예전 is_read=True 인 (남이 보낸) 메시지도 읽은 걸로
+    """
+    Thread = apps.get_model("message", "CourseMessageThread")
+    Message = apps.get_model("message", "CourseMessage")
+    Participant = apps.get_model("message", "CourseMessageThreadParticipant")
+
+    for thread in Thread.objects.all().iterator():
+        messages = list(
+            Message.objects.filter(thread_id=thread.pk)
+            .order_by("created_at", "id")
+            .values("id", "sender_id", "content", "created_at", "is_read")
+        )
+        if not messages:
+            continue
+
+        last = messages[-1]
+        Thread.objects.filter(pk=thread.pk).update(
+            message_count=len(messages),
+            last_message_at=last["created_at"],
+            last_message_preview=(last["content"] or "")[:100],
+        )
+
+        # user_id -> 읽은 위치(messages 인덱스)
+        cursors = {}
+        for idx, msg in enumerate(messages):
+            cursors[msg["sender_id"]] = idx
+        for idx, msg in enumerate(messages):
+            if not msg["is_read"]:
+                continue
+            for user_id in cursors:
+                if user_id != msg["sender_id"] and cursors[user_id] < idx:
+                    cursors[user_id] = idx
+
+        Participant.objects.bulk_create([
+            Participant(
+                thread_id=thread.pk,
+                user_id=user_id,
+                last_read_message_id=messages[idx]["id"],
+                read_count=idx + 1,
+            )
+            for user_id, idx in cursors.items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('message', '0002_alter_coursemessage_attachment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursemessagethread',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='coursemessagethread',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='coursemessagethread',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='CourseMessageThreadParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_read_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='message.coursemessage')),
+                ('thread', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='message.coursemessagethread')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='message_thread_participations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('thread', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
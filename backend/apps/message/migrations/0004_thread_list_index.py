@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0009_submission_pipeline'),
+        ('message', '0003_thread_counters_participants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursemessagethread',
+            index=models.Index(fields=['course', 'updated_at', 'id'], name='msg_thread_course_upd_idx'),
+        ),
+    ]
@@ -21,11 +21,20 @@ class CourseMessageThread(models.Model):
     title = models.CharField(max_length=200)
     is_closed = models.BooleanField(default=False)
 
+    # 목록용 비정규화 값 (services.record_new_message 에서 같이 갱신)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_preview = models.CharField(max_length=100, blank=True, default="")
+    message_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            # 목록 keyset 페이지네이션 (views.ThreadKeysetPagination)
+            models.Index(fields=["course", "updated_at", "id"], name="msg_thread_course_upd_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.course_id}] {self.title}"
@@ -54,6 +63,8 @@ class CourseMessage(models.Model):
         blank=True,
     )
 
+    # 예전 전역 읽음 플래그 (읽는 사람이 여럿이면 틀림)
+    # 이제 읽음 처리는 CourseMessageThreadParticipant 의 read cursor 로 함
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -62,3 +73,36 @@ class CourseMessage(models.Model):
 
     def __str__(self):
         return f"{self.thread_id} - {self.sender.username}: {self.content[:20]}"
+
+
+class CourseMessageThreadParticipant(models.Model):
+    """
+    스레드별 참여자의 읽음 위치(read cursor)
+    - read_count: 마지막으로 읽었을 때의 thread.message_count
+    - 안 읽은 개수 = thread.message_count - read_count
+    """
+    thread = models.ForeignKey(
+        CourseMessageThread,
+        on_delete=models.CASCADE,
+        related_name="participants",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="message_thread_participations",
+    )
+    last_read_message = models.ForeignKey(
+        CourseMessage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    read_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("thread", "user")
+
+    def __str__(self):
+        return f"{self.thread_id} - {self.user_id} ({self.read_count})"
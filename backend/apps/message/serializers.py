@@ -3,7 +3,9 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 
 from .models import CourseMessageThread, CourseMessage
+from .services import record_new_message, unread_count_for
 from apps.learning.models import Course
+from myproject.files import protected_file_url
 
 
 class CourseMessageSerializer(serializers.ModelSerializer):
@@ -12,6 +14,7 @@ class CourseMessageSerializer(serializers.ModelSerializer):
     """
     sender_nickname = serializers.SerializerMethodField()
     is_mine = serializers.SerializerMethodField()
+    attachment = serializers.SerializerMethodField()
 
     class Meta:
         model = CourseMessage
@@ -36,14 +39,16 @@ class CourseMessageSerializer(serializers.ModelSerializer):
             return False
         return obj.sender_id == request.user.id
 
+    def get_attachment(self, obj):
+        # 링크 끝이 파일 이름이라 프론트에서 이름 뽑던 방식 그대로 됨
+        return protected_file_url(self.context.get("request"), "message", obj.id, obj.attachment)
+
 
 class CourseMessageThreadListSerializer(serializers.ModelSerializer):
     """
     스레드 목록용 직렬화 (좌측 리스트)
     """
     course_title = serializers.CharField(source="course.title", read_only=True)
-    last_message_at = serializers.SerializerMethodField()
-    last_message_preview = serializers.SerializerMethodField()
     unread_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -58,24 +63,18 @@ class CourseMessageThreadListSerializer(serializers.ModelSerializer):
             "updated_at",
             "last_message_at",
             "last_message_preview",
+            "message_count",
             "unread_count",
         ]
 
-    def get_last_message_at(self, obj):
-        last = obj.messages.order_by("-created_at").first()
-        return last.created_at if last else None
-
-    def get_last_message_preview(self, obj):
-        last = obj.messages.order_by("-created_at").first()
-        if not last:
-            return ""
-        return last.content[:100]
-
     def get_unread_count(self, obj):
+        # 목록 뷰에서는 annotate_thread_list 로 my_read_count 가 붙어서 옴
+        if hasattr(obj, "my_read_count"):
+            return max(obj.message_count - obj.my_read_count, 0)
         request = self.context.get("request")
         if not request or request.user.is_anonymous:
             return 0
-        return obj.messages.filter(is_read=False).exclude(sender=request.user).count()
+        return unread_count_for(obj, request.user)
 
 
 class CourseMessageThreadDetailSerializer(serializers.ModelSerializer):
@@ -126,12 +125,13 @@ class CreateThreadSerializer(serializers.Serializer):
             creator=user,
             title=validated_data["title"],
         )
-        CourseMessage.objects.create(
+        message = CourseMessage.objects.create(
             thread=thread,
             sender=user,
             content=validated_data.get("content", ""),
             attachment=attachment,
         )
+        record_new_message(thread, message)
         return thread
 
 
@@ -156,4 +156,5 @@ class ReplyMessageSerializer(serializers.Serializer):
             content=validated_data.get("content", ""),
             attachment=attachment,
         )
+        record_new_message(thread, message)
         return message
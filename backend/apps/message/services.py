@@ -0,0 +1,79 @@
+# apps/message/services.py
+from django.db import transaction
+
+from .models import CourseMessage, CourseMessageThread, CourseMessageThreadParticipant
+
+PREVIEW_LENGTH = 100
+
+
+def record_new_message(thread, message):
+    """
+    메시지 하나 저장된 뒤 호출
+    - 스레드의 last_message_at / preview / message_count 갱신
+    - 보낸 사람은 자기 메시지까지 읽은 걸로 cursor 이동
+    """
+    with transaction.atomic():
+        # 같은 스레드에 답장이 동시에 들어와도 count 가 안 꼬이게 행 잠금
+        locked = CourseMessageThread.objects.select_for_update().get(pk=thread.pk)
+        locked.message_count += 1
+        locked.last_message_at = message.created_at
+        locked.last_message_preview = (message.content or "")[:PREVIEW_LENGTH]
+        locked.save(update_fields=[
+            "message_count",
+            "last_message_at",
+            "last_message_preview",
+            "updated_at",
+        ])
+
+        _move_read_cursor(locked, message.sender_id, message)
+
+    # 호출한 쪽이 들고 있는 객체도 최신 값으로 맞춰줌
+    thread.message_count = locked.message_count
+    thread.last_message_at = locked.last_message_at
+    thread.last_message_preview = locked.last_message_preview
+    thread.updated_at = locked.updated_at
+    return thread
+
+
+def mark_thread_read(thread, user):
+    """
+    스레드를 끝까지 읽은 걸로 표시 (상세 조회 시)
+    - 이미 최신이면 쓰기 안 함
+    """
+    participant = (
+        CourseMessageThreadParticipant.objects
+        .filter(thread=thread, user=user)
+        .only("id", "read_count")
+        .first()
+    )
+    if participant and participant.read_count >= thread.message_count:
+        return participant
+
+    last = CourseMessage.objects.filter(thread=thread).order_by("-created_at", "-id").first()
+    return _move_read_cursor(thread, user.id, last)
+
+
+def _move_read_cursor(thread, user_id, message):
+    participant, created = CourseMessageThreadParticipant.objects.get_or_create(
+        thread=thread,
+        user_id=user_id,
+        defaults={"last_read_message": message, "read_count": thread.message_count},
+    )
+    if not created and participant.read_count != thread.message_count:
+        participant.last_read_message = message
+        participant.read_count = thread.message_count
+        participant.save(update_fields=["last_read_message", "read_count", "updated_at"])
+    return participant
+
+
+def unread_count_for(thread, user):
+    """
+    annotate 안 된 스레드용 (O(1) 빼기)
+    """
+    participant = (
+        CourseMessageThreadParticipant.objects
+        .filter(thread=thread, user=user)
+        .values_list("read_count", flat=True)
+        .first()
+    )
+    return max(thread.message_count - (participant or 0), 0)
@@ -1,3 +1,134 @@
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-# Create your tests here.
+from apps.learning.models import Course
+
+from .models import CourseMessage, CourseMessageThread, CourseMessageThreadParticipant
+from .services import record_new_message
+
+
+class ThreadListQueryTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", password="pw")
+        self.student = User.objects.create_user(username="student", password="pw")
+        self.course = Course.objects.create(title="C")
+        self.url = f"/api/courses/{self.course.id}/messages/"
+        self.client.force_login(self.teacher)
+
+    def _make_threads(self, n):
+        for i in range(n):
+            thread = CourseMessageThread.objects.create(
+                course=self.course, creator=self.student, title=f"T{i}"
+            )
+            self._send(thread, self.student, "q" * 150)
+            self._send(thread, self.teacher, f"a{i}")
+
+    def _send(self, thread, sender, content):
+        message = CourseMessage.objects.create(thread=thread, sender=sender, content=content)
+        record_new_message(thread, message)
+        return message
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx), res.json()
+
+    def test_query_count_is_constant(self):
+        self._make_threads(3)
+        small, _ = self._count_queries(self.url)
+
+        self._make_threads(30)
+        large, data = self._count_queries(self.url)
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), 33)
+
+    def test_annotated_fields(self):
+        self._make_threads(1)
+        self._send(CourseMessageThread.objects.get(), self.student, "x" * 150)
+
+        _, data = self._count_queries(self.url)
+        row = data[0]
+        self.assertEqual(row["course_title"], "C")
+        self.assertEqual(row["last_message_preview"], "x" * 100)
+        self.assertEqual(row["message_count"], 3)
+        # 선생님은 자기 답장까지는 읽은 상태 -> 그 뒤 학생 메시지 1개만 안 읽음
+        self.assertEqual(row["unread_count"], 1)
+        self.assertIsNotNone(row["last_message_at"])
+
+    def test_cursor_pagination(self):
+        self._make_threads(5)
+
+        _, page = self._count_queries(self.url + "?page_size=2")
+        self.assertEqual(len(page["results"]), 2)
+        seen = [t["id"] for t in page["results"]]
+        while page["next"]:
+            _, page = self._count_queries(page["next"])
+            seen += [t["id"] for t in page["results"]]
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_keyset_cursor_with_identical_updated_at(self):
+        self._make_threads(5)
+        CourseMessageThread.objects.update(updated_at=timezone.now())
+
+        page = self.client.get(self.url + "?page_size=2").json()
+        seen = [t["id"] for t in page["results"]]
+        while page["next"]:
+            page = self.client.get(page["next"]).json()
+            seen += [t["id"] for t in page["results"]]
+        self.assertEqual(seen, sorted(CourseMessageThread.objects.values_list("id", flat=True), reverse=True))
+
+
+class ReadCursorTest(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username="student", password="pw")
+        self.teacher = User.objects.create_user(username="teacher", password="pw")
+        self.assistant = User.objects.create_user(username="assistant", password="pw")
+        self.course = Course.objects.create(title="C")
+        self.client.force_login(self.student)
+        res = self.client.post("/api/messages/", {
+            "course_id": self.course.id,
+            "title": "질문",
+            "content": "첫 메시지",
+        })
+        self.assertEqual(res.status_code, 201)
+        self.thread = CourseMessageThread.objects.get()
+
+    def _unread(self, user):
+        self.client.force_login(user)
+        data = self.client.get(f"/api/courses/{self.course.id}/messages/").json()
+        return data[0]["unread_count"]
+
+    def test_reply_updates_counters_and_sender_cursor(self):
+        self.client.force_login(self.teacher)
+        self.client.post(f"/api/messages/{self.thread.id}/reply/", {"content": "답장"})
+
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.message_count, 2)
+        self.assertEqual(self.thread.last_message_preview, "답장")
+        self.assertEqual(self._unread(self.teacher), 0)
+        self.assertEqual(self._unread(self.student), 1)
+        self.assertEqual(self._unread(self.assistant), 2)
+
+    def test_reading_is_per_participant(self):
+        self.client.force_login(self.teacher)
+        self.client.get(f"/api/messages/{self.thread.id}/")
+
+        self.assertEqual(self._unread(self.teacher), 0)
+        # 다른 사람 읽음 상태에는 영향 없음
+        self.assertEqual(self._unread(self.assistant), 1)
+
+        # 이미 최신이면 다시 열어도 쓰기 없음
+        participant = CourseMessageThreadParticipant.objects.get(user=self.teacher)
+        self.client.force_login(self.teacher)
+        self.client.get(f"/api/messages/{self.thread.id}/")
+        self.assertEqual(
+            CourseMessageThreadParticipant.objects.get(pk=participant.pk).updated_at,
+            participant.updated_at,
+        )
@@ -1,4 +1,6 @@
 # apps/message/views.py
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 
 from rest_framework import permissions, status
@@ -7,7 +9,10 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import CourseMessageThread, CourseMessage
+from myproject.pagination import KeysetPagination
+
+from .models import CourseMessageThread, CourseMessageThreadParticipant
+from .services import mark_thread_read
 from .serializers import (
     CourseMessageSerializer,
     CourseMessageThreadListSerializer,
@@ -17,12 +22,39 @@ from .serializers import (
 )
 
 
+def annotate_thread_list(qs, user):
+    """
+    목록에 필요한 값을 한 쿼리로
+    - 마지막 메시지 시각/미리보기, 메시지 수는 스레드에 비정규화돼 있음
+    - 내 read cursor(read_count)만 서브쿼리로 붙이고 안 읽은 개수는 빼기로 계산
+    """
+    my_read = CourseMessageThreadParticipant.objects.filter(
+        thread=OuterRef("pk"),
+        user_id=user.id,
+    ).values("read_count")[:1]
+
+    return qs.select_related("course").annotate(
+        my_read_count=Coalesce(Subquery(my_read), 0),
+    )
+
+
+class ThreadKeysetPagination(KeysetPagination):
+    """
+    스레드 목록 keyset 페이지네이션 (최근 갱신 순, 앞으로만, myproject/pagination.py)
+    - (updated_at, id) 커서라 updated_at 이 겹쳐도 빠지거나 겹치는 스레드 없음
+    """
+    ordering_field = "updated_at"
+
+
 class CourseMessageThreadListAPIView(APIView):
     """
     GET /api/courses/{course_id}/messages/
     - 해당 강의에서 내가 볼 수 있는 메시지 스레드 목록
+    - ?cursor= / ?page_size= 를 주면 keyset 페이지네이션 ({next, results})
+      안 주면 예전처럼 배열 그대로 (기존 프론트 호환)
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ThreadKeysetPagination
 
     def get(self, request, course_id):
         qs = CourseMessageThread.objects.filter(course_id=course_id)
@@ -32,8 +64,21 @@ class CourseMessageThreadListAPIView(APIView):
         if local and getattr(local, "role", "") == "student":
             qs = qs.filter(creator=request.user)
 
+        qs = annotate_thread_list(qs, request.user)
+
+        params = request.query_params
+        if "cursor" in params or "page_size" in params:
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(qs, request, view=self)
+            serializer = CourseMessageThreadListSerializer(
+                page,
+                many=True,
+                context={"request": request},
+            )
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = CourseMessageThreadListSerializer(
-            qs,
+            qs.order_by("-updated_at", "-id"),
             many=True,
             context={"request": request},
         )
@@ -87,11 +132,8 @@ class MessageThreadDetailAPIView(APIView):
     def get(self, request, pk):
         thread = self.get_object(pk, request.user)
 
-        # 상대방이 보낸 안 읽은 메시지 읽음 처리
-        CourseMessage.objects.filter(
-            thread=thread,
-            is_read=False,
-        ).exclude(sender=request.user).update(is_read=True)
+        # 내 read cursor 를 끝으로 (이미 최신이면 쓰기 없음)
+        mark_thread_read(thread, request.user)
 
         serializer = CourseMessageThreadDetailSerializer(
             thread,
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import StoredBlob, UploadSession
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ("id", "sha256", "size", "file", "created_at")
+    search_fields = ("sha256", "file")
+    readonly_fields = ("created_at",)
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "target", "target_id", "filename", "size", "status", "created_at")
+    list_filter = ("target", "status")
+    search_fields = ("user__username", "filename")
+    readonly_fields = ("created_at", "completed_at")
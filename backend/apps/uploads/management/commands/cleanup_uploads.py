@@ -0,0 +1,17 @@
+# apps/uploads/management/commands/cleanup_uploads.py
+"""
+UPLOAD_SESSION_TTL_HOURS 가 지난 미완료 청크 업로드와 .part 파일을 지운다. (cron 으로 하루 한 번 정도)
+
+    python manage.py cleanup_uploads
+"""
+from django.core.management.base import BaseCommand
+
+from apps.uploads.services import expire_sessions
+
+
+class Command(BaseCommand):
+    help = "오래된 미완료 청크 업로드 세션과 임시 파일을 정리합니다."
+
+    def handle(self, *args, **options):
+        removed = expire_sessions()
+        self.stdout.write(self.style.SUCCESS(f"removed {removed} stale upload session(s)"))
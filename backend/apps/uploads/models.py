@@ -0,0 +1,77 @@
+# apps/uploads/models.py
+import math
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class StoredBlob(models.Model):
+    """
+    업로드된 파일 실제 내용 (sha256 기준으로 한 번만 저장)
+    - 같은 내용 파일을 여러 명이 올려도 Submission/GroupFile 은 같은 경로를 가리킴
+    - 파일 이름은 처음 올린 사람 기준
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    file = models.FileField(upload_to="resources/blobs", max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes)"
+
+
+class UploadSession(models.Model):
+    """
+    청크 업로드 한 건 (이어 올리기 가능)
+    - 청크는 MEDIA_ROOT/uploads/tmp/<id>.part 의 제자리(offset)에 바로 씀
+    - complete 때 해시 검증 -> StoredBlob 으로 옮기고 Submission/GroupFile 생성
+    """
+    TARGET_CHOICES = (
+        ("submission", "과제 제출"),
+        ("group-file", "그룹 파일"),
+    )
+    STATUS_CHOICES = (
+        ("open", "업로드 중"),
+        ("assembling", "마무리 중"),
+        ("complete", "완료"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="upload_sessions")
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    target_id = models.PositiveIntegerField()  # submission: assignment id / group-file: group id
+    filename = models.CharField(max_length=200)
+    size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, default="")  # 클라이언트가 알려준 값 (있으면 검증)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="open")
+    blob = models.ForeignKey(StoredBlob, on_delete=models.SET_NULL, null=True, blank=True)
+    result_id = models.PositiveIntegerField(null=True, blank=True)  # 만들어진 Submission/GroupFile id
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def total_chunks(self):
+        return max(1, math.ceil(self.size / self.chunk_size))
+
+    def chunk_length(self, index):
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def __str__(self):
+        return f"{self.user} {self.target}:{self.target_id} {self.filename} ({self.status})"
+
+
+class UploadChunk(models.Model):
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name="chunks")
+    index = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("session", "index")
+        ordering = ["index"]
@@ -0,0 +1,322 @@
+# apps/uploads/services.py
+"""
+청크 업로드 흐름
+1) start_session   : 대상(과제/그룹) 권한 확인 + 빈 .part 파일 만들기
+2) write_chunk     : 청크를 임시 버퍼에 받아 길이/해시 확인 후 .part 파일 제자리(offset)에 씀
+                     (메모리에 전체 파일 안 올림, 잘못 온 청크는 이미 받은 내용을 안 건드림)
+3) complete_session: 청크 다 왔는지 확인 -> sha256 -> StoredBlob 으로 이동(같은 내용이면 재사용)
+                     -> Submission / GroupFile 생성
+
+.part 파일은 MEDIA_ROOT 아래에 있어서 완료할 때 rename 한 번으로 저장소에 들어감 (복사 없음)
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import StoredBlob, UploadChunk, UploadSession
+
+CHUNK_SIZE = getattr(settings, "UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024)
+MAX_CHUNK_SIZE = getattr(settings, "UPLOAD_MAX_CHUNK_SIZE", 16 * 1024 * 1024)
+MAX_SIZE = getattr(settings, "UPLOAD_MAX_SIZE", 500 * 1024 * 1024)
+SESSION_TTL_HOURS = getattr(settings, "UPLOAD_SESSION_TTL_HOURS", 24)
+IO_BLOCK = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------------------------------------------------------------------
+# 대상별 권한/생성
+# ---------------------------------------------------------------------------
+
+def _check_submission(user, assignment_id, started_at=None):
+    from apps.learning.models import Assignment
+
+    assignment = Assignment.objects.filter(
+        pk=assignment_id, course__enrollments__student=user
+    ).first()
+    if assignment is None:
+        raise UploadError("assignment not found", status=404)
+    # 마감 전에 시작한 업로드는 완료가 마감 뒤여도 받아줌 (느린 회선 때문에 잘리지 않게)
+    if assignment.due_date < (started_at or timezone.now()):
+        raise UploadError("마감 시간이 지났습니다")
+    return assignment
+
+
+def _check_group(user, group_id, started_at=None):
+    from apps.group.models import GroupMember
+
+    if not GroupMember.objects.filter(group_id=group_id, user=user).exists():
+        raise UploadError("You are not a member of this group", status=403)
+
+
+def _create_submission(session, blob):
+    from apps.learning.models import Assignment
+    from apps.learning.submissions import accept_submission
+
+    assignment = Assignment.objects.get(pk=session.target_id)
+    return accept_submission(assignment, session.user, blob=blob, filename=session.filename)
+
+
+def _create_group_file(session, blob):
+    from apps.group.models import GroupFile
+
+    return GroupFile.objects.create(
+        group_id=session.target_id,
+        uploader_id=session.user_id,
+        file=blob.file.name,
+        filename=session.filename,
+    )
+
+
+TARGETS = {
+    "submission": (_check_submission, _create_submission),
+    "group-file": (_check_group, _create_group_file),
+}
+
+
+# ---------------------------------------------------------------------------
+# 세션
+# ---------------------------------------------------------------------------
+
+def part_path(session):
+    return os.path.join(settings.MEDIA_ROOT, "uploads", "tmp", f"{session.id}.part")
+
+
+def _parse_int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise UploadError(f"{name} must be an integer")
+
+
+def start_session(user, target, target_id, filename, size, sha256="", chunk_size=None):
+    if target not in TARGETS:
+        raise UploadError("unknown target")
+    target_id = _parse_int(target_id, "target_id")
+    size = _parse_int(size, "size")
+    chunk_size = _parse_int(chunk_size, "chunk_size") if chunk_size else CHUNK_SIZE
+    filename = get_valid_filename(os.path.basename(filename or ""))[:200]
+    sha256 = (sha256 or "").lower()
+
+    if not filename:
+        raise UploadError("filename is required")
+    if size <= 0 or size > MAX_SIZE:
+        raise UploadError(f"size must be between 1 and {MAX_SIZE}")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise UploadError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}")
+    if sha256 and len(sha256) != 64:
+        raise UploadError("sha256 must be a hex digest")
+
+    check, _ = TARGETS[target]
+    check(user, target_id)
+
+    session = UploadSession.objects.create(
+        user=user,
+        target=target,
+        target_id=target_id,
+        filename=filename,
+        size=size,
+        chunk_size=chunk_size,
+        sha256=sha256,
+    )
+    # 파일 크기만큼 미리 잡아두고(sparse) 청크마다 제자리에 씀
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.truncate(size)
+    return session
+
+
+def received_indexes(session):
+    return list(session.chunks.values_list("index", flat=True))
+
+
+def write_chunk(session, index, stream, expected_sha256=""):
+    """
+    stream 에서 청크 하나를 읽어서 .part 의 index * chunk_size 위치에 씀
+    - 같은 index 를 다시 보내면 덮어씀 (재시도/이어 올리기)
+    - 길이/해시가 맞을 때만 .part 에 씀 -> 잘못 다시 보낸 청크가 이미 받은 청크를 망가뜨리지 않음
+    """
+    if session.status != "open":
+        raise UploadError("upload already completed", status=409)
+    if not 0 <= index < session.total_chunks:
+        raise UploadError("chunk index out of range")
+
+    length = session.chunk_length(index)
+    digest = hashlib.sha256()
+    written = 0
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as buf:
+        while written < length:
+            data = stream.read(min(IO_BLOCK, length - written))
+            if not data:
+                break
+            buf.write(data)
+            digest.update(data)
+            written += len(data)
+        extra = stream.read(1)
+
+        if written != length or extra:
+            raise UploadError(f"chunk {index} must be exactly {length} bytes")
+        if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+            raise UploadError("chunk checksum mismatch")
+
+        buf.seek(0)
+        with open(part_path(session), "r+b") as f:
+            f.seek(index * session.chunk_size)
+            shutil.copyfileobj(buf, f, IO_BLOCK)
+
+    UploadChunk.objects.update_or_create(
+        session=session,
+        index=index,
+        defaults={"size": written, "sha256": digest.hexdigest()},
+    )
+    return index
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def store_blob(path, sha256, filename, size):
+    """
+    같은 해시가 있으면 그걸 쓰고 path 는 지움, 없으면 path 파일을 저장소로 옮김
+    blob 은 사용자끼리 공유되니 경로의 파일이름은 처음 올린 사람 것 -> 화면/다운로드 이름은 Submission/GroupFile.filename
+    """
+    blob = StoredBlob.objects.filter(sha256=sha256).first()
+    if blob is not None:
+        os.remove(path)
+        return blob
+
+    # 같은 내용+이름이 동시에 올라와도 서로 다른 경로 (진 쪽이 지울 때 이긴 쪽 파일을 안 건드리게)
+    prefix = f"resources/blobs/{sha256[:2]}/{sha256}/{uuid.uuid4().hex[:8]}/"
+    # StoredBlob.file max_length 255 안으로 (확장자는 남김)
+    stem, ext = os.path.splitext(filename)
+    name = prefix + stem[: max(255 - len(prefix) - len(ext), 1)] + ext
+    try:
+        dest = default_storage.path(name)
+    except NotImplementedError:
+        # 로컬 경로가 없는 저장소(S3 등)는 스트리밍 복사
+        with open(path, "rb") as f:
+            name = default_storage.save(name, File(f))
+        os.remove(path)
+    else:
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(path, dest)
+
+    try:
+        with transaction.atomic():
+            return StoredBlob.objects.create(sha256=sha256, size=size, file=name)
+    except IntegrityError:
+        # 같은 내용이 동시에 완료됨 -> 먼저 만든 쪽 사용
+        blob = StoredBlob.objects.get(sha256=sha256)
+        if blob.file.name != name:
+            default_storage.delete(name)
+        return blob
+
+
+def blob_from_upload(uploaded_file, filename=None):
+    """
+    multipart 로 한 번에 받은 파일(UploadedFile)을 해시 계산하면서 임시 파일로 내린 뒤 StoredBlob 으로
+    (청크 업로드를 안 쓰는 기존 API 용)
+    """
+    filename = get_valid_filename(os.path.basename(filename or uploaded_file.name or "file"))[:200]
+    path = os.path.join(settings.MEDIA_ROOT, "uploads", "tmp", f"{uuid.uuid4()}.part")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "wb") as f:
+        for chunk in uploaded_file.chunks(IO_BLOCK):
+            f.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+    return store_blob(path, digest.hexdigest(), filename, size)
+
+
+def complete_session(session):
+    """
+    업로드 마무리 -> 대상 모델 객체 (Submission / GroupFile)
+    이미 완료된 세션이면 만들어둔 객체 그대로 (complete 재시도 안전)
+    """
+    check, create = TARGETS[session.target]
+
+    if session.status == "complete":
+        return _load_result(session)
+
+    received = session.chunks.count()
+    if received != session.total_chunks:
+        raise UploadError(f"missing chunks ({received}/{session.total_chunks})", status=409)
+
+    # complete 가 동시에 두 번 와도 조립은 한 번만
+    claimed = UploadSession.objects.filter(pk=session.pk, status="open").update(status="assembling")
+    if not claimed:
+        session.refresh_from_db()
+        if session.status == "complete":
+            return _load_result(session)
+        raise UploadError("upload is being completed", status=409)
+
+    try:
+        check(session.user, session.target_id, started_at=session.created_at)
+
+        if session.blob_id is None:
+            # (이전 시도에서 blob 까지 만들고 실패했으면 해시/이동은 건너뜀)
+            path = part_path(session)
+            sha256 = _file_sha256(path)
+            if session.sha256 and sha256 != session.sha256:
+                raise UploadError("file checksum mismatch")
+
+            session.blob = store_blob(path, sha256, session.filename, session.size)
+            session.save(update_fields=["blob"])
+
+        with transaction.atomic():
+            obj = create(session, session.blob)
+            session.status = "complete"
+            session.result_id = obj.pk
+            session.completed_at = timezone.now()
+            session.save(update_fields=["status", "result_id", "completed_at"])
+            session.chunks.all().delete()
+    except Exception:
+        UploadSession.objects.filter(pk=session.pk).update(status="open")
+        session.status = "open"
+        raise
+    return obj
+
+
+def _load_result(session):
+    if session.target == "submission":
+        from apps.learning.models import Submission
+        return Submission.objects.get(pk=session.result_id)
+    from apps.group.models import GroupFile
+    return GroupFile.objects.get(pk=session.result_id)
+
+
+def expire_sessions(now=None):
+    """TTL 지난 미완료 세션 + .part 파일 정리. 지운 세션 수"""
+    now = now or timezone.now()
+    cutoff = now - timedelta(hours=SESSION_TTL_HOURS)
+    stale = list(UploadSession.objects.filter(status="open", created_at__lt=cutoff))
+    for session in stale:
+        try:
+            os.remove(part_path(session))
+        except FileNotFoundError:
+            pass
+    UploadSession.objects.filter(pk__in=[s.pk for s in stale]).delete()
+    return len(stale)
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from apps.group.models import Group, GroupFile, GroupMember
+from apps.learning.models import Assignment, Course, StudentEnrollment, Submission
+
+from . import services
+from .models import StoredBlob, UploadSession
+
+
+class ChunkedUploadTest(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.student = User.objects.create_user(username="s1", password="pw")
+        self.course = Course.objects.create(title="C")
+        StudentEnrollment.objects.create(student=self.student, course=self.course)
+        self.assignment = Assignment.objects.create(
+            course=self.course,
+            title="A1",
+            description="",
+            due_date=timezone.now() + timedelta(hours=1),
+        )
+        self.body = b"0123456789" * 25  # 250 바이트 -> 100 바이트 청크 3개
+        self.client.force_login(self.student)
+
+    def _start(self, target="submission", target_id=None, body=None, **extra):
+        body = self.body if body is None else body
+        res = self.client.post("/api/uploads/", {
+            "target": target,
+            "target_id": target_id or self.assignment.id,
+            "filename": "report.pdf",
+            "size": len(body),
+            "chunk_size": 100,
+            "sha256": hashlib.sha256(body).hexdigest(),
+            **extra,
+        }, content_type="application/json")
+        return res
+
+    def _put(self, upload_id, index, data, **headers):
+        return self.client.put(
+            f"/api/uploads/{upload_id}/chunks/{index}/",
+            data=data,
+            content_type="application/octet-stream",
+            **headers,
+        )
+
+    def test_out_of_order_resumable_upload_creates_submission(self):
+        res = self._start()
+        self.assertEqual(res.status_code, 201)
+        upload = res.json()
+        self.assertEqual(upload["total_chunks"], 3)
+
+        self.assertEqual(self._put(upload["id"], 2, self.body[200:]).status_code, 200)
+        self.assertEqual(self._put(upload["id"], 0, self.body[:100]).status_code, 200)
+
+        # 중간에 끊김 -> 세션 조회해서 빠진 청크만
+        status = self.client.get(f"/api/uploads/{upload['id']}/").json()
+        self.assertEqual(sorted(status["received"]), [0, 2])
+        self.assertEqual(self.client.post(f"/api/uploads/{upload['id']}/complete/").status_code, 409)
+
+        self._put(upload["id"], 1, self.body[100:200])
+        res = self.client.post(f"/api/uploads/{upload['id']}/complete/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["filename"], "report.pdf")
+
+        submission = Submission.objects.get(assignment=self.assignment, student=self.student)
+        with submission.file.open("rb") as f:
+            self.assertEqual(f.read(), self.body)
+        self.assertTrue(submission.file.name.endswith("/report.pdf"))
+
+        # complete 재시도는 같은 결과
+        again = self.client.post(f"/api/uploads/{upload['id']}/complete/").json()
+        self.assertEqual(again["id"], submission.id)
+
+    def test_chunk_validation(self):
+        upload = self._start().json()
+        self.assertEqual(self._put(upload["id"], 0, b"short").status_code, 400)
+        self.assertEqual(self._put(upload["id"], 9, self.body[:100]).status_code, 400)
+        self.assertEqual(self._put(upload["id"], 0, b"").status_code, 400)
+        res = self._put(upload["id"], 0, self.body[:100], HTTP_X_CHUNK_SHA256="0" * 64)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.client.get(f"/api/uploads/{upload['id']}/").json()["received"], [])
+
+    def test_bad_resend_keeps_received_chunk(self):
+        upload = self._start().json()
+        for i in range(3):
+            self._put(upload["id"], i, self.body[i * 100:(i + 1) * 100])
+
+        # 이미 받은 청크를 깨진 내용으로 다시 보냄 -> 거절되고 원래 내용 그대로
+        res = self._put(upload["id"], 1, b"x" * 100, HTTP_X_CHUNK_SHA256="0" * 64)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self._put(upload["id"], 2, b"y" * 10).status_code, 400)
+
+        self.assertEqual(self.client.post(f"/api/uploads/{upload['id']}/complete/").status_code, 200)
+        with Submission.objects.get().file.open("rb") as f:
+            self.assertEqual(f.read(), self.body)
+
+    def test_identical_content_is_stored_once(self):
+        group = Group.objects.create(name="G", course=self.course)
+        other = User.objects.create_user(username="s2", password="pw")
+        GroupMember.objects.create(group=group, user=other)
+
+        upload = self._start().json()
+        for i in range(3):
+            self._put(upload["id"], i, self.body[i * 100:(i + 1) * 100])
+        self.client.post(f"/api/uploads/{upload['id']}/complete/")
+
+        # 다른 사용자가 같은 내용을 다른 이름으로 -> blob 은 공유, 이름은 자기 것
+        self.client.force_login(other)
+        upload = self._start(target="group-file", target_id=group.id, filename="notes.pdf").json()
+        for i in range(3):
+            self._put(upload["id"], i, self.body[i * 100:(i + 1) * 100])
+        result = self.client.post(f"/api/uploads/{upload['id']}/complete/").json()
+
+        self.assertNotIn("deduplicated", result)
+        self.assertEqual(result["filename"], "notes.pdf")
+        self.assertTrue(result["file_url"].endswith("/notes.pdf"))
+        self.assertEqual(StoredBlob.objects.count(), 1)
+        gf = GroupFile.objects.get(group=group)
+        self.assertEqual(gf.file.name, Submission.objects.get().file.name)
+
+        res = self.client.get(f"/api/files/group-file/{gf.id}/notes.pdf?download=1")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Disposition"], 'attachment; filename="notes.pdf"')
+        res.close()
+
+    def test_concurrent_identical_blob_keeps_winner_file(self):
+        sha256 = hashlib.sha256(self.body).hexdigest()
+
+        def part():
+            path = os.path.join(self.media, f"{uuid.uuid4()}.part")
+            with open(path, "wb") as f:
+                f.write(self.body)
+            return path
+
+        winner = services.store_blob(part(), sha256, "report.pdf", len(self.body))
+        # 진 쪽은 중복 확인 시점엔 아직 blob 이 없었던 상황
+        with mock.patch.object(services.StoredBlob.objects, "filter") as lookup:
+            lookup.return_value.first.return_value = None
+            loser = services.store_blob(part(), sha256, "report.pdf", len(self.body))
+
+        self.assertEqual(loser.pk, winner.pk)
+        with winner.file.open("rb") as f:
+            self.assertEqual(f.read(), self.body)
+
+    def test_requires_csrf_token(self):
+        # 다른 사이트에서 세션 쿠키만으로 제출을 덮어쓰지 못하게 (lib/api.js 의 apiFetch 가 X-CSRFToken 을 붙임)
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.student)
+        upload = self._start().json()
+        body = {"target": "submission", "target_id": self.assignment.id, "filename": "a.pdf", "size": 10}
+
+        self.assertEqual(client.post("/api/uploads/", body, content_type="application/json").status_code, 403)
+        res = client.put(
+            f"/api/uploads/{upload['id']}/chunks/0/", data=self.body[:100], content_type="application/octet-stream"
+        )
+        self.assertEqual(res.status_code, 403)
+        self.assertEqual(client.post(f"/api/uploads/{upload['id']}/complete/").status_code, 403)
+
+        client.cookies["csrftoken"] = "a" * 32
+        res = client.post("/api/uploads/", body, content_type="application/json", HTTP_X_CSRFTOKEN="a" * 32)
+        self.assertEqual(res.status_code, 201)
+
+    def test_permissions_and_deadline(self):
+        outsider = Group.objects.create(name="H", course=self.course)
+        self.assertEqual(self._start(target="group-file", target_id=outsider.id).status_code, 403)
+
+        self.assignment.due_date = timezone.now() - timedelta(minutes=1)
+        self.assignment.save()
+        self.assertEqual(self._start().status_code, 400)
+
+    def test_expire_sessions_removes_part_files(self):
+        upload = self._start().json()
+        session = UploadSession.objects.get(pk=upload["id"])
+        UploadSession.objects.filter(pk=session.pk).update(created_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(services.expire_sessions(), 1)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(services.part_path(session)))
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from .views import UploadChunkView, UploadCompleteView, UploadSessionCreateView, UploadSessionDetailView
+
+urlpatterns = [
+    path("uploads/", UploadSessionCreateView.as_view()),
+    path("uploads/<uuid:upload_id>/", UploadSessionDetailView.as_view()),
+    path("uploads/<uuid:upload_id>/chunks/<int:index>/", UploadChunkView.as_view()),
+    path("uploads/<uuid:upload_id>/complete/", UploadCompleteView.as_view()),
+]
@@ -0,0 +1,109 @@
+# apps/uploads/views.py
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.group.serializers import GroupFileSerializer
+from apps.learning.serializers import SubmissionSerializer
+
+from .models import UploadSession
+from .services import UploadError, complete_session, received_indexes, start_session, write_chunk
+
+
+def _session_data(session):
+    return {
+        "id": str(session.id),
+        "target": session.target,
+        "target_id": session.target_id,
+        "filename": session.filename,
+        "size": session.size,
+        "chunk_size": session.chunk_size,
+        "total_chunks": session.total_chunks,
+        "received": received_indexes(session),
+        "status": session.status,
+    }
+
+
+def _error(e):
+    return Response({"detail": str(e)}, status=e.status)
+
+
+class UploadSessionCreateView(APIView):
+    """
+    POST /api/uploads/
+    Body: { "target": "submission" | "group-file", "target_id": 과제 id / 그룹 id,
+            "filename": "report.pdf", "size": 바이트, "sha256": "(선택)", "chunk_size": (선택) }
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        data = request.data
+        try:
+            session = start_session(
+                request.user,
+                target=data.get("target"),
+                target_id=data.get("target_id"),
+                filename=data.get("filename"),
+                size=data.get("size"),
+                sha256=data.get("sha256", ""),
+                chunk_size=data.get("chunk_size"),
+            )
+        except UploadError as e:
+            return _error(e)
+        return Response(_session_data(session), status=status.HTTP_201_CREATED)
+
+
+class UploadSessionDetailView(APIView):
+    """
+    GET /api/uploads/<id>/
+    - 이어 올리기 전에 이미 받은 청크 번호(received) 확인
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+        return Response(_session_data(session))
+
+
+class UploadChunkView(APIView):
+    """
+    PUT /api/uploads/<id>/chunks/<index>/
+    - body 는 청크 바이트 그대로 (Content-Type: application/octet-stream)
+    - X-Chunk-Sha256 헤더가 있으면 검증
+    """
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, upload_id, index):
+        session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+        # Content-Length 가 0 이거나 없으면 DRF 의 request.stream 이 None
+        if request.stream is None:
+            return Response({"detail": "chunk body is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # request.data 를 건드리지 않고 stream 에서 바로 읽음 (파서/메모리 안 거침)
+            write_chunk(session, index, request.stream, request.headers.get("X-Chunk-Sha256", ""))
+        except UploadError as e:
+            return _error(e)
+        return Response({"index": index, "received": session.chunks.count()})
+
+
+class UploadCompleteView(APIView):
+    """
+    POST /api/uploads/<id>/complete/
+    - 파일 해시 확인 후 Submission / GroupFile 생성 (응답은 기존 업로드 API 와 같은 포맷)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+        try:
+            obj = complete_session(session)
+        except UploadError as e:
+            return _error(e)
+
+        if session.target == "submission":
+            data = SubmissionSerializer(obj).data
+        else:
+            data = GroupFileSerializer(obj, context={"request": request}).data
+        return Response(data, status=status.HTTP_200_OK)
@@ -11,6 +11,7 @@ django_asgi_app = get_asgi_application()
 # 🔹 settings 로드된 다음에 import 해야 함
 import apps.group.routing
 from apps.consultation import routing as consultation_routing
+from apps.group.buffer import lifespan as group_chat_lifespan
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
@@ -20,4 +21,6 @@ application = ProtocolTypeRouter({
             + consultation_routing.websocket_urlpatterns
         )
     ),
+    # 워커 종료 시 채팅 write-behind 버퍼 저장 (lifespan 보내는 서버에서)
+    "lifespan": group_chat_lifespan,
 })
@@ -0,0 +1,272 @@
+# myproject/files.py
+"""
+업로드 파일 전달 (강의 자료 PDF/영상, 과제 제출, 그룹 파일, 메시지 첨부)
+
+- GET /api/files/<kind>/<pk>/<파일이름>  (파일이름은 링크 표시용, 없어도 됨)
+- 권한 체크는 장고에서, 실제 전송은
+  - FILE_OFFLOAD = "nginx"  -> X-Accel-Redirect (nginx 가 Range/캐시 다 처리)
+  - FILE_OFFLOAD = "apache" -> X-Sendfile
+  - ""(기본)               -> 장고가 직접 (Range / ETag / Last-Modified 지원)
+- 장고가 직접 보낼 때 전체 파일이면 FileResponse 에 진짜 파일 객체를 넘겨서
+  WSGI 서버(gunicorn 등)가 wsgi.file_wrapper(sendfile) 로 보낼 수 있게 함
+
+nginx 예시 (FILE_OFFLOAD_PREFIX = "/protected/")
+    location /protected/media/ { internal; alias <MEDIA_ROOT>/; }
+    location /protected/course_messages/ { internal; alias <BASE_DIR>/course_messages/; }
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import reverse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+OFFLOAD = getattr(settings, "FILE_OFFLOAD", "")
+OFFLOAD_PREFIX = getattr(settings, "FILE_OFFLOAD_PREFIX", "/protected/")
+BLOCK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _roots():
+    # 오프로드 경로 이름 -> 실제 디렉터리
+    return {
+        "media": str(settings.MEDIA_ROOT),
+        "course_messages": str(settings.BASE_DIR / "course_messages"),
+    }
+
+
+class _RangeReader:
+    """파일의 start 부터 length 바이트만 읽히게 (FileResponse 에 넘김)"""
+
+    def __init__(self, f, start, length):
+        self.f = f
+        self.remaining = length
+        f.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def parse_range(header, size):
+    """
+    "bytes=a-b" 하나만 지원 -> (start, end) (end 포함)
+    - 헤더가 없거나 여러 구간이면 None (전체 파일로 응답해도 됨)
+    - 범위가 파일 밖이면 ValueError (416)
+    """
+    if not header:
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None
+    first, last = m.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # bytes=-500 : 마지막 500 바이트
+        length = int(last)
+        if length == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+def _etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _disposition(filename, as_attachment):
+    kind = "attachment" if as_attachment else "inline"
+    try:
+        filename.encode("ascii")
+        return f'{kind}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{kind}; filename*=utf-8''{quote(filename)}"
+
+
+def serve_file(request, path, root="media", filename=None, as_attachment=False):
+    """
+    root 디렉터리 안의 path 파일을 응답 (권한 체크는 호출하는 쪽에서)
+    """
+    base = _roots()[root]
+    try:
+        full_path = safe_join(base, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found")
+
+    filename = filename or os.path.basename(full_path)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if OFFLOAD in ("nginx", "apache"):
+        response = HttpResponse(content_type=content_type)
+        if OFFLOAD == "nginx":
+            rel = os.path.relpath(full_path, base).replace(os.sep, "/")
+            response["X-Accel-Redirect"] = quote(f"{OFFLOAD_PREFIX.rstrip('/')}/{root}/{rel}")
+        else:
+            response["X-Sendfile"] = full_path
+        response["Content-Disposition"] = _disposition(filename, as_attachment)
+        return response
+
+    stat = os.stat(full_path)
+    etag = _etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    # If-None-Match / If-Modified-Since -> 304, If-Match 실패 -> 412
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        return conditional
+
+    size = stat.st_size
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range and not _if_range_matches(request, etag, last_modified):
+        byte_range = None
+
+    f = open(full_path, "rb")
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(_RangeReader(f, start, length), status=206, content_type=content_type)
+        response.block_size = BLOCK_SIZE
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        response = FileResponse(f, content_type=content_type)
+        response.block_size = BLOCK_SIZE
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "private, max-age=0, must-revalidate"
+    response["Content-Disposition"] = _disposition(filename, as_attachment)
+    return response
+
+
+# ---------------------------------------------------------------------------
+# 모델별 파일 + 권한
+# ---------------------------------------------------------------------------
+
+def _is_manager(user):
+    local = getattr(user, "local_account", None)
+    return bool(user.is_staff or (local and local.role == "MG"))
+
+
+def _lesson(user, pk):
+    from apps.learning.models import Lesson, StudentEnrollment
+
+    lesson = Lesson.objects.select_related("course").filter(pk=pk).first()
+    if lesson is None:
+        return None, False
+    allowed = (
+        lesson.course.instructor_id == user.id
+        or StudentEnrollment.objects.filter(course_id=lesson.course_id, student=user).exists()
+    )
+    return lesson.file, allowed
+
+
+def _submission(user, pk):
+    from apps.learning.models import Submission
+
+    sub = Submission.objects.select_related("assignment__course").filter(pk=pk).first()
+    if sub is None:
+        return None, False
+    allowed = sub.student_id == user.id or sub.assignment.course.instructor_id == user.id
+    return sub.file, allowed
+
+
+def _group_file(user, pk):
+    from apps.group.models import GroupFile, GroupMember
+
+    gf = GroupFile.objects.filter(pk=pk).first()
+    if gf is None:
+        return None, False
+    allowed = GroupMember.objects.filter(group_id=gf.group_id, user=user).exists()
+    return gf.file, allowed
+
+
+def _message(user, pk):
+    from apps.message.models import CourseMessage
+
+    msg = CourseMessage.objects.select_related("thread__course").filter(pk=pk).first()
+    if msg is None:
+        return None, False
+    thread = msg.thread
+    allowed = user.id in (msg.sender_id, thread.creator_id, thread.course.instructor_id)
+    return msg.attachment, allowed
+
+
+FILE_KINDS = {
+    "lesson": _lesson,
+    "submission": _submission,
+    "group-file": _group_file,
+    "message": _message,
+}
+
+
+def resolve_file(user, kind, pk):
+    """(FieldFile, 권한 있는지). 매니저/스태프는 전부 허용"""
+    lookup = FILE_KINDS.get(kind)
+    if lookup is None:
+        raise Http404("Unknown file kind")
+    field_file, allowed = lookup(user, pk)
+    if not field_file:
+        raise Http404("File not found")
+    if not (allowed or _is_manager(user)):
+        raise PermissionDenied
+    return field_file
+
+
+def display_name(field_file):
+    """
+    보여줄 파일이름. 모델에 filename(올린 사람이 보낸 이름)이 있으면 그것
+    (Submission/GroupFile 의 file 은 사용자끼리 공유하는 blob 경로라 이름이 남의 것일 수 있음)
+    """
+    return getattr(field_file.instance, "filename", "") or os.path.basename(field_file.name)
+
+
+def protected_file_url(request, kind, pk, field_file):
+    """serializer 에서 쓰는 다운로드 링크 (파일 없으면 None)"""
+    if not field_file:
+        return None
+    url = reverse("protected-file", kwargs={
+        "kind": kind,
+        "pk": pk,
+        "filename": display_name(field_file),
+    })
+    return request.build_absolute_uri(url) if request else url
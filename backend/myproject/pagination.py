@@ -0,0 +1,69 @@
+# myproject/pagination.py
+"""
+(시각, id) keyset 페이지네이션 (최근 순, 앞으로만)
+
+- 커서 = 이전 페이지 마지막 줄의 (ordering_field, id)
+  다음 페이지는 (ordering_field, id) < 커서 인 것 -> 시각이 겹쳐도 id 로 이어져서 빠지거나 겹치는 줄 없음
+  (DRF CursorPagination 은 ordering 첫 필드만 위치로 쓰고 나머지는 offset 이라 같은 시각이 많으면 느려짐.
+   id 처럼 유일한 필드 하나로 정렬할 때는 CursorPagination 그대로 써도 됨)
+- (…, ordering_field) 인덱스를 그대로 타서 뒤 페이지도 빠름
+- 응답: {next, results}
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    ordering_field = None  # 하위 클래스에서 (null 없는 DateTimeField)
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+
+    def _page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def _encode(self, obj):
+        raw = f"{getattr(obj, self.ordering_field).isoformat()}|{obj.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def _decode(self, cursor):
+        try:
+            at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+            return datetime.fromisoformat(at), int(pk)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            raise NotFound("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        field = self.ordering_field
+        size = self._page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            at, pk = self._decode(cursor)
+            queryset = queryset.filter(Q(**{f"{field}__lt": at}) | Q(**{field: at, "id__lt": pk}))
+
+        rows = list(queryset.order_by(f"-{field}", "-id")[: size + 1])
+        self.has_next = len(rows) > size
+        self.page = rows[:size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self._encode(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
@@ -5,6 +5,7 @@ Generated by 'django-admin startproject' using Django 5.2.
 
 import os
 from pathlib import Path
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
     "apps.eval",
     "apps.schedule",
     "apps.notice",
+    "apps.uploads",
     
     # 'apps.group', 
     'apps.group.apps.GroupConfig',
@@ -200,6 +202,28 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/resource/'
 MEDIA_ROOT = BASE_DIR / 'resource'
 
+# 업로드 파일 전달 (myproject/files.py)
+# - "" : 장고가 직접 (Range/ETag 지원)
+# - "nginx" : X-Accel-Redirect 로 넘김 (FILE_OFFLOAD_PREFIX 아래 internal location 필요)
+# - "apache" : X-Sendfile
+FILE_OFFLOAD = os.getenv("FILE_OFFLOAD", "")
+FILE_OFFLOAD_PREFIX = os.getenv("FILE_OFFLOAD_PREFIX", "/protected/")
+
+# 청크 업로드 (apps/uploads). 청크는 한 요청에 하나씩 받아서 .part 파일 제자리에 씀
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+UPLOAD_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", str(500 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = 24  # 이보다 오래된 미완료 업로드는 cleanup_uploads 로 정리
+
+# 과제 제출 후처리 (apps/learning/submissions.py, 워커: manage.py process_submissions)
+SUBMISSION_MAX_SIZE = 100 * 1024 * 1024
+SUBMISSION_BLOCKED_EXTENSIONS = (".exe", ".bat", ".cmd", ".com", ".scr", ".msi")
+SUBMISSION_SCANNER = os.getenv("SUBMISSION_SCANNER", "")  # "모듈.함수" (파일 경로 받아서 감염이면 ValueError)
+# 1 이면 워커 없이 요청 안에서 커밋 직후 바로 처리 (개발용). 기본은 큐에 쌓고 워커가 처리
+SUBMISSION_JOBS_INLINE = os.getenv("SUBMISSION_JOBS_INLINE", "0") == "1"
+# running 인 채로 이 시간(초)이 지나면 워커가 죽은 걸로 보고 다시 queued
+SUBMISSION_JOB_LEASE_SECONDS = int(os.getenv("SUBMISSION_JOB_LEASE_SECONDS", str(15 * 60)))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -215,6 +239,11 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# 사이드바 폴링: 프론트가 ETag 를 읽고 If-None-Match 로 다시 보낼 수 있게
+# 청크 업로드: 청크마다 X-Chunk-Sha256 헤더
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match", "x-chunk-sha256")
+CORS_EXPOSE_HEADERS = ["ETag"]
+
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:3000",
     "http://127.0.0.1:3000",
@@ -226,9 +255,108 @@ CSRF_TRUSTED_ORIGINS = [
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
 
-# 웹소켓 관련 (개발용 InMemory. 운영 시 Redis 백엔드로 교체)
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
-    },
-}
+# solved.ac 공용 클라이언트 (apps/challenge/solvedac_client.py)
+SOLVEDAC_BASE_URL = os.getenv("SOLVEDAC_BASE_URL", "https://solved.ac/api/v3")
+SOLVEDAC_CLIENT_CACHE_TTL = 60  # 핸들별 응답 캐시(초)
+
+# 챌린지 화면 payload 캐시 (stale-while-revalidate)
+CHALLENGE_CACHE_FRESH_TTL = 120  # 이 시간 안이면 그대로 응답(초)
+CHALLENGE_CACHE_STALE_TTL = 24 * 60 * 60  # 이 시간까지는 이전 값 응답 + 백그라운드 갱신(초)
+
+# solved.ac 백그라운드 동기화 (manage.py sync_solvedac)
+SOLVEDAC_SYNC_TTL = int(os.getenv("SOLVEDAC_SYNC_TTL", "600"))  # 핸들별 재호출 간격(초)
+SOLVEDAC_SYNC_MIN_INTERVAL = float(os.getenv("SOLVEDAC_SYNC_MIN_INTERVAL", "0.5"))  # 요청 간 최소 간격(초)
+SOLVEDAC_SYNC_BASE_BACKOFF = 60
+SOLVEDAC_SYNC_MAX_BACKOFF = 6 * 60 * 60
+
+# 그룹 채팅 히스토리 (keyset 페이지네이션 / 웹소켓 접속 시 replay 개수)
+GROUP_CHAT_PAGE_SIZE = 50
+GROUP_CHAT_MAX_PAGE_SIZE = 200
+GROUP_CHAT_REPLAY_SIZE = 50
+# 그룹 채팅 write-behind 버퍼 (apps/group/buffer.py). 0 이면 메시지마다 바로 저장
+GROUP_CHAT_FLUSH_INTERVAL_MS = int(os.getenv("GROUP_CHAT_FLUSH_INTERVAL_MS", "50"))
+GROUP_CHAT_FLUSH_BATCH = 100
+
+# 그룹 페이지 블록 트리 캐시(초). 문서가 바뀌면 그룹 버전이 올라가서 바로 무효화됨
+GROUP_PAGE_TREE_CACHE_TTL = 300
+# 페이지 동시 편집 (apps/group/collab.py): 메모리에 모아둔 블록 편집을 DB 에 저장하는 주기(ms)
+GROUP_DOC_CHECKPOINT_MS = int(os.getenv("GROUP_DOC_CHECKPOINT_MS", "1000"))
+
+# 상담 추천 답변 (apps/consultation/suggestions.py): LLM 은 요청 밖 스레드 풀에서, 결과는 웹소켓 push
+CONSULTATION_SUGGESTION_CACHE_TTL = 24 * 60 * 60  # 같은 질문(정규화 텍스트 해시) LLM 답 캐시(초)
+CONSULTATION_SUGGESTION_WORKERS = int(os.getenv("CONSULTATION_SUGGESTION_WORKERS", "4"))
+# 1 이면 LLM 답을 SSE 로 받아 웹소켓으로 조각(suggestion_delta)씩 흘려보냄
+CONSULTATION_SUGGESTION_STREAM = os.getenv("CONSULTATION_SUGGESTION_STREAM", "0") == "1"
+# 스트리밍 시작 이벤트를 이 초 안에 받아 간 학생 소켓이 없으면 스레드 풀로 생성
+CONSULTATION_SUGGESTION_STREAM_CLAIM_TIMEOUT = float(os.getenv("CONSULTATION_SUGGESTION_STREAM_CLAIM_TIMEOUT", "2.0"))
+# LLM 공급자 라우터 (apps/consultation/router.py)
+CONSULTATION_LLM_HEDGE_BUDGET = float(os.getenv("CONSULTATION_LLM_HEDGE_BUDGET", "2.0"))  # 첫 공급자 답이 이 초 안에 없으면 다음 공급자도 같이
+CONSULTATION_LLM_BREAKER_FAILURES = int(os.getenv("CONSULTATION_LLM_BREAKER_FAILURES", "3"))  # 연속 실패 몇 번에 차단
+CONSULTATION_LLM_BREAKER_COOLDOWN = float(os.getenv("CONSULTATION_LLM_BREAKER_COOLDOWN", "30"))  # 차단 후 다시 시험해 볼 때까지(초)
+
+# 웹소켓 채널 레이어
+# - memory: 개발용 (같은 프로세스 소켓끼리만 브로드캐스트됨 -> ASGI 워커 1개일 때만)
+# - redis: channels_redis (워커 여러 개 / 서버 여러 대). redis-server 나 fakeredis TCP 서버로도 테스트 가능
+# - redis-pubsub: Redis Pub/Sub 기반 레이어 (Lua 스크립트 안 씀)
+CHANNEL_LAYER_BACKEND = os.getenv("CHANNEL_LAYER_BACKEND", "memory")
+CHANNEL_REDIS_URL = os.getenv("CHANNEL_REDIS_URL", "redis://127.0.0.1:6379/0")
+
+if CHANNEL_LAYER_BACKEND == "redis":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [CHANNEL_REDIS_URL],
+                "prefix": os.getenv("CHANNEL_REDIS_PREFIX", "dororo"),
+                "capacity": int(os.getenv("CHANNEL_LAYER_CAPACITY", "1000")),  # 채널별 대기 메시지 최대
+                "expiry": 60,
+                "group_expiry": 24 * 60 * 60,
+            },
+        },
+    }
+elif CHANNEL_LAYER_BACKEND == "redis-pubsub":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.pubsub.RedisPubSubChannelLayer",
+            "CONFIG": {
+                "hosts": [CHANNEL_REDIS_URL],
+                "prefix": os.getenv("CHANNEL_REDIS_PREFIX", "dororo"),
+            },
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+        },
+    }
+
+# 캐시
+# - locmem: 개발용 (프로세스마다 따로 -> 워커 1개일 때만. 다른 워커에서 무효화해도 안 보임)
+# - redis: 워커 여러 개 / 서버 여러 대. 페이지 트리 버전, 출석 캐시, 추천 답변 claim 등이 워커끼리 공유돼야 함
+#   채널 레이어를 redis 로 쓰면(=워커 여러 개) 기본값도 redis
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis" if CHANNEL_LAYER_BACKEND.startswith("redis") else "locmem")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", CHANNEL_REDIS_URL)
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "dororo-cache"),
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+
+# 출석 6칸 윈도우 캐시(초). 무효화(cache.delete)가 모든 워커에 보이는 공유 캐시일 때만 하루
+GAMIFICATION_ATTENDANCE_CACHE_TTL = int(os.getenv(
+    "GAMIFICATION_ATTENDANCE_CACHE_TTL", str(24 * 60 * 60 if CACHE_BACKEND == "redis" else 60)
+))
+
+# 웹소켓 방별 접속/팬아웃 지연 지표 (myproject/ws_metrics.py)
+WS_METRICS_SAMPLE_SIZE = 500  # 방마다 최근 팬아웃 지연 샘플 개수
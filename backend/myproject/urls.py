@@ -4,7 +4,7 @@ from rest_framework.routers import DefaultRouter
 from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import re_path
-from .views import serve_course_message_file
+from .views import protected_file_view, serve_course_message_file, ws_metrics_view
 
 
 
@@ -26,18 +26,15 @@ urlpatterns = [
     path("api/", include("apps.message.urls")),
     path("api/", include("apps.eval.urls")),
     path("api/", include("apps.schedule.urls")), 
+    path("api/", include("apps.uploads.urls")),
     re_path(r"^course_messages/(?P<path>.*)$", serve_course_message_file),
+    path("api/ws-metrics/", ws_metrics_view),
+    path("api/files/<str:kind>/<int:pk>/", protected_file_view),
+    path("api/files/<str:kind>/<int:pk>/<str:filename>", protected_file_view, name="protected-file"),
 
     
     path('api/', include(router.urls)),
 ]
 
-if settings.DEBUG:
-    # 👇 이 한 줄이 "course_messages 폴더 전체를 /course_messages/ 밑으로 서빙해줘" 라는 뜻이야
-    urlpatterns += static(
-        "/course_messages/",
-        document_root=settings.BASE_DIR / "course_messages",
-    )
-
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -1,15 +1,60 @@
 # myproject/views.py
-from django.http import FileResponse, Http404
-from django.conf import settings
-import os
+from django.db.models import Q
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 
+from .files import display_name, resolve_file, serve_file
+from .ws_metrics import metrics
+
+@require_safe
 def serve_course_message_file(request, path):
-    file_path = os.path.join(settings.BASE_DIR, "course_messages", path)
-    if not os.path.exists(file_path):
+    """
+    예전 경로 /course_messages/<path> (BASE_DIR/course_messages). 브라우저가 '저장'으로 처리하게 attachment
+    - /api/files/message/ 와 같은 권한: 그 파일이 붙은 메시지를 찾아서 resolve_file("message") 로 확인
+    - 어떤 메시지에도 안 붙은 파일은 404
+    """
+    from apps.message.models import CourseMessage
+
+    if not request.user.is_authenticated:
+        return HttpResponse(status=401)
+    message_id = (
+        CourseMessage.objects
+        .filter(Q(attachment=path) | Q(attachment=f"course_messages/{path}") | Q(attachment__endswith=f"/{path}"))
+        .values_list("id", flat=True)
+        .first()
+    )
+    if message_id is None:
         raise Http404("File not found")
+    resolve_file(request.user, "message", message_id)
+    return serve_file(request, path, root="course_messages", as_attachment=True)
+
+
+@require_safe
+def protected_file_view(request, kind, pk, filename=None):
+    """
+    GET /api/files/<kind>/<pk>/<filename>
+    - kind: lesson / submission / group-file / message
+    - 권한 체크 후 Range/ETag 지원해서 보내거나 nginx 로 넘김 (myproject/files.py)
+    """
+    if not request.user.is_authenticated:
+        return HttpResponse(status=401)
+    field_file = resolve_file(request.user, kind, pk)
+    return serve_file(
+        request,
+        field_file.name,
+        filename=display_name(field_file),
+        as_attachment=request.GET.get("download") == "1",
+    )
+
 
-    # FileResponse는 자동으로 Content-Disposition 헤더를 붙여줘서
-    # 브라우저가 '저장'으로 처리함
-    response = FileResponse(open(file_path, "rb"))
-    response["Content-Disposition"] = f'attachment; filename="{os.path.basename(file_path)}"'
-    return response
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def ws_metrics_view(request):
+    """
+    GET /api/ws-metrics/
+    - 이 워커의 웹소켓 방별 접속 수 / 팬아웃 지연 (관리자만)
+    """
+    return Response(metrics.snapshot())
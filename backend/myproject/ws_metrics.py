@@ -0,0 +1,109 @@
+# myproject/ws_metrics.py
+"""
+웹소켓 방(room)별 지표 (프로세스 단위)
+- 현재 접속 수 / 최대 접속 수
+- 팬아웃 지연: group_send 한 시각(sent_at) -> 각 소켓 핸들러에서 받은 시각 차이
+
+워커가 여러 개면 워커마다 따로 집계됨 (GET /api/ws-metrics/ 는 응답한 워커 값)
+"""
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+SAMPLE_SIZE = getattr(settings, "WS_METRICS_SAMPLE_SIZE", 500)
+
+
+class _RoomStats:
+    __slots__ = ("connections", "peak", "delivered", "latency_total", "latency_max", "samples")
+
+    def __init__(self):
+        self.connections = 0
+        self.peak = 0
+        self.delivered = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class WsMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rooms = {}
+
+    def _room(self, room):
+        stats = self._rooms.get(room)
+        if stats is None:
+            stats = self._rooms[room] = _RoomStats()
+        return stats
+
+    def connected(self, room):
+        with self._lock:
+            stats = self._room(room)
+            stats.connections += 1
+            stats.peak = max(stats.peak, stats.connections)
+
+    def disconnected(self, room):
+        with self._lock:
+            stats = self._rooms.get(room)
+            if stats is None:
+                return
+            stats.connections = max(stats.connections - 1, 0)
+            # 아무도 없고 팬아웃 기록도 없으면 정리 (방이 계속 쌓이지 않게)
+            if stats.connections == 0 and not stats.delivered:
+                del self._rooms[room]
+
+    def observe_fanout(self, room, sent_at):
+        """group_send 이벤트에 실어 보낸 sent_at(time.time()) 으로 지연 기록"""
+        if not sent_at:
+            return
+        latency = max(time.time() - float(sent_at), 0.0)
+        with self._lock:
+            stats = self._room(room)
+            stats.delivered += 1
+            stats.latency_total += latency
+            stats.latency_max = max(stats.latency_max, latency)
+            stats.samples.append(latency)
+
+    def snapshot(self):
+        with self._lock:
+            rooms = {}
+            for room, stats in self._rooms.items():
+                samples = sorted(stats.samples)
+                rooms[room] = {
+                    "connections": stats.connections,
+                    "peak_connections": stats.peak,
+                    "delivered": stats.delivered,
+                    "fanout_avg_ms": _ms(stats.latency_total / stats.delivered) if stats.delivered else None,
+                    "fanout_p50_ms": _ms(_percentile(samples, 50)),
+                    "fanout_p95_ms": _ms(_percentile(samples, 95)),
+                    "fanout_max_ms": _ms(stats.latency_max) if stats.delivered else None,
+                }
+
+        return {
+            "worker": f"{socket.gethostname()}:{os.getpid()}",
+            "channel_layer": settings.CHANNEL_LAYERS["default"]["BACKEND"],
+            "total_connections": sum(r["connections"] for r in rooms.values()),
+            "rooms": rooms,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._rooms.clear()
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+metrics = WsMetrics()
@@ -67,6 +67,7 @@ export default function CounselDetailPage() {
     socket.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
+        if (data.type === "suggestion" || data.type === "suggestion_delta") return; // 학생 화면용 추천 답변
         setDetail((prev) => {
           if (!prev) return prev;
           return {
@@ -5,7 +5,7 @@
 import Link from "next/link";
 import styles from "./counsel.module.css";
 import { useEffect, useState } from "react";
-import { fetchConsultations } from "@/lib/consultation";
+import { fetchConsultationPage } from "@/lib/consultation";
 
 const formatDateTime = (iso) => {
   if (!iso) return "";
@@ -21,27 +21,32 @@ const formatDateTime = (iso) => {
   }
 };
 
+const normalize = (c) => ({
+  id: c.id,
+  title: c.title || "무제",
+  status: c.status,
+  last_message: c.last_message,
+  last_message_at: c.last_message_at || c.created_at,
+  last_message_sender_type: c.last_message_sender_type,
+  created_at: c.created_at,
+});
+
 export default function CounselPage() {
   const [counselList, setCounselList] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
+  // 진행 중인 상담만, 최근 메시지 순으로 한 페이지씩 (서버 커서 페이지네이션)
   useEffect(() => {
     const load = async () => {
       setLoading(true);
       setError(null);
       try {
-        const data = await fetchConsultations();
-        const normalized = (data || []).map((c) => ({
-          id: c.id,
-          title: c.title || "무제",
-          status: c.status,
-          last_message: c.last_message,
-          last_message_at: c.last_message_at || c.created_at,
-          last_message_sender_type: c.last_message_sender_type,
-          created_at: c.created_at,
-        }));
-        setCounselList(normalized);
+        const data = await fetchConsultationPage({ status: "IN_PROGRESS" });
+        setCounselList((data?.results || []).map(normalize));
+        setNextUrl(data?.next || null);
       } catch (err) {
         setError(err?.detail || "상담 목록을 불러오지 못했습니다.");
       } finally {
@@ -51,22 +56,41 @@ export default function CounselPage() {
     load();
   }, []);
 
-  // 폴링: 목록 갱신 (새 메시지/상태 반영)
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchConsultationPage({ status: "IN_PROGRESS", nextUrl });
+      const more = (data?.results || []).map(normalize);
+      setCounselList((prev) => {
+        const ids = new Set(prev.map((c) => c.id));
+        return [...prev, ...more.filter((c) => !ids.has(c.id))];
+      });
+      setNextUrl(data?.next || null);
+    } catch (err) {
+      setError(err?.detail || "상담 목록을 더 불러오지 못했습니다.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // 폴링: 첫 페이지만 다시 받아서 합침 (새 메시지/상태 반영)
+  // 첫 페이지 범위 안에서 빠진 건(종료 등) 지우고, 그보다 오래된 건 이미 불러온 그대로
   useEffect(() => {
     const timer = setInterval(async () => {
       if (document.visibilityState !== "visible") return;
       try {
-        const data = await fetchConsultations();
-        const normalized = (data || []).map((c) => ({
-          id: c.id,
-          title: c.title || "무제",
-          status: c.status,
-          last_message: c.last_message,
-          last_message_at: c.last_message_at || c.created_at,
-          last_message_sender_type: c.last_message_sender_type,
-          created_at: c.created_at,
-        }));
-        setCounselList(normalized);
+        const data = await fetchConsultationPage({ status: "IN_PROGRESS" });
+        const fresh = (data?.results || []).map(normalize);
+        setCounselList((prev) => {
+          if (!data?.next) return fresh;
+          const ids = new Set(fresh.map((c) => c.id));
+          const oldest = new Date(fresh[fresh.length - 1]?.last_message_at || 0);
+          const older = prev.filter(
+            (c) => !ids.has(c.id) && new Date(c.last_message_at) < oldest
+          );
+          return [...fresh, ...older];
+        });
       } catch {
         // ignore
       }
@@ -115,6 +139,12 @@ export default function CounselPage() {
           </div>
         ))}
       </div>
+
+      {nextUrl && (
+        <button className={styles.replyBtn} onClick={loadMore} disabled={loadingMore}>
+          {loadingMore ? "불러오는 중..." : "더 보기"}
+        </button>
+      )}
     </div>
   );
 }
@@ -5,23 +5,7 @@ import styles from "./assignmentDetail.module.css";
 import Image from "next/image";
 import { useParams } from 'next/navigation';
 import Sidebar from "@/components/Sidebar.js";
-
-function getCookie(name) {
-  let cookieValue = null;
-  if (typeof document === "undefined") return null;
-
-  if (document.cookie && document.cookie !== "") {
-    const cookies = document.cookie.split(";");
-    for (let i = 0; i < cookies.length; i++) {
-      const cookie = cookies[i].trim();
-      if (cookie.substring(0, name.length + 1) === name + "=") {
-        cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
-        break;
-      }
-    }
-  }
-  return cookieValue;
-}
+import { uploadInChunks } from "@/lib/uploads";
 
 export default function AssignmentDetailPage() {
   const params = useParams();
@@ -81,21 +65,13 @@ export default function AssignmentDetailPage() {
       return;
     }
 
-    const formData = new FormData();
-    formData.append("file", selectedFile);
-
     try {
-      const res = await fetch(
-        `http://localhost:8000/api/student/course/${courseId}/assignment/${assignmentId}/`,
-        {
-          headers: {"X-CSRFToken": getCookie("csrftoken"),},
-          method: "POST",
-          body: formData,
-          credentials: "include",
-        }
-      );
-
-      if (!res.ok) throw new Error("제출 실패");
+      // 청크 업로드 (마감 직전에 끊겨도 다시 누르면 이어서 올라감)
+      await uploadInChunks({
+        target: "submission",
+        targetId: assignmentId,
+        file: selectedFile,
+      });
 
       alert("제출 완료되었습니다!");
 
@@ -7,6 +7,7 @@ export default function ChatPanel({
   groupId,
   chatMessages,
   addChatMessage,
+  confirmChatMessages,
 }) {
   const [chatInput, setChatInput] = useState("");
   const socketRef = useRef(null);
@@ -32,6 +33,11 @@ export default function ChatPanel({
     ws.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
+        // 서버 저장 완료 -> 임시 id 를 실제 id 로
+        if (data.type === "chat_message_saved") {
+          confirmChatMessages?.(data.ids);
+          return;
+        }
         if (data.type !== "chat_message") return;
 
         addChatMessage({
@@ -36,35 +36,48 @@ export default function FolderTree({ courseId }) {
   }, []);
 
   // Load folder/page tree
+  // 15초마다 폴링. 서버가 ETag 를 주니까 안 바뀌었으면 304 (본문 없음)
+  const etagRef = useRef(null);
+
   useEffect(() => {
+    etagRef.current = null;
+
     const fetchPages = async () => {
       if (!groupId) return;
       try {
+        const headers = etagRef.current ? { "If-None-Match": etagRef.current } : {};
         const res = await fetch(`${API_BASE}/api/group/${groupId}/pages/`, {
           credentials: "include",
+          headers,
+          cache: "no-store",
         });
-        if (!res.ok) return;
+        if (res.status === 304 || !res.ok) return;
+        etagRef.current = res.headers.get("ETag");
         const data = await res.json();
-        const mapped = data
-          .sort((a, b) => (a.order_index || 0) - (b.order_index || 0))
-          .map((f) => ({
-            id: f.id,
-            name: f.name || "페이지",
-            isOpen: true,
-            items: (f.items || []).sort((a, b) => (a.order_index || 0) - (b.order_index || 0)),
-          }));
-        setFolders(
-          mapped.length
+        setFolders((prev) => {
+          // 폴링으로 다시 받아도 접힘/펼침 상태는 유지
+          const openState = new Map(prev.map((f) => [f.id, f.isOpen]));
+          const mapped = data
+            .sort((a, b) => (a.order_index || 0) - (b.order_index || 0))
+            .map((f) => ({
+              id: f.id,
+              name: f.name || "페이지",
+              isOpen: openState.has(f.id) ? openState.get(f.id) : true,
+              items: (f.items || []).sort((a, b) => (a.order_index || 0) - (b.order_index || 0)),
+            }));
+          return mapped.length
             ? mapped
             : [
                 { id: ROOT_ID, name: "페이지", isOpen: true, items: [] },
-              ]
-        );
+              ];
+        });
       } catch (err) {
         console.error(err);
       }
     };
     fetchPages();
+    const timer = setInterval(fetchPages, 15000);
+    return () => clearInterval(timer);
   }, [groupId]);
 
   // Drag handlers
@@ -152,15 +165,20 @@ export default function FolderTree({ courseId }) {
       setFolders(_folders);
 
       if (groupId) {
-        const payload = _folders
-          .filter((f) => f.id !== ROOT_ID)
-          .map((f, idx) => ({ id: Number(f.id), order_index: idx + 1 }));
+        // 옮긴 폴더 하나만 앞뒤 폴더 사이로 (서버에서 행 하나만 수정)
+        const realFolders = _folders.filter((f) => f.id !== ROOT_ID);
+        const pos = realFolders.indexOf(draggedFolder);
         try {
           const res = await fetch(`${API_BASE}/api/group/${groupId}/pages/reorder/`, {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             credentials: "include",
-            body: JSON.stringify({ parent: null, orders: payload }),
+            body: JSON.stringify({
+              id: Number(draggedFolder.id),
+              parent: null,
+              after_id: pos > 0 ? Number(realFolders[pos - 1].id) : null,
+              before_id: pos < realFolders.length - 1 ? Number(realFolders[pos + 1].id) : null,
+            }),
           });
           if (!res.ok) {
             const t = await res.text();
@@ -200,38 +218,26 @@ export default function FolderTree({ courseId }) {
       setFolders(_folders);
 
       if (groupId) {
+        // 옮긴 페이지 하나만 새 위치의 앞뒤 페이지 사이로 (서버에서 행 하나만 수정)
         const parentId = destFolderId === ROOT_ID ? null : destFolderId;
-        const destPayload = _folders[dest.folderIdx].items.map((item, idx) => ({
-          id: Number(item.id),
-          order_index: idx + 1,
-        }));
+        const destItems = _folders[dest.folderIdx].items;
+        const pos = destItems.indexOf(draggedItem);
         try {
           const res = await fetch(`${API_BASE}/api/group/${groupId}/pages/reorder/`, {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             credentials: "include",
-            body: JSON.stringify({ parent: parentId, orders: destPayload }),
+            body: JSON.stringify({
+              id: Number(draggedItem.id),
+              parent: parentId,
+              after_id: pos > 0 ? Number(destItems[pos - 1].id) : null,
+              before_id: pos < destItems.length - 1 ? Number(destItems[pos + 1].id) : null,
+            }),
           });
           if (!res.ok) {
             const t = await res.text();
             console.error("페이지 이동/정렬 실패", res.status, t);
           }
-          // 출발 폴더 정렬 (다른 폴더로 이동 시)
-          if (source.folderIdx !== dest.folderIdx) {
-            const sourcePayload = _folders[source.folderIdx].items.map((item, idx) => ({
-              id: Number(item.id),
-              order_index: idx + 1,
-            }));
-            await fetch(`${API_BASE}/api/group/${groupId}/pages/reorder/`, {
-              method: "POST",
-              headers: { "Content-Type": "application/json" },
-              credentials: "include",
-              body: JSON.stringify({
-                parent: _folders[source.folderIdx].id === ROOT_ID ? null : _folders[source.folderIdx].id,
-                orders: sourcePayload,
-              }),
-            });
-          }
         } catch (err) {
           console.error(err);
         }
@@ -3,14 +3,7 @@
 import { useEffect, useRef, useState } from "react";
 import styles from "../team.module.css";
 import Image from "next/image";
-
-function getCookie(name) {
-  if (typeof document === "undefined") return null;
-  const value = `; ${document.cookie}`;
-  const parts = value.split(`; ${name}=`);
-  if (parts.length === 2) return parts.pop().split(";").shift();
-  return null;
-}
+import { uploadInChunks } from "@/lib/uploads";
 
 
 export default function UploadPanel({ groupId }) {
@@ -50,35 +43,18 @@ export default function UploadPanel({ groupId }) {
     const selected = e.target.files[0];
     if (!selected) return;
 
-    const formData = new FormData();
-    formData.append("file", selected);
-
-    const csrftoken = getCookie("csrftoken");
-    
     try {
-      const res = await fetch(
-        `http://localhost:8000/api/group/${groupId}/files/`,
-        {
-          method: "POST",
-          body: formData,
-          credentials: "include",
-          headers: {
-            "X-CSRFToken": csrftoken ?? "",
-          },
-        }
-      );
-
-      if (!res.ok) {
-        alert("업로드 실패");
-        return;
-      }
-
-      const data = await res.json();
+      const data = await uploadInChunks({
+        target: "group-file",
+        targetId: groupId,
+        file: selected,
+      });
 
       // 🔹 업로드된 파일을 목록에 추가 (새 파일이 위로 오게)
       setFiles((prev) => [data, ...prev]);
     } catch (err) {
       console.error("업로드 오류:", err);
+      alert("업로드 실패");
     }
 
     e.target.value = "";
@@ -19,7 +19,7 @@ export default function TeamPage() {
   const [activeTab, setActiveTab] = useState("chat");
 
   // 👇 setChatMessages 추가로 꺼내오기
-  const { chatMessages, addChatMessage, setChatMessages } =
+  const { chatMessages, addChatMessage, confirmChatMessages, setChatMessages } =
     useTeamData();
 
   // 1) 내 그룹 정보 가져오기
@@ -54,9 +54,11 @@ export default function TeamPage() {
           return;
         }
 
-        const data = await res.json(); // [{id, sender, text, time, is_me}, ...]
+        // { results: [{id, sender, text, time, is_me}, ...], has_more }
+        // 최신 50개만 옴. 더 이전 건 ?before_id=<가장 오래된 id> 로
+        const data = await res.json();
 
-        const mapped = data.map((m) => ({
+        const mapped = data.results.map((m) => ({
           id: m.id,
           sender: m.sender,
           text: m.text,
@@ -127,6 +129,7 @@ export default function TeamPage() {
                       groupId={myGroup.id}
                       chatMessages={chatMessages}
                       addChatMessage={addChatMessage}
+                      confirmChatMessages={confirmChatMessages}
                     />
                   )}
 
@@ -47,6 +47,15 @@ export function TeamProvider({ children, groupId }) {
     });
   };
 
+  // 서버가 모아서 저장한 뒤 임시 id("tmp-...") -> 실제 id 로 바꿔줌
+  // pairs: [[임시 id, 실제 id], ...]
+  const confirmChatMessages = (pairs) => {
+    const realIds = new Map(pairs);
+    setChatMessages((prev) =>
+      prev.map((m) => (realIds.has(m.id) ? { ...m, id: realIds.get(m.id) } : m))
+    );
+  };
+
   return (
     <TeamContext.Provider
       value={{
@@ -55,6 +64,7 @@ export function TeamProvider({ children, groupId }) {
         addFile,
         chatMessages,
         addChatMessage,
+        confirmChatMessages,
         setChatMessages,   // 👈 히스토리 세팅용으로 노출
       }}
     >
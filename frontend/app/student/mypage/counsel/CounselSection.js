@@ -1,6 +1,6 @@
 'use client';
 
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import styles from './counsel.module.css';
 import {
   closeConsultation,
@@ -52,6 +52,41 @@ export default function CounselSection() {
     () => conversations.find((c) => String(c.id) === String(selectedId)),
     [conversations, selectedId]
   );
+  // 소켓 핸들러에서 최신 목록 보려고
+  const conversationsRef = useRef(conversations);
+  conversationsRef.current = conversations;
+
+  const applySuggestion = (id, sug) => {
+    setConversations((prev) =>
+      prev.map((c) =>
+        String(c.id) === String(id)
+          ? { ...c, suggestion: { category: sug.category, message: sug.message } }
+          : c
+      )
+    );
+  };
+
+  // 스트리밍 모드: 조각(delta)이 오는 대로 이어 붙임 (다른 메시지의 조각이면 새로 시작)
+  const appendSuggestionDelta = (id, delta) => {
+    setConversations((prev) =>
+      prev.map((c) => {
+        if (String(c.id) !== String(id)) return c;
+        const cur = c.suggestion;
+        const base =
+          cur?.streaming && cur.message_id === delta.message_id ? cur.message : '';
+        return {
+          ...c,
+          suggestion: {
+            category: 'LLM',
+            message: base + delta.delta,
+            message_id: delta.message_id,
+            streaming: true,
+            pending: true,
+          },
+        };
+      })
+    );
+  };
 
   useEffect(() => {
     const load = async () => {
@@ -159,6 +194,15 @@ export default function CounselSection() {
     socket.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
+        // 추천 답변은 메시지가 아니라 suggestion 으로 (서버에서 생성 끝나면 push)
+        if (data.type === 'suggestion') {
+          applySuggestion(selectedId, data);
+          return;
+        }
+        if (data.type === 'suggestion_delta') {
+          appendSuggestionDelta(selectedId, data);
+          return;
+        }
         setConversations((prev) =>
           prev.map((c) =>
             String(c.id) === String(selectedId)
@@ -176,6 +220,20 @@ export default function CounselSection() {
       }
     };
 
+    // 소켓이 붙기 전에 생성이 끝났으면 push 를 놓쳤을 수 있음 -> 한 번 다시 물어봄 (서버 캐시에서 바로 옴)
+    socket.onopen = async () => {
+      const current = conversationsRef.current.find(
+        (c) => String(c.id) === String(selectedId)
+      );
+      if (!current?.suggestion?.pending) return;
+      try {
+        const sug = await fetchConsultationSuggestion(selectedId);
+        if (!sug.pending) applySuggestion(selectedId, sug);
+      } catch {
+        // push 로 오면 됨
+      }
+    };
+
     return () => {
       socket.close();
     };
@@ -398,7 +456,8 @@ export default function CounselSection() {
                   messages: [...(c.messages || []), res],
                   last_message: res.text,
                   last_message_at: res.created_at,
-                  suggestion: res.suggestion || c.suggestion || null,
+                  // pending 이면 웹소켓 push 로 채워짐 (이미 push 가 먼저 왔으면 그대로 둠)
+                  suggestion: res.suggestion?.pending ? c.suggestion : res.suggestion || c.suggestion || null,
                 };
               })()
             : c
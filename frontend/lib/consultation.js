@@ -6,6 +6,16 @@ export function fetchConsultations() {
   return apiFetch('/api/consultations/', { method: 'GET' });
 }
 
+// 3-1 목록 조회 (keyset 페이지) -> { next, results }
+// nextUrl: 이전 응답의 next (없으면 첫 페이지), status: 'IN_PROGRESS' / 'DONE'
+export function fetchConsultationPage({ status, nextUrl, pageSize = 50 } = {}) {
+  const params = new URLSearchParams({ page_size: String(pageSize) });
+  if (status) params.set('status', status);
+  const cursor = nextUrl ? new URL(nextUrl).searchParams.get('cursor') : null;
+  if (cursor) params.set('cursor', cursor);
+  return apiFetch(`/api/consultations/?${params.toString()}`, { method: 'GET' });
+}
+
 // 3-2 새 상담 생성 (title, first_message 둘 다 선택사항)
 export function createConsultation(payload = {}) {
   return apiFetch('/api/consultations/', {
@@ -39,6 +39,15 @@ export async function getTeacherEvalCourseDetail(courseId) {
   return apiFetch(`/api/evals/teacher/courses/${courseId}/`);
 }
 
+// ✅ 강사용: 코멘트 다음 페이지
+// nextUrl 은 상세의 comments_next 또는 이전 응답의 next 를 그대로 넘기면 됨
+// 반환: { next, previous, results: [{ id, text }] }
+export async function getTeacherEvalComments(courseId, nextUrl) {
+  const cursor = nextUrl ? new URL(nextUrl).searchParams.get("cursor") : null;
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  return apiFetch(`/api/evals/teacher/courses/${courseId}/comments/${query}`);
+}
+
 
 export async function getTeacherTestEvalCourses() {
   return apiFetch("/api/evals/teacher/test/courses/");
@@ -0,0 +1,83 @@
+// frontend/lib/uploads.js
+import { apiFetch } from "./api";
+
+const PARALLEL = 3; // 동시에 올리는 청크 수
+
+function resumeKey(target, targetId, file) {
+  return `upload:${target}:${targetId}:${file.name}:${file.size}:${file.lastModified}`;
+}
+
+async function sha256Hex(blob) {
+  if (typeof crypto === "undefined" || !crypto.subtle) return "";
+  const digest = await crypto.subtle.digest("SHA-256", await blob.arrayBuffer());
+  return Array.from(new Uint8Array(digest))
+    .map((b) => b.toString(16).padStart(2, "0"))
+    .join("");
+}
+
+async function openSession(target, targetId, file) {
+  // 같은 파일을 다시 올리는 거면 예전 세션 이어서 (이미 받은 청크는 건너뜀)
+  const key = resumeKey(target, targetId, file);
+  const saved = typeof localStorage !== "undefined" ? localStorage.getItem(key) : null;
+  if (saved) {
+    try {
+      const session = await apiFetch(`/api/uploads/${saved}/`);
+      if (session.status === "open") return { session, key };
+    } catch (e) {
+      // 만료/삭제된 세션이면 새로 시작
+    }
+  }
+
+  const session = await apiFetch("/api/uploads/", {
+    method: "POST",
+    body: JSON.stringify({
+      target,
+      target_id: Number(targetId),
+      filename: file.name,
+      size: file.size,
+    }),
+  });
+  if (typeof localStorage !== "undefined") localStorage.setItem(key, session.id);
+  return { session, key };
+}
+
+/**
+ * 큰 파일을 청크로 나눠서 업로드 (끊겨도 다시 호출하면 이어서 올림)
+ * target: "submission" (targetId = 과제 id) | "group-file" (targetId = 그룹 id)
+ * 반환값은 기존 업로드 API 와 같은 Submission / GroupFile JSON
+ */
+export async function uploadInChunks({ target, targetId, file, onProgress }) {
+  const { session, key } = await openSession(target, targetId, file);
+
+  const done = new Set(session.received);
+  const pending = [];
+  for (let i = 0; i < session.total_chunks; i++) {
+    if (!done.has(i)) pending.push(i);
+  }
+  onProgress?.(done.size / session.total_chunks);
+
+  const worker = async () => {
+    while (pending.length) {
+      const index = pending.shift();
+      const start = index * session.chunk_size;
+      const chunk = file.slice(start, Math.min(start + session.chunk_size, file.size));
+      const checksum = await sha256Hex(chunk);
+
+      await apiFetch(`/api/uploads/${session.id}/chunks/${index}/`, {
+        method: "PUT",
+        body: chunk,
+        headers: {
+          "Content-Type": "application/octet-stream",
+          ...(checksum ? { "X-Chunk-Sha256": checksum } : {}),
+        },
+      });
+      done.add(index);
+      onProgress?.(done.size / session.total_chunks);
+    }
+  };
+  await Promise.all(Array.from({ length: PARALLEL }, worker));
+
+  const result = await apiFetch(`/api/uploads/${session.id}/complete/`, { method: "POST" });
+  if (typeof localStorage !== "undefined") localStorage.removeItem(key);
+  return result;
+}